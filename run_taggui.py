@@ -18,6 +18,11 @@ if __name__ == '__main__':
     if len(sys.argv) >= 2 and sys.argv[1] == '--import-marking-model':
         from utils.marking_model_importer import main as import_marking_model_main
         raise SystemExit(import_marking_model_main(sys.argv[2:]))
+    if len(sys.argv) >= 2 and sys.argv[1] == '--warm-thumbnails':
+        from multiprocessing import freeze_support
+        from utils.thumbnail_warmup import main as warm_thumbnails_main
+        freeze_support()
+        raise SystemExit(warm_thumbnails_main(sys.argv[2:]))
     from multiprocessing import freeze_support
     from run_gui import run_gui, suppress_warnings, install_crash_handlers
     freeze_support()
@@ -0,0 +1,130 @@
+"""Time the masonry engine and spatial index against the loops they replaced.
+
+    python scripts/benchmark_masonry.py --items 250000 1000000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'taggui'))
+
+from widgets.masonry_engine import (  # noqa: E402
+    calculate_masonry_arrays,
+    compute_masonry_arrays,
+    update_masonry_arrays,
+)
+from widgets.masonry_spatial_index import MasonrySpatialIndex  # noqa: E402
+from widgets.masonry_worker import calculate_masonry_layout  # noqa: E402
+
+
+def _dict_loop_layout(items_data, column_width, spacing, num_columns):
+    """Previous worker algorithm: shortest-column scan plus one dict per item."""
+    column_heights = [0] * num_columns
+    positioned_items = []
+    column_stride = column_width + spacing
+    for index, aspect_ratio in items_data:
+        aspect_ratio = min(max(aspect_ratio, 0.01), 100)
+        item_height = int(column_width / aspect_ratio)
+        shortest_col = 0
+        shortest_height = column_heights[0]
+        for column_index in range(1, num_columns):
+            if column_heights[column_index] < shortest_height:
+                shortest_col = column_index
+                shortest_height = column_heights[column_index]
+        positioned_items.append({
+            'index': index, 'x': shortest_col * column_stride,
+            'y': column_heights[shortest_col], 'width': column_width,
+            'height': item_height, 'aspect_ratio': aspect_ratio,
+        })
+        column_heights[shortest_col] += item_height + spacing
+    return {'items': positioned_items, 'total_height': max(column_heights)}
+
+
+def _best_of(repeats, func, *args):
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000.0
+
+
+def _linear_viewport_scan(items, top, bottom):
+    """Previous visible-item query: test every item."""
+    return [item for item in items if item['y'] + item['height'] >= top and item['y'] <= bottom]
+
+
+def _benchmark_spatial_index(items, queries=2000, linear_queries=20):
+    total_height = max(item['y'] + item['height'] for item in items)
+    rng = random.Random(1)
+    tops = [rng.randint(0, total_height) for _ in range(queries)]
+
+    started = time.perf_counter()
+    index = MasonrySpatialIndex.from_items(items)
+    build_ms = (time.perf_counter() - started) * 1000.0
+
+    started = time.perf_counter()
+    for top in tops:
+        index.query_rect(0, top, 1400, top + 1000)
+    rect_us = (time.perf_counter() - started) / queries * 1e6
+
+    started = time.perf_counter()
+    for top in tops:
+        index.item_at(300, top)
+    point_us = (time.perf_counter() - started) / queries * 1e6
+
+    started = time.perf_counter()
+    for top in tops[:linear_queries]:
+        _linear_viewport_scan(items, top, top + 1000)
+    linear_us = (time.perf_counter() - started) / linear_queries * 1e6
+    return {
+        'spatial index build': f'{build_ms:8.1f} ms',
+        'viewport query, index': f'{rect_us:8.1f} us',
+        'point query, index': f'{point_us:8.1f} us',
+        'viewport query, linear scan': f'{linear_us / 1000.0:8.1f} ms',
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, nargs='+', default=[250_000, 1_000_000])
+    parser.add_argument('--columns', type=int, default=6)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    ratios = [0.5, 2 / 3, 0.75, 1.0, 4 / 3, 1.5, 16 / 9]
+    for count in args.items:
+        items_data = [(index, rng.choice(ratios)) for index in range(count)]
+        import numpy as np
+        indices = np.arange(count)
+        aspect_ratios = np.array([ratio for _index, ratio in items_data])
+        layout = compute_masonry_arrays(indices, aspect_ratios, 200, 2, args.columns)
+        repaired_ratios = aspect_ratios.copy()
+        repaired_ratios[int(count * 0.9)] = 3.0
+        timings = {
+            'dict loop (previous)': _best_of(
+                args.repeats, _dict_loop_layout, items_data, 200, 2, args.columns),
+            'engine, arrays in': _best_of(
+                args.repeats, compute_masonry_arrays, indices, aspect_ratios, 200, 2, args.columns),
+            'engine, items_data in': _best_of(
+                args.repeats, calculate_masonry_arrays, items_data, 200, 2, args.columns),
+            'worker (engine + dicts)': _best_of(
+                args.repeats, calculate_masonry_layout, items_data, 200, 2, args.columns),
+            'update, 1 row at 90%': _best_of(
+                args.repeats, update_masonry_arrays, layout, indices, repaired_ratios,
+                200, 2, args.columns),
+        }
+        print(f'{count:,} items, {args.columns} columns (best of {args.repeats}):')
+        for label, milliseconds in timings.items():
+            print(f'  {label:<28} {milliseconds:8.1f} ms')
+        items = calculate_masonry_layout(items_data, 200, 2, args.columns)['items']
+        for label, value in _benchmark_spatial_index(items).items():
+            print(f'  {label:<28} {value}')
+
+
+if __name__ == '__main__':
+    main()
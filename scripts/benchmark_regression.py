@@ -0,0 +1,524 @@
+"""Performance regression suite for the masonry and folder-database hot paths.
+
+Times the paths behind the numbers in docs/PERFORMANCE_OPTIMIZATIONS.md on
+synthetic data and compares them with stored baselines:
+
+    python scripts/benchmark_regression.py                  # compare, exit 1 on regression
+    python scripts/benchmark_regression.py --update-baselines
+    python scripts/benchmark_regression.py --rows 100000 --only masonry
+
+Two kinds of checks:
+
+- Ratio checks compare cases from the same run (sprite badges against vector
+  badges, the last DB page against the first, ...). They hold on any machine,
+  so the default pytest run checks them on a small dataset.
+- Absolute checks compare each median with benchmark_baselines.json. The
+  baselines are wall times from one machine and row count, so these checks
+  are opt-in: under pytest they only run when TAGGUI_BENCHMARKS=1 is set.
+  After moving to different hardware, regenerate them with
+  --update-baselines (once per --rows value) before trusting a failure. A
+  case without a baseline is reported but never fails.
+
+Synthetic folder databases are written once per row count and seed to
+--data-dir and reused, because inserting 1,000,000 rows takes about 30 s.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'taggui'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide6.QtCore import QRect, Qt  # noqa: E402
+from PySide6.QtGui import QColor, QImage, QPainter  # noqa: E402
+from PySide6.QtWidgets import QApplication, QStyleOptionViewItem  # noqa: E402
+
+from utils.image_index_db import ImageIndexDB  # noqa: E402
+from widgets.image_list_masonry_incremental_service import MasonryIncrementalService  # noqa: E402
+from widgets.image_list_shared import ImageDelegate  # noqa: E402
+from widgets.image_list_strict_domain_service import StrictScrollDomainService  # noqa: E402
+from widgets.masonry_worker import calculate_masonry_layout  # noqa: E402
+
+
+DEFAULT_ROWS = 1_000_000
+DEFAULT_SEED = 1234
+BASELINES_PATH = Path(__file__).resolve().with_name('benchmark_baselines.json')
+# A case fails when it is slower than baseline * tolerance + slack.
+DEFAULT_TOLERANCE = 1.5
+DEFAULT_SLACK_MS = 2.0
+# (case, reference case, max ratio): case must take at most
+# ratio * reference + slack. These encode the relative claims in
+# docs/PERFORMANCE_OPTIMIZATIONS.md and need no per-machine baseline.
+RATIO_CHECKS = (
+    ('badge_paint_sprites', 'badge_paint_vector', 0.5),
+    ('db_get_page_100pct', 'db_get_page_0pct', 3.0),
+    ('incremental_page_up', 'incremental_page_down', 3.0),
+    ('masonry_layout_extreme', 'masonry_layout_photo', 3.0),
+)
+# Bumped when the synthetic data changes, so stale databases are rebuilt.
+SYNTHETIC_DATA_VERSION = 1
+SYNTHETIC_META_KEY = 'benchmark_synthetic_rows'
+
+PAGE_SIZE = 1000
+COLUMN_WIDTH = 200
+SPACING = 2
+NUM_COLUMNS = 6
+INCREMENTAL_PAGES = 20
+STRICT_DOMAIN_QUERIES = 2000
+BADGE_TILES = 200
+BADGE_TILE_SIZE = (160, 120)
+INSERT_CHUNK_ROWS = 50000
+
+# Typical photo and video aspect ratios with rough frequencies.
+_PHOTO_RATIOS = np.array([2 / 3, 3 / 4, 4 / 5, 1.0, 5 / 4, 4 / 3, 3 / 2, 16 / 9, 9 / 16])
+_PHOTO_WEIGHTS = np.array([0.22, 0.12, 0.06, 0.1, 0.04, 0.16, 0.18, 0.08, 0.04])
+
+
+def synthetic_aspect_ratios(count: int, distribution: str, seed: int = DEFAULT_SEED) -> np.ndarray:
+    """Aspect ratios (width / height) for `count` synthetic media files.
+
+    Distributions:
+        photo      common camera and video ratios
+        lognormal  continuous spread around 1.0 (crops, screenshots)
+        extreme    mostly photos plus panoramas and tall strips
+    """
+    rng = np.random.default_rng(seed)
+    if distribution == 'photo':
+        return rng.choice(_PHOTO_RATIOS, size=count, p=_PHOTO_WEIGHTS / _PHOTO_WEIGHTS.sum())
+    if distribution == 'lognormal':
+        return np.clip(rng.lognormal(mean=0.0, sigma=0.35, size=count), 0.2, 5.0)
+    if distribution == 'extreme':
+        ratios = rng.choice(_PHOTO_RATIOS, size=count, p=_PHOTO_WEIGHTS / _PHOTO_WEIGHTS.sum())
+        outliers = rng.random(count)
+        ratios[outliers < 0.02] = rng.uniform(3.0, 12.0, size=int((outliers < 0.02).sum()))
+        tall = (outliers >= 0.02) & (outliers < 0.04)
+        ratios[tall] = rng.uniform(0.08, 0.3, size=int(tall.sum()))
+        return ratios
+    raise ValueError(f'Unknown aspect ratio distribution: {distribution}')
+
+
+def _synthetic_rows(start: int, ratios: np.ndarray, mtimes: np.ndarray):
+    """Rows in the column order of ImageIndexDB._bulk_insert_chunk."""
+    for offset, (aspect_ratio, mtime) in enumerate(zip(ratios.tolist(), mtimes.tolist())):
+        row_id = start + offset
+        is_video = int(row_id % 50 == 0)
+        suffix = 'mp4' if is_video else 'jpg'
+        yield (
+            f'dir_{row_id // 1000:04d}/media_{row_id:07d}.{suffix}',
+            1024, max(1, int(1024 / aspect_ratio)), aspect_ratio,
+            is_video, None, None, None,
+            mtime, 0.0, mtime, 250000 + row_id % 4096, suffix, mtime,
+        )
+
+
+def build_synthetic_database(data_dir: Path, rows: int, seed: int = DEFAULT_SEED) -> ImageIndexDB:
+    """Open (creating on first use) a folder database with `rows` synthetic rows."""
+    folder = Path(data_dir) / f'rows-{rows}-seed-{seed}-v{SYNTHETIC_DATA_VERSION}'
+    folder.mkdir(parents=True, exist_ok=True)
+    db = ImageIndexDB(folder)
+    if not db.enabled:
+        raise RuntimeError('The folder database is disabled in settings (enable_dimension_cache)')
+    if db.get_meta_value(SYNTHETIC_META_KEY) == str(rows) and db.count() == rows:
+        return db
+
+    print(f'[BENCH] Writing synthetic database with {rows:,} rows to {folder}')
+    started = time.perf_counter()
+    db.conn.execute('DELETE FROM images')
+    db.conn.commit()
+    ratios = synthetic_aspect_ratios(rows, 'photo', seed)
+    mtimes = 1.7e9 + np.random.default_rng(seed + 1).random(rows) * 3.0e7
+    for start in range(0, rows, INSERT_CHUNK_ROWS):
+        end = min(rows, start + INSERT_CHUNK_ROWS)
+        db._bulk_insert_chunk(list(_synthetic_rows(start, ratios[start:end], mtimes[start:end])))
+    db.set_meta_value(SYNTHETIC_META_KEY, str(rows))
+    print(f'[BENCH] Synthetic database ready in {time.perf_counter() - started:.1f}s')
+    return db
+
+
+class _SyntheticSourceModel:
+    def __init__(self, total_count, resident_pages):
+        self._total_count = total_count
+        self.PAGE_SIZE = PAGE_SIZE
+        self._paginated_mode = True
+        self._pages = {page: None for page in resident_pages}
+        self._loading_pages = set()
+
+
+class _SyntheticScrollBar:
+    def maximum(self):
+        # Zero forces strict_page_from_position through the canonical domain.
+        return 0
+
+    def width(self):
+        return 15
+
+
+class _SyntheticViewport:
+    def width(self):
+        return NUM_COLUMNS * (COLUMN_WIDTH + SPACING) + 15
+
+    def height(self):
+        return 1000
+
+
+class _SyntheticView:
+    """The attributes StrictScrollDomainService reads from ImageListView."""
+
+    def __init__(self, source_model):
+        self.current_thumbnail_size = COLUMN_WIDTH
+        self._strict_virtual_avg_height = 0.0
+        self._strict_masonry_avg_h = 0.0
+        self._strict_scroll_max_floor = 0
+        self._strict_drag_frozen_max = 0
+        self._drag_scroll_max_baseline = 0
+        self._masonry_items = []
+        self._source_model = source_model
+        self._scrollbar = _SyntheticScrollBar()
+        self._viewport = _SyntheticViewport()
+
+    def model(self):
+        return self._source_model
+
+    def verticalScrollBar(self):
+        return self._scrollbar
+
+    def viewport(self):
+        return self._viewport
+
+
+class _TileIndex:
+    def __init__(self, image):
+        self._image = image
+
+    def data(self, role):
+        return self._image if role == Qt.ItemDataRole.UserRole else None
+
+
+def _badge_tiles(seed):
+    """Tile indexes with every thumbnail badge kind enabled."""
+    rng = np.random.default_rng(seed)
+    tiles = []
+    for tile in range(BADGE_TILES):
+        image = SimpleNamespace(
+            is_video=True,
+            video_metadata={'frame_count': int(rng.choice([80, 81]))},
+            review_rank=1 + tile % 3,
+            review_flags=0,
+            love=True,
+            bomb=bool(tile % 2),
+            rating=float(rng.choice([0.2, 0.5, 0.6, 0.9, 1.0])),
+        )
+        columns = 8
+        rect = QRect((tile % columns) * BADGE_TILE_SIZE[0], (tile // columns) * BADGE_TILE_SIZE[1],
+                     BADGE_TILE_SIZE[0], BADGE_TILE_SIZE[1])
+        tiles.append((rect, _TileIndex(image)))
+    return tiles
+
+
+def _paint_badge_viewport(state):
+    """Paint the overlays of one viewport full of tiles, as ImageDelegate.paint does."""
+    delegate, tiles, canvas = state
+    painter = QPainter(canvas)
+    option = QStyleOptionViewItem()
+    for rect, index in tiles:
+        option.rect = rect
+        delegate._draw_n4_plus_1_stamp(painter, option, index)
+        delegate._draw_review_badges(painter, option, index)
+        delegate._draw_reaction_badges(painter, option, index)
+        delegate._draw_star_rating_badge(painter, option, index)
+    painter.end()
+
+
+def _badge_viewport_state(delegate, tiles):
+    rows = math.ceil(BADGE_TILES / 8)
+    canvas = QImage(8 * BADGE_TILE_SIZE[0], rows * BADGE_TILE_SIZE[1],
+                    QImage.Format.Format_ARGB32_Premultiplied)
+    canvas.fill(QColor(40, 40, 40))
+    return delegate, tiles, canvas
+
+
+@dataclass
+class BenchmarkCase:
+    """One timed operation. `setup` builds untimed state for each repeat."""
+
+    name: str
+    run: object
+    setup: object = None
+    repeats: int = 5
+    tolerance: float = DEFAULT_TOLERANCE
+
+
+def _page_items_data(ratios, page_num):
+    start = page_num * PAGE_SIZE
+    return list(zip(range(start, start + PAGE_SIZE), ratios[start:start + PAGE_SIZE].tolist()))
+
+
+def _seeded_incremental_service(ratios, page_num):
+    """Service holding one laid-out page, as after a full recalc."""
+    service = MasonryIncrementalService(None)
+    page = calculate_masonry_layout(
+        _page_items_data(ratios, page_num), COLUMN_WIDTH, SPACING, NUM_COLUMNS)
+    avg_h = COLUMN_WIDTH / float(np.mean(ratios[:PAGE_SIZE]))
+    prefix = int(math.ceil(page_num * PAGE_SIZE / NUM_COLUMNS) * avg_h)
+    for item in page['items']:
+        item['y'] += prefix
+    service.cache_from_full_result(
+        page['items'], PAGE_SIZE, COLUMN_WIDTH, SPACING, NUM_COLUMNS, avg_h)
+    return service
+
+
+def _page_down_chain(state):
+    service, pages = state
+    for page_num, items_data in pages:
+        service.compute_page_down(page_num, items_data)
+
+
+def _page_up_chain(state):
+    service, pages, total = state
+    for page_num, items_data in pages:
+        service.compute_page_up(page_num, items_data, total)
+
+
+def _strict_domain_queries(state):
+    service, scroll_values = state
+    for value in scroll_values:
+        service.strict_page_from_position(value)
+        service.get_strict_scroll_domain_max()
+
+
+def _reset_order_cache(db):
+    with db._db_lock:
+        db.conn.execute('DELETE FROM ordered_image_cache')
+        db.conn.commit()
+        db._order_cache_signature = None
+    return db
+
+
+def _warm_order_cache(db):
+    db._ensure_order_cache(sort_field='mtime', sort_dir='DESC')
+    return db
+
+
+def build_cases(rows: int, data_dir: Path, seed: int = DEFAULT_SEED, only: str = '') -> list[BenchmarkCase]:
+    """Benchmark cases for a dataset of `rows` items; `only` filters by name."""
+    cases = []
+    layout_items = max(PAGE_SIZE, rows // 4)
+    for distribution in ('photo', 'lognormal', 'extreme'):
+        ratios = synthetic_aspect_ratios(layout_items, distribution, seed)
+        items_data = list(zip(range(layout_items), ratios.tolist()))
+        cases.append(BenchmarkCase(
+            f'masonry_layout_{distribution}',
+            lambda _state, items_data=items_data: calculate_masonry_layout(
+                items_data, COLUMN_WIDTH, SPACING, NUM_COLUMNS),
+        ))
+
+    total_pages = max(1, rows // PAGE_SIZE)
+    ratios = synthetic_aspect_ratios(total_pages * PAGE_SIZE, 'photo', seed)
+    chain = min(INCREMENTAL_PAGES, max(1, total_pages - 1))
+    down_start = 0
+    up_start = total_pages // 2 if total_pages > chain else chain
+    down_pages = [(page, _page_items_data(ratios, page))
+                  for page in range(down_start + 1, down_start + 1 + chain)]
+    up_pages = [(page, _page_items_data(ratios, page))
+                for page in range(up_start - 1, up_start - 1 - chain, -1)]
+    cases.append(BenchmarkCase(
+        'incremental_page_down',
+        _page_down_chain,
+        setup=lambda: (_seeded_incremental_service(ratios, down_start), down_pages),
+    ))
+    cases.append(BenchmarkCase(
+        'incremental_page_up',
+        _page_up_chain,
+        setup=lambda: (_seeded_incremental_service(ratios, up_start), up_pages, rows),
+    ))
+
+    domain_rng = np.random.default_rng(seed)
+    resident_pages = range(min(total_pages, INCREMENTAL_PAGES))
+    scroll_values = domain_rng.integers(0, max(2, rows * 40), size=STRICT_DOMAIN_QUERIES).tolist()
+    cases.append(BenchmarkCase(
+        'strict_domain_math',
+        _strict_domain_queries,
+        setup=lambda: (
+            StrictScrollDomainService(_SyntheticView(_SyntheticSourceModel(rows, resident_pages))),
+            scroll_values,
+        ),
+    ))
+
+    QApplication.instance() or QApplication([])
+    tiles = _badge_tiles(seed)
+    sprite_delegate = ImageDelegate()
+    vector_delegate = ImageDelegate()
+    vector_delegate._badge_sprites_enabled = False
+    # The sprite case times repaints; the first paint fills the atlas.
+    _paint_badge_viewport(_badge_viewport_state(sprite_delegate, tiles))
+    cases.append(BenchmarkCase(
+        'badge_paint_sprites',
+        _paint_badge_viewport,
+        setup=lambda: _badge_viewport_state(sprite_delegate, tiles),
+        repeats=9,
+    ))
+    cases.append(BenchmarkCase(
+        'badge_paint_vector',
+        _paint_badge_viewport,
+        setup=lambda: _badge_viewport_state(vector_delegate, tiles),
+        repeats=9,
+    ))
+
+    wants_db = any(prefix.startswith(only) or only.startswith(prefix)
+                   for prefix in ('db_get_page', 'db_order_cache'))
+    if wants_db:
+        db = build_synthetic_database(data_dir, rows, seed)
+        depths = sorted({0, total_pages // 2, total_pages - 1})
+        for depth in depths:
+            cases.append(BenchmarkCase(
+                f'db_get_page_{depth * 100 // max(1, total_pages - 1)}pct',
+                lambda _state, depth=depth: db.get_page(depth, PAGE_SIZE, 'mtime', 'DESC'),
+                setup=lambda: _warm_order_cache(db),
+            ))
+        cases.append(BenchmarkCase(
+            'db_order_cache_rebuild',
+            lambda state: state._ensure_order_cache(sort_field='mtime', sort_dir='DESC'),
+            setup=lambda: _reset_order_cache(db),
+            repeats=3,
+        ))
+    return [case for case in cases if case.name.startswith(only)]
+
+
+def time_case(case: BenchmarkCase, repeats: int | None = None) -> float:
+    """Median wall time of the case in milliseconds."""
+    samples = []
+    for _ in range(max(1, repeats or case.repeats)):
+        state = case.setup() if case.setup else None
+        started = time.perf_counter()
+        case.run(state)
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return statistics.median(samples)
+
+
+def load_baselines(path: Path = BASELINES_PATH) -> dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baselines(baselines: dict, path: Path = BASELINES_PATH):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare_to_baseline(name: str, measured_ms: float, baseline: dict | None,
+                        tolerance_scale: float = 1.0) -> str | None:
+    """Regression message when `measured_ms` exceeds the allowed time, else None."""
+    if not baseline:
+        return None
+    allowed = (float(baseline['median_ms']) * float(baseline.get('tolerance', DEFAULT_TOLERANCE))
+               * tolerance_scale + float(baseline.get('slack_ms', DEFAULT_SLACK_MS)))
+    if measured_ms <= allowed:
+        return None
+    return (f'{name}: {measured_ms:.1f} ms exceeds {allowed:.1f} ms '
+            f'(baseline {float(baseline["median_ms"]):.1f} ms)')
+
+
+def compare_ratios(measured: dict[str, float], tolerance_scale: float = 1.0) -> list[str]:
+    """Messages for RATIO_CHECKS whose cases both ran and are out of proportion."""
+    failures = []
+    for name, reference, ratio in RATIO_CHECKS:
+        if name not in measured or reference not in measured:
+            continue
+        allowed = measured[reference] * ratio * tolerance_scale + DEFAULT_SLACK_MS
+        if measured[name] > allowed:
+            failures.append(
+                f'{name}: {measured[name]:.1f} ms exceeds {allowed:.1f} ms '
+                f'({ratio:g}x {reference} at {measured[reference]:.1f} ms)')
+    return failures
+
+
+def tolerance_scale_from_env() -> float:
+    """TAGGUI_BENCHMARK_TOLERANCE scales every tolerance (e.g. 2 on a slow CI box)."""
+    try:
+        return max(0.1, float(os.environ.get('TAGGUI_BENCHMARK_TOLERANCE', '1') or 1))
+    except ValueError:
+        return 1.0
+
+
+def default_data_dir() -> Path:
+    return Path(os.environ.get('TAGGUI_BENCHMARK_DATA_DIR')
+                or Path(tempfile.gettempdir()) / 'taggui-benchmarks')
+
+
+def run_suite(rows: int, data_dir: Path, *, only: str = '', update: bool = False,
+              baselines_path: Path = BASELINES_PATH, repeats: int | None = None,
+              absolute: bool = True) -> list[str]:
+    """Run the cases, print a report and return regression messages.
+
+    `absolute=False` skips the per-machine baselines and only applies RATIO_CHECKS.
+    """
+    baselines = load_baselines(baselines_path) if absolute or update else {}
+    scale_baselines = baselines.setdefault(str(rows), {})
+    tolerance_scale = tolerance_scale_from_env()
+    failures = []
+    timings = {}
+    print(f'{rows:,} rows on {platform.machine()} / Python {platform.python_version()}:')
+    for case in build_cases(rows, data_dir, only=only):
+        measured = time_case(case, repeats)
+        timings[case.name] = measured
+        baseline = scale_baselines.get(case.name)
+        message = None if update else compare_to_baseline(
+            case.name, measured, baseline, tolerance_scale)
+        status = 'no baseline' if baseline is None else ('REGRESSION' if message else 'ok')
+        reference = f'{float(baseline["median_ms"]):10.1f} ms' if baseline else ' ' * 13
+        print(f'  {case.name:<28} {measured:10.1f} ms  baseline {reference}  {status}')
+        if message:
+            failures.append(message)
+        if update:
+            scale_baselines[case.name] = {
+                'median_ms': round(measured, 2),
+                'tolerance': case.tolerance,
+                'slack_ms': DEFAULT_SLACK_MS,
+            }
+    if update:
+        save_baselines(baselines, baselines_path)
+        print(f'[BENCH] Baselines written to {baselines_path}')
+    else:
+        failures.extend(compare_ratios(timings, tolerance_scale))
+    return failures
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS,
+                        help=f'synthetic dataset size (default: {DEFAULT_ROWS:,})')
+    parser.add_argument('--data-dir', type=Path, default=None,
+                        help='where synthetic databases are kept between runs')
+    parser.add_argument('--only', default='', help='run cases whose name starts with this')
+    parser.add_argument('--repeats', type=int, default=None, help='override repeats per case')
+    parser.add_argument('--baselines', type=Path, default=BASELINES_PATH)
+    parser.add_argument('--update-baselines', action='store_true',
+                        help='store this run as the baseline instead of comparing')
+    args = parser.parse_args(argv)
+
+    failures = run_suite(
+        max(PAGE_SIZE, args.rows), args.data_dir or default_data_dir(), only=args.only,
+        update=args.update_baselines, baselines_path=args.baselines, repeats=args.repeats)
+    for message in failures:
+        print(f'[BENCH] {message}', file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -519,6 +519,8 @@ class SignalManager:
             video_editing_controller.fix_sar_selected)
         toolbar_manager.fix_all_sar_btn.clicked.connect(
             video_editing_controller.fix_all_sar_folder)
+        toolbar_manager.validate_videos_btn.clicked.connect(
+            video_editing_controller.validate_folder_videos)
         toolbar_manager.apply_speed_btn.clicked.connect(
             video_editing_controller.apply_speed_change)
         toolbar_manager.change_fps_btn.clicked.connect(
@@ -82,6 +82,7 @@ class ToolbarManager:
         self.fix_all_folder_btn = None
         self.fix_sar_btn = None
         self.fix_all_sar_btn = None
+        self.validate_videos_btn = None
         self.apply_speed_btn = None
         self.change_fps_btn = None
         self.rating = 0
@@ -697,6 +698,15 @@ class ToolbarManager:
         )
         toolbar.addWidget(self.fix_all_sar_btn)
 
+        self.validate_videos_btn = self._create_styled_button(
+            'CHECK',
+            'Validate all videos in folder for corruption\n'
+            'Results are kept; filter them with valid:true or corrupt:true',
+            55,
+            '#8BC34A',
+        )
+        toolbar.addWidget(self.validate_videos_btn)
+
         self.apply_speed_btn = self._create_styled_button(
             'SPEED',
             'Apply speed change to video (uses current speed slider value)',
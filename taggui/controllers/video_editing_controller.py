@@ -1336,9 +1336,23 @@ class VideoEditingController:
             return
 
         # Scan for non-square SAR videos
+        scan_progress = QProgressDialog("Checking videos...", "Cancel", 0, len(video_paths), self.main_window)
+        scan_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        scan_progress.setMinimumDuration(500)
+
+        def update_scan_progress(current, total, name):
+            scan_progress.setMaximum(total)
+            scan_progress.setLabelText(f"Checking {name}...")
+            scan_progress.setValue(current)
+            return scan_progress.wasCanceled()
+
         non_square_videos = _video_editor_class().scan_directory_for_non_square_sar(
-            self.main_window.directory_path, video_extensions
+            self.main_window.directory_path, video_extensions, progress_callback=update_scan_progress
         )
+        scan_cancelled = scan_progress.wasCanceled()
+        scan_progress.close()
+        if scan_cancelled:
+            return
 
         if not non_square_videos:
             QMessageBox.information(self.main_window, "No Issues",
@@ -1399,6 +1413,61 @@ class VideoEditingController:
         # Auto-reload directory to show changes
         self.main_window.reload_directory()
 
+    def validate_folder_videos(self):
+        """Check every video in the folder for corruption and store the results."""
+        if not self.main_window.directory_path:
+            QMessageBox.warning(self.main_window, "No Directory", "No directory is loaded.")
+            return
+
+        from utils.video.validation_service import VALIDATION_LEVELS, validate_folder
+
+        level_labels = {
+            "Quick (ffprobe structure)": "probe",
+            "Sample frames (OpenCV)": "sample",
+            "Full decode (ffmpeg, slowest)": "decode",
+        }
+        label, ok = QInputDialog.getItem(
+            self.main_window, "Validate Videos",
+            "Check all videos in this folder.\n"
+            "Unchanged videos keep their earlier result.\n"
+            "Filter the results with valid:true or corrupt:true.",
+            list(level_labels), 0, False
+        )
+        if not ok or level_labels.get(label) not in VALIDATION_LEVELS:
+            return
+
+        progress = QProgressDialog("Validating videos...", "Cancel", 0, 0, self.main_window)
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(0)
+
+        def update_progress(current, total, name):
+            progress.setMaximum(total)
+            progress.setLabelText(f"Checking {name}...")
+            progress.setValue(current)
+            return progress.wasCanceled()
+
+        results, report = validate_folder(
+            self.main_window.directory_path, level_labels[label], progress_callback=update_progress
+        )
+        progress.close()
+
+        corrupt = sorted((path, result) for path, result in results.items() if not result.ok)
+        result_msg = f"Validated {len(results)} video(s), {report.completed} checked now:\n"
+        result_msg += f"✓ Valid: {len(results) - len(corrupt)}\n"
+        result_msg += f"✗ Corrupt: {len(corrupt)}"
+        if report.cancelled:
+            result_msg += f"\n{report.cancelled} video(s) skipped (cancelled)"
+        if corrupt:
+            result_msg += "\n\nCorrupt:\n" + "\n".join(
+                f"• {path.name}: {result.message.splitlines()[0] if result.message else ''}"
+                for path, result in corrupt[:10]
+            )
+            if len(corrupt) > 10:
+                result_msg += f"\n... and {len(corrupt) - 10} more"
+            QMessageBox.warning(self.main_window, "Validation Complete", result_msg)
+        else:
+            QMessageBox.information(self.main_window, "Validation Complete", result_msg)
+
     def apply_speed_change(self):
         """Apply speed change to current video based on speed slider value."""
         video_player = self.main_window.image_viewer.video_player
@@ -1044,18 +1044,34 @@ class SettingsDialog(QDialog):
                               Qt.AlignmentFlag.AlignRight)
         max_pages_spin_box = SettingsSpinBox(
             key='max_pages_in_memory',
-            minimum=3, maximum=60, default=20)
+            minimum=3, maximum=200, default=60)
         max_pages_spin_box.setToolTip(
-            'Maximum paginated pages kept in RAM.\n'
-            'Lower = less RAM, more refetch on jumps\n'
-            'Higher = smoother revisits, more RAM use\n'
-            'Guardrail: effective value is at least (2 * eviction pages + 1).\n'
+            'Upper limit on paginated pages kept in RAM.\n'
+            'Below this limit the page memory budget decides what stays resident.\n'
+            'Guardrail: effective value is at least (2 * eviction pages + 2).\n'
             'Applied live.')
         grid_layout.addWidget(max_pages_spin_box, 8, 1,
                               Qt.AlignmentFlag.AlignLeft)
 
+        # Page memory budget (byte budget for paginated mode)
+        grid_layout.addWidget(QLabel('Page memory budget (MB)'), 9, 0,
+                              Qt.AlignmentFlag.AlignRight)
+        page_budget_spin_box = SettingsSpinBox(
+            key='page_memory_budget_mb',
+            minimum=0, maximum=65536)
+        page_budget_spin_box.setSpecialValueText('Auto')
+        page_budget_spin_box.setSingleStep(256)
+        page_budget_spin_box.setToolTip(
+            'Estimated RAM for paginated pages: image entries, tags and decoded thumbnails.\n'
+            'Large, least recently used pages outside the viewport window are evicted first.\n'
+            'Auto = a quarter of the memory available when a folder loads (256 MB - 4 GB).\n'
+            'Current usage is shown in the Performance HUD list mode.\n'
+            'Applied live.')
+        grid_layout.addWidget(page_budget_spin_box, 9, 1,
+                              Qt.AlignmentFlag.AlignLeft)
+
         # Video player skin
-        grid_layout.addWidget(QLabel('Video player skin'), 9, 0,
+        grid_layout.addWidget(QLabel('Video player skin'), 10, 0,
                               Qt.AlignmentFlag.AlignRight)
         self.video_skin_combo = SettingsComboBox(
             key='video_player_skin',
@@ -1774,10 +1790,62 @@ class SettingsDialog(QDialog):
         grid_layout.addWidget(thumbnail_cache_location_button, 3, 1,
                               Qt.AlignmentFlag.AlignLeft)
 
+        # Thumbnail cache size cap
+        grid_layout.addWidget(QLabel('Thumbnail cache size limit (MB)'), 4, 0,
+                              Qt.AlignmentFlag.AlignRight)
+        thumbnail_cache_max_size_spin_box = SettingsSpinBox(
+            key='thumbnail_cache_max_size_mb',
+            minimum=0, maximum=1024 * 1024)
+        thumbnail_cache_max_size_spin_box.setSingleStep(512)
+        thumbnail_cache_max_size_spin_box.setToolTip(
+            'Maximum disk space for cached thumbnails across all folders.\n'
+            'Least recently used thumbnails are removed in the background\n'
+            'when the cache grows past this limit.\n'
+            '0 = unlimited. Applied live.')
+        thumbnail_cache_max_size_spin_box.valueChanged.connect(
+            lambda value: get_thumbnail_cache().set_max_size_mb(value))
+        grid_layout.addWidget(thumbnail_cache_max_size_spin_box, 4, 1,
+                              Qt.AlignmentFlag.AlignLeft)
+
+        # Content-addressed thumbnail sharing
+        grid_layout.addWidget(QLabel('Share thumbnails between identical files'), 5, 0,
+                              Qt.AlignmentFlag.AlignRight)
+        thumbnail_cache_content_dedup_check_box = SettingsBigCheckBox(
+            key='thumbnail_cache_content_dedup')
+        thumbnail_cache_content_dedup_check_box.setToolTip(
+            'Key thumbnails by a fast fingerprint of the file content as well as its path.\n'
+            'Copies of the same image in other folders share one thumbnail, and\n'
+            'renamed files keep theirs instead of being decoded again.\n'
+            'Applied live.')
+        thumbnail_cache_content_dedup_check_box.stateChanged.connect(
+            lambda state: setattr(
+                get_thumbnail_cache(), 'content_dedup',
+                state == Qt.CheckState.Checked.value))
+        grid_layout.addWidget(thumbnail_cache_content_dedup_check_box, 5, 1,
+                              Qt.AlignmentFlag.AlignLeft)
+
+        # Thumbnail cache statistics (from the cache access index)
+        grid_layout.addWidget(QLabel('Thumbnail cache statistics'), 6, 0,
+                              Qt.AlignmentFlag.AlignRight)
+        self.thumbnail_cache_stats_label = QLabel('(click to refresh)')
+        self.thumbnail_cache_stats_label.setStyleSheet('color: #666; font-size: 10px;')
+        self.refresh_thumbnail_cache_stats_button = QPushButton('Refresh')
+        self.refresh_thumbnail_cache_stats_button.setToolTip(
+            'Show cache size, entry count, and hit/miss counts')
+        self.refresh_thumbnail_cache_stats_button.clicked.connect(
+            self._refresh_thumbnail_cache_stats)
+        stats_row_layout = QHBoxLayout()
+        stats_row_layout.setSpacing(10)
+        stats_row_layout.addWidget(self.thumbnail_cache_stats_label)
+        stats_row_layout.addWidget(self.refresh_thumbnail_cache_stats_button)
+        stats_row_layout.addStretch()
+        grid_layout.addLayout(stats_row_layout, 6, 1,
+                              Qt.AlignmentFlag.AlignLeft)
+
         # Cache management section (continue grid layout)
-        grid_layout.addWidget(QLabel(''), 4, 0)  # Spacer row
+        grid_layout.addWidget(QLabel(''), 7, 0)  # Spacer row
 
-        grid_layout.addWidget(QLabel('Cache Management'), 5, 0,
+        grid_layout.addWidget(QLabel('Cache Management'), 8, 0,
                               Qt.AlignmentFlag.AlignRight)
 
         cache_buttons_layout = QVBoxLayout()
@@ -1873,7 +1941,7 @@ class SettingsDialog(QDialog):
         cache_buttons_layout.addSpacing(10)
         cache_buttons_layout.addLayout(all_db_row_layout)
 
-        grid_layout.addLayout(cache_buttons_layout, 5, 1,
+        grid_layout.addLayout(cache_buttons_layout, 8, 1,
                               Qt.AlignmentFlag.AlignLeft)
 
         layout.addLayout(grid_layout)
@@ -2505,9 +2573,7 @@ class SettingsDialog(QDialog):
                     for image_path in image_paths:
                         try:
                             mtime = image_path.stat().st_mtime
-                            cache_key = thumbnail_cache._get_cache_key(image_path, mtime, 512)
-                            cache_path = thumbnail_cache._get_cache_path(cache_key)
-                            if cache_path.exists():
+                            for cache_path in thumbnail_cache.level_paths(image_path, mtime, 512):
                                 dir_cache_size += cache_path.stat().st_size
                         except Exception:
                             pass
@@ -2541,7 +2607,11 @@ class SettingsDialog(QDialog):
                 return
 
             try:
-                cache_size = self._get_cache_size(thumbnail_cache.cache_dir)
+                stats = thumbnail_cache.stats()
+                if stats is not None:
+                    cache_size = self._format_size(stats['size_bytes'])
+                else:
+                    cache_size = self._get_cache_size(thumbnail_cache.cache_dir)
                 self.clear_all_size_label.setText(cache_size)
             except Exception:
                 self.clear_all_size_label.setText('(error)')
@@ -2550,6 +2620,28 @@ class SettingsDialog(QDialog):
 
         QTimer.singleShot(10, do_calculation)
 
+    @Slot()
+    def _refresh_thumbnail_cache_stats(self):
+        """Show thumbnail cache size and hit/miss counters from the access index."""
+        thumbnail_cache = get_thumbnail_cache()
+        stats = thumbnail_cache.stats() if thumbnail_cache.enabled else None
+        if stats is None:
+            self.thumbnail_cache_stats_label.setText('(cache disabled)')
+            return
+        limit_text = (self._format_size(stats['max_bytes'])
+                      if stats['max_bytes'] > 0 else 'unlimited')
+        session_reads = stats['session_hits'] + stats['session_misses']
+        hit_rate = (f"{100.0 * stats['session_hits'] / session_reads:.0f}%"
+                    if session_reads else 'n/a')
+        self.thumbnail_cache_stats_label.setText(
+            f"{self._format_size(stats['size_bytes'])} of {limit_text} "
+            f"in {stats['entries']:,} thumbnails\n"
+            f"This session: {stats['session_hits']:,} hits, "
+            f"{stats['session_misses']:,} misses ({hit_rate}), "
+            f"{stats['session_evictions']:,} evicted\n"
+            f"All time: {stats['lifetime_hits']:,} hits, "
+            f"{stats['lifetime_misses']:,} misses")
+
     @Slot()
     def _calculate_all_db_size(self):
         """Calculate total database size."""
@@ -2892,13 +2984,9 @@ class SettingsDialog(QDialog):
                 for image_path in image_paths:
                     try:
                         mtime = image_path.stat().st_mtime
-                        cache_key = thumbnail_cache._get_cache_key(
+                        deleted_count += thumbnail_cache.remove_thumbnail(
                             image_path, mtime, 512  # Default thumbnail size
                         )
-                        cache_path = thumbnail_cache._get_cache_path(cache_key)
-                        if cache_path.exists():
-                            cache_path.unlink()
-                            deleted_count += 1
                     except Exception:
                         pass  # Skip files that fail
 
@@ -2967,23 +3055,8 @@ class SettingsDialog(QDialog):
             return
 
         try:
-            deleted_count = 0
-
-            # Delete all cache files
-            for cache_file in thumbnail_cache.cache_dir.rglob('*.webp'):
-                try:
-                    cache_file.unlink()
-                    deleted_count += 1
-                except Exception:
-                    pass
-
-            # Also delete old PNG files if any remain
-            for cache_file in thumbnail_cache.cache_dir.rglob('*.png'):
-                try:
-                    cache_file.unlink()
-                    deleted_count += 1
-                except Exception:
-                    pass
+            # Delete all cache files (WebP plus any old PNG leftovers)
+            deleted_count = thumbnail_cache.clear_all()
 
             QMessageBox.information(
                 self,
@@ -32,6 +32,7 @@ from utils.image_index_db import (
     build_sidecar_review_recovery,
     extract_sidecar_reaction_state,
     extract_sidecar_review_state,
+    video_metadata_from_row,
 )
 from utils.jxlutil import get_jxl_size
 from utils.review_marks import (
@@ -50,10 +51,20 @@ from utils.ideogram_caption import (
     legacy_ideogram_caption_path,
 )
 from utils.diagnostic_logging import diagnostic_print, diagnostic_time_prefix, should_emit_trace_log
+from utils.frame_trace import frame_trace
 from utils.pillow_plugins import ensure_pillow_plugins_registered
 from utils.settings import DEFAULT_SETTINGS, settings, parse_image_list_formats
 from utils.thumbnail_cache import get_thumbnail_cache
 from utils.load_options import LimitedLoadOptions
+from utils.page_prefetch import PagePrefetchPlanner
+from utils.page_residency import (
+    FALLBACK_BUDGET_BYTES,
+    MB,
+    choose_victim,
+    estimate_page_bytes,
+    page_thumbnail_bytes,
+    resolve_page_budget_bytes,
+)
 from utils.utils import get_confirmation_dialog_reply, pluralize
 import utils.target_dimension as target_dimension
 
@@ -77,7 +88,7 @@ def _get_imagesize_module():
 
     return imagesize
 
-# Global lock for video operations (OpenCV/ffmpeg is not thread-safe)
+# Serializes in-process OpenCV/ffmpeg use (probe fallback, captioning frame reads)
 _video_lock = threading.Lock()
 # Global lock for thumbnail cache writes (limits I/O contention during scroll).
 _thumbnail_save_lock = threading.Lock()
@@ -414,14 +425,10 @@ def load_thumbnail_data(
         cache = get_thumbnail_cache()
         if cache.enabled:
             mtime = image_path.stat().st_mtime
-            # Get cache path directly and load as QImage (thread-safe)
-            cache_key = cache._get_cache_key(image_path, mtime, thumbnail_width)
-            cache_path = cache._get_cache_path(cache_key)
-
-            cached_qimage = None
-            if cache_path.exists():
-                # Load directly as QImage (thread-safe, no QIcon/QPixmap needed)
-                cached_qimage = QImage(str(cache_path))
+            # Load directly as QImage (thread-safe, no QIcon/QPixmap needed).
+            # A missing exact width is served from the nearest larger
+            # pyramid level, so size changes never re-decode the source.
+            cached_qimage = cache.get_thumbnail_qimage(image_path, mtime, thumbnail_width)
             if cached_qimage is not None and not cached_qimage.isNull():
                 return (cached_qimage, True, None, image_path)  # Cache hit! (No original dims from cache)
     except Exception:
@@ -433,7 +440,8 @@ def load_thumbnail_data(
     try:
         if is_video:
             # For videos, extract first frame as thumbnail (returns QImage, thread-safe)
-            dims, _, first_frame_image = extract_video_info(image_path)
+            dims, _, first_frame_image = extract_video_info(
+                image_path, representative_frame=True, max_frame_width=thumbnail_width)
             original_size = dims
             if first_frame_image and not first_frame_image.isNull():
                 qimage = first_frame_image.scaledToWidth(
@@ -1456,64 +1464,59 @@ def _scan_image_paths_in_subtrees_worker(
     )
 
 
-def extract_video_info(video_path: Path) -> tuple[tuple[int, int] | None, dict | None, QImage | None]:
+def extract_video_info(
+    video_path: Path,
+    include_frame: bool = True,
+    representative_frame: bool = False,
+    max_frame_width: int | None = None,
+) -> tuple[tuple[int, int] | None, dict | None, QImage | None]:
     """
-    Extract metadata and first frame from a video file.
-    Returns: (dimensions, video_metadata, first_frame_image)
+    Extract metadata and a preview frame from a video file.
+    Returns: (dimensions, video_metadata, frame_image)
 
-    Thread-safe: Uses global lock to prevent OpenCV/ffmpeg crashes.
+    Probes run in isolated worker processes (see utils.video.probe), so
+    callers on different threads decode in parallel. `_video_lock` only
+    guards the in-process fallback used when the pool is unavailable, which
+    keeps the same time limit.
     Returns QImage (thread-safe) instead of QPixmap (main-thread only).
-    """
-    with _video_lock:
-        try:
-            import cv2
-
-            # Force software decoding (CAP_FFMPEG backend, no DXVA/D3D11 HW accel).
-            # OpenCV is built with DXVA + NVD3D11 support — if hw accel is active while
-            # MPV's D3D11 renderer is running, both fight over the D3D11 device and trigger
-            # exception 0xe24c4a02 in the GPU driver. SW decode avoids the conflict entirely.
-            cap = cv2.VideoCapture(str(video_path), cv2.CAP_FFMPEG)
-            cap.set(cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_NONE)
-            if not cap.isOpened():
-                return None, None, None
-
-            # Get video properties
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            duration = frame_count / fps if fps > 0 else 0
-
-            # Get SAR (Sample Aspect Ratio)
-            sar_num = cap.get(cv2.CAP_PROP_SAR_NUM)
-            sar_den = cap.get(cv2.CAP_PROP_SAR_DEN)
-
-            video_metadata = {
-                'fps': fps,
-                'duration': duration,
-                'frame_count': frame_count,
-                'current_frame': 0,
-                'sar_num': sar_num if sar_num > 0 else 1,
-                'sar_den': sar_den if sar_den > 0 else 1
-            }
 
-            # Read first frame
-            ret, frame = cap.read()
-            cap.release()
-
-            if not ret:
-                return (width, height), video_metadata, None
-
-            # Convert BGR to RGB — return QImage (thread-safe; caller converts to QPixmap if needed)
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = frame_rgb.shape
-            bytes_per_line = ch * w
-            qt_image = QImage(frame_rgb.data.tobytes(), w, h, bytes_per_line, QImage.Format_RGB888)
+    Args:
+        include_frame: Decode a frame; False returns metadata only and can
+            be served from an earlier probe of the same file
+        representative_frame: Seek a little into the clip instead of
+            using the first frame (thumbnails)
+        max_frame_width: Downscale the frame in the worker before transfer
+    """
+    from utils.video.probe import (
+        get_cached_probe_metadata,
+        probe_video_in_pool,
+        probe_video_in_thread,
+        remember_probe_metadata,
+    )
 
-            return (width, height), video_metadata, qt_image
-        except Exception as e:
-            print(f"Error extracting video info from {video_path}: {e}")
-            return None, None, None
+    if not include_frame:
+        cached = get_cached_probe_metadata(video_path)
+        if cached is not None:
+            dimensions, video_metadata = cached
+            return dimensions, dict(video_metadata), None
+
+    result = probe_video_in_pool(
+        video_path, include_frame, representative_frame, max_frame_width)
+    if result is None:
+        with _video_lock:
+            result = probe_video_in_thread(
+                str(video_path), include_frame, representative_frame, max_frame_width)
+
+    dimensions = result['dimensions']
+    video_metadata = result['metadata']
+    remember_probe_metadata(video_path, dimensions, video_metadata)
+    frame = result['frame']
+    if frame is None:
+        return dimensions, video_metadata, None
+    rgb_bytes, w, h = frame
+    # copy() detaches the QImage from the Python bytes buffer.
+    qt_image = QImage(rgb_bytes, w, h, 3 * w, QImage.Format_RGB888).copy()
+    return dimensions, video_metadata, qt_image
 
 
 @dataclass
@@ -2195,7 +2198,15 @@ class ImageListModel(QAbstractListModel):
     # Default threshold for enabling pagination mode (overridden by settings)
     PAGINATION_THRESHOLD = 0  # Will be loaded from settings
     PAGE_SIZE = 1000
-    MAX_PAGES_IN_MEMORY = 20  # Increased from 5 to reduce evictions and crashes
+    # Ceiling on resident pages; below it the byte budget decides residency.
+    MAX_PAGES_IN_MEMORY = 60
+    # Longest a moving page range may wait on the debouncer before it is processed.
+    PAGE_REQUEST_MAX_WAIT_S = 0.15
+    # Prefetch never queues more loads than this, so a direction change is not
+    # stuck behind pages for the old direction.
+    PREFETCH_MAX_IN_FLIGHT = 4
+    # Narrower requests come from clicks and jumps, not scrolling.
+    _PREFETCH_MIN_MOTION_SPAN = 8
 
     @staticmethod
     def _set_low_priority_thread():
@@ -2300,6 +2311,14 @@ class ImageListModel(QAbstractListModel):
         self._loading_pages: set = set()  # Pages currently being loaded
         self._page_load_lock = threading.RLock()
         self._protected_page_window: tuple[int, int] | None = None
+        # Byte-budgeted residency: estimated Image/tag bytes per page as
+        # (id(page list), bytes), and the last measured cost per page
+        # including decoded thumbnails.
+        self._page_memory_budget_bytes = FALLBACK_BUDGET_BYTES
+        self._page_meta_bytes: dict[int, tuple[int, int]] = {}
+        self._page_costs: dict[int, int] = {}
+        self._page_costs_measured_at = 0.0
+        self._page_thumbnail_count = 0
         self._db: ImageIndexDB = None
         self._directory_path: Path = None
         self._path_validation_generation = 0
@@ -2362,6 +2381,12 @@ class ImageListModel(QAbstractListModel):
         self._page_debouncer.setInterval(50)  # 50ms delay
         self._page_debouncer.timeout.connect(self._process_pending_page_requests)
         self._pending_page_range = None
+        self._page_request_pending_since = 0.0
+        self._page_request_times: dict[int, float] = {}
+        self._page_prefetch_planner = (
+            PagePrefetchPlanner(self.PAGE_SIZE)
+            if os.environ.get('TAGGUI_PAGE_PREFETCH', '1') != '0' else None
+        )
         self._page_load_priority_page = None
         self._page_load_priority_until = 0.0
         # DISABLED: Cache warming causes UI blocking
@@ -2404,6 +2429,7 @@ class ImageListModel(QAbstractListModel):
         self._pending_cache_saves = []  # Queue of (path, mtime, width, thumbnail) to save when idle
         self._pending_cache_saves_lock = threading.Lock()
         self._pending_db_cache_flags = []  # Batch DB updates for thumbnail_cached flag (file_name strings)
+        self._pending_db_fingerprints = []  # (file_name, content_fingerprint) pairs, same lock
         self._pending_db_cache_flags_lock = threading.Lock()
 
         # Timer for deferred DB flush (only when truly idle)
@@ -2904,6 +2930,7 @@ class ImageListModel(QAbstractListModel):
             if page_num in self._pages or page_num in self._loading_pages:
                 return  # Already loaded or loading
             self._loading_pages.add(page_num)
+            self._page_request_times[page_num] = time.perf_counter()
 
         # Submit background load
         # print(f"[PAGE request] Requesting Page {page_num}")
@@ -2996,6 +3023,8 @@ class ImageListModel(QAbstractListModel):
         finally:
             with self._page_load_lock:
                 self._loading_pages.discard(page_num)
+                if page_num not in self._pages:
+                    self._page_request_times.pop(page_num, None)
 
     def _load_images_from_db(
         self,
@@ -3028,6 +3057,7 @@ class ImageListModel(QAbstractListModel):
         missing_rel_paths: list[str] = []
         sidecar_reaction_updates: list[tuple[float, bool, bool, float | None, int]] = []
         sidecar_review_updates: list[tuple[int, int, float | None, int]] = []
+        stored_fingerprints: list[tuple[Path, float, str]] = []
         image_ids = [row['id'] for row in rows]
         tags_map = active_db.get_tags_for_images(image_ids)
 
@@ -3062,13 +3092,11 @@ class ImageListModel(QAbstractListModel):
             image.file_type = row.get('file_type')
             image.ctime = row.get('ctime')
             image.mtime = row.get('mtime')
+            if row.get('content_fingerprint') and image.mtime is not None:
+                stored_fingerprints.append((file_path, image.mtime, row['content_fingerprint']))
 
             if row['is_video']:
-                image.video_metadata = {
-                    'fps': row.get('video_fps'),
-                    'duration': row.get('video_duration'),
-                    'frame_count': row.get('video_frame_count')
-                }
+                image.video_metadata = video_metadata_from_row(row)
 
             # In paginated mode we still need sidecar loop metadata for playback loop markers.
             json_file_path = self._preferred_sidecar_meta_path(file_path)
@@ -3099,6 +3127,12 @@ class ImageListModel(QAbstractListModel):
 
             images.append(image)
 
+        if stored_fingerprints:
+            # Renamed or copied files then find their shared thumbnails without a rehash.
+            from utils.thumbnail_cache import get_thumbnail_cache
+            cache = get_thumbnail_cache()
+            if cache.content_dedup:
+                cache.remember_content_fingerprints(stored_fingerprints)
         if sidecar_reaction_updates and hasattr(active_db, 'import_sidecar_reactions'):
             try:
                 imported = int(active_db.import_sidecar_reactions(sidecar_reaction_updates) or 0)
@@ -3199,6 +3233,8 @@ class ImageListModel(QAbstractListModel):
 
         # Clear cache and reset
         self._pages.clear()
+        if self._page_prefetch_planner is not None:
+            self._page_prefetch_planner.reset()
 
         # Bootstrap load first pages
         print(f"[FILTER] Applied SQL filter (Count: {self._total_count})")
@@ -3402,6 +3438,38 @@ class ImageListModel(QAbstractListModel):
                     if normalized in {'0', 'false', 'no', 'off'}:
                         return f"COALESCE({op}, 0) = 0", ()
                     return "", ()
+                # Results for an older version of the file (edited since) don't count.
+                signature_sql = (" AND video_validation.mtime=images.mtime"
+                                 " AND video_validation.file_size=images.file_size")
+                if op == 'valid':
+                    # Videos whose stored validation passed, optionally at a minimum level.
+                    from utils.video.validation_service import levels_at_least
+
+                    normalized = str(val).strip().lower()
+                    passed_sql = ("EXISTS(SELECT 1 FROM video_validation "
+                                  "WHERE video_validation.file_name=images.file_name"
+                                  + signature_sql + " AND ok = 1")
+                    if normalized in {'1', 'true', 'yes', 'on', 'any'}:
+                        return passed_sql + ")", ()
+                    if normalized in {'0', 'false', 'no', 'off'}:
+                        return "is_video = 1 AND NOT " + passed_sql + ")", ()
+                    levels = levels_at_least(normalized)
+                    if levels:
+                        placeholders = ",".join("?" for _ in levels)
+                        return passed_sql + f" AND level IN ({placeholders}))", tuple(levels)
+                    return "", ()
+                if op == 'corrupt':
+                    # Videos whose stored validation failed; other values match the error text.
+                    failed_sql = ("EXISTS(SELECT 1 FROM video_validation "
+                                  "WHERE video_validation.file_name=images.file_name"
+                                  + signature_sql + " AND ok = 0")
+                    normalized = str(val).strip().lower()
+                    if normalized in {'1', 'true', 'yes', 'on', 'any'}:
+                        return failed_sql + ")", ()
+                    if normalized in {'0', 'false', 'no', 'off'}:
+                        return "is_video = 1 AND NOT " + failed_sql + ")", ()
+                    pattern = str(val).replace('*', '%').replace('?', '_')
+                    return failed_sql + " AND message LIKE ?)", (f"%{pattern}%",)
                 
                 # Default case for other prefixes? like 'path'
                 
@@ -3425,13 +3493,21 @@ class ImageListModel(QAbstractListModel):
 
     def _store_page(self, page_num: int, images: list[Image]):
         """Store a loaded page and evict old pages if needed."""
+        meta_bytes = estimate_page_bytes(images)
         with self._page_load_lock:
             self._pages[page_num] = images
+            self._page_meta_bytes[page_num] = (id(images), meta_bytes)
+            self._page_costs[page_num] = meta_bytes
             if page_num not in self._page_load_order:
                 self._page_load_order.append(page_num)
+            resident_bytes = sum(
+                self._page_costs.get(resident_page, 0) for resident_page in self._pages)
 
             # Check if we need to evict pages (but don't do it here - background thread unsafe)
-            if len(self._pages) > self.MAX_PAGES_IN_MEMORY:
+            if (
+                len(self._pages) > self.MAX_PAGES_IN_MEMORY
+                or resident_bytes > self._page_memory_budget_bytes
+            ):
                 # Schedule eviction on model's thread (main/UI thread).
                 # QTimer.singleShot from worker context can miss/dispatch inconsistently.
                 QMetaObject.invokeMethod(
@@ -3440,10 +3516,55 @@ class ImageListModel(QAbstractListModel):
                     Qt.ConnectionType.QueuedConnection
                 )
 
+    def _measure_page_costs_locked(self) -> dict[int, int]:
+        """Estimate bytes per resident page; call with `_page_load_lock` held."""
+        # A 512px thumbnail at a typical 4:3 aspect, for icons without a QImage.
+        icon_fallback_bytes = self.thumbnail_generation_width * self.thumbnail_generation_width * 3
+        costs = {}
+        thumbnail_count = 0
+        for page_num, images in self._pages.items():
+            cached = self._page_meta_bytes.get(page_num)
+            if cached is None or cached[0] != id(images):
+                cached = (id(images), estimate_page_bytes(images))
+                self._page_meta_bytes[page_num] = cached
+            thumbnail_bytes, count = page_thumbnail_bytes(images, icon_fallback_bytes)
+            costs[page_num] = cached[1] + thumbnail_bytes
+            thumbnail_count += count
+        for page_num in [page_num for page_num in self._page_meta_bytes if page_num not in costs]:
+            del self._page_meta_bytes[page_num]
+        self._page_costs = costs
+        self._page_thumbnail_count = thumbnail_count
+        self._page_costs_measured_at = time.monotonic()
+        return dict(costs)
+
+    def page_residency_usage(self, max_age_s: float = 1.0) -> dict[str, int]:
+        """Resident pages, estimated bytes, budget and decoded thumbnail count."""
+        with self._page_load_lock:
+            if time.monotonic() - self._page_costs_measured_at > max_age_s:
+                self._measure_page_costs_locked()
+            return {
+                'pages': len(self._page_costs),
+                'bytes': sum(self._page_costs.values()),
+                'budget_bytes': int(self._page_memory_budget_bytes),
+                'thumbnails': self._page_thumbnail_count,
+            }
+
+    def apply_page_memory_budget(self):
+        """Resolve the byte budget from settings (0 MB = auto from free memory)."""
+        budget_mb = settings.value(
+            'page_memory_budget_mb',
+            defaultValue=DEFAULT_SETTINGS.get('page_memory_budget_mb', 0),
+            type=int,
+        )
+        self._page_memory_budget_bytes = resolve_page_budget_bytes(budget_mb)
+        mode = 'auto' if int(budget_mb or 0) <= 0 else 'setting'
+        print(f"[PAGINATION] Page memory budget: {self._page_memory_budget_bytes // MB} MB ({mode})")
+
     @Slot()
     def _evict_old_pages(self):
-        """Evict old pages (called on main thread via QTimer)."""
+        """Evict pages over the byte budget or page ceiling (main thread)."""
         evicted_any = False
+        evicted_pages = []
         with self._page_load_lock:
             protected = getattr(self, "_protected_page_window", None)
             if (
@@ -3453,35 +3574,42 @@ class ImageListModel(QAbstractListModel):
                 or not isinstance(protected[1], int)
             ):
                 protected = None
-            while len(self._pages) > self.MAX_PAGES_IN_MEMORY:
-                victim_order_idx = None
-                if protected is not None:
-                    p_start, p_end = protected
-                    for i, page_num in enumerate(self._page_load_order):
-                        if page_num in self._pages and not (p_start <= int(page_num) <= p_end):
-                            victim_order_idx = i
-                            break
-
-                if victim_order_idx is None:
+            costs = self._measure_page_costs_locked()
+            resident_bytes = sum(costs.values())
+            budget_bytes = self._page_memory_budget_bytes
+            while len(self._pages) > self.MAX_PAGES_IN_MEMORY or resident_bytes > budget_bytes:
+                victim_page = choose_victim(self._page_load_order, costs, protected)
+                if victim_page is None:
+                    if len(self._pages) <= self.MAX_PAGES_IN_MEMORY:
+                        # Over budget with only protected pages left: keep them.
+                        break
                     # Fallback: evict oldest valid page if all are protected or no hint exists.
-                    for i, page_num in enumerate(self._page_load_order):
-                        if page_num in self._pages:
-                            victim_order_idx = i
-                            break
-
-                if victim_order_idx is None:
-                    break
+                    victim_page = next(
+                        (page_num for page_num in self._page_load_order if page_num in self._pages),
+                        None,
+                    )
+                    if victim_page is None:
+                        break
 
-                victim_page = self._page_load_order.pop(victim_order_idx)
+                self._page_load_order.remove(victim_page)
+                resident_bytes -= costs.pop(victim_page, 0)
+                self._page_costs.pop(victim_page, None)
+                self._page_meta_bytes.pop(victim_page, None)
                 if victim_page in self._pages:
                     # Cancel pending thumbnail loads for evicted page
                     self._cancel_page_thumbnails(victim_page)
                     del self._pages[victim_page]
-                    # print(f"[PAGE] Evicted page {victim_page}, {len(self._pages)} pages remain")
+                    evicted_pages.append(victim_page)
                     evicted_any = True
 
         # If pages were evicted, notify masonry that pages changed (avoid layoutChanged crash!)
         if evicted_any:
+            self._log_flow(
+                "PAGE",
+                f"Evicted pages {evicted_pages}; resident {len(self._pages)} pages, "
+                f"{resident_bytes / MB:.0f}/{budget_bytes / MB:.0f} MB",
+                throttle_key="page_evict", every_s=1.0,
+            )
             self._emit_pages_updated()
 
     def _cancel_page_thumbnails(self, page_num: int):
@@ -3520,8 +3648,20 @@ class ImageListModel(QAbstractListModel):
         s = max(0, min(s, total_items - 1))
         e = max(0, min(e, total_items - 1))
 
-        # Update pending range and restart timer (debounce)
+        planner = self._page_prefetch_planner
+        if planner is not None and e - s >= self._PREFETCH_MIN_MOTION_SPAN:
+            planner.observe((s + e) // 2)
+
+        # Update pending range and restart timer (debounce). A range that keeps
+        # moving would restart the timer forever, so cap how long it can wait.
         self._pending_page_range = (s, e)
+        now = time.perf_counter()
+        if not self._page_debouncer.isActive():
+            self._page_request_pending_since = now
+        elif now - self._page_request_pending_since >= self.PAGE_REQUEST_MAX_WAIT_S:
+            self._page_debouncer.stop()
+            self._process_pending_page_requests()
+            return
         self._page_debouncer.start()
 
     def _process_pending_page_requests(self):
@@ -3557,9 +3697,11 @@ class ImageListModel(QAbstractListModel):
         
         # print(f"[PAGINATION] Processing range {start_idx}-{end_idx} (Pages {start_page}-{end_page})")
 
+        prefetch_pages = self._plan_page_prefetch(start_page, end_page, last_page)
+
         # 1. Compatibility hook: keep_pages currently no-ops for in-flight loads
         # to avoid cancellation races. Keep call for future queue-based pruning.
-        keep_window = set(range(start_page - 2, end_page + 3))
+        keep_window = set(range(start_page - 2, end_page + 3)) | set(prefetch_pages)
         self.cancel_pending_loads_except(keep_window)
 
         # 2. Submit new requests
@@ -3597,6 +3739,61 @@ class ImageListModel(QAbstractListModel):
             self._log_flow("PAGINATION", f"Triggered loads for page range {start_page}-{end_page}",
                            throttle_key="page_range", every_s=1.0)
 
+        # 3. Prefetch ahead of the scroll direction, after the visible pages
+        # so they keep their place in the loader queue.
+        prefetched = []
+        for page_num in prefetch_pages:
+            with self._page_load_lock:
+                if len(self._loading_pages) >= self.PREFETCH_MAX_IN_FLIGHT:
+                    break
+                should_load = page_num not in self._pages and page_num not in self._loading_pages
+            if should_load:
+                self._request_page_load(page_num)
+                prefetched.append(page_num)
+        if prefetched:
+            planner = self._page_prefetch_planner
+            self._log_flow(
+                "PAGINATION",
+                f"Prefetching pages {prefetched} "
+                f"(velocity={planner.velocity:.0f} items/s, latency={planner.latency_s * 1000:.0f}ms)",
+                throttle_key="page_prefetch", every_s=1.0,
+            )
+
+    def _plan_page_prefetch(self, start_page: int, end_page: int, last_page: int) -> list[int]:
+        """Pages to load ahead of the requested range, within the memory budget.
+
+        Prefetched pages sit outside the protection window and are the newest
+        entries in LRU order, so eviction takes older unprotected pages first.
+        Both the page ceiling and the byte budget leave room for the whole
+        protected window plus one page, so loading them never pushes a
+        protected page out.
+        """
+        planner = self._page_prefetch_planner
+        if planner is None:
+            return []
+        with self._page_load_lock:
+            protected = self._protected_page_window
+            costs = dict(self._page_costs)
+        if protected is not None:
+            protected_count = protected[1] - protected[0] + 1
+        else:
+            protected_count = end_page - start_page + 1
+        budget = int(self.MAX_PAGES_IN_MEMORY) - protected_count - 1
+        if costs:
+            # Pages of this folder cost about the resident average; protected
+            # pages that are not loaded yet will need that much too.
+            average_bytes = max(1.0, sum(costs.values()) / len(costs))
+            if protected is not None:
+                protected_bytes = sum(
+                    costs.get(page_num, average_bytes)
+                    for page_num in range(protected[0], protected[1] + 1)
+                )
+            else:
+                protected_bytes = average_bytes * protected_count
+            spare_bytes = self._page_memory_budget_bytes - protected_bytes
+            budget = min(budget, int(spare_bytes // average_bytes) - 1)
+        return planner.plan(start_page, end_page, last_page, budget)
+
     def event(self, event):
         """Handle custom events for page loading."""
         if isinstance(event, PageLoadedEvent):
@@ -3611,6 +3808,14 @@ class ImageListModel(QAbstractListModel):
         """Called on main thread when a page finishes loading (via signal)."""
         if not self._paginated_mode:
             return
+        if not frame_trace.enabled:
+            self._handle_page_loaded(page_num)
+            return
+        started = time.perf_counter()
+        self._handle_page_loaded(page_num)
+        frame_trace.record_event('page_load', started, detail=f'page {page_num} loaded')
+
+    def _handle_page_loaded(self, page_num: int):
 
         initial_page_finished = bool(
             int(page_num) == 0
@@ -3624,6 +3829,11 @@ class ImageListModel(QAbstractListModel):
             for warm_page_num in warm_pages:
                 self._request_page_load(int(warm_page_num))
 
+        with self._page_load_lock:
+            requested_at = self._page_request_times.pop(page_num, None)
+        if requested_at is not None and self._page_prefetch_planner is not None:
+            self._page_prefetch_planner.record_latency(time.perf_counter() - requested_at)
+
         try:
             if int(page_num) == int(getattr(self, "_page_load_priority_page", -1) or -1):
                 self._page_load_priority_page = None
@@ -4132,6 +4342,7 @@ class ImageListModel(QAbstractListModel):
             with self._page_load_lock:
                 self._pages.clear()
                 self._loading_pages.clear()
+                self._page_request_times.clear()
                 self._page_load_order.clear()
             self.images = []
             self._total_count = int(new_total)
@@ -4775,8 +4986,12 @@ class ImageListModel(QAbstractListModel):
 
         try:
             from utils.thumbnail_cache import get_thumbnail_cache
+            cache = get_thumbnail_cache()
             with _thumbnail_save_lock:
-                get_thumbnail_cache().save_thumbnail_qimage(path, mtime, width, qimage)
+                cache.save_thumbnail_qimage(path, mtime, width, qimage)
+            # Already hashed by the save when content dedup is on.
+            fingerprint = (cache.content_fingerprint(path, mtime, compute=False)
+                           if cache.content_dedup else None)
 
             # Queue DB update for deferred batch write (when truly idle)
             if self._db and self._directory_path:
@@ -4784,6 +4999,8 @@ class ImageListModel(QAbstractListModel):
                     relative_path = str(path.relative_to(self._directory_path))
                     with self._pending_db_cache_flags_lock:
                         self._pending_db_cache_flags.append(relative_path)
+                        if fingerprint:
+                            self._pending_db_fingerprints.append((relative_path, fingerprint))
                         # REMOVED: Immediate flush every 100 items (caused blocking)
                         # DB updates now deferred to idle time (5+ seconds after scrolling stops)
                 except ValueError:
@@ -4817,6 +5034,8 @@ class ImageListModel(QAbstractListModel):
 
             batch = list(self._pending_db_cache_flags)
             self._pending_db_cache_flags.clear()
+            fingerprint_batch = list(self._pending_db_fingerprints)
+            self._pending_db_fingerprints.clear()
 
         # Submit DB flush to background thread (never blocks main thread)
         def db_flush_worker():
@@ -4830,17 +5049,12 @@ class ImageListModel(QAbstractListModel):
             try:
                 for i in range(0, total, CHUNK):
                     chunk = batch[i:i + CHUNK]
-                    with self._db._db_lock:
-                        cursor = self._db.conn.cursor()
-                        cursor.executemany(
-                            'UPDATE images SET thumbnail_cached = 1 WHERE file_name = ?',
-                            [(fn,) for fn in chunk]
-                        )
-                        self._db.conn.commit()
-                    flushed += len(chunk)
+                    flushed += self._db.mark_thumbnails_cached(chunk)
                     # Yield between chunks so page loads can acquire the lock
                     if i + CHUNK < total:
                         time.sleep(0.02)  # 20ms
+                for i in range(0, len(fingerprint_batch), CHUNK):
+                    self._db.set_content_fingerprints(fingerprint_batch[i:i + CHUNK])
                 if flushed:
                     print(f"[DB] Flushed {flushed} thumbnail_cached flags in background")
             except Exception as e:
@@ -5025,6 +5239,16 @@ class ImageListModel(QAbstractListModel):
         """Emit batched dataChanged for all pending thumbnail updates."""
         if not self._pending_thumbnail_updates:
             return
+        if not frame_trace.enabled:
+            self._emit_thumbnail_updates()
+            return
+        batch_size = len(self._pending_thumbnail_updates)
+        started = time.perf_counter()
+        self._emit_thumbnail_updates()
+        frame_trace.record_event('thumbnails', started, count=batch_size,
+                                 detail=f'thumbnails x{batch_size}')
+
+    def _emit_thumbnail_updates(self):
 
         # In paginated masonry mode, never emit dataChanged for thumbnail updates.
         # The custom paintEvent reads image.thumbnail directly on every viewport.update(),
@@ -5127,6 +5351,15 @@ class ImageListModel(QAbstractListModel):
         return -1
 
     def data(self, index: QModelIndex, role=None) -> Image | str | QIcon | QSize:
+        if not frame_trace.enabled:
+            return self._data(index, role)
+        started = time.perf_counter()
+        try:
+            return self._data(index, role)
+        finally:
+            frame_trace.add('data', (time.perf_counter() - started) * 1000.0)
+
+    def _data(self, index: QModelIndex, role=None) -> Image | str | QIcon | QSize:
         # Validate index bounds to prevent errors during model reset
         try:
             row = index.row()
@@ -5637,7 +5870,7 @@ class ImageListModel(QAbstractListModel):
                       
                       # Extract dimensions
                       if is_video:
-                         dimensions, video_metadata, _ = extract_video_info(full_path)
+                         dimensions, video_metadata, _ = extract_video_info(full_path, include_frame=False)
                       elif full_path.suffix.lower() == '.jxl':
                          from utils.jxlutil import get_jxl_size
                          dimensions = get_jxl_size(full_path)
@@ -6838,7 +7071,7 @@ class ImageListModel(QAbstractListModel):
 
                         # Read actual dimensions
                         if is_video:
-                            dimensions, video_metadata, _ = extract_video_info(image.path)
+                            dimensions, video_metadata, _ = extract_video_info(image.path, include_frame=False)
                             if dimensions is None:
                                 continue
                             image.video_metadata = video_metadata
@@ -7071,10 +7304,10 @@ class ImageListModel(QAbstractListModel):
         """Resolve raw + effective paginated page-memory limits from settings."""
         raw_max = settings.value(
             'max_pages_in_memory',
-            defaultValue=DEFAULT_SETTINGS.get('max_pages_in_memory', 20),
+            defaultValue=DEFAULT_SETTINGS.get('max_pages_in_memory', 60),
             type=int,
         )
-        raw_max = max(3, min(int(raw_max), 60))
+        raw_max = max(3, min(int(raw_max), 200))
 
         eviction_pages = settings.value(
             'thumbnail_eviction_pages',
@@ -7161,6 +7394,7 @@ class ImageListModel(QAbstractListModel):
                   f"(raised from {raw_max} to satisfy eviction window {eviction_pages})")
         else:
             print(f"[PAGINATION] Max pages in memory: {self.MAX_PAGES_IN_MEMORY}")
+        self.apply_page_memory_budget()
 
         self._db = ImageIndexDB(directory_path)
         self._paginated_mode = True
@@ -7209,6 +7443,8 @@ class ImageListModel(QAbstractListModel):
             self._total_count = db_count
         self._pages = {}  # Will be populated on-demand
         self._page_load_order.clear()
+        if self._page_prefetch_planner is not None:
+            self._page_prefetch_planner.reset()
 
         self.endResetModel()
 
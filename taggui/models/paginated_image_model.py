@@ -19,7 +19,7 @@ from PySide6.QtGui import QIcon, QImage
 from PySide6.QtWidgets import QApplication
 
 from utils.image import Image
-from utils.image_index_db import ImageIndexDB
+from utils.image_index_db import ImageIndexDB, video_metadata_from_row
 
 
 # Page configuration
@@ -200,7 +200,7 @@ class PaginatedImageModel(QAbstractListModel):
                 is_video = file_path.suffix.lower() in video_extensions
                 if is_video:
                     from models.image_list_model import extract_video_info
-                    dimensions, video_metadata, _ = extract_video_info(file_path)
+                    dimensions, video_metadata, _ = extract_video_info(file_path, include_frame=False)
                 else:
                     import imagesize
                     try:
@@ -337,11 +337,7 @@ class PaginatedImageModel(QAbstractListModel):
             )
 
             if row['is_video']:
-                image.video_metadata = {
-                    'fps': row.get('video_fps'),
-                    'duration': row.get('video_duration'),
-                    'frame_count': row.get('video_frame_count')
-                }
+                image.video_metadata = video_metadata_from_row(row)
 
             images.append(image)
 
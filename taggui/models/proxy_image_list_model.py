@@ -271,6 +271,22 @@ class ProxyImageListModel(QSortFilterProxyModel):
                 if review_flag is not None:
                     return (review_flags & int(review_flag)) != 0
                 return False
+            if filter_[0] in ('valid', 'corrupt'):
+                if not getattr(image, 'is_video', False):
+                    return False
+                from utils.video.validation_service import levels_at_least, lookup_validation
+
+                result = lookup_validation(image.path)
+                normalized = str(filter_[1]).strip().lower()
+                wanted_ok = filter_[0] == 'valid'
+                matched = result is not None and result.ok == wanted_ok
+                if normalized in {'1', 'true', 'yes', 'on', 'any'}:
+                    return matched
+                if normalized in {'0', 'false', 'no', 'off'}:
+                    return not matched
+                if wanted_ok:
+                    return matched and result.level in levels_at_least(normalized)
+                return matched and fnmatchcase(result.message.lower(), f'*{normalized}*')
         if filter_[1] == 'AND':
             if len(filter_) < 3:
                 return self.does_image_match_filter(image, filter_[0])
@@ -0,0 +1,37 @@
+"""Fast partial-content fingerprints for media files."""
+
+import hashlib
+import os
+from pathlib import Path
+
+
+FINGERPRINT_CHUNK_SIZE = 64 * 1024
+
+
+def compute_content_fingerprint(file_path: Path) -> str | None:
+    """Hash the file size plus head, middle, and tail chunks.
+
+    Reads at most three 64 KiB chunks, so it is cheap next to decoding the
+    file. This is not a cryptographic identity: two files that differ only
+    outside the sampled chunks (and have the same size) collide, which is
+    acceptable for sharing thumbnails.
+
+    Returns:
+        Hex digest, or None when the file cannot be read
+    """
+    try:
+        with open(file_path, 'rb') as handle:
+            file_size = os.fstat(handle.fileno()).st_size
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(str(file_size).encode())
+            if file_size <= 3 * FINGERPRINT_CHUNK_SIZE:
+                digest.update(handle.read())
+            else:
+                for offset in (0,
+                               (file_size - FINGERPRINT_CHUNK_SIZE) // 2,
+                               file_size - FINGERPRINT_CHUNK_SIZE):
+                    handle.seek(offset)
+                    digest.update(handle.read(FINGERPRINT_CHUNK_SIZE))
+            return digest.hexdigest()
+    except OSError:
+        return None
@@ -0,0 +1,187 @@
+"""Opt-in frame-time instrumentation for the image list.
+
+Each `ImageListView` paint becomes one frame record: the paint duration
+(including the model `data()` calls made while painting) plus the main-thread
+work since the previous frame, which is thumbnail delivery, masonry completion
+and page loads. Records and timed events go to ring buffers. The Performance
+HUD reads them for a histogram and a worst-frame breakdown, and they can be
+exported as a Chrome trace that chrome://tracing or Perfetto can open.
+
+Recording is off until the HUD switches to its List mode or
+TAGGUI_FRAME_TRACE=1 is set. Call sites check `frame_trace.enabled` before
+reading the clock, and record from the GUI thread only.
+"""
+
+import json
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+
+
+FRAME_CAPACITY = 600
+EVENT_CAPACITY = 4000
+# Work attributed to frames. `data` runs inside paint; the others run between frames.
+CATEGORIES = ('data', 'thumbnails', 'completion', 'page_load')
+BETWEEN_FRAME_CATEGORIES = ('thumbnails', 'completion', 'page_load')
+# Upper bucket edges for the frame-time histogram; the last bucket is open.
+HISTOGRAM_EDGES_MS = (8.0, 16.7, 33.3, 50.0, 100.0)
+
+
+@dataclass
+class FrameRecord:
+    started: float
+    interval_ms: float
+    paint_ms: float
+    work_ms: dict[str, float]
+    counts: dict[str, int]
+
+    @property
+    def total_ms(self) -> float:
+        """Paint plus the between-frame work that delayed it."""
+        return self.paint_ms + sum(self.work_ms.get(name, 0.0) for name in BETWEEN_FRAME_CATEGORIES)
+
+
+@dataclass
+class TraceEvent:
+    category: str
+    started: float
+    duration_ms: float
+    count: int
+    detail: str
+
+
+class FrameTrace:
+    def __init__(self, frame_capacity: int = FRAME_CAPACITY, event_capacity: int = EVENT_CAPACITY):
+        self.enabled = False
+        # Set from TAGGUI_FRAME_TRACE so closing the HUD does not stop a forced trace.
+        self.always_on = False
+        self.frames: deque[FrameRecord] = deque(maxlen=frame_capacity)
+        self.events: deque[TraceEvent] = deque(maxlen=event_capacity)
+        self._pending_ms = dict.fromkeys(CATEGORIES, 0.0)
+        self._pending_counts = dict.fromkeys(CATEGORIES, 0)
+        self._last_frame_started = None
+
+    def set_enabled(self, enabled: bool):
+        enabled = bool(enabled) or self.always_on
+        if enabled and not self.enabled:
+            self._reset_pending()
+            self._last_frame_started = None
+        self.enabled = enabled
+
+    def clear(self):
+        self.frames.clear()
+        self.events.clear()
+        self._reset_pending()
+        self._last_frame_started = None
+
+    def _reset_pending(self):
+        for name in CATEGORIES:
+            self._pending_ms[name] = 0.0
+            self._pending_counts[name] = 0
+
+    def add(self, category: str, duration_ms: float, count: int = 1):
+        """Attribute work to the next frame without keeping an event."""
+        self._pending_ms[category] += duration_ms
+        self._pending_counts[category] += count
+
+    def record_event(self, category: str, started: float, *, count: int = 1, detail: str = ''):
+        """Record work that began at perf_counter() time `started` and ends now."""
+        duration_ms = (time.perf_counter() - started) * 1000.0
+        self.add(category, duration_ms, count)
+        self.events.append(TraceEvent(category, started, duration_ms, count, detail))
+
+    def begin_frame(self) -> float:
+        return time.perf_counter()
+
+    def end_frame(self, started: float):
+        now = time.perf_counter()
+        interval_ms = (
+            (started - self._last_frame_started) * 1000.0
+            if self._last_frame_started is not None else 0.0
+        )
+        self._last_frame_started = started
+        self.frames.append(FrameRecord(
+            started=started,
+            interval_ms=interval_ms,
+            paint_ms=(now - started) * 1000.0,
+            work_ms=dict(self._pending_ms),
+            counts=dict(self._pending_counts),
+        ))
+        self._reset_pending()
+
+    def histogram(self, edges=HISTOGRAM_EDGES_MS) -> list[int]:
+        """Frame counts per total-time bucket: <= edges[0], ..., > edges[-1]."""
+        counts = [0] * (len(edges) + 1)
+        for frame in self.frames:
+            total = frame.total_ms
+            bucket = len(edges)
+            for position, edge in enumerate(edges):
+                if total <= edge:
+                    bucket = position
+                    break
+            counts[bucket] += 1
+        return counts
+
+    def worst_frame(self) -> FrameRecord | None:
+        return max(self.frames, key=lambda frame: frame.total_ms, default=None)
+
+    def summary_lines(self) -> list[str]:
+        """Short text lines for the HUD."""
+        if not self.frames:
+            return ['No image list frames yet; scroll the list to record.']
+        totals = sorted(frame.total_ms for frame in self.frames)
+        p50 = totals[len(totals) // 2]
+        p95 = totals[min(len(totals) - 1, int(len(totals) * 0.95))]
+        over = sum(1 for total in totals if total > 16.7)
+        worst = self.worst_frame()
+        thumbnails = sum(frame.counts['thumbnails'] for frame in self.frames)
+        batches = sum(1 for event in self.events if event.category == 'thumbnails')
+        return [
+            f"frames={len(totals)}  p50={p50:5.1f}ms  p95={p95:5.1f}ms  >16.7ms={over}",
+            (f"worst {worst.total_ms:5.1f}ms: paint {worst.paint_ms:.1f} "
+             f"(data {worst.work_ms['data']:.1f}/{worst.counts['data']})"),
+            (f"  thumbs {worst.work_ms['thumbnails']:.1f}/{worst.counts['thumbnails']}  "
+             f"masonry {worst.work_ms['completion']:.1f}  "
+             f"pages {worst.work_ms['page_load']:.1f}/{worst.counts['page_load']}"),
+            f"thumb batches={batches}  avg={thumbnails / max(1, batches):.1f} items",
+        ]
+
+    def to_chrome_trace(self) -> dict:
+        """Trace Event Format document with one slice per paint and per event."""
+        pid = os.getpid()
+        trace_events = []
+        for frame in self.frames:
+            args = {'interval_ms': round(frame.interval_ms, 3)}
+            for name in CATEGORIES:
+                args[f'{name}_ms'] = round(frame.work_ms[name], 3)
+                args[f'{name}_count'] = frame.counts[name]
+            trace_events.append({
+                'name': 'paint', 'cat': 'frame', 'ph': 'X', 'pid': pid, 'tid': 1,
+                'ts': frame.started * 1e6, 'dur': frame.paint_ms * 1000.0, 'args': args,
+            })
+        for event in self.events:
+            trace_events.append({
+                'name': event.detail or event.category, 'cat': event.category, 'ph': 'X',
+                'pid': pid, 'tid': 2, 'ts': event.started * 1e6,
+                'dur': event.duration_ms * 1000.0, 'args': {'count': event.count},
+            })
+        trace_events.sort(key=lambda entry: entry['ts'])
+        return {
+            'traceEvents': trace_events,
+            'displayTimeUnit': 'ms',
+            'otherData': {'histogram_edges_ms': list(HISTOGRAM_EDGES_MS),
+                          'histogram': self.histogram()},
+        }
+
+    def export_chrome_trace(self, path) -> Path:
+        path = Path(path)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f)
+        return path
+
+
+frame_trace = FrameTrace()
+frame_trace.always_on = os.environ.get('TAGGUI_FRAME_TRACE', '0') == '1'
+frame_trace.set_enabled(frame_trace.always_on)
@@ -38,6 +38,47 @@ def _mapping_value(mapping: Any, key: str, default: Any = None) -> Any:
         return getattr(mapping, key, default)
 
 
+def _optional_positive_int(value: Any) -> int | None:
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number > 0 else None
+
+
+# Stream details beyond fps/duration/frame count/SAR, kept as one JSON column
+# so the player can configure itself from the DB instead of opening a capture.
+VIDEO_STREAM_INFO_KEYS = ('codec', 'pixel_format', 'fps_num', 'fps_den', 'rotation', 'keyframe_interval')
+
+
+def encode_video_stream_info(video_metadata: Any) -> str | None:
+    if not isinstance(video_metadata, dict):
+        return None
+    info = {key: video_metadata[key] for key in VIDEO_STREAM_INFO_KEYS
+            if video_metadata.get(key) not in (None, '')}
+    return json.dumps(info, separators=(',', ':'), sort_keys=True) if info else None
+
+
+def video_metadata_from_row(row: Any) -> dict[str, Any]:
+    """`Image.video_metadata` for an images row, including stored stream info."""
+    metadata = {
+        'fps': _mapping_value(row, 'video_fps'),
+        'duration': _mapping_value(row, 'video_duration'),
+        'frame_count': _mapping_value(row, 'video_frame_count'),
+        'sar_num': _mapping_value(row, 'video_sar_num') or 1,
+        'sar_den': _mapping_value(row, 'video_sar_den') or 1,
+    }
+    raw_info = _mapping_value(row, 'video_stream_info')
+    if raw_info:
+        try:
+            info = json.loads(raw_info)
+        except (TypeError, ValueError):
+            info = None
+        if isinstance(info, dict):
+            metadata.update({key: info[key] for key in VIDEO_STREAM_INFO_KEYS if key in info})
+    return metadata
+
+
 def normalize_sidecar_rating(raw_rating: Any) -> float | None:
     if isinstance(raw_rating, bool) or not isinstance(raw_rating, (int, float)):
         return None
@@ -412,6 +453,42 @@ class ImageIndexDB:
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_markings_label ON image_markings(label)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_markings_type ON image_markings(type)')
 
+    @staticmethod
+    def _create_video_keyframe_index_schema(cursor):
+        # Keyed by path, not image id: the index outlives image row rebuilds
+        # and is only trusted while mtime and size still match.
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS video_keyframe_index (
+                file_name TEXT PRIMARY KEY,
+                mtime REAL NOT NULL,
+                file_size INTEGER NOT NULL,
+                frame_times TEXT NOT NULL,
+                keyframes TEXT NOT NULL,
+                indexed_at REAL,
+                cut_points TEXT
+            )
+        ''')
+        cursor.execute("PRAGMA table_info(video_keyframe_index)")
+        if 'cut_points' not in [info[1] for info in cursor.fetchall()]:
+            cursor.execute('ALTER TABLE video_keyframe_index ADD COLUMN cut_points TEXT')
+
+    @staticmethod
+    def _create_video_validation_schema(cursor):
+        # Same keying as the keyframe index; mtime and size tell the
+        # validation service whether a stored result still applies.
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS video_validation (
+                file_name TEXT PRIMARY KEY,
+                mtime REAL NOT NULL,
+                file_size INTEGER NOT NULL,
+                ok INTEGER NOT NULL,
+                message TEXT,
+                level TEXT NOT NULL,
+                validated_at REAL
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_video_validation_ok ON video_validation(ok)')
+
     def _init_db(self):
         """Create database and tables if they don't exist."""
         try:
@@ -473,6 +550,8 @@ class ImageIndexDB:
                         video_fps REAL,
                         video_duration REAL,
                         video_frame_count INTEGER,
+                        video_sar_num INTEGER,
+                        video_sar_den INTEGER,
                         mtime REAL NOT NULL,
                         rating REAL DEFAULT 0.0,
                         love INTEGER DEFAULT 0,
@@ -486,7 +565,9 @@ class ImageIndexDB:
                         file_size INTEGER,
                         file_type TEXT,
                         ctime REAL,
-                        txt_sidecar_mtime REAL
+                        txt_sidecar_mtime REAL,
+                        content_fingerprint TEXT,
+                        video_stream_info TEXT
                     )
                 ''')
 
@@ -519,6 +600,8 @@ class ImageIndexDB:
                     )
                 ''')
                 self._create_image_markings_schema(cursor)
+                self._create_video_keyframe_index_schema(cursor)
+                self._create_video_validation_schema(cursor)
 
                 # Old folder DBs may already exist without newer columns.
                 # Ensure schema columns exist before creating indexes that
@@ -537,6 +620,10 @@ class ImageIndexDB:
                     ('review_rank', 'ALTER TABLE images ADD COLUMN review_rank INTEGER DEFAULT 0'),
                     ('review_flags', 'ALTER TABLE images ADD COLUMN review_flags INTEGER DEFAULT 0'),
                     ('review_updated_at', 'ALTER TABLE images ADD COLUMN review_updated_at REAL'),
+                    ('video_sar_num', 'ALTER TABLE images ADD COLUMN video_sar_num INTEGER'),
+                    ('video_sar_den', 'ALTER TABLE images ADD COLUMN video_sar_den INTEGER'),
+                    ('content_fingerprint', 'ALTER TABLE images ADD COLUMN content_fingerprint TEXT'),
+                    ('video_stream_info', 'ALTER TABLE images ADD COLUMN video_stream_info TEXT'),
                 ):
                     if column_name not in columns:
                         cursor.execute(ddl)
@@ -555,6 +642,7 @@ class ImageIndexDB:
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_images_review_flags ON images(review_flags)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_images_review_updated_at ON images(review_updated_at)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_images_thumbnail_cached ON images(thumbnail_cached)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_images_content_fingerprint ON images(content_fingerprint)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_ordered_image_cache_image ON ordered_image_cache(cache_key, image_id)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_tags_tag ON image_tags(tag)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_tags_image_id ON image_tags(image_id)')
@@ -619,6 +707,8 @@ class ImageIndexDB:
                                 video_fps REAL,
                                 video_duration REAL,
                                 video_frame_count INTEGER,
+                                video_sar_num INTEGER,
+                                video_sar_den INTEGER,
                                 mtime REAL NOT NULL,
                                 rating REAL DEFAULT 0.0,
                                 love INTEGER DEFAULT 0,
@@ -632,7 +722,9 @@ class ImageIndexDB:
                                 file_size INTEGER,
                                 file_type TEXT,
                                 ctime REAL,
-                                txt_sidecar_mtime REAL
+                                txt_sidecar_mtime REAL,
+                                content_fingerprint TEXT,
+                                video_stream_info TEXT
                             )
                         ''')
                         cursor.execute('''
@@ -657,6 +749,7 @@ class ImageIndexDB:
                         cursor.execute('CREATE INDEX IF NOT EXISTS idx_images_review_flags ON images(review_flags)')
                         cursor.execute('CREATE INDEX IF NOT EXISTS idx_images_review_updated_at ON images(review_updated_at)')
                         cursor.execute('CREATE INDEX IF NOT EXISTS idx_images_thumbnail_cached ON images(thumbnail_cached)')
+                        cursor.execute('CREATE INDEX IF NOT EXISTS idx_images_content_fingerprint ON images(content_fingerprint)')
                         cursor.execute('CREATE INDEX IF NOT EXISTS idx_tags_tag ON image_tags(tag)')
                         cursor.execute('CREATE INDEX IF NOT EXISTS idx_tags_image_id ON image_tags(image_id)')
                 else:
@@ -720,6 +813,7 @@ class ImageIndexDB:
                     cursor.execute('CREATE INDEX IF NOT EXISTS idx_images_review_flags ON images(review_flags)')
                     cursor.execute('CREATE INDEX IF NOT EXISTS idx_images_review_updated_at ON images(review_updated_at)')
                     cursor.execute('CREATE INDEX IF NOT EXISTS idx_images_thumbnail_cached ON images(thumbnail_cached)')
+                    cursor.execute('CREATE INDEX IF NOT EXISTS idx_images_content_fingerprint ON images(content_fingerprint)')
                     cursor.execute('CREATE INDEX IF NOT EXISTS idx_images_ctime ON images(ctime)')
                     cursor.execute('CREATE INDEX IF NOT EXISTS idx_images_file_size ON images(file_size)')
                     cursor.execute('CREATE INDEX IF NOT EXISTS idx_tags_tag ON image_tags(tag)')
@@ -803,7 +897,8 @@ class ImageIndexDB:
             cursor = self.conn.cursor()
             cursor.execute('''
                 SELECT width, height, is_video, video_fps, video_duration,
-                       video_frame_count, mtime, thumbnail_cached, rating,
+                       video_frame_count, video_sar_num, video_sar_den, video_stream_info,
+                       mtime, thumbnail_cached, rating,
                        love, bomb, reaction_updated_at,
                        review_rank, review_flags, review_updated_at
                 FROM images
@@ -838,11 +933,7 @@ class ImageIndexDB:
             }
 
             if row['is_video']:
-                result['video_metadata'] = {
-                    'fps': row['video_fps'],
-                    'duration': row['video_duration'],
-                    'frame_count': row['video_frame_count']
-                }
+                result['video_metadata'] = video_metadata_from_row(row)
 
             return result
 
@@ -877,11 +968,17 @@ class ImageIndexDB:
         video_fps = None
         video_duration = None
         video_frame_count = None
+        video_sar_num = None
+        video_sar_den = None
+        video_stream_info = None
 
         if is_video and video_metadata:
             video_fps = video_metadata.get('fps')
             video_duration = video_metadata.get('duration')
             video_frame_count = video_metadata.get('frame_count')
+            video_sar_num = _optional_positive_int(video_metadata.get('sar_num'))
+            video_sar_den = _optional_positive_int(video_metadata.get('sar_den'))
+            video_stream_info = encode_video_stream_info(video_metadata)
 
         # Calculate aspect ratio
         aspect_ratio = width / height if height > 0 else 1.0
@@ -904,9 +1001,11 @@ class ImageIndexDB:
                     cursor.execute('''
                         INSERT INTO images
                         (file_name, width, height, aspect_ratio, is_video, video_fps,
-                         video_duration, video_frame_count, mtime, rating, reaction_updated_at, indexed_at,
-                         file_size, file_type, ctime, review_rank, review_flags, review_updated_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                         video_duration, video_frame_count, video_sar_num, video_sar_den,
+                         mtime, rating, reaction_updated_at, indexed_at,
+                         file_size, file_type, ctime, review_rank, review_flags, review_updated_at,
+                         video_stream_info)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                         ON CONFLICT(file_name) DO UPDATE SET
                             width = excluded.width,
                             height = excluded.height,
@@ -915,6 +1014,13 @@ class ImageIndexDB:
                             video_fps = excluded.video_fps,
                             video_duration = excluded.video_duration,
                             video_frame_count = excluded.video_frame_count,
+                            video_sar_num = excluded.video_sar_num,
+                            video_sar_den = excluded.video_sar_den,
+                            video_stream_info = COALESCE(excluded.video_stream_info, images.video_stream_info),
+                            content_fingerprint = CASE
+                                WHEN images.mtime IS excluded.mtime THEN images.content_fingerprint
+                                ELSE NULL
+                            END,
                             mtime = excluded.mtime,
                             rating = CASE
                                 WHEN ABS(COALESCE(excluded.rating, 0.0)) > 0.000001
@@ -964,8 +1070,10 @@ class ImageIndexDB:
                             END
                             -- thumbnail_cached intentionally NOT updated (preserve existing value)
                     ''', (file_name, width, height, aspect_ratio, int(is_video), video_fps,
-                          video_duration, video_frame_count, mtime, rating, reaction_updated_at, indexed_at,
-                          file_size, file_type, insert_ctime, review_rank, review_flags, review_updated_at))
+                          video_duration, video_frame_count, video_sar_num, video_sar_den,
+                          mtime, rating, reaction_updated_at, indexed_at,
+                          file_size, file_type, insert_ctime, review_rank, review_flags, review_updated_at,
+                          video_stream_info))
                 return  # Success
 
             except sqlite3.OperationalError as e:
@@ -3126,6 +3234,62 @@ class ImageIndexDB:
         """Get count of images with cached thumbnails."""
         return self.count(filter_sql='thumbnail_cached = 1')
 
+    def get_uncached_thumbnail_rows(self, after_id: int = 0, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Get rows without a cached thumbnail, keyset-paged by id.
+
+        Paging by id keeps each batch cheap on very large folders and lets an
+        interrupted bulk warm-up resume where it stopped.
+        """
+        return self._get_thumbnail_rows(0, after_id, limit)
+
+    def get_cached_thumbnail_rows(self, after_id: int = 0, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Get rows flagged as having a cached thumbnail, keyset-paged by id."""
+        return self._get_thumbnail_rows(1, after_id, limit)
+
+    def _get_thumbnail_rows(self, cached: int, after_id: int, limit: int) -> List[Dict[str, Any]]:
+        if not self._ensure_connection():
+            return []
+
+        try:
+            with self._db_lock:
+                cursor = self.conn.cursor()
+                cursor.execute('''
+                    SELECT id, file_name, is_video, width, height
+                    FROM images
+                    WHERE thumbnail_cached = ? AND id > ?
+                    ORDER BY id
+                    LIMIT ?
+                ''', (int(cached), int(after_id), max(1, int(limit))))
+                return [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f'Database query error: {e}')
+            return []
+
+    def mark_thumbnails_cached(self, file_names: List[str], cached: bool = True) -> int:
+        """Set thumbnail_cached for many rows in one transaction.
+
+        Pass cached=False for rows whose cache entries were evicted, so the
+        next bulk warm-up regenerates them.
+        """
+        if not self.enabled or not file_names:
+            return 0
+
+        with self._db_lock:
+            conn = self.conn
+            if conn is None:
+                return 0
+            try:
+                cursor = conn.cursor()
+                cursor.executemany(
+                    'UPDATE images SET thumbnail_cached = ? WHERE file_name = ?',
+                    [(1 if cached else 0, file_name) for file_name in file_names]
+                )
+                conn.commit()
+                return len(file_names)
+            except sqlite3.Error as e:
+                print(f'Database thumbnail flag write error: {e}')
+                return 0
+
     def get_page(self, page: int, page_size: int = 1000,
                  sort_field: str = 'mtime', sort_dir: str = 'DESC',
                  filter_sql: str = '', bindings: tuple = (), **kwargs) -> List[Dict[str, Any]]:
@@ -3166,10 +3330,11 @@ class ImageIndexDB:
                         cursor.execute(
                             '''
                             SELECT i.id, i.file_name, i.width, i.height, i.aspect_ratio, i.is_video,
-                                   i.video_fps, i.video_duration, i.video_frame_count, i.mtime, i.rating,
+                                   i.video_fps, i.video_duration, i.video_frame_count,
+                                   i.video_sar_num, i.video_sar_den, i.video_stream_info, i.mtime, i.rating,
                                    i.love, i.bomb, i.reaction_updated_at,
                                    i.review_rank, i.review_flags, i.review_updated_at,
-                                   i.file_size, i.file_type, i.ctime
+                                   i.file_size, i.file_type, i.ctime, i.content_fingerprint
                             FROM ordered_image_cache c
                             JOIN images i ON i.id = c.image_id
                             WHERE c.cache_key = ? AND c.rank >= ? AND c.rank < ?
@@ -3199,10 +3364,11 @@ class ImageIndexDB:
 
                 query = f'''
                     SELECT id, file_name, width, height, aspect_ratio, is_video,
-                           video_fps, video_duration, video_frame_count, mtime, rating,
+                           video_fps, video_duration, video_frame_count,
+                           video_sar_num, video_sar_den, video_stream_info, mtime, rating,
                            love, bomb, reaction_updated_at,
                            review_rank, review_flags, review_updated_at,
-                           file_size, file_type, ctime
+                           file_size, file_type, ctime, content_fingerprint
                     FROM images
                 '''
                 if filter_sql:
@@ -3304,7 +3470,8 @@ class ImageIndexDB:
             cursor = self.conn.cursor()
             cursor.execute('''
                 SELECT id, file_name, width, height, aspect_ratio, is_video,
-                       video_fps, video_duration, video_frame_count, mtime, rating,
+                       video_fps, video_duration, video_frame_count,
+                       video_sar_num, video_sar_den, video_stream_info, mtime, rating,
                        love, bomb, reaction_updated_at,
                        review_rank, review_flags, review_updated_at,
                        file_size, file_type, ctime
@@ -3332,7 +3499,8 @@ class ImageIndexDB:
                 placeholders = ','.join('?' * len(batch))
                 cursor.execute(f'''
                     SELECT id, file_name, width, height, aspect_ratio, is_video,
-                           video_fps, video_duration, video_frame_count, mtime, rating,
+                           video_fps, video_duration, video_frame_count,
+                           video_sar_num, video_sar_den, video_stream_info, mtime, rating,
                            love, bomb, reaction_updated_at,
                            review_rank, review_flags, review_updated_at
                     FROM images WHERE id IN ({placeholders})
@@ -3392,6 +3560,106 @@ class ImageIndexDB:
         except sqlite3.Error:
             return
 
+    def get_video_keyframe_index(self, file_name: str, mtime: float, file_size: int):
+        """Stored KeyframeIndex for a video, or None if missing or stale."""
+        if not self._ensure_connection():
+            return None
+        try:
+            with self._db_lock:
+                cursor = self.conn.cursor()
+                cursor.execute(
+                    '''
+                    SELECT frame_times, keyframes, cut_points FROM video_keyframe_index
+                    WHERE file_name = ? AND mtime = ? AND file_size = ?
+                    ''',
+                    (str(file_name), float(mtime), int(file_size)),
+                )
+                row = cursor.fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        from utils.video.keyframe_index import KeyframeIndex
+        try:
+            return KeyframeIndex.from_json(row['frame_times'], row['keyframes'], row['cut_points'])
+        except (TypeError, ValueError):
+            return None
+
+    def save_video_keyframe_index(self, file_name: str, mtime: float, file_size: int, index):
+        """Persist a KeyframeIndex, replacing any entry for an older file version."""
+        if not self._ensure_connection():
+            return
+        frame_times, keyframes, cut_points = index.to_json()
+        try:
+            with self._db_lock:
+                cursor = self.conn.cursor()
+                cursor.execute(
+                    '''
+                    INSERT OR REPLACE INTO video_keyframe_index
+                    (file_name, mtime, file_size, frame_times, keyframes, cut_points, indexed_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ''',
+                    (str(file_name), float(mtime), int(file_size), frame_times, keyframes,
+                     cut_points, time.time()),
+                )
+                keyframe_interval = index.keyframe_interval
+                if keyframe_interval is not None:
+                    # Surface the GOP length with the rest of the stream info.
+                    cursor.execute(
+                        'SELECT video_stream_info FROM images WHERE file_name = ? AND is_video = 1',
+                        (str(file_name),),
+                    )
+                    row = cursor.fetchone()
+                    if row is not None:
+                        metadata = video_metadata_from_row(row)
+                        metadata['keyframe_interval'] = round(keyframe_interval, 6)
+                        cursor.execute(
+                            'UPDATE images SET video_stream_info = ? WHERE file_name = ?',
+                            (encode_video_stream_info(metadata), str(file_name)),
+                        )
+                self.conn.commit()
+        except sqlite3.Error as e:
+            print(f'Database keyframe index write error: {e}')
+
+    def get_video_validation_results(self) -> Dict[str, Dict[str, Any]]:
+        """Stored validation rows keyed by relative file name."""
+        if not self._ensure_connection():
+            return {}
+        try:
+            with self._db_lock:
+                cursor = self.conn.cursor()
+                cursor.execute(
+                    'SELECT file_name, mtime, file_size, ok, message, level FROM video_validation'
+                )
+                rows = cursor.fetchall()
+        except sqlite3.Error:
+            return {}
+        return {str(row['file_name']): dict(row) for row in rows}
+
+    def save_video_validation_results(self, rows: List[Dict[str, Any]]):
+        """Persist validation results, replacing older results for the same files."""
+        if not rows or not self._ensure_connection():
+            return
+        now = time.time()
+        try:
+            with self._db_lock:
+                cursor = self.conn.cursor()
+                cursor.executemany(
+                    '''
+                    INSERT OR REPLACE INTO video_validation
+                    (file_name, mtime, file_size, ok, message, level, validated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ''',
+                    [
+                        (str(row['file_name']), float(row['mtime']), int(row['file_size']),
+                         int(bool(row['ok'])), str(row.get('message') or ''), str(row['level']), now)
+                        for row in rows
+                    ],
+                )
+                self.conn.commit()
+        except sqlite3.Error as e:
+            print(f'Database video validation write error: {e}')
+
     def get_directory_signatures(self) -> Dict[str, float]:
         """Return stored directory mtimes keyed by relative directory path."""
         if not self._ensure_connection():
@@ -4052,7 +4320,8 @@ class ImageIndexDB:
             offset = page * page_size
             cursor.execute('''
                 SELECT i.id, i.file_name, i.width, i.height, i.aspect_ratio, i.is_video,
-                       i.video_fps, i.video_duration, i.video_frame_count, i.mtime, i.rating,
+                       i.video_fps, i.video_duration, i.video_frame_count,
+                       i.video_sar_num, i.video_sar_den, i.video_stream_info, i.mtime, i.rating,
                        i.love, i.bomb
                 FROM images i
                 INNER JOIN image_tags t ON i.id = t.image_id
@@ -4191,22 +4460,40 @@ class ImageIndexDB:
             except sqlite3.Error as e:
                 print(f'Database thumbnail cache flag write error: {e}')
 
-    def update_image_dimensions(self, file_name: str, width: int, height: int):
-        """Persist dimensions for an existing DB row without disturbing other metadata."""
-        if not self.enabled:
-            return
+    def set_content_fingerprints(self, items: List[tuple[str, str]]) -> int:
+        """Store content fingerprints as (file_name, fingerprint) pairs."""
+        if not self.enabled or not items:
+            return 0
 
+        with self._db_lock:
+            conn = self.conn
+            if conn is None:
+                return 0
+            try:
+                cursor = conn.cursor()
+                cursor.executemany(
+                    'UPDATE images SET content_fingerprint = ? WHERE file_name = ?',
+                    [(fingerprint, file_name) for file_name, fingerprint in items]
+                )
+                conn.commit()
+                return len(items)
+            except sqlite3.Error as e:
+                print(f'Database content fingerprint write error: {e}')
+                return 0
+
+    def _dimension_update_row(self, file_name: str, width: int, height: int):
+        """(width, height, aspect_ratio, relative file_name) for an UPDATE, or None if invalid."""
         if not file_name:
-            return
+            return None
 
         try:
             width = int(width)
             height = int(height)
         except Exception:
-            return
+            return None
 
         if width <= 0 or height <= 0:
-            return
+            return None
 
         normalized_file_name = str(file_name)
         try:
@@ -4216,7 +4503,16 @@ class ImageIndexDB:
         except Exception:
             normalized_file_name = str(file_name)
 
-        aspect_ratio = width / height if height > 0 else 1.0
+        return width, height, width / height, normalized_file_name
+
+    def update_image_dimensions(self, file_name: str, width: int, height: int):
+        """Persist dimensions for an existing DB row without disturbing other metadata."""
+        if not self.enabled:
+            return
+
+        row = self._dimension_update_row(file_name, width, height)
+        if row is None:
+            return
 
         with self._db_lock:
             conn = self.conn
@@ -4230,11 +4526,40 @@ class ImageIndexDB:
                     SET width = ?, height = ?, aspect_ratio = ?
                     WHERE file_name = ?
                     ''',
-                    (width, height, aspect_ratio, normalized_file_name),
+                    row,
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f'Database image dimension write error: {e}')
+
+    def update_image_dimensions_batch(self, items: List[tuple[str, int, int]]) -> int:
+        """Persist (file_name, width, height) rows in one transaction."""
+        if not self.enabled or not items:
+            return 0
+
+        rows = [row for row in (self._dimension_update_row(*item) for item in items) if row is not None]
+        if not rows:
+            return 0
+
+        with self._db_lock:
+            conn = self.conn
+            if conn is None:
+                return 0
+            try:
+                cursor = conn.cursor()
+                cursor.executemany(
+                    '''
+                    UPDATE images
+                    SET width = ?, height = ?, aspect_ratio = ?
+                    WHERE file_name = ?
+                    ''',
+                    rows,
                 )
                 conn.commit()
+                return len(rows)
             except sqlite3.Error as e:
                 print(f'Database image dimension write error: {e}')
+                return 0
 
     def rename_image_path(self, old_file_name: str, new_file_name: str, *, directory_path: Path | None = None) -> bool:
         """Rename one indexed image path in-place after an on-disk file rename."""
@@ -4289,10 +4614,16 @@ class ImageIndexDB:
                 if not row:
                     return False
 
+                # A plain rename keeps the content fingerprint; a conversion
+                # (new mtime or size) makes it stale.
                 cursor.execute(
                     '''
                     UPDATE images
                     SET file_name = ?,
+                        content_fingerprint = CASE
+                            WHEN ? IS NULL OR (mtime IS ? AND file_size IS ?) THEN content_fingerprint
+                            ELSE NULL
+                        END,
                         mtime = COALESCE(?, mtime),
                         ctime = COALESCE(?, ctime),
                         file_size = COALESCE(?, file_size),
@@ -4302,6 +4633,9 @@ class ImageIndexDB:
                     (
                         normalized_new,
                         mtime,
+                        mtime,
+                        file_size,
+                        mtime,
                         ctime,
                         file_size,
                         file_type,
@@ -0,0 +1,100 @@
+"""Scroll-velocity page prefetch planning for the paginated image list.
+
+The view asks the model for the pages around the viewport. When the user
+flings through a large folder, the next region is usually not loaded by the
+time it scrolls into view. `PagePrefetchPlanner` tracks how fast the requested
+range is moving and how long page loads take, and names the pages ahead of
+the range that should be loaded now so they arrive in time.
+
+The planner is pure bookkeeping. The model decides what to submit and keeps
+the result inside its memory budget.
+"""
+
+import math
+import time
+
+
+# Initial page-load latency guess, replaced by measurements as pages arrive.
+DEFAULT_LATENCY_S = 0.2
+# Weight of a new latency measurement in the moving average.
+LATENCY_SMOOTHING = 0.3
+# Weight of a new velocity sample in the moving average.
+VELOCITY_SMOOTHING = 0.5
+# A gap this long between range updates means scrolling stopped.
+IDLE_RESET_S = 0.6
+# Moves further than this many pages at once are jumps, not scrolling.
+JUMP_PAGES = 50
+# Slower than this (pages per second) is treated as standing still.
+MIN_SPEED_PAGES_PER_S = 0.25
+# Prefetch far enough ahead to cover this multiple of the load latency.
+LATENCY_SAFETY = 1.5
+DEFAULT_MAX_LOOKAHEAD_PAGES = 8
+
+
+class PagePrefetchPlanner:
+    def __init__(self, page_size: int, *, max_lookahead_pages: int = DEFAULT_MAX_LOOKAHEAD_PAGES):
+        self.page_size = max(1, int(page_size))
+        self.max_lookahead_pages = max(0, int(max_lookahead_pages))
+        self.latency_s = DEFAULT_LATENCY_S
+        self.velocity = 0.0  # items per second, positive means scrolling down
+        self._last_center = None
+        self._last_time = None
+
+    def reset(self):
+        """Forget the scroll motion (for example after a folder or sort change)."""
+        self.velocity = 0.0
+        self._last_center = None
+        self._last_time = None
+
+    def observe(self, center_index: int, now: float | None = None):
+        """Record the center of the latest requested range."""
+        now = time.perf_counter() if now is None else now
+        if self._last_center is None or now - self._last_time > IDLE_RESET_S:
+            self.velocity = 0.0
+            self._last_center, self._last_time = center_index, now
+            return
+        delta = center_index - self._last_center
+        elapsed = now - self._last_time
+        if abs(delta) > JUMP_PAGES * self.page_size:
+            self.velocity = 0.0
+        elif elapsed >= 0.001:
+            sample = delta / elapsed
+            if sample * self.velocity < 0:
+                # Direction flipped: do not average against the old direction.
+                self.velocity = sample
+            else:
+                self.velocity += VELOCITY_SMOOTHING * (sample - self.velocity)
+        else:
+            # Keep the older reference point so the next sample has a usable interval.
+            return
+        self._last_center, self._last_time = center_index, now
+
+    def record_latency(self, seconds: float):
+        if seconds < 0:
+            return
+        self.latency_s += LATENCY_SMOOTHING * (seconds - self.latency_s)
+
+    def lookahead_pages(self, now: float | None = None) -> int:
+        """Pages to keep loaded ahead of the range in the scroll direction."""
+        now = time.perf_counter() if now is None else now
+        if self._last_time is None or now - self._last_time > IDLE_RESET_S:
+            return 0
+        speed_pages = abs(self.velocity) / self.page_size
+        if speed_pages < MIN_SPEED_PAGES_PER_S:
+            return 0
+        pages = math.ceil(speed_pages * self.latency_s * LATENCY_SAFETY)
+        return max(1, min(self.max_lookahead_pages, pages))
+
+    def plan(self, start_page: int, end_page: int, last_page: int, budget: int,
+             now: float | None = None) -> list[int]:
+        """Pages beyond [start_page, end_page] to prefetch, nearest first.
+
+        `budget` caps the count so prefetched pages fit in memory next to the
+        window the view protects.
+        """
+        count = min(self.lookahead_pages(now), max(0, int(budget)))
+        if count <= 0:
+            return []
+        if self.velocity > 0:
+            return list(range(end_page + 1, min(last_page, end_page + count) + 1))
+        return list(range(start_page - 1, max(0, start_page - count) - 1, -1))
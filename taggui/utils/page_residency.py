@@ -0,0 +1,150 @@
+"""Memory accounting for paginated image list pages.
+
+Pages used to be kept by count. A page of 4K videos with tags, loop markers and
+decoded thumbnails costs far more than a page of small untagged PNGs. This
+module estimates what a page holds, resolves a byte budget (by default derived
+from available system memory), and picks eviction victims by cost.
+
+The per-object constants were measured with tracemalloc on CPython 3.12. They
+are estimates meant to rank and bound pages, not exact accounting.
+"""
+
+import ctypes
+import os
+import sys
+
+
+MB = 1024 * 1024
+# Auto budget: this share of the memory that is available when a folder loads.
+AUTO_BUDGET_FRACTION = 0.25
+AUTO_BUDGET_MIN_BYTES = 256 * MB
+AUTO_BUDGET_MAX_BYTES = 4096 * MB
+# Used when available memory cannot be queried.
+FALLBACK_BUDGET_BYTES = 1024 * MB
+
+# Image dataclass, its attribute dict, Path and the scalar fields.
+IMAGE_BASE_BYTES = 700
+# Per tag: the str object and its list slot.
+TAG_BYTES = 57
+VIDEO_METADATA_BYTES = 400
+LOOP_MARKER_BYTES = 250
+MARKING_BYTES = 200
+
+
+def available_memory_bytes() -> int | None:
+    """Physical memory that is currently available, or None if unknown."""
+    if sys.platform == 'win32':
+        class MemoryStatusEx(ctypes.Structure):
+            _fields_ = [
+                ('dwLength', ctypes.c_ulong),
+                ('dwMemoryLoad', ctypes.c_ulong),
+                ('ullTotalPhys', ctypes.c_ulonglong),
+                ('ullAvailPhys', ctypes.c_ulonglong),
+                ('ullTotalPageFile', ctypes.c_ulonglong),
+                ('ullAvailPageFile', ctypes.c_ulonglong),
+                ('ullTotalVirtual', ctypes.c_ulonglong),
+                ('ullAvailVirtual', ctypes.c_ulonglong),
+                ('ullAvailExtendedVirtual', ctypes.c_ulonglong),
+            ]
+
+        status = MemoryStatusEx()
+        status.dwLength = ctypes.sizeof(MemoryStatusEx)
+        try:
+            if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+                return int(status.ullAvailPhys)
+        except Exception:
+            return None
+        return None
+    try:
+        page_size = os.sysconf('SC_PAGE_SIZE')
+        # macOS has no SC_AVPHYS_PAGES; fall back to total physical memory there.
+        for name in ('SC_AVPHYS_PAGES', 'SC_PHYS_PAGES'):
+            if name in os.sysconf_names:
+                pages = os.sysconf(name)
+                if pages > 0 and page_size > 0:
+                    return int(pages * page_size)
+    except (OSError, ValueError):
+        return None
+    return None
+
+
+def auto_page_budget_bytes(available: int | None = None) -> int:
+    if available is None:
+        available = available_memory_bytes()
+    if not available:
+        return FALLBACK_BUDGET_BYTES
+    budget = int(available * AUTO_BUDGET_FRACTION)
+    return max(AUTO_BUDGET_MIN_BYTES, min(AUTO_BUDGET_MAX_BYTES, budget))
+
+
+def resolve_page_budget_bytes(budget_mb: int) -> int:
+    """Byte budget for a `page_memory_budget_mb` setting (0 means auto)."""
+    try:
+        budget_mb = int(budget_mb)
+    except (TypeError, ValueError):
+        budget_mb = 0
+    if budget_mb <= 0:
+        return auto_page_budget_bytes()
+    return budget_mb * MB
+
+
+def estimate_image_bytes(image) -> int:
+    """Bytes held by an Image, not counting its thumbnails."""
+    size = IMAGE_BASE_BYTES + len(image.path.name)
+    tags = image.tags
+    if tags:
+        size += sum(TAG_BYTES + len(tag) for tag in tags)
+    if image.video_metadata:
+        size += VIDEO_METADATA_BYTES
+    if image.viewer_loop_markers:
+        size += LOOP_MARKER_BYTES * len(image.viewer_loop_markers)
+    if image.markings:
+        size += MARKING_BYTES * len(image.markings)
+    return size
+
+
+def estimate_page_bytes(images) -> int:
+    """Bytes held by a page of Images, not counting thumbnails."""
+    return sum(estimate_image_bytes(image) for image in images if image is not None)
+
+
+def page_thumbnail_bytes(images, icon_fallback_bytes: int) -> tuple[int, int]:
+    """Decoded thumbnail bytes and thumbnail count for a page.
+
+    An image can hold the worker's QImage, the QIcon built from it, or both.
+    The icon's pixmap is a copy of the QImage. An icon without a QImage is
+    counted as `icon_fallback_bytes`.
+    """
+    total = 0
+    count = 0
+    for image in images:
+        if image is None:
+            continue
+        qimage = image.thumbnail_qimage
+        qimage_bytes = qimage.sizeInBytes() if qimage is not None else 0
+        if qimage_bytes:
+            total += qimage_bytes
+            count += 1
+        if image.thumbnail is not None:
+            total += qimage_bytes or icon_fallback_bytes
+            if not qimage_bytes:
+                count += 1
+    return total, count
+
+
+def choose_victim(load_order, costs: dict[int, int], protected: tuple[int, int] | None):
+    """Page to evict next, or None if every resident page is protected.
+
+    Among the older half of unprotected pages (in LRU order), pick the most
+    expensive one. Large, cold pages go first, and a recently loaded page is
+    kept even when it is large.
+    """
+    candidates = [
+        page_num for page_num in load_order
+        if page_num in costs
+        and (protected is None or not (protected[0] <= page_num <= protected[1]))
+    ]
+    if not candidates:
+        return None
+    older = candidates[:max(1, (len(candidates) + 1) // 2)]
+    return max(older, key=lambda page_num: costs[page_num])
@@ -44,8 +44,11 @@ DEFAULT_SETTINGS = {
     'enable_dimension_cache': True,
     'enable_thumbnail_cache': True,
     'thumbnail_cache_location': '',  # Empty = default (~/.taggui_cache/thumbnails)
+    'thumbnail_cache_max_size_mb': 8192,  # Disk cap for the thumbnail cache; LRU entries are evicted in the background (0 = unlimited)
+    'thumbnail_cache_content_dedup': False,  # Share thumbnails between copies of the same file content (also survives renames)
     'thumbnail_eviction_pages': 3,  # How many pages to keep loaded on each side (1-5, higher = more VRAM but smoother)
-    'max_pages_in_memory': 20,  # Max paginated pages held in RAM (higher = smoother revisits, higher RAM)
+    'max_pages_in_memory': 60,  # Ceiling on paginated pages held in RAM; the memory budget decides below it
+    'page_memory_budget_mb': 0,  # RAM budget for paginated pages incl. decoded thumbnails (0 = auto from free memory)
     'pagination_threshold': 0,  # Minimum images to enable pagination mode (0 = always paginate, higher = only for large datasets)
     'image_list_sort_dir': 'ASC',
     'image_list_random_seed': 0,
@@ -1,16 +1,47 @@
 """Disk caching for generated thumbnails to speed up reloads."""
 
 import hashlib
+import json
+import os
 import shutil
 import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from PySide6.QtGui import QIcon, QPixmap
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QIcon, QImage, QPixmap
+from utils.content_fingerprint import compute_content_fingerprint
 from utils.settings import settings, DEFAULT_SETTINGS
+from utils.thumbnail_cache_index import (
+    MAINTENANCE_INTERVAL_SECONDS,
+    ThumbnailCacheIndex,
+    _set_low_priority_current_thread,
+)
+
+# Standard widths written next to every generated thumbnail. Other list,
+# secondary-browser, or wall sizes are served from the nearest larger level
+# instead of decoding the source image again.
+PYRAMID_WIDTHS = (128, 256, 512)
+# Remembered content fingerprints, keyed by (path, mtime).
+FINGERPRINT_MEMO_SIZE = 8192
 
 
 class ThumbnailCache:
     """Disk cache for thumbnail QIcons."""
 
+    PURGE_KEY = '_thumbnail_cache_purge_v1'
+    PNG_CLEANUP_KEY = '_thumbnail_cache_png_cleanup_v1'
+
+    # Class-level defaults keep partially constructed caches (tests, disabled
+    # caches) on the no-index path.
+    _index: ThumbnailCacheIndex | None = None
+    _maintenance_thread: threading.Thread | None = None
+    _maintenance_wakeup: threading.Event | None = None
+    max_bytes = 0
+    content_dedup = False
+    _fingerprint_memo: OrderedDict | None = None
+    _fingerprint_lock = threading.Lock()
+
     def __init__(self):
         """Initialize thumbnail cache directory."""
         # Check if caching is enabled
@@ -37,82 +68,200 @@ class ThumbnailCache:
 
         self.cache_dir = new_cache_dir
 
+        self.max_bytes = self._resolve_max_bytes()
+        self.content_dedup = settings.value(
+            'thumbnail_cache_content_dedup',
+            defaultValue=DEFAULT_SETTINGS['thumbnail_cache_content_dedup'],
+            type=bool)
+
         if self.enabled:
             self.cache_dir.mkdir(parents=True, exist_ok=True)
             print(f"[CACHE INIT] Thumbnail cache enabled: {self.cache_dir}")
             print(f"[CACHE INIT] Cache directory exists: {self.cache_dir.exists()}")
-            # Clean up old PNG cache files (we use WebP now)
-            self._cleanup_old_png_cache()
-            # One-time purge of potentially corrupted cache entries from
-            # the row-shift thumbnail bug (fixed in 330eadc).
-            self._purge_corrupted_cache_v1()
+            self._open_index()
+            self._start_maintenance_thread()
         else:
             print("[CACHE INIT] Thumbnail cache DISABLED")
 
-    def _purge_corrupted_cache_v1(self):
-        """One-time purge of all cached thumbnails that may have been corrupted
-        by the row-shift bug in paginated mode (fixed in commit 330eadc).
-
-        Uses a settings flag so this only runs once per installation.
-        """
-        PURGE_KEY = '_thumbnail_cache_purge_v1'
-        if settings.value(PURGE_KEY, False, type=bool):
-            return  # Already purged
-
-        if not self.cache_dir.exists():
-            settings.setValue(PURGE_KEY, True)
+    @staticmethod
+    def _resolve_max_bytes() -> int:
+        """Return the configured cache byte cap (0 = unlimited)."""
+        try:
+            max_size_mb = int(settings.value(
+                'thumbnail_cache_max_size_mb',
+                defaultValue=DEFAULT_SETTINGS['thumbnail_cache_max_size_mb'],
+                type=int) or 0)
+        except (TypeError, ValueError):
+            max_size_mb = DEFAULT_SETTINGS['thumbnail_cache_max_size_mb']
+        return max(0, max_size_mb) * 1024 * 1024
+
+    def set_max_size_mb(self, max_size_mb: int):
+        """Apply a new byte cap; the maintenance thread evicts if needed."""
+        self.max_bytes = max(0, int(max_size_mb)) * 1024 * 1024
+        self._wake_maintenance()
+
+    def _open_index(self):
+        """Open the access index, recording the legacy maintenance it still owes."""
+        try:
+            self._index = ThumbnailCacheIndex(self.cache_dir)
+        except Exception as e:
+            print(f'[CACHE INIT] Access index unavailable, size cap disabled: {e}')
+            self._index = None
             return
 
+        if self._index.is_bootstrapped():
+            return
+        # The first index build replaces the old global rglob passes. Decide
+        # here (main thread, QSettings) whether it must also apply the one-time
+        # purge of entries from the row-shift bug (fixed in 330eadc).
+        if self._index.get_meta_value(ThumbnailCacheIndex.BOOTSTRAP_PURGE_WEBP_KEY) is None:
+            purge_webp = not settings.value(self.PURGE_KEY, False, type=bool)
+            self._index.set_meta_value(
+                ThumbnailCacheIndex.BOOTSTRAP_PURGE_WEBP_KEY, '1' if purge_webp else '0')
+        settings.setValue(self.PURGE_KEY, True)
+        settings.setValue(self.PNG_CLEANUP_KEY, True)
+
+    def _start_maintenance_thread(self):
+        if self._index is None:
+            return
+        # Bulk warm-up worker processes leave GC to the parent process.
+        if os.getenv('TAGGUI_THUMBNAIL_CACHE_GC', '1').strip() == '0':
+            return
+        self._maintenance_wakeup = threading.Event()
+        self._maintenance_thread = threading.Thread(
+            target=self._maintenance_loop,
+            name='ThumbnailCacheGC',
+            daemon=True,
+        )
+        self._maintenance_thread.start()
+
+    def _wake_maintenance(self):
+        if self._maintenance_wakeup is not None:
+            self._maintenance_wakeup.set()
+
+    def _maintenance_loop(self):
+        """Low-priority loop: bootstrap the index once, then flush and evict."""
+        _set_low_priority_current_thread()
         try:
-            webp_files = list(self.cache_dir.rglob('*.webp'))
-            if webp_files:
-                print(f'[CACHE] Purging {len(webp_files)} potentially corrupted cache entries (one-time fix)...')
-                removed = 0
-                for f in webp_files:
-                    try:
-                        f.unlink()
-                        removed += 1
-                    except Exception:
-                        pass
-                print(f'[CACHE] Purged {removed} entries. Cache will rebuild on demand.')
+            if not self._index.is_bootstrapped():
+                self._bootstrap_index_from_disk()
         except Exception as e:
-            print(f'[CACHE] Purge failed: {e}')
-
-        settings.setValue(PURGE_KEY, True)
+            print(f'[CACHE] Index bootstrap failed: {e}')
+        while self._index is not None:
+            self._maintenance_wakeup.wait(MAINTENANCE_INTERVAL_SECONDS)
+            self._maintenance_wakeup.clear()
+            try:
+                self.run_maintenance()
+            except Exception as e:
+                print(f'[CACHE] Maintenance failed: {e}')
 
-    def _cleanup_old_png_cache(self):
-        """Remove old PNG cache files (we use WebP now for better compression)."""
-        CLEANUP_KEY = '_thumbnail_cache_png_cleanup_v1'
-        if settings.value(CLEANUP_KEY, False, type=bool):
-            return
+    def run_maintenance(self) -> int:
+        """Flush buffered index updates and enforce the byte cap.
 
-        if not self.cache_dir.exists():
-            settings.setValue(CLEANUP_KEY, True)
-            return
+        Returns:
+            Number of evicted cache entries
+        """
+        if self._index is None:
+            return 0
+        self._index.flush()
+        evicted = self._index.evict_to_budget(self.max_bytes, self._remove_entry_file)
+        if evicted:
+            print(f'[CACHE] Evicted {evicted} least-recently-used thumbnails to fit the size cap')
+        return evicted
+
+    def flush_index(self):
+        """Persist buffered index updates now (atexit does not run in pool workers)."""
+        if self._index is not None:
+            self._index.flush()
+
+    def _iter_bucket_files(self):
+        """Yield DirEntry objects for files inside the two-character buckets."""
+        with os.scandir(self.cache_dir) as buckets:
+            for bucket in buckets:
+                if not bucket.is_dir(follow_symlinks=False):
+                    continue
+                try:
+                    with os.scandir(bucket.path) as entries:
+                        for entry in entries:
+                            if entry.is_file(follow_symlinks=False):
+                                yield entry
+                except OSError:
+                    continue
 
-        try:
-            png_files = list(self.cache_dir.rglob('*.png'))
-            if not png_files:
-                settings.setValue(CLEANUP_KEY, True)
-                return
+    def _bootstrap_index_from_disk(self):
+        """Build the index from one bucket walk, applying legacy cleanups inline.
 
-            print(f'Cleaning up {len(png_files)} old PNG cache files...')
-            removed = 0
-            for png_file in png_files:
+        Replaces the old startup `rglob` passes: PNG leftovers are removed,
+        the one-time v1 purge drops WebP entries when still owed, and all
+        remaining entries are registered with their size and mtime.
+        """
+        purge_webp = self._index.get_meta_value(
+            ThumbnailCacheIndex.BOOTSTRAP_PURGE_WEBP_KEY) == '1'
+        registered = 0
+        removed = 0
+        batch: list[tuple[str, int, float]] = []
+        for entry in self._iter_bucket_files():
+            name = entry.name
+            if name.endswith('.png') or (purge_webp and name.endswith('.webp')):
                 try:
-                    png_file.unlink()
+                    os.unlink(entry.path)
                     removed += 1
-                except Exception:
+                except OSError:
                     pass
+                continue
+            if not name.endswith('.webp'):
+                continue
+            try:
+                stat = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            batch.append((name[:-len('.webp')], int(stat.st_size), float(stat.st_mtime)))
+            if len(batch) >= 1000:
+                self._index.register_existing(batch)
+                registered += len(batch)
+                batch = []
+        self._index.register_existing(batch)
+        registered += len(batch)
+        self._index.set_meta_value(ThumbnailCacheIndex.BOOTSTRAPPED_KEY, '1')
+        if removed or registered:
+            print(f'[CACHE] Index built: {registered} entries registered, {removed} obsolete files removed')
+
+    def _remove_entry_file(self, cache_key: str):
+        cache_path = self._get_cache_path(cache_key)
+        for path in (cache_path, cache_path.with_suffix('.json')):
+            try:
+                path.unlink()
+            except OSError:
+                pass
 
-            if removed > 0:
-                print(f'Removed {removed} PNG files, cache will be rebuilt in WebP format')
+    def stats(self) -> dict | None:
+        """Return cache size, entry count, and hit/miss counters from the index."""
+        if self._index is None:
+            return None
+        stats = self._index.stats()
+        stats['max_bytes'] = self.max_bytes
+        return stats
 
-        except Exception as e:
-            print(f'Failed to cleanup PNG cache: {e}')
-        finally:
-            # Never retry on every startup; expensive cache walks can stall/crash workers.
-            settings.setValue(CLEANUP_KEY, True)
+    def clear_all(self) -> int:
+        """Delete every cached thumbnail and reset the index.
+
+        Returns:
+            Number of deleted files
+        """
+        deleted = 0
+        if not self.cache_dir.exists():
+            return 0
+        for entry in self._iter_bucket_files():
+            if not entry.name.endswith(('.webp', '.png', '.json')):
+                continue
+            try:
+                os.unlink(entry.path)
+                deleted += 1
+            except OSError:
+                pass
+        if self._index is not None:
+            self._index.clear()
+        return deleted
 
     def _migrate_cache(self, old_dir: Path, new_dir: Path):
         """
@@ -133,6 +282,9 @@ class ThumbnailCache:
 
             # Count total files for progress (support both PNG and WebP)
             cache_files = list(old_dir.rglob('*.png')) + list(old_dir.rglob('*.webp'))
+            # The access index is keyed by cache key, so it stays valid after a move.
+            cache_files.extend(
+                path for path in ThumbnailCacheIndex.bundle_paths(old_dir) if path.exists())
             total_files = len(cache_files)
 
             if total_files == 0:
@@ -197,6 +349,74 @@ class ThumbnailCache:
         key_string = f"{file_path}_{mtime}_{size}"
         return hashlib.md5(key_string.encode()).hexdigest()
 
+    @staticmethod
+    def _get_content_cache_key(fingerprint: str, size: int) -> str:
+        """Cache key shared by every copy of the same file content."""
+        return hashlib.md5(f"content:{fingerprint}_{size}".encode()).hexdigest()
+
+    def content_fingerprint(self, file_path: Path, mtime: float,
+                            *, compute: bool = True) -> str | None:
+        """Return the file's content fingerprint, memoized per (path, mtime).
+
+        Args:
+            compute: Hash the file on a memo miss; False only peeks the memo
+        """
+        memo_key = (str(file_path), mtime)
+        with self._fingerprint_lock:
+            if self._fingerprint_memo is None:
+                self._fingerprint_memo = OrderedDict()
+            fingerprint = self._fingerprint_memo.get(memo_key)
+            if fingerprint is not None:
+                self._fingerprint_memo.move_to_end(memo_key)
+                return fingerprint
+        if not compute:
+            return None
+        fingerprint = compute_content_fingerprint(file_path)
+        if fingerprint is None:
+            return None
+        self.remember_content_fingerprints(((file_path, mtime, fingerprint),))
+        return fingerprint
+
+    def remember_content_fingerprints(self, entries) -> None:
+        """Seed the memo with known fingerprints, e.g. stored in the folder DB.
+
+        Args:
+            entries: (file_path, mtime, fingerprint) per file version
+        """
+        with self._fingerprint_lock:
+            if self._fingerprint_memo is None:
+                self._fingerprint_memo = OrderedDict()
+            for file_path, mtime, fingerprint in entries:
+                memo_key = (str(file_path), mtime)
+                self._fingerprint_memo[memo_key] = fingerprint
+                self._fingerprint_memo.move_to_end(memo_key)
+            while len(self._fingerprint_memo) > FINGERPRINT_MEMO_SIZE:
+                self._fingerprint_memo.popitem(last=False)
+
+    def _link_entry(self, source_path: Path, cache_key: str) -> Path | None:
+        """Expose an existing cache file under `cache_key` without re-encoding.
+
+        Uses a hard link so shared content costs its bytes once on disk,
+        falling back to a copy on filesystems without hard links. The index
+        counts every link at full size, so the size cap errs on the safe side.
+        """
+        target_path = self._get_cache_path(cache_key, ensure_parent=True)
+        try:
+            os.link(source_path, target_path)
+        except FileExistsError:
+            return target_path
+        except OSError:
+            try:
+                shutil.copyfile(source_path, target_path)
+            except OSError:
+                return None
+        if self._index is not None:
+            try:
+                self._index.record_write(cache_key, target_path.stat().st_size)
+            except OSError:
+                pass
+        return target_path
+
     def _get_cache_path(self, cache_key: str, *, ensure_parent: bool = False) -> Path:
         """Get a cache path, creating its hash bucket only for writes."""
         # Organize into subdirectories by first 2 chars to avoid too many files in one dir
@@ -206,6 +426,88 @@ class ThumbnailCache:
             cache_subdir.mkdir(parents=True, exist_ok=True)
         return cache_subdir / f"{cache_key}.webp"
 
+    def _iter_candidate_widths(self, size: int):
+        """Yield stored widths that can serve `size`, cheapest downscale first."""
+        size = int(size)
+        yield size
+        for level_width in PYRAMID_WIDTHS:
+            if level_width > size:
+                yield level_width
+
+    def find_cached_level(self, file_path: Path, mtime: float,
+                          size: int) -> tuple[int, Path] | None:
+        """Return (width, path) of the smallest cached level usable for `size`."""
+        if not self.enabled:
+            return None
+        for level_width in self._iter_candidate_widths(size):
+            cache_key = self._get_cache_key(file_path, mtime, level_width)
+            cache_path = self._get_cache_path(cache_key)
+            if cache_path.is_file():
+                return level_width, cache_path
+        if self.content_dedup:
+            return self._find_content_level(file_path, mtime, size)
+        return None
+
+    def _find_content_level(self, file_path: Path, mtime: float,
+                            size: int) -> tuple[int, Path] | None:
+        """Serve a path-key miss from a copy of the same content (rename, copy).
+
+        On a hit the level is linked under this path's key, so the next lookup
+        takes the plain path-key fast path again.
+        """
+        fingerprint = self.content_fingerprint(file_path, mtime)
+        if fingerprint is None:
+            return None
+        for level_width in self._iter_candidate_widths(size):
+            content_path = self._get_cache_path(
+                self._get_content_cache_key(fingerprint, level_width))
+            if not content_path.is_file():
+                continue
+            linked_path = self._link_entry(
+                content_path, self._get_cache_key(file_path, mtime, level_width))
+            return level_width, linked_path or content_path
+        return None
+
+    def get_thumbnail_qimage(self, file_path: Path, mtime: float, size: int) -> QImage | None:
+        """
+        Get a cached thumbnail as QImage (thread-safe).
+
+        Serves the exact width when present, otherwise downscales the nearest
+        larger pyramid level so a size change never touches the source file.
+
+        Args:
+            file_path: Path to the image file
+            mtime: File modification time
+            size: Thumbnail size in pixels
+
+        Returns:
+            Cached QImage or None if no usable level exists
+        """
+        level = self.find_cached_level(file_path, mtime, size)
+        if level is None:
+            if self._index is not None:
+                self._index.record_miss()
+            return None
+
+        level_width, cache_path = level
+        qimage = QImage(str(cache_path))
+        if qimage.isNull():
+            # Corrupted cache file, delete it
+            try:
+                cache_path.unlink()
+            except Exception:
+                pass
+            if self._index is not None:
+                self._index.forget((cache_path.stem,))
+                self._index.record_miss()
+            return None
+        if self._index is not None:
+            self._index.record_hit(cache_path.stem)
+        if level_width != size and qimage.width() > size:
+            qimage = qimage.scaledToWidth(
+                int(size), Qt.TransformationMode.SmoothTransformation)
+        return qimage
+
     def get_thumbnail(self, file_path: Path, mtime: float, size: int) -> QIcon | None:
         """
         Get cached thumbnail if it exists.
@@ -221,34 +523,94 @@ class ThumbnailCache:
         if not self.enabled:
             return None
 
-        cache_key = self._get_cache_key(file_path, mtime, size)
-        cache_path = self._get_cache_path(cache_key)
-
-        if not cache_path.exists():
-            return None
-
         try:
-            pixmap = QPixmap(str(cache_path))
-            if pixmap.isNull():
-                # Corrupted cache file, delete it
-                cache_path.unlink()
-                return None
-            return QIcon(pixmap)
+            qimage = self.get_thumbnail_qimage(file_path, mtime, size)
         except Exception:
-            # Failed to load, delete corrupted cache
-            try:
-                cache_path.unlink()
-            except Exception:
-                pass
             return None
+        if qimage is None:
+            return None
+        return QIcon(QPixmap.fromImage(qimage))
 
     def has_thumbnail(self, file_path: Path, mtime: float, size: int) -> bool:
-        """Return whether a cache entry exists without decoding it."""
+        """Return whether a usable cache level exists without decoding it."""
+        return self.find_cached_level(file_path, mtime, size) is not None
+
+    def level_paths(self, file_path: Path, mtime: float, size: int | None = None) -> list[Path]:
+        """Return existing cache files for every level of one source file version."""
         if not self.enabled:
-            return False
+            return []
+        widths = set(PYRAMID_WIDTHS)
+        if size is not None:
+            widths.add(int(size))
+        paths = []
+        for level_width in sorted(widths):
+            cache_path = self._get_cache_path(
+                self._get_cache_key(file_path, mtime, level_width))
+            if cache_path.is_file():
+                paths.append(cache_path)
+        return paths
+
+    def remove_thumbnail(self, file_path: Path, mtime: float, size: int | None = None) -> int:
+        """Delete every cached level for one source file version.
 
-        cache_key = self._get_cache_key(file_path, mtime, size)
-        return self._get_cache_path(cache_key).is_file()
+        Returns:
+            Number of cache files removed
+        """
+        removed = 0
+        removed_keys = []
+        for cache_path in self.level_paths(file_path, mtime, size):
+            try:
+                cache_path.unlink()
+                removed += 1
+                removed_keys.append(cache_path.stem)
+            except OSError:
+                pass
+        if self._index is not None and removed_keys:
+            self._index.forget(removed_keys)
+        return removed
+
+    def carry_over_thumbnail(self, old_path: Path, old_mtime: float,
+                             new_path: Path, new_mtime: float,
+                             *, move: bool = False, size: int | None = None) -> int:
+        """Reuse cached levels after a file is moved, renamed, or copied.
+
+        Args:
+            move: The old path is gone; rename its entries instead of linking
+
+        Returns:
+            Number of levels made available under the new path
+        """
+        if not self.enabled:
+            return 0
+        # Same content under the new name: a later path-key miss needs no rehash.
+        fingerprint = self.content_fingerprint(old_path, old_mtime, compute=False)
+        if fingerprint is not None:
+            self.remember_content_fingerprints(((new_path, new_mtime, fingerprint),))
+        widths = set(PYRAMID_WIDTHS)
+        if size is not None:
+            widths.add(int(size))
+        carried = 0
+        for level_width in sorted(widths):
+            old_key = self._get_cache_key(old_path, old_mtime, level_width)
+            old_cache_path = self._get_cache_path(old_key)
+            if not old_cache_path.is_file():
+                continue
+            new_key = self._get_cache_key(new_path, new_mtime, level_width)
+            if new_key == old_key:
+                continue
+            if move:
+                new_cache_path = self._get_cache_path(new_key, ensure_parent=True)
+                try:
+                    os.replace(old_cache_path, new_cache_path)
+                except OSError:
+                    continue
+                if self._index is not None:
+                    self._index.forget((old_key,))
+                    self._index.record_write(new_key, new_cache_path.stat().st_size)
+            elif self._link_entry(old_cache_path, new_key) is None:
+                continue
+            carried += 1
+        return carried
 
     def save_thumbnail(self, file_path: Path, mtime: float, size: int, icon: QIcon):
         """Save thumbnail to cache from QIcon (DEPRECATED — prefer save_thumbnail_qimage)."""
@@ -257,9 +619,7 @@ class ThumbnailCache:
         try:
             pixmap = icon.pixmap(size, size)
             if not pixmap.isNull():
-                cache_key = self._get_cache_key(file_path, mtime, size)
-                cache_path = self._get_cache_path(cache_key, ensure_parent=True)
-                pixmap.save(str(cache_path), 'WEBP', quality=85)
+                self.save_thumbnail_qimage(file_path, mtime, size, pixmap.toImage())
         except Exception as e:
             print(f'[CACHE ERROR] Exception saving {file_path.name}: {type(e).__name__}: {e}')
 
@@ -269,43 +629,124 @@ class ThumbnailCache:
         Unlike save_thumbnail(), this method uses only QImage which is safe
         to call from any thread.  QPixmap operations are main-thread-only and
         cause GIL contention when used in worker threads.
+
+        The smaller pyramid levels are derived from the same QImage, so one
+        source decode fills every standard width. With content dedup enabled,
+        each level is stored once per file content and linked under the path.
+
+        Returns:
+            True when the requested level was written
         """
         if not self.enabled:
-            return
+            return False
         if qimage is None or qimage.isNull():
-            return
+            return False
 
+        fingerprint = self.content_fingerprint(file_path, mtime) if self.content_dedup else None
+        if not self._write_level(file_path, mtime, size, qimage, fingerprint):
+            return False
+        self._save_pyramid_levels(file_path, mtime, size, qimage, fingerprint)
+        return True
+
+    def _write_level(self, file_path: Path, mtime: float, size: int, qimage,
+                     fingerprint: str | None = None) -> bool:
+        """Write one cache level; return False when the write failed."""
         cache_key = self._get_cache_key(file_path, mtime, size)
+        if fingerprint is not None:
+            content_key = self._get_content_cache_key(fingerprint, size)
+            content_path = self._get_cache_path(content_key, ensure_parent=True)
+            if not content_path.is_file():
+                if not self._encode_entry(file_path, content_key, content_path, qimage):
+                    return False
+            if self._link_entry(content_path, cache_key) is not None:
+                return True
         cache_path = self._get_cache_path(cache_key, ensure_parent=True)
+        return self._encode_entry(file_path, cache_key, cache_path, qimage)
 
+    def _encode_entry(self, file_path: Path, cache_key: str, cache_path: Path, qimage) -> bool:
+        # Encode to a temp name and swap it in, so a reader never sees a
+        # partial file and an existing hard link's other names are untouched.
+        temp_path = cache_path.with_name(f'{cache_path.name}.{threading.get_ident()}.tmp')
         try:
-            result = qimage.save(str(cache_path), 'WEBP', quality=85)
+            result = qimage.save(str(temp_path), 'WEBP', quality=85)
             if not result:
                 print(f"[CACHE ERROR] qimage.save() failed for: {file_path.name} -> {cache_path}")
+                try:
+                    temp_path.unlink()
+                except OSError:
+                    pass
+                return False
+            os.replace(temp_path, cache_path)
+            if self._index is not None:
+                if self._index.record_write(cache_key, cache_path.stat().st_size):
+                    self._wake_maintenance()
+            return True
         except Exception as e:
             print(f'[CACHE ERROR] Exception saving {file_path.name}: {type(e).__name__}: {e}')
+            return False
+
+    def _save_pyramid_levels(self, file_path: Path, mtime: float, size: int, qimage,
+                             fingerprint: str | None = None):
+        """Write missing standard levels below `size`, each scaled from the previous one."""
+        source = qimage
+        for level_width in sorted(PYRAMID_WIDTHS, reverse=True):
+            if level_width >= int(size) or level_width >= source.width():
+                continue
+            source = source.scaledToWidth(
+                level_width, Qt.TransformationMode.SmoothTransformation)
+            cache_key = self._get_cache_key(file_path, mtime, level_width)
+            if self._get_cache_path(cache_key).is_file():
+                continue
+            if not self._write_level(file_path, mtime, level_width, source, fingerprint):
+                return
+
+    def _sprite_sheet_cache_key(self, file_path: Path, mtime: float, file_size: int) -> str:
+        return self._get_cache_key(file_path, mtime, f'sprites-{int(file_size)}')
+
+    def get_sprite_sheet(self, file_path: Path, mtime: float, file_size: int) -> tuple[QImage, dict] | None:
+        """Return a video's timeline sprite sheet and its tile index (thread-safe)."""
+        if not self.enabled:
+            return None
+        cache_key = self._sprite_sheet_cache_key(file_path, mtime, file_size)
+        cache_path = self._get_cache_path(cache_key)
+        try:
+            index = json.loads(cache_path.with_suffix('.json').read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        qimage = QImage(str(cache_path))
+        if qimage.isNull():
+            return None
+        if self._index is not None:
+            self._index.record_hit(cache_key)
+        return qimage, index
+
+    def save_sprite_sheet(self, file_path: Path, mtime: float, file_size: int, qimage, index: dict) -> bool:
+        """Store a sprite sheet; the tile index goes in a JSON file next to it."""
+        if not self.enabled or qimage is None or qimage.isNull():
+            return False
+        cache_key = self._sprite_sheet_cache_key(file_path, mtime, file_size)
+        cache_path = self._get_cache_path(cache_key, ensure_parent=True)
+        try:
+            cache_path.with_suffix('.json').write_text(json.dumps(index), encoding='utf-8')
+        except OSError as e:
+            print(f'[CACHE ERROR] Exception saving sprite index for {file_path.name}: {e}')
+            return False
+        return self._encode_entry(file_path, cache_key, cache_path, qimage)
 
     def clear_old_cache(self, max_age_days: int = 30):
         """
-        Clear cache entries older than max_age_days.
+        Clear cache entries not accessed for more than max_age_days.
+
+        Uses the access index instead of walking and stat-ing every bucket.
 
         Args:
-            max_age_days: Delete cached thumbnails older than this many days
+            max_age_days: Delete cached thumbnails idle longer than this many days
         """
-        import time
-        max_age_seconds = max_age_days * 24 * 60 * 60
-        current_time = time.time()
-
+        if self._index is None:
+            return
+        cutoff = time.time() - max_age_days * 24 * 60 * 60
         try:
-            for subdir in self.cache_dir.iterdir():
-                if not subdir.is_dir():
-                    continue
-                for cache_file in subdir.iterdir():
-                    if cache_file.suffix not in ['.png', '.webp']:
-                        continue
-                    age = current_time - cache_file.stat().st_mtime
-                    if age > max_age_seconds:
-                        cache_file.unlink()
+            self._index.evict_older_than(cutoff, self._remove_entry_file)
         except Exception as e:
             print(f'Failed to clear old cache: {e}')
 
@@ -323,3 +764,24 @@ def get_thumbnail_cache() -> ThumbnailCache:
             if _thumbnail_cache is None:
                 _thumbnail_cache = ThumbnailCache()
     return _thumbnail_cache
+
+
+def carry_over_cached_thumbnail(old_path: Path, old_mtime: float | None,
+                                new_path: Path, *, move: bool = False) -> int:
+    """Best-effort thumbnail reuse after a file operation (move, copy, duplicate).
+
+    Args:
+        old_mtime: Source mtime captured before the operation
+        move: The source no longer exists under `old_path`
+    """
+    if old_mtime is None:
+        return 0
+    try:
+        cache = get_thumbnail_cache()
+        if not cache.enabled:
+            return 0
+        return cache.carry_over_thumbnail(
+            old_path, old_mtime, new_path, new_path.stat().st_mtime, move=move)
+    except Exception as e:
+        print(f'[CACHE] Could not carry thumbnails over to {new_path.name}: {e}')
+        return 0
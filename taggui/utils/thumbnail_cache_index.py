@@ -0,0 +1,318 @@
+"""Persistent access index and size-bounded garbage collection for thumbnails."""
+
+import atexit
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+
+INDEX_FILE_NAME = 'cache_index.db'
+INDEX_BUNDLE_SUFFIXES = ('', '-wal', '-shm')
+# Evict down to this fraction of the cap so GC does not run on every write.
+EVICTION_LOW_WATERMARK = 0.9
+EVICTION_BATCH_SIZE = 500
+MAINTENANCE_INTERVAL_SECONDS = 60.0
+# Flush buffered writes early once this many bytes are waiting.
+PENDING_WRITE_WAKE_BYTES = 32 * 1024 * 1024
+
+
+def _set_low_priority_current_thread():
+    """Best-effort lowest OS priority for the calling maintenance thread."""
+    try:
+        if sys.platform == 'win32':
+            import ctypes
+            ctypes.windll.kernel32.SetThreadPriority(
+                ctypes.windll.kernel32.GetCurrentThread(),
+                -2  # THREAD_PRIORITY_LOWEST
+            )
+        elif sys.platform.startswith('linux'):
+            # Linux applies nice to the calling thread only; elsewhere it
+            # would lower the whole GUI process, so leave those alone.
+            os.nice(19)
+    except Exception:
+        pass
+
+
+class ThumbnailCacheIndex:
+    """SQLite index of thumbnail cache entries, sizes, and last-access times.
+
+    Reads and writes are buffered in memory and flushed in batches by the
+    maintenance thread, so the thumbnail hot path never waits on SQLite.
+    """
+
+    BOOTSTRAPPED_KEY = 'bootstrapped_v1'
+    BOOTSTRAP_PURGE_WEBP_KEY = 'bootstrap_purge_webp'
+    LIFETIME_HITS_KEY = 'lifetime_hits'
+    LIFETIME_MISSES_KEY = 'lifetime_misses'
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self.index_path = self.cache_dir / INDEX_FILE_NAME
+        self._lock = threading.RLock()
+        self._pending_access: dict[str, float] = {}
+        self._pending_writes: dict[str, tuple[int, float]] = {}
+        self._pending_write_bytes = 0
+        self._pending_removals: set[str] = set()
+        self.session_hits = 0
+        self.session_misses = 0
+        self.session_evictions = 0
+        self._flushed_hits = 0
+        self._flushed_misses = 0
+        self.conn = sqlite3.connect(
+            str(self.index_path), timeout=30.0, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS entries (
+                cache_key TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+        ''')
+        self.conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access)')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        ''')
+        self.conn.commit()
+        atexit.register(self.close)
+
+    @classmethod
+    def bundle_paths(cls, cache_dir: Path) -> list[Path]:
+        base = str(Path(cache_dir) / INDEX_FILE_NAME)
+        return [Path(base + suffix) for suffix in INDEX_BUNDLE_SUFFIXES]
+
+    # ---- meta helpers -------------------------------------------------
+
+    def get_meta_value(self, key: str, default: str | None = None) -> str | None:
+        with self._lock:
+            if self.conn is None:
+                return default
+            row = self.conn.execute(
+                'SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta_value(self, key: str, value: str):
+        with self._lock:
+            if self.conn is None:
+                return
+            self.conn.execute(
+                'INSERT INTO meta (key, value) VALUES (?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET value = excluded.value',
+                (key, str(value)))
+            self.conn.commit()
+
+    def is_bootstrapped(self) -> bool:
+        return self.get_meta_value(self.BOOTSTRAPPED_KEY) == '1'
+
+    # ---- hot-path recording (memory only) -----------------------------
+
+    def record_hit(self, cache_key: str):
+        with self._lock:
+            self.session_hits += 1
+            self._pending_access[cache_key] = time.time()
+
+    def record_miss(self):
+        with self._lock:
+            self.session_misses += 1
+
+    def record_write(self, cache_key: str, size: int) -> bool:
+        """Buffer one written entry; return True when a flush is worthwhile."""
+        with self._lock:
+            self._pending_removals.discard(cache_key)
+            self._pending_writes[cache_key] = (int(size), time.time())
+            self._pending_write_bytes += int(size)
+            return self._pending_write_bytes >= PENDING_WRITE_WAKE_BYTES
+
+    def forget(self, cache_keys):
+        with self._lock:
+            for cache_key in cache_keys:
+                self._pending_writes.pop(cache_key, None)
+                self._pending_access.pop(cache_key, None)
+                self._pending_removals.add(cache_key)
+
+    # ---- batched persistence ------------------------------------------
+
+    def flush(self):
+        """Write buffered writes, accesses, removals, and counters to SQLite."""
+        with self._lock:
+            if self.conn is None:
+                return
+            writes = self._pending_writes
+            accesses = self._pending_access
+            removals = self._pending_removals
+            self._pending_writes = {}
+            self._pending_access = {}
+            self._pending_removals = set()
+            self._pending_write_bytes = 0
+            new_hits = self.session_hits - self._flushed_hits
+            new_misses = self.session_misses - self._flushed_misses
+            self._flushed_hits = self.session_hits
+            self._flushed_misses = self.session_misses
+            if not (writes or accesses or removals or new_hits or new_misses):
+                return
+            try:
+                cursor = self.conn.cursor()
+                if removals:
+                    cursor.executemany(
+                        'DELETE FROM entries WHERE cache_key = ?',
+                        [(key,) for key in removals])
+                if writes:
+                    cursor.executemany(
+                        'INSERT INTO entries (cache_key, size, last_access) VALUES (?, ?, ?) '
+                        'ON CONFLICT(cache_key) DO UPDATE SET '
+                        'size = excluded.size, last_access = excluded.last_access',
+                        [(key, size, accessed) for key, (size, accessed) in writes.items()])
+                if accesses:
+                    cursor.executemany(
+                        'UPDATE entries SET last_access = MAX(last_access, ?) WHERE cache_key = ?',
+                        [(accessed, key) for key, accessed in accesses.items()])
+                for key, delta in ((self.LIFETIME_HITS_KEY, new_hits),
+                                   (self.LIFETIME_MISSES_KEY, new_misses)):
+                    if delta:
+                        cursor.execute(
+                            'INSERT INTO meta (key, value) VALUES (?, ?) '
+                            'ON CONFLICT(key) DO UPDATE SET '
+                            'value = CAST(meta.value AS INTEGER) + CAST(excluded.value AS INTEGER)',
+                            (key, str(delta)))
+                self.conn.commit()
+            except sqlite3.Error as e:
+                print(f'[CACHE INDEX] Flush failed: {e}')
+
+    def register_existing(self, rows: list[tuple[str, int, float]]):
+        """Insert entries discovered on disk without touching newer index rows."""
+        if not rows:
+            return
+        with self._lock:
+            if self.conn is None:
+                return
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO entries (cache_key, size, last_access) VALUES (?, ?, ?)',
+                rows)
+            self.conn.commit()
+
+    # ---- queries --------------------------------------------------------
+
+    def totals(self) -> tuple[int, int]:
+        """Return (total_bytes, entry_count) including buffered writes."""
+        self.flush()
+        with self._lock:
+            if self.conn is None:
+                return 0, 0
+            row = self.conn.execute(
+                'SELECT COALESCE(SUM(size), 0), COUNT(*) FROM entries').fetchone()
+        return int(row[0] or 0), int(row[1] or 0)
+
+    def stats(self) -> dict:
+        total_bytes, entry_count = self.totals()
+        return {
+            'size_bytes': total_bytes,
+            'entries': entry_count,
+            'session_hits': self.session_hits,
+            'session_misses': self.session_misses,
+            'session_evictions': self.session_evictions,
+            'lifetime_hits': int(self.get_meta_value(self.LIFETIME_HITS_KEY, '0') or 0),
+            'lifetime_misses': int(self.get_meta_value(self.LIFETIME_MISSES_KEY, '0') or 0),
+        }
+
+    def _oldest(self, *, limit: int, older_than: float | None = None) -> list[tuple[str, int]]:
+        with self._lock:
+            if self.conn is None:
+                return []
+            if older_than is None:
+                rows = self.conn.execute(
+                    'SELECT cache_key, size FROM entries ORDER BY last_access ASC LIMIT ?',
+                    (int(limit),)).fetchall()
+            else:
+                rows = self.conn.execute(
+                    'SELECT cache_key, size FROM entries WHERE last_access < ? '
+                    'ORDER BY last_access ASC LIMIT ?',
+                    (float(older_than), int(limit))).fetchall()
+        return [(str(row[0]), int(row[1] or 0)) for row in rows]
+
+    def _delete_rows(self, cache_keys: list[str]):
+        if not cache_keys:
+            return
+        with self._lock:
+            if self.conn is None:
+                return
+            self.conn.executemany(
+                'DELETE FROM entries WHERE cache_key = ?', [(key,) for key in cache_keys])
+            self.conn.commit()
+
+    def evict_to_budget(self, max_bytes: int, remove_entry: Callable[[str], None]) -> int:
+        """Delete least-recently-used entries until the cache fits `max_bytes`.
+
+        Returns:
+            Number of evicted entries
+        """
+        if max_bytes <= 0:
+            return 0
+        total_bytes, _ = self.totals()
+        if total_bytes <= max_bytes:
+            return 0
+        target_bytes = int(max_bytes * EVICTION_LOW_WATERMARK)
+        evicted = 0
+        while total_bytes > target_bytes:
+            batch = self._oldest(limit=EVICTION_BATCH_SIZE)
+            if not batch:
+                break
+            evicted_keys = []
+            for cache_key, size in batch:
+                if total_bytes <= target_bytes:
+                    break
+                remove_entry(cache_key)
+                evicted_keys.append(cache_key)
+                total_bytes -= size
+            self._delete_rows(evicted_keys)
+            evicted += len(evicted_keys)
+        with self._lock:
+            self.session_evictions += evicted
+        return evicted
+
+    def evict_older_than(self, cutoff: float, remove_entry: Callable[[str], None]) -> int:
+        """Delete entries not accessed since `cutoff` (epoch seconds)."""
+        self.flush()
+        evicted = 0
+        while True:
+            batch = self._oldest(limit=EVICTION_BATCH_SIZE, older_than=cutoff)
+            if not batch:
+                break
+            for cache_key, _size in batch:
+                remove_entry(cache_key)
+            self._delete_rows([cache_key for cache_key, _size in batch])
+            evicted += len(batch)
+        with self._lock:
+            self.session_evictions += evicted
+        return evicted
+
+    def clear(self):
+        with self._lock:
+            self._pending_writes.clear()
+            self._pending_access.clear()
+            self._pending_removals.clear()
+            self._pending_write_bytes = 0
+            if self.conn is None:
+                return
+            self.conn.execute('DELETE FROM entries')
+            self.conn.commit()
+
+    def close(self):
+        try:
+            self.flush()
+        except Exception:
+            pass
+        with self._lock:
+            if self.conn is not None:
+                try:
+                    self.conn.close()
+                except Exception:
+                    pass
+                self.conn = None
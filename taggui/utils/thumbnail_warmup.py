@@ -0,0 +1,359 @@
+"""Headless bulk thumbnail pre-warm for large folders.
+
+Fills the persistent thumbnail cache for a whole folder without opening the
+GUI, so the first scroll through a million-image dataset is served from disk:
+
+    python run_taggui.py --warm-thumbnails /path/to/folder --jobs 8
+
+Decoding runs in a low-priority process pool (the GIL would serialize
+threads). Progress is tracked through the folder DB's ``thumbnail_cached``
+flag, so an interrupted run resumes where it stopped. The cache's size cap can
+evict entries behind that flag, so flagged rows are checked against the cache
+before each run, and a folder whose thumbnails would not fit under the cap is
+refused up front instead of evicting its own earlier output.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+
+DEFAULT_THUMBNAIL_WIDTH = 512
+# Rows fetched from the DB per keyset page.
+DB_PAGE_SIZE = 2000
+# Rows handed to a worker per task; large enough to amortize IPC.
+TASK_CHUNK_SIZE = 32
+# Cached flags are written back in batches of this size.
+FLAG_FLUSH_SIZE = 500
+PROGRESS_INTERVAL_SECONDS = 2.0
+# Bytes per stored cache level when the cache index has no entries to average.
+ESTIMATED_LEVEL_BYTES = 16 * 1024
+
+
+def _init_warm_worker():
+    """Pool initializer: low priority, no cache GC thread, no nested pools."""
+    os.environ['TAGGUI_THUMBNAIL_CACHE_GC'] = '0'
+    # Each warm worker is already an isolated process; probe videos inline.
+    os.environ['TAGGUI_VIDEO_PROBE_PROCESSES'] = '0'
+    from models.image_list_model import _set_low_priority_worker_process
+    _set_low_priority_worker_process()
+
+
+def _warm_chunk_worker(
+    directory_str: str,
+    rows: list[tuple[str, bool]],
+    thumbnail_width: int,
+) -> list[tuple[str, str, tuple[int, int] | None, str | None]]:
+    """Generate and store thumbnails for one chunk of rows.
+
+    Returns:
+        (file_name, status, original_size, content_fingerprint) per row, where
+        status is one of 'cached' (already on disk), 'generated', or 'failed'.
+    """
+    from models.image_list_model import load_thumbnail_data
+    from utils.thumbnail_cache import get_thumbnail_cache
+
+    directory_path = Path(directory_str)
+    cache = get_thumbnail_cache()
+    results = []
+    for file_name, is_video in rows:
+        image_path = directory_path / file_name
+        try:
+            mtime = image_path.stat().st_mtime
+        except OSError:
+            results.append((file_name, 'failed', None, None))
+            continue
+        if cache.has_thumbnail(image_path, mtime, thumbnail_width):
+            results.append((file_name, 'cached', None, None))
+            continue
+        qimage, _was_cached, original_size, resolved_path = load_thumbnail_data(
+            image_path, None, thumbnail_width, bool(is_video))
+        if qimage is None or qimage.isNull():
+            results.append((file_name, 'failed', None, None))
+            continue
+        try:
+            resolved_mtime = resolved_path.stat().st_mtime
+        except OSError:
+            resolved_mtime = mtime
+        if cache.save_thumbnail_qimage(resolved_path, resolved_mtime, thumbnail_width, qimage):
+            fingerprint = (cache.content_fingerprint(resolved_path, resolved_mtime, compute=False)
+                           if cache.content_dedup else None)
+            results.append((file_name, 'generated', original_size, fingerprint))
+        else:
+            results.append((file_name, 'failed', original_size, None))
+    # atexit hooks do not run in pool workers, so persist index updates here.
+    cache.flush_index()
+    return results
+
+
+def _index_folder(db, directory_path: Path):
+    """Scan the folder and insert any media files missing from the DB."""
+    from models.image_list_model import scan_image_paths_in_subtrees
+    from utils.settings import DEFAULT_SETTINGS, settings, parse_image_list_formats
+
+    image_suffixes_string = settings.value(
+        'image_list_file_formats',
+        defaultValue=DEFAULT_SETTINGS['image_list_file_formats'], type=str)
+    image_suffixes = set(parse_image_list_formats(image_suffixes_string))
+    rel_paths, _dir_mtimes = scan_image_paths_in_subtrees(
+        directory_path, [""], image_suffixes)
+    db.bulk_insert_relative_paths(sorted(rel_paths), directory_path)
+    return len(rel_paths)
+
+
+def _format_eta(seconds: float) -> str:
+    seconds = max(0, int(seconds))
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if hours:
+        return f'{hours}h{minutes:02d}m'
+    return f'{minutes}m{seconds:02d}s'
+
+
+def _reset_evicted_flags(db, cache, directory_path: Path, thumbnail_width: int) -> int:
+    """Clear thumbnail_cached on rows whose cache entries no longer exist.
+
+    The size cap's LRU eviction only knows cache keys, not folders, so it
+    cannot clear the flag itself.
+    """
+    evicted: list[str] = []
+    after_id = 0
+    while True:
+        page = db.get_cached_thumbnail_rows(after_id=after_id, limit=DB_PAGE_SIZE)
+        if not page:
+            break
+        after_id = page[-1]['id']
+        for row in page:
+            image_path = directory_path / row['file_name']
+            try:
+                mtime = image_path.stat().st_mtime
+            except OSError:
+                continue
+            if not cache.has_thumbnail(image_path, mtime, thumbnail_width):
+                evicted.append(row['file_name'])
+    for start in range(0, len(evicted), FLAG_FLUSH_SIZE):
+        db.mark_thumbnails_cached(evicted[start:start + FLAG_FLUSH_SIZE], cached=False)
+    return len(evicted)
+
+
+def estimate_folder_bytes(cache, file_count: int, thumbnail_width: int) -> int:
+    """Estimate the cache bytes a fully warmed folder takes.
+
+    Each file stores its requested width plus every smaller pyramid level.
+    The bytes per level come from the cache index's current average when it
+    has entries.
+    """
+    from utils.thumbnail_cache import PYRAMID_WIDTHS
+
+    levels = 1 + sum(1 for width in PYRAMID_WIDTHS if width < thumbnail_width)
+    level_bytes = ESTIMATED_LEVEL_BYTES
+    stats = cache.stats()
+    if stats and stats.get('entries'):
+        level_bytes = max(1, stats['size_bytes'] // stats['entries'])
+    return int(file_count) * levels * level_bytes
+
+
+def _iter_task_chunks(db, chunk_size: int):
+    """Yield lists of (file_name, is_video) rows still missing a thumbnail."""
+    after_id = 0
+    while True:
+        page = db.get_uncached_thumbnail_rows(after_id=after_id, limit=DB_PAGE_SIZE)
+        if not page:
+            return
+        after_id = page[-1]['id']
+        rows = [(row['file_name'], bool(row['is_video'])) for row in page]
+        for start in range(0, len(rows), chunk_size):
+            yield rows[start:start + chunk_size]
+
+
+def warm_thumbnails(
+    directory_path: Path,
+    *,
+    jobs: int,
+    thumbnail_width: int = DEFAULT_THUMBNAIL_WIDTH,
+    scan: bool = False,
+    allow_eviction: bool = False,
+    executor=None,
+    cache=None,
+) -> dict:
+    """Pre-generate every missing thumbnail in `directory_path`.
+
+    Raises RuntimeError when the folder's estimated thumbnail size exceeds the
+    cache cap, unless `allow_eviction` is set.
+
+    Returns:
+        Counters for generated, already cached, and failed files
+    """
+    from utils.image_index_db import ImageIndexDB
+    from utils.thumbnail_cache import get_thumbnail_cache
+
+    if cache is None:
+        cache = get_thumbnail_cache()
+
+    db = ImageIndexDB(directory_path)
+    if not db.enabled:
+        raise RuntimeError(f'Could not open the folder database for {directory_path}')
+
+    counters = {'generated': 0, 'cached': 0, 'failed': 0}
+    pending_flags: list[str] = []
+    pending_fingerprints: list[tuple[str, str]] = []
+    pending_dimensions: list[tuple[str, int, int]] = []
+    owns_executor = executor is None
+    try:
+        if scan or db.count() == 0:
+            print(f'[WARM] Indexing {directory_path}...')
+            found = _index_folder(db, directory_path)
+            print(f'[WARM] Indexed {found} media files')
+
+        max_bytes = int(getattr(cache, 'max_bytes', 0) or 0)
+        if max_bytes > 0:
+            needed_bytes = estimate_folder_bytes(cache, db.count(), thumbnail_width)
+            if needed_bytes > max_bytes:
+                message = (
+                    f'[WARM] Thumbnails for this folder need about {needed_bytes / 2**30:.1f} GB, '
+                    f'more than the {max_bytes / 2**30:.1f} GB cache cap; later files would evict '
+                    f'earlier ones. Raise the cap in settings or pass --allow-eviction.')
+                if not allow_eviction:
+                    raise RuntimeError(message)
+                print(message)
+
+        evicted = _reset_evicted_flags(db, cache, directory_path, thumbnail_width)
+        if evicted:
+            print(f'[WARM] {evicted} cached thumbnails were evicted; queued again')
+
+        total_missing = db.count(filter_sql='thumbnail_cached = 0')
+        if total_missing == 0:
+            print('[WARM] All thumbnails are already cached')
+            return counters
+        print(f'[WARM] {total_missing} thumbnails to check with {jobs} worker(s)')
+
+        if owns_executor:
+            executor = ProcessPoolExecutor(
+                max_workers=jobs,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_warm_worker,
+            )
+
+        started_at = time.monotonic()
+        last_progress_at = started_at
+        max_in_flight = max(2, jobs * 2)
+        in_flight = set()
+        chunks = _iter_task_chunks(db, TASK_CHUNK_SIZE)
+        exhausted = False
+
+        def _flush_pending():
+            db.update_image_dimensions_batch(pending_dimensions)
+            db.mark_thumbnails_cached(pending_flags)
+            db.set_content_fingerprints(pending_fingerprints)
+            pending_flags.clear()
+            pending_fingerprints.clear()
+            pending_dimensions.clear()
+
+        def _collect(done_futures):
+            for future in done_futures:
+                for file_name, status, original_size, fingerprint in future.result():
+                    counters[status] += 1
+                    if status == 'failed':
+                        continue
+                    pending_flags.append(file_name)
+                    if fingerprint:
+                        pending_fingerprints.append((file_name, fingerprint))
+                    if original_size and original_size[0] > 0 and original_size[1] > 0:
+                        pending_dimensions.append((file_name, original_size[0], original_size[1]))
+            if len(pending_flags) >= FLAG_FLUSH_SIZE:
+                _flush_pending()
+
+        while in_flight or not exhausted:
+            while not exhausted and len(in_flight) < max_in_flight:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                    break
+                in_flight.add(executor.submit(
+                    _warm_chunk_worker, str(directory_path), chunk, thumbnail_width))
+            if not in_flight:
+                break
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            _collect(done)
+
+            now = time.monotonic()
+            if now - last_progress_at >= PROGRESS_INTERVAL_SECONDS:
+                last_progress_at = now
+                processed = sum(counters.values())
+                rate = processed / max(now - started_at, 1e-6)
+                remaining = max(0, total_missing - processed)
+                eta = _format_eta(remaining / rate) if rate > 0 else '?'
+                print(f'[WARM] {processed}/{total_missing} ({rate:.1f} img/s, ETA {eta})')
+
+        elapsed = time.monotonic() - started_at
+        processed = sum(counters.values())
+        print(
+            f"[WARM] Done: {counters['generated']} generated, {counters['cached']} already cached, "
+            f"{counters['failed']} failed in {elapsed:.1f}s "
+            f"({processed / max(elapsed, 1e-6):.1f} img/s)"
+        )
+        return counters
+    finally:
+        # Always persist finished work so an interrupted run resumes cleanly.
+        if pending_flags:
+            db.update_image_dimensions_batch(pending_dimensions)
+            db.mark_thumbnails_cached(pending_flags)
+            db.set_content_fingerprints(pending_fingerprints)
+        if owns_executor and executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        db.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='run_taggui.py --warm-thumbnails',
+        description='Pre-generate the thumbnail cache for a folder without opening the GUI.',
+    )
+    parser.add_argument('folder')
+    parser.add_argument(
+        '--jobs', type=int, default=os.cpu_count() or 1,
+        help='number of decoder processes (default: CPU count)')
+    parser.add_argument(
+        '--width', type=int, default=DEFAULT_THUMBNAIL_WIDTH,
+        help=f'thumbnail width to generate (default: {DEFAULT_THUMBNAIL_WIDTH})')
+    parser.add_argument(
+        '--scan', action='store_true',
+        help='rescan the folder for new files before warming')
+    parser.add_argument(
+        '--allow-eviction', action='store_true',
+        help='warm even when the folder does not fit under the cache size cap')
+    args = parser.parse_args(list(argv or []))
+
+    directory_path = Path(args.folder).expanduser().resolve()
+    if not directory_path.is_dir():
+        print(f'Folder not found: {directory_path}', file=sys.stderr)
+        return 2
+
+    from utils.thumbnail_cache import get_thumbnail_cache
+    if not get_thumbnail_cache().enabled:
+        print('Thumbnail cache is disabled in settings; nothing to warm.', file=sys.stderr)
+        return 2
+
+    try:
+        warm_thumbnails(
+            directory_path,
+            jobs=max(1, int(args.jobs)),
+            thumbnail_width=max(16, int(args.width)),
+            scan=args.scan,
+            allow_eviction=args.allow_eviction,
+        )
+    except KeyboardInterrupt:
+        print('[WARM] Interrupted; progress saved, rerun to resume', file=sys.stderr)
+        return 130
+    except RuntimeError as e:
+        print(str(e), file=sys.stderr)
+        return 3
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main(sys.argv[1:]))
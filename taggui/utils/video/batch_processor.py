@@ -3,6 +3,7 @@
 from pathlib import Path
 from typing import List, Tuple
 
+from .job_runner import JobFailed, ffmpeg_job_threads, run_jobs
 from .sar_fixer import SARFixer
 
 
@@ -15,31 +16,26 @@ class BatchProcessor:
         Batch fix multiple videos with non-square SAR.
         Creates .backup for each video before fixing.
 
+        Several encodes run at once, each limited to `ffmpeg_job_threads()`
+        threads, so the pool fills the CPU without oversubscribing it.
+
         Args:
             video_paths: List of video paths to fix
-            progress_callback: Optional callback(current, total, video_name) for progress updates
+            progress_callback: Optional callback(current, total, video_name) for progress updates;
+                called on this thread, return True to cancel the videos not started yet
 
         Returns:
             Tuple of (success_count, failure_count, error_messages)
         """
-        success_count = 0
-        failure_count = 0
-        error_messages = []
-        total = len(video_paths)
-
-        for i, video_path in enumerate(video_paths):
-            if progress_callback:
-                # Check if cancelled
-                cancelled = progress_callback(i + 1, total, video_path.name)
-                if cancelled:
-                    break
-
-            success, message = SARFixer.fix_sar_to_square_pixels(video_path, video_path)
-
-            if success:
-                success_count += 1
-            else:
-                failure_count += 1
-                error_messages.append(f"{video_path.name}: {message}")
-
-        return success_count, failure_count, error_messages
+        threads = ffmpeg_job_threads()
+
+        def fix(video_path: Path) -> str:
+            success, message = SARFixer.fix_sar_to_square_pixels(video_path, video_path, threads=threads)
+            if not success:
+                raise JobFailed(message)
+            return message
+
+        _results, report = run_jobs(video_paths, fix, label='SAR fix',
+                                    progress_callback=progress_callback, threads_per_job=threads)
+        print(f'[VIDEO] {report.summary()}')
+        return report.succeeded, report.failed, report.errors
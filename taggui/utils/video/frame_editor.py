@@ -1,12 +1,40 @@
 """Frame-level video editing operations."""
 
+import os
+import shutil
 import subprocess
 import json
+import tempfile
 from pathlib import Path
 from typing import Tuple, Optional
 
 from .common import create_backup
 from .ffmpeg_gpu import ffmpeg_base_args, ffmpeg_base_args_software
+from .keyframe_index import KeyframeIndex, load_keyframe_index
+
+
+SMART_CUT_ENV = 'TAGGUI_VIDEO_SMART_CUT'
+# Source codec -> (encoder, ffprobe profile -> encoder profile). Boundary GOPs
+# are re-encoded with the source's encoder settings so the copied GOPs between
+# them still decode; other codecs fall back to a full re-encode.
+SMART_CUT_ENCODERS = {
+    'h264': ('libx264', {
+        'Constrained Baseline': 'baseline',
+        'Baseline': 'baseline',
+        'Main': 'main',
+        'High': 'high',
+        'High 10': 'high10',
+    }),
+    'hevc': ('libx265', {
+        'Main': 'main',
+        'Main 10': 'main10',
+    }),
+}
+SMART_CUT_PIXEL_FORMATS = {'yuv420p', 'yuvj420p', 'yuv420p10le'}
+
+
+def smart_cut_enabled() -> bool:
+    return os.getenv(SMART_CUT_ENV, '1').strip() != '0'
 
 
 class FrameEditor:
@@ -38,6 +66,217 @@ class FrameEditor:
 
         return has_audio, probe_data, video_stream, ""
 
+    @staticmethod
+    def _stream_copy_range(input_path: Path, output_path: Path, index: KeyframeIndex,
+                           start_frame: int, end_frame: int,
+                           video_only: bool = False) -> subprocess.CompletedProcess:
+        """Copy frames start_frame..end_frame without re-encoding.
+
+        Only exact when `index.can_stream_copy(start_frame, end_frame)`. Both
+        cut points sit halfway between frames, so rounding in the timestamps
+        cannot move them onto a neighbouring frame. `-t` stops on decode
+        timestamps, so with B-frames it can let packets of the next GOP
+        through; `-frames:v` caps the video at the kept frame count, which for
+        closed GOPs is exactly the kept frames in decode order.
+        """
+        # Stream copy keeps the packets from the keyframe before -ss on.
+        seek_time = FrameEditor._cut_time(index, start_frame)
+        cmd = [*ffmpeg_base_args_software(), '-ss', f'{seek_time:.6f}', '-i', str(input_path)]
+        if end_frame < index.frame_count - 1:
+            cmd.extend(['-t', f'{FrameEditor._cut_time(index, end_frame) - seek_time:.6f}',
+                        '-frames:v', str(end_frame - start_frame + 1)])
+        cmd.extend(['-c', 'copy', '-avoid_negative_ts', 'make_zero'])
+        if video_only:
+            cmd.extend(['-map', '0:v:0', '-an'])
+        cmd.extend(['-y', str(output_path)])
+        return subprocess.run(cmd, capture_output=True, text=True)
+
+    @staticmethod
+    def _cut_time(index: KeyframeIndex, frame_number: int) -> float:
+        """Time halfway between `frame_number` and the next frame (or of the last frame)."""
+        if frame_number + 1 >= index.frame_count:
+            return index.time_for_frame(frame_number)
+        return (index.time_for_frame(frame_number) + index.time_for_frame(frame_number + 1)) / 2.0
+
+    @staticmethod
+    def _smart_cut_encoder_args(video_stream: Optional[dict]) -> Optional[list]:
+        """Encoder arguments matching the source stream, or None if they can't be matched."""
+        if not video_stream:
+            return None
+        encoder, profiles = SMART_CUT_ENCODERS.get(video_stream.get('codec_name'), (None, {}))
+        profile = profiles.get(video_stream.get('profile'))
+        pixel_format = video_stream.get('pix_fmt')
+        if encoder is None or profile is None or pixel_format not in SMART_CUT_PIXEL_FORMATS:
+            return None
+        args = ['-c:v', encoder, '-profile:v', profile, '-pix_fmt', pixel_format,
+                '-crf', '18', '-preset', 'slow']
+        level = int(video_stream.get('level') or 0)
+        if encoder == 'libx264' and level > 0:
+            args.extend(['-level:v', f'{level / 10:.1f}'])
+        for key, option in (('color_primaries', '-color_primaries'), ('color_transfer', '-color_trc'),
+                            ('color_space', '-colorspace'), ('color_range', '-color_range')):
+            value = video_stream.get(key)
+            if value and value != 'unknown':
+                args.extend([option, value])
+        return args
+
+    @staticmethod
+    def _count_video_packets(video_path: Path) -> Optional[int]:
+        probe_cmd = [
+            'ffprobe',
+            '-v', 'error',
+            '-select_streams', 'v:0',
+            '-count_packets',
+            '-show_entries', 'stream=nb_read_packets',
+            '-of', 'csv=p=0',
+            str(video_path)
+        ]
+        try:
+            probe_result = subprocess.run(probe_cmd, capture_output=True, text=True, timeout=60)
+            return int(probe_result.stdout.strip()) if probe_result.returncode == 0 else None
+        except (subprocess.SubprocessError, ValueError):
+            return None
+
+    @staticmethod
+    def _decode_errors(video_path: Path) -> Optional[str]:
+        """Decode the whole file; the decoder's error output, or None when it decodes cleanly."""
+        cmd = ['ffmpeg', '-v', 'error', '-i', str(video_path), '-f', 'null', '-']
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True)
+        except (subprocess.SubprocessError, OSError) as e:
+            return str(e)
+        errors = (result.stderr or '').strip()
+        if result.returncode != 0 or errors:
+            return errors or f"ffmpeg exited with code {result.returncode}"
+        return None
+
+    @staticmethod
+    def _check_cut_output(video_path: Path, expected_frames: int) -> Optional[str]:
+        """Why a cut output can't be kept, or None when it has the expected frames and decodes."""
+        actual_frames = FrameEditor._count_video_packets(video_path)
+        if actual_frames != expected_frames:
+            return f"got {actual_frames} frames but expected {expected_frames}"
+        # A stream can have every packet and still not decode, e.g. when a
+        # copied GOP references a frame that was cut away.
+        decode_errors = FrameEditor._decode_errors(video_path)
+        if decode_errors is not None:
+            return f"decode check failed: {decode_errors[-300:]}"
+        return None
+
+    @staticmethod
+    def _verified_stream_copy(input_path: Path, output_path: Path, index: KeyframeIndex,
+                              start_frame: int, end_frame: int) -> Tuple[bool, str]:
+        """Stream-copy a cut-point-aligned range and keep it only if it checks out.
+
+        Returns:
+            Tuple of (success: bool, message: str); on failure the output is
+            removed and the caller re-encodes
+        """
+        result = FrameEditor._stream_copy_range(input_path, output_path, index,
+                                                start_frame, end_frame)
+        if result.returncode != 0:
+            problem = f"stream copy failed: {result.stderr[-300:]}"
+        else:
+            problem = FrameEditor._check_cut_output(output_path, end_frame - start_frame + 1)
+        if problem is None:
+            return True, "stream copy"
+        if output_path.exists():
+            output_path.unlink()
+        return False, problem
+
+    @staticmethod
+    def _smart_cut(input_path: Path, output_path: Path, index: KeyframeIndex,
+                   kept_ranges: list, has_audio: bool, video_stream: Optional[dict]) -> Tuple[bool, str]:
+        """Join frame ranges, copying complete GOPs and re-encoding only partial ones.
+
+        Each range is split by `KeyframeIndex.smart_cut_segments`. Every piece
+        is written to an MPEG-TS file, which carries the codec headers in-band,
+        so copied and re-encoded pieces can be concatenated with stream copy.
+        Audio is trimmed from the source and re-encoded in the final pass. The
+        result is only kept when its frame count matches and a full decode of
+        it reports no error.
+
+        Returns:
+            Tuple of (success: bool, message: str); on failure the caller re-encodes
+        """
+        if not smart_cut_enabled():
+            return False, "smart cut disabled"
+        encoder_args = FrameEditor._smart_cut_encoder_args(video_stream)
+        if encoder_args is None:
+            codec = (video_stream or {}).get('codec_name')
+            profile = (video_stream or {}).get('profile')
+            pixel_format = (video_stream or {}).get('pix_fmt')
+            return False, f"no matching encoder for {codec} {profile} {pixel_format}"
+
+        segments = []
+        for first, last in kept_ranges:
+            segments.extend(index.smart_cut_segments(first, last) or [(first, last, False)])
+        copied_frames = sum(last - first + 1 for first, last, copy in segments if copy)
+        if copied_frames == 0:
+            return False, "no complete GOP to copy"
+        expected_frames = sum(last - first + 1 for first, last in kept_ranges)
+
+        temp_dir = Path(tempfile.mkdtemp(prefix='.temp_smart_cut_', dir=output_path.parent))
+        try:
+            concat_lines = []
+            for number, (first, last, copy) in enumerate(segments):
+                segment_path = temp_dir / f'segment{number}.ts'
+                if copy:
+                    result = FrameEditor._stream_copy_range(input_path, segment_path, index,
+                                                            first, last, video_only=True)
+                else:
+                    # Accurate input seek: decoding starts at the keyframe before,
+                    # and output starts at the first frame past the cut.
+                    seek_time = FrameEditor._cut_time(index, first - 1) if first > 0 else 0.0
+                    cmd = [
+                        *ffmpeg_base_args_software(),
+                        '-ss', f'{seek_time:.6f}',
+                        '-i', str(input_path),
+                        '-map', '0:v:0',
+                        '-an',
+                        '-frames:v', str(last - first + 1),
+                        *encoder_args,
+                        '-y', str(segment_path),
+                    ]
+                    result = subprocess.run(cmd, capture_output=True, text=True)
+                if result.returncode != 0:
+                    return False, f"segment {first}-{last} failed: {result.stderr[-300:]}"
+                escaped = str(segment_path).replace("'", "'\\''")
+                concat_lines.append(f"file '{escaped}'")
+            concat_list = temp_dir / 'concat.txt'
+            concat_list.write_text('\n'.join(concat_lines) + '\n', encoding='utf-8')
+
+            joined_path = temp_dir / f'joined{output_path.suffix}'
+            cmd = [*ffmpeg_base_args_software(), '-f', 'concat', '-safe', '0', '-i', str(concat_list)]
+            if has_audio:
+                audio_parts = []
+                for number, (first, last) in enumerate(kept_ranges):
+                    start = FrameEditor._cut_time(index, first - 1) if first > 0 else 0.0
+                    trim = f'atrim=start={start:.6f}'
+                    if last < index.frame_count - 1:
+                        trim += f':end={FrameEditor._cut_time(index, last):.6f}'
+                    audio_parts.append(f'[1:a]{trim},asetpts=PTS-STARTPTS[a{number}]')
+                labels = ''.join(f'[a{number}]' for number in range(len(kept_ranges)))
+                audio_parts.append(f'{labels}concat=n={len(kept_ranges)}:v=0:a=1[aout]')
+                cmd.extend(['-i', str(input_path), '-filter_complex', ';'.join(audio_parts),
+                            '-map', '0:v', '-map', '[aout]', '-c:v', 'copy', '-c:a', 'aac', '-b:a', '192k'])
+            else:
+                cmd.extend(['-map', '0:v', '-c:v', 'copy', '-an'])
+            cmd.extend(['-y', str(joined_path)])
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            if result.returncode != 0:
+                return False, f"concat failed: {result.stderr[-300:]}"
+
+            problem = FrameEditor._check_cut_output(joined_path, expected_frames)
+            if problem is not None:
+                return False, problem
+            shutil.move(str(joined_path), str(output_path))
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        reencoded_frames = expected_frames - copied_frames
+        return True, f"smart cut (copied {copied_frames} frames, re-encoded {reencoded_frames})"
+
     @staticmethod
     def extract_range_rough(input_path: Path, output_path: Path,
                             start_frame: int, end_frame: int, fps: float) -> Tuple[bool, str]:
@@ -133,7 +372,7 @@ class FrameEditor:
             Tuple of (success: bool, message: str)
         """
         try:
-            has_audio, _, _, probe_error = FrameEditor._probe_streams(input_path)
+            has_audio, _, video_stream, probe_error = FrameEditor._probe_streams(input_path)
             if probe_error:
                 return False, f"Failed to probe video: {probe_error}"
 
@@ -151,6 +390,30 @@ class FrameEditor:
             temp_output = output_path.parent / f'.temp_extract_{output_path.name}'
             actual_output = temp_output if input_path == output_path else output_path
 
+            # A plain cut that starts on a cut point (IDR or closed-GOP
+            # keyframe) and ends before one is exact with stream copy.
+            plain_cut = not reverse and abs(speed_factor - 1.0) < 0.01 and target_fps is None
+            index = load_keyframe_index(input_path) if plain_cut else None
+            if index is not None and index.can_stream_copy(start_frame, end_frame):
+                success, message = FrameEditor._verified_stream_copy(input_path, actual_output, index,
+                                                                     start_frame, end_frame)
+                if success:
+                    if input_path == output_path:
+                        shutil.move(str(temp_output), str(output_path))
+                    return True, (f"Successfully extracted {end_frame - start_frame + 1} frames "
+                                  f"({start_frame}-{end_frame}) by stream copy (cut-point-aligned, no re-encoding)")
+                print(f'[VIDEO] Stream copy rejected, re-encoding: {message}')
+            elif index is not None:
+                # Copy the complete GOPs and re-encode only the partial ones at the ends.
+                success, message = FrameEditor._smart_cut(input_path, actual_output, index,
+                                                          [(start_frame, end_frame)], has_audio, video_stream)
+                if success:
+                    if input_path == output_path:
+                        shutil.move(str(temp_output), str(output_path))
+                    return True, (f"Successfully extracted {end_frame - start_frame + 1} frames "
+                                  f"({start_frame}-{end_frame}) by {message}")
+                print(f'[VIDEO] Smart cut skipped, re-encoding: {message}')
+
             # Build video filter chain.
             # Use trim with time instead of frame number — trim=start_frame is unreliable
             # when the video PTS doesn't start at 0 (common with social media containers).
@@ -302,6 +565,36 @@ class FrameEditor:
             # Create backup of original
             if not create_backup(input_path):
                 return False, "Failed to create backup"
+
+            # Trimming only the head or the tail keeps one range; when that
+            # range is aligned to cut points it can be copied instead of re-encoded.
+            index = load_keyframe_index(input_path)
+            kept_range = None
+            if index is not None and index.frame_count == current_frames:
+                if start_frame == 0 and end_frame < current_frames - 1:
+                    kept_range = (end_frame + 1, current_frames - 1)
+                elif start_frame > 0 and end_frame >= current_frames - 1:
+                    kept_range = (0, start_frame - 1)
+            if kept_range is not None and index.can_stream_copy(*kept_range):
+                import shutil
+                temp_output = output_path.parent / f'.temp_output_{output_path.name}'
+                success, message = FrameEditor._verified_stream_copy(input_path, temp_output, index,
+                                                                     *kept_range)
+                if success:
+                    shutil.move(str(temp_output), str(output_path))
+                    return True, f"Successfully removed frames {start_frame}-{end_frame} by stream copy"
+                print(f'[VIDEO] Stream copy rejected, re-encoding: {message}')
+            elif index is not None and index.frame_count == current_frames:
+                # Keep the frames around the cut, re-encoding only their partial GOPs.
+                kept_ranges = [(first, last) for first, last in
+                               ((0, start_frame - 1), (end_frame + 1, current_frames - 1)) if first <= last]
+                if kept_ranges:
+                    success, message = FrameEditor._smart_cut(input_path, output_path, index,
+                                                              kept_ranges, has_audio, video_stream)
+                    if success:
+                        return True, f"Successfully removed frames {start_frame}-{end_frame} by {message}"
+                    print(f'[VIDEO] Smart cut skipped, re-encoding: {message}')
+
             # Create two segments and concatenate
             start_time = start_frame / fps
             end_time = (end_frame + 1) / fps
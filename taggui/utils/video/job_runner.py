@@ -0,0 +1,169 @@
+"""Bounded parallel runner for per-file ffmpeg/ffprobe jobs.
+
+Batch operations used to run one ffmpeg or ffprobe process at a time, which
+left most cores idle on large folders. `run_jobs` keeps a fixed number of jobs
+in flight on a thread pool. The threads only wait on subprocesses, so the GIL
+does not serialize the work.
+
+By default the pool runs `cores // threads_per_job` jobs: an encode limited to
+`-threads N` gets N cores, and a probe gets one.
+
+The `progress_callback(current, total, name)` contract of the batch helpers
+is kept. It is called only on the calling thread, so Qt progress dialogs stay
+safe to update from it, and it keeps being polled until every job is done.
+Returning True cancels every job that has not started yet; jobs already
+running finish normally so no file is left half written, unless the caller
+passes `cancel_running` to abort them (e.g. by killing worker processes).
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+
+VIDEO_JOB_WORKERS_ENV = 'TAGGUI_VIDEO_JOB_WORKERS'
+FFMPEG_JOB_THREADS_ENV = 'TAGGUI_FFMPEG_JOB_THREADS'
+DEFAULT_FFMPEG_JOB_THREADS = 4
+# How often the progress callback is polled while jobs run, so a modal
+# progress dialog keeps repainting and its Cancel button stays live.
+PROGRESS_POLL_SECONDS = 0.1
+
+
+def ffmpeg_job_threads() -> int:
+    """`-threads` value for one encode when several run side by side."""
+    raw_value = os.getenv(FFMPEG_JOB_THREADS_ENV, '').strip()
+    try:
+        if raw_value:
+            return max(1, int(raw_value))
+    except ValueError:
+        pass
+    return DEFAULT_FFMPEG_JOB_THREADS
+
+
+def default_worker_count(threads_per_job: int = 1) -> int:
+    raw_value = os.getenv(VIDEO_JOB_WORKERS_ENV, '').strip()
+    try:
+        if raw_value:
+            return max(1, int(raw_value))
+    except ValueError:
+        pass
+    return max(1, (os.cpu_count() or 1) // max(1, int(threads_per_job)))
+
+
+class JobFailed(Exception):
+    """Raised by a job to record a failure message without a traceback."""
+
+
+@dataclass
+class JobReport:
+    """Outcome and throughput of one `run_jobs` call."""
+
+    label: str
+    total: int
+    workers: int
+    succeeded: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    elapsed_seconds: float = 0.0
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def completed(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def jobs_per_minute(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.completed * 60.0 / self.elapsed_seconds
+
+    def summary(self) -> str:
+        text = (f'{self.label}: {self.completed}/{self.total} jobs in {self.elapsed_seconds:.1f}s '
+                f'with {self.workers} workers ({self.jobs_per_minute:.1f} jobs/min), '
+                f'{self.succeeded} ok, {self.failed} failed')
+        if self.cancelled:
+            text += f', {self.cancelled} cancelled'
+        return text
+
+
+def terminate_process_pool(executor):
+    """Shut a ProcessPoolExecutor down without waiting, killing workers stuck in a job."""
+    processes = list((getattr(executor, '_processes', None) or {}).values())
+    try:
+        executor.shutdown(wait=False, cancel_futures=True)
+    except Exception:
+        pass
+    for process in processes:
+        try:
+            if process.is_alive():
+                process.kill()
+        except Exception:
+            pass
+
+
+def run_jobs(items, job, *, label: str, describe=None, progress_callback=None,
+             workers: int | None = None, threads_per_job: int = 1, cancel_running=None):
+    """Run `job(item)` for every item on a bounded pool.
+
+    Args:
+        items: Work items (usually paths)
+        job: Callable returning a result; raise JobFailed (or any exception)
+            to record a failure
+        label: Name used in the report
+        describe: item -> display name for progress and errors (default: path name)
+        progress_callback: Optional callback(current, total, name) -> cancelled
+        workers: Pool size; defaults to `default_worker_count(threads_per_job)`
+        threads_per_job: Cores one job keeps busy
+        cancel_running: Optional callable run once on cancel to abort running jobs
+
+    Returns:
+        Tuple of (results, report). `results[i]` is job(items[i]), or None
+        when it failed or was cancelled.
+    """
+    items = list(items)
+    describe = describe or (lambda item: getattr(item, 'name', str(item)))
+    total = len(items)
+    workers = max(1, min(int(workers or default_worker_count(threads_per_job)), max(1, total)))
+    report = JobReport(label=label, total=total, workers=workers)
+    results = [None] * total
+    started_at = time.monotonic()
+    if not items:
+        return results, report
+
+    cancelled = False
+    last_name = describe(items[0])
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='video_jobs')
+    try:
+        futures = {executor.submit(job, item): index for index, item in enumerate(items)}
+        pending = set(futures)
+        while pending:
+            # Keep polling after a cancel so the progress dialog stays painted.
+            if progress_callback is not None:
+                if progress_callback(report.completed, total, last_name) and not cancelled:
+                    cancelled = True
+                    for future in pending:
+                        future.cancel()
+                    if cancel_running is not None:
+                        cancel_running()
+            done, pending = wait(pending, timeout=PROGRESS_POLL_SECONDS, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = futures[future]
+                name = describe(items[index])
+                if future.cancelled():
+                    report.cancelled += 1
+                    continue
+                last_name = name
+                try:
+                    results[index] = future.result()
+                    report.succeeded += 1
+                except Exception as e:
+                    report.failed += 1
+                    report.errors.append(f'{name}: {e}')
+    finally:
+        # Every job is done here unless the loop raised; never block the caller on them.
+        executor.shutdown(wait=False, cancel_futures=True)
+    report.elapsed_seconds = time.monotonic() - started_at
+    if progress_callback is not None and not cancelled:
+        progress_callback(report.completed, total, last_name)
+    return results, report
@@ -0,0 +1,327 @@
+"""Persisted keyframe and packet-timestamp index per video.
+
+Exact seeks used to rediscover the stream layout every time: OpenCV seeks
+went wherever its own heuristics landed, marker resolution assumed a constant
+frame rate, and the frame editor re-encoded every range because it could not
+tell whether a cut fell on a keyframe. `KeyframeIndex` records the
+presentation time of every video frame and which frames are keyframes.
+
+ffprobe's K flag also marks open-GOP and recovery-point keyframes, so not
+every keyframe is a place where a stream can be cut. The index also records
+cut points: keyframes with no leading pictures. In decode order, no frame of
+their GOP is shown before them, which holds for IDR and closed-GOP keyframes.
+Stream copy and smart cut only cut there.
+
+The index is read once per file with `ffprobe -show_entries packet=...` (no
+decoding, so it is fast even for long clips) in a background thread, then
+stored in the folder's `ImageIndexDB` keyed by relative path, mtime and size.
+Later sessions load it from the DB without running ffprobe again.
+
+This module is Qt-free; callers that need results on the GUI thread wrap the
+callback of `request_keyframe_index` in a signal.
+"""
+
+import json
+import os
+import subprocess
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+KEYFRAME_INDEX_ENV = 'TAGGUI_VIDEO_KEYFRAME_INDEX'
+PROBE_TIMEOUT_SECONDS = 120
+MEMORY_CACHE_SIZE = 64
+
+_executor = None
+_executor_lock = threading.Lock()
+_memory_cache: OrderedDict = OrderedDict()
+_memory_cache_lock = threading.Lock()
+
+
+def keyframe_index_enabled() -> bool:
+    return os.getenv(KEYFRAME_INDEX_ENV, '1').strip() != '0'
+
+
+@dataclass
+class KeyframeIndex:
+    """Frame times (seconds from the first frame) and keyframe frame numbers."""
+
+    frame_times: list[float] = field(default_factory=list)
+    keyframes: list[int] = field(default_factory=list)
+    # Keyframes a stream can be cut at; None for an index stored before they
+    # were recorded, which then allows no stream-copy cut at all.
+    cut_points: list[int] | None = None
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.frame_times)
+
+    @property
+    def keyframe_interval(self) -> float | None:
+        """Mean seconds between keyframes, or None with fewer than two."""
+        if len(self.keyframes) < 2:
+            return None
+        first, last = self.keyframes[0], self.keyframes[-1]
+        return (self.frame_times[last] - self.frame_times[first]) / (len(self.keyframes) - 1)
+
+    def preceding_keyframe(self, frame_number: int) -> int | None:
+        """The last keyframe at or before `frame_number`."""
+        position = bisect_right(self.keyframes, int(frame_number)) - 1
+        return self.keyframes[position] if position >= 0 else None
+
+    def is_keyframe(self, frame_number: int) -> bool:
+        position = bisect_left(self.keyframes, int(frame_number))
+        return position < len(self.keyframes) and self.keyframes[position] == int(frame_number)
+
+    def is_cut_point(self, frame_number: int) -> bool:
+        cut_points = self.cut_points or []
+        position = bisect_left(cut_points, int(frame_number))
+        return position < len(cut_points) and cut_points[position] == int(frame_number)
+
+    def time_for_frame(self, frame_number: int) -> float:
+        frame_number = max(0, min(int(frame_number), self.frame_count - 1))
+        return self.frame_times[frame_number]
+
+    def frame_for_time(self, seconds: float) -> int:
+        """The frame whose presentation time is nearest to `seconds`."""
+        if not self.frame_times:
+            return 0
+        position = bisect_left(self.frame_times, float(seconds))
+        if position <= 0:
+            return 0
+        if position >= self.frame_count:
+            return self.frame_count - 1
+        before, after = self.frame_times[position - 1], self.frame_times[position]
+        return position if after - seconds < seconds - before else position - 1
+
+    def can_stream_copy(self, start_frame: int, end_frame: int) -> bool:
+        """Whether frames `start_frame`..`end_frame` can be cut without re-encoding.
+
+        The range must start on a cut point, and end either at the last frame
+        or right before the next cut point, so no frame in it references a
+        packet outside it.
+        """
+        if not self.frame_times or start_frame < 0 or end_frame < start_frame:
+            return False
+        if end_frame >= self.frame_count:
+            return False
+        return self.is_cut_point(start_frame) and (
+            end_frame == self.frame_count - 1 or self.is_cut_point(end_frame + 1))
+
+    def smart_cut_segments(self, start_frame: int, end_frame: int) -> list[tuple[int, int, bool]] | None:
+        """Split `start_frame`..`end_frame` into (first, last, copy) pieces.
+
+        The complete GOPs between cut points inside the range form one piece
+        that can be stream copied; the partial GOPs before and after it must
+        be re-encoded. None when the range holds no such piece, so nothing
+        could be copied.
+        """
+        if not self.frame_times or start_frame < 0 or end_frame < start_frame:
+            return None
+        if end_frame >= self.frame_count:
+            return None
+        cut_points = self.cut_points or []
+        position = bisect_left(cut_points, int(start_frame))
+        if position >= len(cut_points):
+            return None
+        copy_start = cut_points[position]
+        if end_frame == self.frame_count - 1:
+            copy_end = end_frame
+        else:
+            # Copied frames must end right before a cut point.
+            position = bisect_right(cut_points, int(end_frame) + 1) - 1
+            copy_end = cut_points[position] - 1 if position >= 0 else -1
+        if copy_end < copy_start:
+            return None
+        segments = []
+        if start_frame < copy_start:
+            segments.append((start_frame, copy_start - 1, False))
+        segments.append((copy_start, copy_end, True))
+        if copy_end < end_frame:
+            segments.append((copy_end + 1, end_frame, False))
+        return segments
+
+    def to_json(self) -> tuple[str, str, str | None]:
+        cut_points = (None if self.cut_points is None
+                      else json.dumps(self.cut_points, separators=(',', ':')))
+        return (json.dumps([round(value, 6) for value in self.frame_times], separators=(',', ':')),
+                json.dumps(self.keyframes, separators=(',', ':')), cut_points)
+
+    @classmethod
+    def from_json(cls, frame_times: str, keyframes: str,
+                  cut_points: str | None = None) -> 'KeyframeIndex':
+        return cls([float(value) for value in json.loads(frame_times)],
+                   [int(value) for value in json.loads(keyframes)],
+                   None if cut_points is None else [int(value) for value in json.loads(cut_points)])
+
+
+def parse_packet_csv(text: str) -> KeyframeIndex | None:
+    """Build an index from `ffprobe -show_entries packet=pts_time,flags -of csv=p=0`."""
+    packets = []  # (pts, is_key) in decode order
+    for line in text.splitlines():
+        fields = line.strip().split(',')
+        if len(fields) < 2:
+            continue
+        pts_time, flags = fields[0], fields[1]
+        if 'D' in flags:
+            # Discarded packets never produce a frame.
+            continue
+        try:
+            packets.append((float(pts_time), 'K' in flags))
+        except ValueError:
+            continue
+    if not packets:
+        return None
+    # A frame decoded after a keyframe but shown before it is a leading
+    # picture; it may reference the previous GOP, so the keyframe is no cut point.
+    open_keyframes = set()
+    gop_keyframe = None
+    for pts, is_key in packets:
+        if is_key:
+            gop_keyframe = pts
+        elif gop_keyframe is not None and pts < gop_keyframe:
+            open_keyframes.add(gop_keyframe)
+    # Packets arrive in decode order; frame numbers follow presentation order.
+    packets.sort(key=lambda packet: packet[0])
+    first_time = packets[0][0]
+    return KeyframeIndex(
+        [pts - first_time for pts, _is_key in packets],
+        [frame_number for frame_number, (_pts, is_key) in enumerate(packets) if is_key],
+        [frame_number for frame_number, (pts, is_key) in enumerate(packets)
+         if is_key and pts not in open_keyframes],
+    )
+
+
+def probe_keyframe_index(video_path) -> KeyframeIndex | None:
+    """Run ffprobe over the video stream's packets; None when it is unavailable."""
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'packet=pts_time,flags',
+        '-of', 'csv=p=0',
+        str(video_path),
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=PROBE_TIMEOUT_SECONDS)
+    except FileNotFoundError:
+        return None
+    except (subprocess.SubprocessError, OSError) as e:
+        print(f'[VIDEO] Keyframe index probe failed for {video_path}: {e}')
+        return None
+    if result.returncode != 0:
+        return None
+    return parse_packet_csv(result.stdout)
+
+
+def _file_signature(video_path) -> tuple[float, int] | None:
+    try:
+        stat = os.stat(video_path)
+    except OSError:
+        return None
+    return float(stat.st_mtime), int(stat.st_size)
+
+
+def _index_db_directory(video_path: Path) -> Path | None:
+    """The nearest folder above the video that has an image index DB."""
+    from utils.image_index_db import ImageIndexDB
+
+    for directory in video_path.parents:
+        if ImageIndexDB.db_base_path(directory).exists():
+            return directory
+    return None
+
+
+def _load_from_db(video_path: Path, signature):
+    from utils.image_index_db import ImageIndexDB
+
+    directory = _index_db_directory(video_path)
+    if directory is None:
+        return None, None, None
+    db = ImageIndexDB(directory)
+    if not db.enabled:
+        db.close()
+        return None, None, None
+    file_name = str(video_path.relative_to(directory))
+    return db, file_name, db.get_video_keyframe_index(file_name, *signature)
+
+
+def cached_keyframe_index(video_path) -> KeyframeIndex | None:
+    """The index already loaded in this process, if the file is unchanged."""
+    signature = _file_signature(video_path)
+    with _memory_cache_lock:
+        entry = _memory_cache.get(str(video_path))
+        if entry is None or entry[0] != signature:
+            return None
+        _memory_cache.move_to_end(str(video_path))
+        return entry[1]
+
+
+def _remember(video_path, signature, index):
+    with _memory_cache_lock:
+        _memory_cache[str(video_path)] = (signature, index)
+        _memory_cache.move_to_end(str(video_path))
+        while len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+
+
+def load_keyframe_index(video_path) -> KeyframeIndex | None:
+    """Index from memory, then the folder DB, then ffprobe (saved to the DB).
+
+    Blocks while ffprobe runs; the player uses `request_keyframe_index`.
+    """
+    if not keyframe_index_enabled():
+        return None
+    video_path = Path(video_path)
+    signature = _file_signature(video_path)
+    if signature is None:
+        return None
+    index = cached_keyframe_index(video_path)
+    if index is not None:
+        return index
+    db = None
+    try:
+        db, file_name, index = _load_from_db(video_path, signature)
+        if index is None or index.cut_points is None:
+            # Also re-probe indexes stored before cut points were recorded.
+            probed = probe_keyframe_index(video_path)
+            if probed is not None:
+                index = probed
+                if db is not None:
+                    db.save_video_keyframe_index(file_name, *signature, index)
+    except Exception as e:
+        print(f'[VIDEO] Keyframe index unavailable for {video_path}: {e}')
+    finally:
+        if db is not None:
+            db.close()
+    if index is not None:
+        _remember(video_path, signature, index)
+    return index
+
+
+def request_keyframe_index(video_path, callback):
+    """Load the index in the background; `callback(index)` runs on the worker."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='video_keyframe_index')
+        executor = _executor
+
+    def run():
+        index = load_keyframe_index(video_path)
+        try:
+            callback(index)
+        except RuntimeError:
+            # The receiver was deleted while ffprobe ran.
+            pass
+
+    executor.submit(run)
+
+
+def clear_memory_cache():
+    with _memory_cache_lock:
+        _memory_cache.clear()
@@ -0,0 +1,380 @@
+"""Video metadata and preview-frame probing in isolated worker processes.
+
+OpenCV/FFmpeg decoder state is not safe to share with MPV's D3D11 renderer
+inside one process, which used to force every probe in the app through a
+single global lock. Probing in spawn-context worker processes gives each
+decoder its own address space, so probes run in parallel and a crashing
+decoder cannot take the GUI down with it.
+
+This module is Qt-free so workers start quickly; callers turn the returned
+RGB bytes into a QImage.
+"""
+
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from .job_runner import terminate_process_pool
+
+
+VIDEO_PROBE_PROCESSES_ENV = 'TAGGUI_VIDEO_PROBE_PROCESSES'
+VIDEO_PROBE_WORKERS_ENV = 'TAGGUI_VIDEO_PROBE_WORKERS'
+VIDEO_PROBE_TIMEOUT_ENV = 'TAGGUI_VIDEO_PROBE_TIMEOUT'
+DEFAULT_PROBE_TIMEOUT_SECONDS = 30
+# Representative frame: a little into the clip (skips black/fade-in first
+# frames) but never deep enough to make the keyframe seek expensive.
+REPRESENTATIVE_FRAME_FRACTION = 0.1
+REPRESENTATIVE_FRAME_MAX_SECONDS = 3.0
+REPRESENTATIVE_FRAME_MIN_DURATION = 1.0
+# Give up on the pool after this many worker crashes and probe in-process.
+# Timeouts restart the pool but do not count: a slow file is not a broken pool.
+MAX_POOL_FAILURES = 3
+METADATA_CACHE_SIZE = 4096
+EMPTY_PROBE_RESULT = {'dimensions': None, 'metadata': None, 'frame': None}
+
+_executor = None
+_executor_lock = threading.Lock()
+# One slot per worker: a probe is submitted only when a worker is free, so
+# its timeout runs from the start of the job instead of from the queue.
+_job_slots = None
+# Pools killed after a timeout; jobs they broke are retried, not counted.
+_restarted_executors = weakref.WeakSet()
+_pool_failures = 0
+_metadata_cache: OrderedDict = OrderedDict()
+_metadata_cache_lock = threading.Lock()
+
+
+def _init_probe_worker():
+    """Pool initializer: low priority, and never nest another probe pool."""
+    os.environ[VIDEO_PROBE_PROCESSES_ENV] = '0'
+    try:
+        if os.name == 'nt':
+            import ctypes
+            BELOW_NORMAL_PRIORITY_CLASS = 0x00004000
+            ctypes.windll.kernel32.SetPriorityClass(
+                ctypes.windll.kernel32.GetCurrentProcess(),
+                BELOW_NORMAL_PRIORITY_CLASS,
+            )
+        else:
+            os.nice(10)
+    except Exception:
+        pass
+
+
+def _resolve_worker_count() -> int:
+    raw_value = os.getenv(VIDEO_PROBE_WORKERS_ENV, '').strip()
+    try:
+        if raw_value:
+            return max(1, int(raw_value))
+    except ValueError:
+        pass
+    return max(1, min(4, (os.cpu_count() or 2) // 2))
+
+
+def probe_timeout() -> float:
+    raw_value = os.getenv(VIDEO_PROBE_TIMEOUT_ENV, '').strip()
+    try:
+        if raw_value:
+            return max(1.0, float(raw_value))
+    except ValueError:
+        pass
+    return float(DEFAULT_PROBE_TIMEOUT_SECONDS)
+
+
+def process_pool_enabled() -> bool:
+    """Whether probes should be sent to the worker process pool."""
+    if os.getenv(VIDEO_PROBE_PROCESSES_ENV, '1').strip() == '0':
+        return False
+    return _pool_failures < MAX_POOL_FAILURES
+
+
+def _representative_seek_ms(fps: float, frame_count: int) -> float:
+    if fps <= 0 or frame_count <= 0:
+        return 0.0
+    duration = frame_count / fps
+    if duration < REPRESENTATIVE_FRAME_MIN_DURATION:
+        return 0.0
+    return min(duration * REPRESENTATIVE_FRAME_FRACTION, REPRESENTATIVE_FRAME_MAX_SECONDS) * 1000.0
+
+
+def _fourcc_text(value) -> str | None:
+    code = int(value or 0)
+    if code <= 0:
+        return None
+    text = ''.join(chr((code >> (8 * i)) & 0xFF) for i in range(4)).strip('\x00 ')
+    return text if text.isprintable() and text else None
+
+
+def stream_info(cv2, cap, fps: float) -> dict:
+    """Codec, pixel format, rational fps and rotation read from an open capture.
+
+    Stored with the rest of the metadata so a later load configures the
+    player without opening a capture.
+    """
+    from fractions import Fraction
+
+    info = {}
+    codec = _fourcc_text(cap.get(cv2.CAP_PROP_FOURCC))
+    if codec:
+        info['codec'] = codec
+    pixel_format_prop = getattr(cv2, 'CAP_PROP_CODEC_PIXEL_FORMAT', None)
+    if pixel_format_prop is not None:
+        pixel_format = _fourcc_text(cap.get(pixel_format_prop))
+        if pixel_format:
+            info['pixel_format'] = pixel_format
+    if fps > 0:
+        # Recovers NTSC rates such as 30000/1001 from OpenCV's float.
+        rate = Fraction(float(fps)).limit_denominator(1001)
+        info['fps_num'], info['fps_den'] = rate.numerator, rate.denominator
+    orientation_prop = getattr(cv2, 'CAP_PROP_ORIENTATION_META', None)
+    if orientation_prop is not None:
+        info['rotation'] = int(cap.get(orientation_prop) or 0) % 360
+    return info
+
+
+def probe_video_file(
+    video_path: str,
+    include_frame: bool = True,
+    representative_frame: bool = False,
+    max_frame_width: int | None = None,
+) -> dict:
+    """Read metadata and optionally one RGB frame from a video.
+
+    Runs in a worker process, or in-process under the caller's lock when the
+    pool is unavailable.
+
+    Returns:
+        Dict with 'dimensions' ((w, h) or None), 'metadata' (dict or None),
+        and 'frame' ((rgb_bytes, width, height) or None)
+    """
+    result = dict(EMPTY_PROBE_RESULT)
+    try:
+        import cv2
+
+        # Force software decoding (CAP_FFMPEG backend, no DXVA/D3D11 HW accel).
+        # OpenCV is built with DXVA + NVD3D11 support — if hw accel is active while
+        # MPV's D3D11 renderer is running, both fight over the D3D11 device and trigger
+        # exception 0xe24c4a02 in the GPU driver. SW decode avoids the conflict entirely.
+        cap = cv2.VideoCapture(str(video_path), cv2.CAP_FFMPEG)
+        cap.set(cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_NONE)
+        if not cap.isOpened():
+            return result
+
+        try:
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            duration = frame_count / fps if fps > 0 else 0
+            sar_num = cap.get(cv2.CAP_PROP_SAR_NUM)
+            sar_den = cap.get(cv2.CAP_PROP_SAR_DEN)
+
+            result['dimensions'] = (width, height)
+            result['metadata'] = {
+                'fps': fps,
+                'duration': duration,
+                'frame_count': frame_count,
+                'current_frame': 0,
+                'sar_num': sar_num if sar_num > 0 else 1,
+                'sar_den': sar_den if sar_den > 0 else 1,
+                **stream_info(cv2, cap, fps),
+            }
+            if not include_frame:
+                return result
+
+            frame = None
+            seek_ms = _representative_seek_ms(fps, frame_count) if representative_frame else 0.0
+            if seek_ms > 0:
+                # FFmpeg seeks to the preceding keyframe and decodes at most one
+                # GOP forward, instead of decoding the clip from the start.
+                cap.set(cv2.CAP_PROP_POS_MSEC, seek_ms)
+                ret, frame = cap.read()
+                if not ret:
+                    frame = None
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            if frame is None:
+                ret, frame = cap.read()
+                if not ret:
+                    return result
+        finally:
+            cap.release()
+
+        frame_height, frame_width = frame.shape[:2]
+        if max_frame_width and 0 < max_frame_width < frame_width:
+            scaled_height = max(1, round(frame_height * max_frame_width / frame_width))
+            frame = cv2.resize(frame, (int(max_frame_width), scaled_height),
+                               interpolation=cv2.INTER_AREA)
+        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        h, w = frame_rgb.shape[:2]
+        result['frame'] = (frame_rgb.tobytes(), w, h)
+        return result
+    except Exception as e:
+        print(f"Error extracting video info from {video_path}: {e}")
+        return result
+
+
+def _get_job_slots():
+    global _job_slots
+    with _executor_lock:
+        if _job_slots is None:
+            _job_slots = threading.BoundedSemaphore(_resolve_worker_count())
+        return _job_slots
+
+
+def _get_executor():
+    global _executor
+    if _executor is not None:
+        return _executor
+    with _executor_lock:
+        if _executor is None:
+            import multiprocessing
+            _executor = ProcessPoolExecutor(
+                max_workers=_resolve_worker_count(),
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_probe_worker,
+            )
+        return _executor
+
+
+def _discard_broken_executor(executor):
+    global _executor, _pool_failures
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+            _pool_failures += 1
+            print(f"[VIDEO PROBE] Worker pool discarded ({_pool_failures}/{MAX_POOL_FAILURES})")
+    terminate_process_pool(executor)
+
+
+def _restart_timed_out_executor(executor):
+    """Kill a pool holding a hung decoder; the next probe starts a fresh one."""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+        _restarted_executors.add(executor)
+    terminate_process_pool(executor)
+
+
+def probe_video_in_pool(
+    video_path: Path,
+    include_frame: bool = True,
+    representative_frame: bool = False,
+    max_frame_width: int | None = None,
+) -> dict | None:
+    """Probe a video in the worker pool; None when the pool is unavailable.
+
+    The job is submitted once a worker is free, so `probe_timeout()` counts
+    decode time only. A probe that outlives it restarts the pool (a hung
+    decoder would otherwise hold a worker forever) and returns an empty
+    result, so the file is treated as unreadable instead of being retried
+    in-process. Other probes broken by that restart are retried once.
+    """
+    for _attempt in range(2):
+        if not process_pool_enabled():
+            return None
+        try:
+            executor = _get_executor()
+        except Exception as e:
+            print(f"[VIDEO PROBE] Process pool unavailable, probing in-process: {e}")
+            _disable_pool()
+            return None
+        with _get_job_slots():
+            try:
+                future = executor.submit(
+                    probe_video_file, str(video_path), include_frame,
+                    representative_frame, max_frame_width)
+                return future.result(timeout=probe_timeout())
+            except FutureTimeoutError:
+                print(f"[VIDEO PROBE] Timed out after {probe_timeout():.0f}s, "
+                      f"restarting workers: {video_path}")
+                _restart_timed_out_executor(executor)
+                return dict(EMPTY_PROBE_RESULT)
+            except BrokenProcessPool:
+                if executor not in _restarted_executors:
+                    _discard_broken_executor(executor)
+                    return None
+            except RuntimeError:
+                # Submitted during interpreter shutdown.
+                return None
+    return None
+
+
+def probe_video_in_thread(
+    video_path: str,
+    include_frame: bool = True,
+    representative_frame: bool = False,
+    max_frame_width: int | None = None,
+) -> dict:
+    """In-process fallback probe with the pool's time limit.
+
+    A thread cannot be killed, so a probe that outlives `probe_timeout()` is
+    left to finish in the background and the file is reported unreadable.
+    """
+    results = []
+    thread = threading.Thread(
+        target=lambda: results.append(probe_video_file(
+            video_path, include_frame, representative_frame, max_frame_width)),
+        name='video-probe-fallback',
+        daemon=True,
+    )
+    thread.start()
+    thread.join(probe_timeout())
+    if results:
+        return results[0]
+    print(f"[VIDEO PROBE] In-process probe timed out after {probe_timeout():.0f}s: {video_path}")
+    return dict(EMPTY_PROBE_RESULT)
+
+
+def _disable_pool():
+    global _pool_failures
+    _pool_failures = MAX_POOL_FAILURES
+
+
+def _metadata_cache_key(video_path: Path):
+    try:
+        stat = Path(video_path).stat()
+    except OSError:
+        return None
+    return str(video_path), stat.st_mtime, stat.st_size
+
+
+def get_cached_probe_metadata(video_path: Path):
+    """Return (dimensions, metadata) from an earlier probe of the same file."""
+    key = _metadata_cache_key(video_path)
+    if key is None:
+        return None
+    with _metadata_cache_lock:
+        cached = _metadata_cache.get(key)
+        if cached is not None:
+            _metadata_cache.move_to_end(key)
+        return cached
+
+
+def remember_probe_metadata(video_path: Path, dimensions, metadata):
+    """Keep probe metadata so later metadata-only lookups skip the decoder."""
+    if dimensions is None or metadata is None:
+        return
+    key = _metadata_cache_key(video_path)
+    if key is None:
+        return
+    with _metadata_cache_lock:
+        _metadata_cache[key] = (dimensions, dict(metadata))
+        _metadata_cache.move_to_end(key)
+        while len(_metadata_cache) > METADATA_CACHE_SIZE:
+            _metadata_cache.popitem(last=False)
+
+
+def shutdown_probe_pool():
+    """Stop worker processes (idempotent); called when the app shuts down."""
+    global _executor
+    with _executor_lock:
+        executor = _executor
+        _executor = None
+    if executor is not None:
+        terminate_process_pool(executor)
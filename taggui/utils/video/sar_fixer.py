@@ -8,6 +8,7 @@ from typing import Tuple, Optional
 
 from .common import create_backup
 from .ffmpeg_gpu import ffmpeg_base_args
+from .job_runner import run_jobs
 
 
 class SARFixer:
@@ -54,7 +55,8 @@ class SARFixer:
             return None, None, None
 
     @staticmethod
-    def fix_sar_to_square_pixels(input_path: Path, output_path: Path) -> Tuple[bool, str]:
+    def fix_sar_to_square_pixels(input_path: Path, output_path: Path,
+                                 threads: Optional[int] = None) -> Tuple[bool, str]:
         """
         Fix video with non-square pixels (SAR != 1:1) by re-encoding to square pixels.
         Creates .backup of original. Scales video to display dimensions with SAR 1:1.
@@ -62,6 +64,7 @@ class SARFixer:
         Args:
             input_path: Input video file path
             output_path: Output video file path
+            threads: Optional encoder thread limit, used when several fixes run at once
 
         Returns:
             Tuple of (success: bool, message: str)
@@ -104,9 +107,10 @@ class SARFixer:
                 '-crf', '18',
                 '-preset', 'slow',
                 '-c:a', 'copy',  # Copy audio without re-encoding
-                '-y',
-                str(temp_output)
             ]
+            if threads:
+                cmd += ['-threads', str(int(threads))]
+            cmd += ['-y', str(temp_output)]
 
             result = subprocess.run(cmd, capture_output=True, text=True)
 
@@ -129,13 +133,16 @@ class SARFixer:
             return False, f"Error: {str(e)}"
 
     @staticmethod
-    def scan_directory_for_non_square_sar(directory: Path, video_extensions: set = None):
+    def scan_directory_for_non_square_sar(directory: Path, video_extensions: set = None,
+                                          progress_callback=None):
         """
         Scan directory for videos with non-square pixel aspect ratios.
+        Videos are probed in parallel (one ffprobe per core).
 
         Args:
             directory: Directory to scan
             video_extensions: Set of video file extensions
+            progress_callback: Optional callback(current, total, video_name); return True to cancel
 
         Returns:
             List of tuples: (video_path, sar_num, sar_den) for videos with SAR != 1:1
@@ -143,16 +150,20 @@ class SARFixer:
         if video_extensions is None:
             video_extensions = {'.mp4', '.avi', '.mov', '.mkv', '.webm'}
 
-        problem_videos = []
-
-        for video_path in directory.rglob('*'):
-            if video_path.suffix.lower() in video_extensions:
-                # Skip backup files
-                if video_path.suffix.endswith('.backup'):
-                    continue
+        video_paths = [
+            video_path for video_path in directory.rglob('*')
+            # Skip backup files
+            if video_path.suffix.lower() in video_extensions and not video_path.suffix.endswith('.backup')
+        ]
+        results, report = run_jobs(video_paths, SARFixer.check_sar, label='SAR scan',
+                                   progress_callback=progress_callback)
+        if len(video_paths) > 1:
+            print(f'[VIDEO] {report.summary()}')
 
-                sar_num, sar_den, _ = SARFixer.check_sar(video_path)
-                if sar_num is not None and sar_den is not None and sar_num != sar_den:
-                    problem_videos.append((video_path, sar_num, sar_den))
+        problem_videos = []
+        for video_path, result in zip(video_paths, results):
+            sar_num, sar_den, _ = result or (None, None, None)
+            if sar_num is not None and sar_den is not None and sar_num != sar_den:
+                problem_videos.append((video_path, sar_num, sar_den))
 
         return problem_videos
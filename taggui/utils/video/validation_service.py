@@ -0,0 +1,358 @@
+"""Folder-wide video validation with results kept in the folder DB.
+
+`VideoValidator.validate` checks one file and forgets the answer, so checking
+a folder again repeated every ffprobe, decode and sampling pass.
+`validate_folder` runs the validator on the shared job pool
+(`job_runner.run_jobs`) with a per-file timeout. It stores each result (ok,
+message, level, mtime and size) in the folder's `ImageIndexDB`. Later runs
+skip files whose mtime and size are unchanged and whose stored result is at
+least as thorough as the one requested. A file found corrupt stays corrupt at
+any level.
+
+The OpenCV levels ('sample' and 'decode') run each file in a spawned worker
+process, one per pool slot. A decoder that hangs inside `cap.read()` or
+crashes then costs only that worker: after the per-file time limit the worker
+is killed and replaced, and the file is recorded as failed. Cancelling kills
+the running workers too. `TAGGUI_VIDEO_VALIDATION_PROCESSES=0` keeps every
+level in-process.
+
+The stored results back the `valid:` and `corrupt:` filters: paginated
+folders query the `video_validation` table, and the in-memory filter uses
+`lookup_validation`.
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+
+from .job_runner import (
+    default_worker_count, ffmpeg_job_threads, run_jobs, terminate_process_pool,
+)
+
+
+VALIDATION_TIMEOUT_ENV = 'TAGGUI_VIDEO_VALIDATION_TIMEOUT'
+VALIDATION_PROCESSES_ENV = 'TAGGUI_VIDEO_VALIDATION_PROCESSES'
+DEFAULT_TIMEOUT_SECONDS = 30
+# Slack on top of the validator's own per-pass timeouts before a worker
+# process counts as hung (covers its startup and imports).
+ISOLATION_GRACE_SECONDS = 5.0
+VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv', '.webm'}
+# Least to most thorough: ffprobe structure check, OpenCV frame sampling,
+# full ffmpeg decode. Maps to VideoValidator.validate(deep, check_decode).
+VALIDATION_LEVELS = {
+    'probe': (False, False),
+    'sample': (True, False),
+    'decode': (True, True),
+}
+
+_results_lock = threading.Lock()
+_results_by_path: dict[str, 'ValidationResult'] = {}
+_loaded_directories: set[str] = set()
+_resolved_parents: set[str] = set()
+
+
+def validation_timeout() -> float:
+    raw_value = os.getenv(VALIDATION_TIMEOUT_ENV, '').strip()
+    try:
+        if raw_value:
+            return max(1.0, float(raw_value))
+    except ValueError:
+        pass
+    return float(DEFAULT_TIMEOUT_SECONDS)
+
+
+def validation_uses_processes(level: str) -> bool:
+    """Whether `level` decodes with OpenCV and so runs in worker processes."""
+    deep, _check_decode = VALIDATION_LEVELS[level]
+    return deep and os.getenv(VALIDATION_PROCESSES_ENV, '1').strip() != '0'
+
+
+def level_rank(level: str) -> int:
+    try:
+        return list(VALIDATION_LEVELS).index(level)
+    except ValueError:
+        return -1
+
+
+def levels_at_least(level: str) -> list[str]:
+    """Levels whose passing result also vouches for `level` (for `valid:<level>`)."""
+    rank = level_rank(level)
+    return [name for name in VALIDATION_LEVELS if rank >= 0 and level_rank(name) >= rank]
+
+
+@dataclass(frozen=True)
+class ValidationResult:
+    ok: bool
+    message: str
+    level: str
+    mtime: float
+    file_size: int
+
+    @classmethod
+    def from_row(cls, row) -> 'ValidationResult':
+        return cls(bool(row['ok']), row['message'] or '', str(row['level']),
+                   float(row['mtime']), int(row['file_size']))
+
+    def matches(self, signature) -> bool:
+        return signature is not None and (self.mtime, self.file_size) == signature
+
+    def covers(self, level: str) -> bool:
+        """Whether this result answers a request at `level` without re-checking."""
+        return not self.ok or level_rank(self.level) >= level_rank(level)
+
+
+def _file_signature(path: Path) -> tuple[float, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return float(stat.st_mtime), int(stat.st_size)
+
+
+def validate_video(video_path: Path, level: str = 'probe',
+                   timeout: float | None = None) -> ValidationResult | None:
+    """Validate one file at `level`; None when it disappeared meanwhile."""
+    from .validator import VideoValidator
+
+    deep, check_decode = VALIDATION_LEVELS[level]
+    signature = _file_signature(video_path)
+    if signature is None:
+        return None
+    threads = ffmpeg_job_threads() if check_decode else None
+    ok, message = VideoValidator.validate(
+        video_path, deep=deep, check_decode=check_decode,
+        timeout=timeout or validation_timeout(), threads=threads,
+    )
+    return ValidationResult(bool(ok), message, level, *signature)
+
+
+class _ValidatorProcess:
+    """One spawned worker process for OpenCV-level checks, replaced after a hang or crash."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._cancelled = False
+
+    def run(self, video_path: Path, level: str, timeout: float) -> ValidationResult | None:
+        deep, check_decode = VALIDATION_LEVELS[level]
+        # The validator may spend `timeout` on each pass: ffprobe, OpenCV, ffmpeg decode.
+        time_limit = timeout * (1 + int(deep) + int(check_decode)) + ISOLATION_GRACE_SECONDS
+        with self._lock:
+            if self._cancelled:
+                return None
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+            executor = self._executor
+            future = executor.submit(validate_video, video_path, level, timeout)
+        try:
+            return future.result(timeout=time_limit)
+        except FutureTimeoutError:
+            message = f'Validation timed out after {time_limit:.0f}s'
+        except BrokenProcessPool:
+            message = 'Validator process crashed while decoding'
+        self._discard(executor)
+        if self._cancelled:
+            return None
+        print(f'[VIDEO] {video_path.name}: {message}')
+        signature = _file_signature(video_path)
+        if signature is None:
+            return None
+        return ValidationResult(False, message, level, *signature)
+
+    def _discard(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        terminate_process_pool(executor)
+
+    def close(self, cancelled: bool = False):
+        with self._lock:
+            self._cancelled = self._cancelled or cancelled
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            terminate_process_pool(executor)
+
+
+def _folder_videos(directory: Path, video_extensions) -> list[Path]:
+    return sorted(
+        path for path in directory.rglob('*')
+        if path.suffix.lower() in video_extensions
+        and not any(part.startswith('.') for part in path.relative_to(directory).parts)
+        and path.is_file()
+    )
+
+
+def _remember(results: dict[Path, ValidationResult]):
+    with _results_lock:
+        for path, result in results.items():
+            _results_by_path[str(path)] = result
+
+
+def _load_directory_results(directory: Path, db=None) -> dict[str, dict]:
+    """Stored rows for `directory`, also remembered for `lookup_validation`."""
+    from utils.image_index_db import ImageIndexDB
+
+    owns_db = db is None
+    if owns_db:
+        if not ImageIndexDB.db_base_path(directory).exists():
+            return {}
+        db = ImageIndexDB(directory)
+    try:
+        rows = db.get_video_validation_results() if db.enabled else {}
+    finally:
+        if owns_db:
+            db.close()
+    with _results_lock:
+        for file_name, row in rows.items():
+            _results_by_path.setdefault(str(directory / file_name), ValidationResult.from_row(row))
+        _loaded_directories.add(str(directory))
+    return rows
+
+
+def validate_folder(directory: Path, level: str = 'probe', *, video_extensions=None,
+                    progress_callback=None, workers: int | None = None,
+                    timeout: float | None = None, force: bool = False):
+    """Validate every video under `directory`, reusing stored results.
+
+    Args:
+        directory: Folder to scan (recursively, skipping hidden folders)
+        level: 'probe', 'sample' or 'decode'
+        video_extensions: Set of video file extensions
+        progress_callback: Optional callback(current, total, video_name); return True to cancel
+        workers: Pool size; defaults to the job runner's
+        timeout: Seconds allowed per file and pass; defaults to TAGGUI_VIDEO_VALIDATION_TIMEOUT
+        force: Re-validate files even when a stored result still applies
+
+    Returns:
+        Tuple of (results keyed by path, JobReport for the files actually checked)
+    """
+    from utils.image_index_db import ImageIndexDB
+
+    if level not in VALIDATION_LEVELS:
+        raise ValueError(f'Unknown validation level: {level}')
+    directory = Path(directory)
+    videos = _folder_videos(directory, video_extensions or VIDEO_EXTENSIONS)
+
+    db = None
+    if ImageIndexDB.db_base_path(directory).exists():
+        db = ImageIndexDB(directory)
+        if not db.enabled:
+            db.close()
+            db = None
+    try:
+        stored = _load_directory_results(directory, db) if db is not None else {}
+        results: dict[Path, ValidationResult] = {}
+        pending = []
+        for path in videos:
+            row = stored.get(str(path.relative_to(directory)))
+            if row is not None and not force:
+                result = ValidationResult.from_row(row)
+                if result.matches(_file_signature(path)) and result.covers(level):
+                    results[path] = result
+                    continue
+            pending.append(path)
+
+        threads_per_job = ffmpeg_job_threads() if VALIDATION_LEVELS[level][1] else 1
+        if validation_uses_processes(level) and pending:
+            checked, report = _run_in_processes(
+                pending, level, timeout or validation_timeout(),
+                progress_callback=progress_callback, workers=workers,
+                threads_per_job=threads_per_job,
+            )
+        else:
+            checked, report = run_jobs(
+                pending, lambda path: validate_video(path, level, timeout),
+                label=f'Video validation ({level})', progress_callback=progress_callback,
+                workers=workers, threads_per_job=threads_per_job,
+            )
+        fresh = {path: result for path, result in zip(pending, checked) if result is not None}
+        results.update(fresh)
+        if db is not None and fresh:
+            db.save_video_validation_results([
+                {
+                    'file_name': str(path.relative_to(directory)),
+                    'mtime': result.mtime,
+                    'file_size': result.file_size,
+                    'ok': result.ok,
+                    'message': result.message,
+                    'level': result.level,
+                }
+                for path, result in fresh.items()
+            ])
+    finally:
+        if db is not None:
+            db.close()
+    _remember(results)
+    print(f'[VIDEO] {report.summary()}, {len(videos) - len(pending)} unchanged skipped')
+    return results, report
+
+
+def _run_in_processes(pending, level, timeout, *, progress_callback, workers, threads_per_job):
+    """`run_jobs` over `pending` with each check in a worker process of its slot."""
+    slot_count = max(1, min(len(pending), workers or default_worker_count(threads_per_job)))
+    slots = [_ValidatorProcess() for _ in range(slot_count)]
+    idle = queue.SimpleQueue()
+    for slot in slots:
+        idle.put(slot)
+
+    def check(path):
+        slot = idle.get()
+        try:
+            return slot.run(path, level, timeout)
+        finally:
+            idle.put(slot)
+
+    def cancel_running():
+        for slot in slots:
+            slot.close(cancelled=True)
+
+    try:
+        return run_jobs(
+            pending, check, label=f'Video validation ({level})',
+            progress_callback=progress_callback, workers=slot_count,
+            threads_per_job=threads_per_job, cancel_running=cancel_running,
+        )
+    finally:
+        for slot in slots:
+            slot.close()
+
+
+def lookup_validation(video_path) -> ValidationResult | None:
+    """Stored result for a file, or None if it was never validated or has changed since."""
+    from utils.image_index_db import ImageIndexDB
+
+    video_path = Path(video_path)
+    parent = str(video_path.parent)
+    with _results_lock:
+        resolved = parent in _resolved_parents
+    if not resolved:
+        # Load the nearest folder DB once; later lookups in this folder hit memory.
+        for directory in video_path.parents:
+            if ImageIndexDB.db_base_path(directory).exists():
+                with _results_lock:
+                    loaded = str(directory) in _loaded_directories
+                if not loaded:
+                    _load_directory_results(directory)
+                break
+        with _results_lock:
+            _resolved_parents.add(parent)
+    with _results_lock:
+        result = _results_by_path.get(str(video_path))
+    if result is None or not result.matches(_file_signature(video_path)):
+        return None
+    return result
+
+
+def clear_memory_cache():
+    with _results_lock:
+        _results_by_path.clear()
+        _loaded_directories.clear()
+        _resolved_parents.clear()
@@ -2,21 +2,30 @@
 
 import subprocess
 import json
+import time
 from pathlib import Path
-from typing import Tuple
+from typing import Optional, Tuple
+
+
+# Per-file budget for a full decode; the structure probe gets at most 10 s.
+DEFAULT_TIMEOUT_SECONDS = 30
 
 
 class VideoValidator:
     """Validates video files for corruption and basic integrity."""
 
     @staticmethod
-    def validate_with_ffprobe(video_path: Path, check_decode: bool = True) -> Tuple[bool, str]:
+    def validate_with_ffprobe(video_path: Path, check_decode: bool = True,
+                              timeout: float = DEFAULT_TIMEOUT_SECONDS,
+                              threads: Optional[int] = None) -> Tuple[bool, str]:
         """
         Validate video using ffprobe to detect corruption.
 
         Args:
             video_path: Path to video file
             check_decode: If True, attempt to decode all frames to detect corruption
+            timeout: Seconds allowed for the decode pass
+            threads: Optional decoder thread limit, used when several files are checked at once
 
         Returns:
             Tuple of (is_valid: bool, message: str)
@@ -29,11 +38,15 @@ class VideoValidator:
                 cmd = [
                     *ffmpeg_base_args(),
                     '-v', 'error',
+                ]
+                if threads:
+                    cmd += ['-threads', str(int(threads))]
+                cmd += [
                     '-i', str(video_path),
                     '-f', 'null',
                     '-'
                 ]
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+                result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
 
                 # Check for corruption errors
                 if result.stderr:
@@ -60,7 +73,7 @@ class VideoValidator:
                 str(video_path)
             ]
 
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=min(10, timeout))
 
             # Check for errors in stderr
             if result.stderr:
@@ -96,18 +109,21 @@ class VideoValidator:
             return False, f"Validation error: {str(e)}"
 
     @staticmethod
-    def validate_with_opencv(video_path: Path, sample_frames: int = 10) -> Tuple[bool, str]:
+    def validate_with_opencv(video_path: Path, sample_frames: int = 10,
+                             timeout: Optional[float] = None) -> Tuple[bool, str]:
         """
         Validate video by attempting to read sample frames with OpenCV.
 
         Args:
             video_path: Path to video file
             sample_frames: Number of frames to sample throughout video
+            timeout: Optional seconds allowed for sampling, checked between frames
 
         Returns:
             Tuple of (is_valid: bool, message: str)
         """
         cap = None
+        deadline = time.monotonic() + timeout if timeout else None
         try:
             import cv2
 
@@ -127,6 +143,8 @@ class VideoValidator:
                               for i in range(sample_frames)]
 
             for frame_num in sample_positions:
+                if deadline is not None and time.monotonic() > deadline:
+                    return False, "Validation timeout - file may be corrupted or very large"
                 cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
                 ret, frame = cap.read()
 
@@ -145,7 +163,9 @@ class VideoValidator:
                 cap.release()
 
     @staticmethod
-    def validate(video_path: Path, deep: bool = False, check_decode: bool = False) -> Tuple[bool, str]:
+    def validate(video_path: Path, deep: bool = False, check_decode: bool = False,
+                 timeout: float = DEFAULT_TIMEOUT_SECONDS,
+                 threads: Optional[int] = None) -> Tuple[bool, str]:
         """
         Validate video file for corruption and integrity.
 
@@ -153,6 +173,8 @@ class VideoValidator:
             video_path: Path to video file
             deep: If True, perform deep validation with frame sampling (slower)
             check_decode: If True, attempt to decode entire video with ffmpeg (slowest, most thorough)
+            timeout: Seconds allowed for each validation pass
+            threads: Optional ffmpeg thread limit for the decode pass
 
         Returns:
             Tuple of (is_valid: bool, message: str)
@@ -164,14 +186,15 @@ class VideoValidator:
             return False, "File is empty"
 
         # First check with ffprobe (fast or thorough depending on check_decode)
-        valid, message = VideoValidator.validate_with_ffprobe(video_path, check_decode=check_decode)
+        valid, message = VideoValidator.validate_with_ffprobe(video_path, check_decode=check_decode,
+                                                              timeout=timeout, threads=threads)
 
         if not valid:
             return False, f"Validation failed: {message}"
 
         # If deep validation requested, also sample frames with OpenCV
         if deep:
-            valid, message = VideoValidator.validate_with_opencv(video_path, sample_frames=20)
+            valid, message = VideoValidator.validate_with_opencv(video_path, sample_frames=20, timeout=timeout)
             if not valid:
                 return False, f"Frame validation failed: {message}"
 
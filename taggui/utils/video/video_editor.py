@@ -81,9 +81,10 @@ class VideoEditor:
         return SARFixer.fix_sar_to_square_pixels(input_path, output_path)
 
     @staticmethod
-    def scan_directory_for_non_square_sar(directory: Path, video_extensions: set = None) -> List[Tuple[Path, int, int]]:
+    def scan_directory_for_non_square_sar(directory: Path, video_extensions: set = None,
+                                          progress_callback=None) -> List[Tuple[Path, int, int]]:
         """Scan directory for videos with non-square SAR."""
-        return SARFixer.scan_directory_for_non_square_sar(directory, video_extensions)
+        return SARFixer.scan_directory_for_non_square_sar(directory, video_extensions, progress_callback)
 
     # Batch processing operations
     @staticmethod
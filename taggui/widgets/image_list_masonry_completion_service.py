@@ -3,6 +3,7 @@ import time
 from PySide6.QtCore import QItemSelectionModel, QTimer
 from PySide6.QtWidgets import QAbstractItemView
 from utils.diagnostic_logging import diagnostic_print
+from utils.frame_trace import frame_trace
 
 
 class MasonryCompletionService:
@@ -232,6 +233,8 @@ class MasonryCompletionService:
                         has_first_item = True
                     if total_items > 0 and item.get('index', -1) == (total_items - 1):
                         has_last_item = True
+                # Items moved in place; the spatial index must be rebuilt.
+                v._masonry_spatial_index = None
 
                 # Reconcile virtual height only in compatibility mode.
                 # In strict mode, keeping a stable virtual height prevents thumb jitter.
@@ -497,9 +500,16 @@ class MasonryCompletionService:
             if is_buffered and v._masonry_items and hasattr(v, '_get_masonry_incremental_service'):
                 try:
                     page_size = source_model.PAGE_SIZE if hasattr(source_model, 'PAGE_SIZE') else 1000
-                    v._get_masonry_incremental_service().cache_from_full_result(
-                        v._masonry_items, page_size, column_width, spacing, num_columns, avg_height,
-                    )
+                    layout_arrays = result_dict.get('arrays')
+                    if layout_arrays is not None and len(layout_arrays) == len(v._masonry_items):
+                        v._get_masonry_incremental_service().cache_from_arrays(
+                            layout_arrays, page_size, column_width, spacing, num_columns, avg_height,
+                            items=v._masonry_items,
+                        )
+                    else:
+                        v._get_masonry_incremental_service().cache_from_full_result(
+                            v._masonry_items, page_size, column_width, spacing, num_columns, avg_height,
+                        )
                 except Exception as e:
                     print(f"[MASONRY-INCR] Cache store failed: {e}")
 
@@ -524,11 +534,14 @@ class MasonryCompletionService:
                     _sel_model = v.selectionModel() if _selection_guard_live else None
                     if _sel_model:
                         _sel_model.blockSignals(True)
+                    apply_started = time.perf_counter() if frame_trace.enabled else None
                     try:
                         v._apply_layout_to_ui(timestamp)
                     finally:
                         if _sel_model:
                             _sel_model.blockSignals(False)
+                        if apply_started is not None:
+                            frame_trace.record_event('completion', apply_started, detail='masonry apply')
                     v.layout_ready.emit()
 
                     def _ensure_selected_anchor_if_needed():
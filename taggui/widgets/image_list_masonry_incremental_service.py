@@ -11,6 +11,14 @@ import math
 
 from utils.diagnostic_logging import diagnostic_print
 
+try:
+    from widgets.masonry_spatial_index import MasonrySpatialIndex
+except ModuleNotFoundError:
+    from taggui.widgets.masonry_spatial_index import MasonrySpatialIndex
+
+# Spatial-index segment key for the prefix spacer (pages use their number).
+PREFIX_SPACER_SEGMENT = -1
+
 
 class MasonryIncrementalService:
     """Manages per-page masonry cache for incremental scroll updates."""
@@ -22,6 +30,22 @@ class MasonryIncrementalService:
         self._prefix_height = 0  # frozen prefix spacer height
         self._cached_avg_h = 0.0
         self._cached_page_size = 0
+        # Kept in step with _page_cache, one segment per page, so hit-testing
+        # over assembled items never needs a full rebuild.
+        self.spatial_index = MasonrySpatialIndex()
+
+    def _store_page(self, page_num, items, end_heights):
+        self._page_cache[page_num] = {
+            'items': items,
+            'end_heights': end_heights,
+        }
+        self.spatial_index.set_segment(page_num, items)
+        self.spatial_index.source = None
+
+    def _clear_pages(self):
+        self._page_cache.clear()
+        self.spatial_index.clear()
+        self.spatial_index.source = None
 
     def invalidate(self, reason="unknown"):
         """Clear all cached pages (on jump, resize, enrichment)."""
@@ -30,7 +54,7 @@ class MasonryIncrementalService:
                 f"[MASONRY-INCR] Cache invalidated ({len(self._page_cache)} pages): {reason}",
                 detail="verbose",
             )
-        self._page_cache.clear()
+        self._clear_pages()
         self._prefix_height = 0
         self._cache_config = None
 
@@ -48,7 +72,7 @@ class MasonryIncrementalService:
         Splits the masonry items by page and records ending column heights
         for each page so incremental appends can continue seamlessly.
         """
-        self._page_cache.clear()
+        self._clear_pages()
         self._cache_config = (col_w, spacing, num_cols)
         self._cached_avg_h = avg_h
         self._cached_page_size = page_size
@@ -75,10 +99,53 @@ class MasonryIncrementalService:
         for page_num in sorted(pages.keys()):
             items = pages[page_num]
             end_heights = self._compute_end_heights(items, col_w, spacing, num_cols)
-            self._page_cache[page_num] = {
-                'items': items,
-                'end_heights': end_heights,
-            }
+            self._store_page(page_num, items, end_heights)
+
+    def cache_from_arrays(self, arrays, page_size, col_w, spacing, num_cols, avg_h, items=None):
+        """Array counterpart of cache_from_full_result.
+
+        Accepts the MasonryArrays layout returned by the masonry worker and
+        computes page splits and end heights with array operations instead of
+        a Python pass over every item. When `items` (the same layout as dicts,
+        in the same order) is given, pages reuse those dicts rather than
+        building new ones.
+        """
+        import numpy as np
+
+        self._clear_pages()
+        self._cache_config = (col_w, spacing, num_cols)
+        self._cached_avg_h = avg_h
+        self._cached_page_size = page_size
+
+        index = np.asarray(arrays.index)
+        prefix_rows = np.flatnonzero((index == -2) & (np.asarray(arrays.y) == 0))
+        self._prefix_height = int(arrays.height[prefix_rows[0]]) if len(prefix_rows) else 0
+
+        real_rows = np.flatnonzero(index >= 0)
+        if not len(real_rows):
+            return
+        pages = index[real_rows] // page_size
+        page_order = np.argsort(pages, kind='stable')
+        order = real_rows[page_order]
+        page_numbers, page_starts, page_counts = np.unique(
+            pages[page_order], return_index=True, return_counts=True)
+
+        columns = np.asarray(arrays.x, dtype=np.int64)[order] // (col_w + spacing)
+        bottoms = (np.asarray(arrays.y, dtype=np.int64)[order]
+                   + np.asarray(arrays.height, dtype=np.int64)[order] + spacing)
+        page_slots = np.repeat(np.arange(len(page_numbers)), page_counts)
+        end_heights = np.zeros((len(page_numbers), num_cols), dtype=np.int64)
+        in_range = (columns >= 0) & (columns < num_cols)
+        np.maximum.at(end_heights, (page_slots[in_range], columns[in_range]), bottoms[in_range])
+
+        page_ends = page_starts + page_counts
+        for slot, page_num in enumerate(page_numbers.tolist()):
+            rows = order[page_starts[slot]:page_ends[slot]]
+            if items is not None:
+                page_items = [items[row] for row in rows.tolist()]
+            else:
+                page_items = arrays.take(rows).to_items()
+            self._store_page(page_num, page_items, end_heights[slot].tolist())
 
     def _compute_end_heights(self, items, col_w, spacing, num_cols):
         """Compute column heights after all items in a page."""
@@ -127,10 +194,8 @@ class MasonryIncrementalService:
 
         items = self._layout_items(items_data, column_heights, col_w, spacing, num_cols)
 
-        self._page_cache[page_num] = {
-            'items': items,
-            'end_heights': list(column_heights),  # modified in-place by _layout_items
-        }
+        # column_heights was modified in-place by _layout_items.
+        self._store_page(page_num, items, list(column_heights))
         return items
 
     def compute_page_up(self, page_num, items_data, total_items):
@@ -176,10 +241,7 @@ class MasonryIncrementalService:
             end_heights = [h + delta for h in end_heights]
             new_prefix_h += delta
 
-        self._page_cache[page_num] = {
-            'items': items,
-            'end_heights': end_heights,
-        }
+        self._store_page(page_num, items, end_heights)
         self._prefix_height = new_prefix_h
         return items
 
@@ -269,6 +331,8 @@ class MasonryIncrementalService:
     def assemble_items(self):
         """Assemble _masonry_items from all cached pages + prefix spacer."""
         if not self._page_cache:
+            self.spatial_index.remove_segment(PREFIX_SPACER_SEGMENT)
+            self.spatial_index.source = None
             return []
 
         cached_pages = sorted(self._page_cache.keys())
@@ -287,11 +351,15 @@ class MasonryIncrementalService:
                 'height': int(self._prefix_height),
                 'aspect_ratio': 1.0,
             })
+        self.spatial_index.set_segment(PREFIX_SPACER_SEGMENT, items[:])
 
         # Cached page items
         for page_num in cached_pages:
             items.extend(self._page_cache[page_num]['items'])
 
+        # The index now describes exactly this list; the view adopts it
+        # instead of re-indexing every item.
+        self.spatial_index.source = items
         return items
 
     def reflow_cached_pages_from(self, page_num, items_data_loader):
@@ -299,7 +367,9 @@ class MasonryIncrementalService:
 
         Returns the list of pages that were recomputed. Later pages ripple from
         the changed page using the previous cached page's end heights as the
-        fixed upstream boundary.
+        fixed upstream boundary, until a page ends with the same column
+        heights as before (or all shifted by one amount); the rest are then
+        kept or shifted as-is and are not part of the returned list.
         """
         if not self.is_active:
             return []
@@ -327,19 +397,36 @@ class MasonryIncrementalService:
             column_heights = [start_y] * num_cols
 
         recomputed = []
-        for p in pages_to_reflow:
+        for position, p in enumerate(pages_to_reflow):
+            old_end_heights = self._page_cache[p]['end_heights']
             items_data = []
             if callable(items_data_loader):
                 items_data = list(items_data_loader(p) or [])
             items = self._layout_items(items_data, column_heights, col_w, spacing, num_cols)
-            self._page_cache[p] = {
-                'items': items,
-                'end_heights': list(column_heights),
-            }
+            self._store_page(p, items, list(column_heights))
             recomputed.append(p)
 
+            # Each page end is a checkpoint: once the column heights match the
+            # old ones (up to a uniform shift), later pages cannot change
+            # except for that shift, so they are not laid out again.
+            if len(old_end_heights) != len(column_heights):
+                continue
+            deltas = {new - old for new, old in zip(column_heights, old_end_heights)}
+            if len(deltas) == 1:
+                self._shift_pages(pages_to_reflow[position + 1:], deltas.pop())
+                break
+
         return recomputed
 
+    def _shift_pages(self, page_nums, delta):
+        """Move whole cached pages vertically without laying them out again."""
+        if not delta:
+            return
+        for page_num in page_nums:
+            entry = self._page_cache[page_num]
+            items = [{**item, 'y': item['y'] + delta} for item in entry['items']]
+            self._store_page(page_num, items, [height + delta for height in entry['end_heights']])
+
     def reflow_cached_pages_upward_from(self, page_num, items_data_loader):
         """Recompute a cached contiguous block from page_num upward.
 
@@ -460,10 +547,7 @@ class MasonryIncrementalService:
         column_heights = [int(anchor_y)] * num_cols
         column_heights[anchor_col] = int(anchor_y) + int(anchor_height) + int(spacing)
         suffix_items = self._layout_items(suffix_data, column_heights, col_w, spacing, num_cols)
-        self._page_cache[int(page_num)] = {
-            'items': prefix_items + [anchor_item] + suffix_items,
-            'end_heights': list(column_heights),
-        }
+        self._store_page(int(page_num), prefix_items + [anchor_item] + suffix_items, list(column_heights))
 
         recomputed = [int(page_num)]
         cur = int(page_num) + 1
@@ -472,10 +556,7 @@ class MasonryIncrementalService:
             if callable(items_data_loader):
                 downstream_data = list(items_data_loader(int(cur)) or [])
             downstream_items = self._layout_items(downstream_data, column_heights, col_w, spacing, num_cols)
-            self._page_cache[int(cur)] = {
-                'items': downstream_items,
-                'end_heights': list(column_heights),
-            }
+            self._store_page(int(cur), downstream_items, list(column_heights))
             recomputed.append(int(cur))
             cur += 1
 
@@ -494,6 +575,8 @@ class MasonryIncrementalService:
         for p in cached_pages:
             if p not in keep:
                 del self._page_cache[p]
+                self.spatial_index.remove_segment(p)
+                self.spatial_index.source = None
                 purged.append(p)
         if purged:
             diagnostic_print(
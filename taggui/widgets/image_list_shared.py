@@ -1,3 +1,5 @@
+import math
+import os
 import shutil
 import time
 from enum import Enum
@@ -48,6 +50,10 @@ from utils.grid import Grid
 from widgets.masonry_worker import calculate_masonry_layout
 from concurrent.futures import ThreadPoolExecutor
 
+# Transparent border around each badge sprite for shadows and outline pens.
+BADGE_SPRITE_MARGIN = 2
+# Upper bound on cached badge sprites; the atlas is simply rebuilt past it.
+BADGE_SPRITE_LIMIT = 1024
 
 def replace_filter_wildcards(filter_: str | list) -> str | list:
     """
@@ -80,6 +86,8 @@ FILTER_TEMPLATE_SPECS = [
     ('Width', 'Filter by image width', 'width:>1024', False),
     ('Height', 'Filter by image height', 'height:>1024', False),
     ('Name', 'Filter by file name', 'name:"{cursor}"', True),
+    ('Valid', 'Filter videos that passed validation', 'valid:true', False),
+    ('Corrupt', 'Filter videos that failed validation', 'corrupt:true', False),
     ('AND', 'Combine two predicates', 'AND', True),
     ('OR', 'Match either predicate', 'OR', True),
     ('NOT', 'Invert the next predicate', 'NOT {cursor}', True),
@@ -295,7 +303,8 @@ class FilterLineEdit(QLineEdit):
                                                    esc_char='\\')
                                     | Word(printables, exclude_chars='()'))
         string_filter_keys = ['tag', 'caption', 'ideogram', 'ideogram_color', 'marking', 'marking_type', 'crops', 'visible',
-                              'name', 'path', 'size', 'target', 'love', 'bomb', 'review']
+                              'name', 'path', 'size', 'target', 'love', 'bomb', 'review',
+                              'valid', 'corrupt']
         string_filter_expressions = [Group(CaselessLiteral(key) + Suppress(':')
                                            + optionally_quoted_string)
                                      for key in string_filter_keys]
@@ -497,9 +506,19 @@ class ImageDelegate(QStyledItemDelegate):
         self._star_badge_margin = 5
         self._star_badge_height = 18
         self._star_badge_vertical_gap = 4
+        # Pre-rendered badge pixmaps keyed by badge kind, style, size, font
+        # and device pixel ratio, so overlays paint as pixmap blits.
+        self._badge_sprites = {}
+        self._badge_style_specs = {}
+        self._badge_sprites_enabled = os.environ.get('TAGGUI_BADGE_SPRITES', '1') != '0'
         self.refresh_thumbnail_badge_settings()
 
     def refresh_thumbnail_badge_settings(self):
+        self.clear_badge_sprites()
+        self._review_badge_font_size = float(get_review_badge_font_size())
+        self._review_badge_corner_radius = float(get_review_badge_corner_radius())
+        self._review_badge_text_color = QColor(get_review_badge_text_color())
+        self._review_badge_text_color.setAlpha(245)
         self._show_review_badges = settings.value(
             'thumbnail_show_review_badges',
             defaultValue=True,
@@ -551,6 +570,46 @@ class ImageDelegate(QStyledItemDelegate):
             )
         )
 
+    def clear_badge_sprites(self):
+        """Drop pre-rendered badge pixmaps so they are redrawn on next paint."""
+        self._badge_sprites.clear()
+        self._badge_style_specs.clear()
+
+    def _blit_badge_sprite(self, painter, rect: QRect, key: tuple, render):
+        """Draw `render(sprite_painter, local_rect)` at `rect` from a cached pixmap.
+
+        The sprite is keyed by `key`, the rect size, the painter's font and the
+        device pixel ratio; it is rendered once and blitted afterwards.
+        """
+        if not self._badge_sprites_enabled:
+            render(painter, rect)
+            return
+        device = painter.device()
+        dpr = float(device.devicePixelRatioF()) if device is not None else 1.0
+        font = painter.font()
+        sprite_key = (key, rect.width(), rect.height(), dpr, font.key())
+        sprite = self._badge_sprites.get(sprite_key)
+        if sprite is None:
+            if len(self._badge_sprites) >= BADGE_SPRITE_LIMIT:
+                self._badge_sprites.clear()
+            margin = BADGE_SPRITE_MARGIN
+            sprite = QPixmap(
+                math.ceil((rect.width() + 2 * margin) * dpr),
+                math.ceil((rect.height() + 2 * margin) * dpr),
+            )
+            sprite.setDevicePixelRatio(dpr)
+            sprite.fill(Qt.GlobalColor.transparent)
+            sprite_painter = QPainter(sprite)
+            try:
+                sprite_painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+                sprite_painter.setRenderHint(QPainter.RenderHint.TextAntialiasing, True)
+                sprite_painter.setFont(font)
+                render(sprite_painter, QRect(margin, margin, rect.width(), rect.height()))
+            finally:
+                sprite_painter.end()
+            self._badge_sprites[sprite_key] = sprite
+        painter.drawPixmap(rect.left() - BADGE_SPRITE_MARGIN, rect.top() - BADGE_SPRITE_MARGIN, sprite)
+
     def _event_pos(self, event):
         try:
             if hasattr(event, 'position'):
@@ -916,50 +975,52 @@ class ImageDelegate(QStyledItemDelegate):
             if option.rect.width() < 26 or option.rect.height() < 26:
                 return
 
-            # Set up painter for stamp
             painter.save()
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
-
-            # Reuse cached pens/brushes to keep paint lightweight.
-            if not hasattr(self, '_stamp_outline_pen'):
-                self._stamp_outline_pen = QPen(QColor(255, 255, 255, 235), 1.3)
-                self._stamp_shadow_pen = QPen(QColor(0, 0, 0, 70), 1.3)
-                self._stamp_green_brush = QColor(76, 175, 80, 235)
-                self._stamp_red_brush = QColor(244, 67, 54, 235)
-                self._stamp_shadow_brush = QColor(0, 0, 0, 65)
-                self._stamp_play_color = QColor(255, 255, 255, 240)
-
-            stamp_rect = self._video_stamp_rect(option)
-            shadow_rect = stamp_rect.translated(1, 1)
-
-            # Shadow pass
-            painter.setPen(self._stamp_shadow_pen)
-            painter.setBrush(self._stamp_shadow_brush)
-            painter.drawEllipse(shadow_rect)
-
-            # Colored status badge
-            painter.setPen(self._stamp_outline_pen)
-            painter.setBrush(badge_color)
-            painter.drawEllipse(stamp_rect)
-
-            # Play triangle
-            cx = stamp_rect.center().x()
-            cy = stamp_rect.center().y()
-            triangle = QPolygon([
-                QPoint(cx - 2, cy - 4),
-                QPoint(cx - 2, cy + 4),
-                QPoint(cx + 4, cy),
-            ])
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.setBrush(self._stamp_play_color)
-            painter.drawPolygon(triangle)
-
+            self._blit_badge_sprite(
+                painter,
+                self._video_stamp_rect(option),
+                ('video', badge_color.rgba()),
+                lambda sprite_painter, stamp_rect: self._render_video_stamp(
+                    sprite_painter, stamp_rect, badge_color),
+            )
             painter.restore()
 
         except Exception:
             # Silently ignore any errors in stamp drawing
             pass
 
+    def _render_video_stamp(self, painter, stamp_rect: QRect, badge_color: QColor):
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+
+        # Reuse cached pens/brushes to keep paint lightweight.
+        if not hasattr(self, '_stamp_outline_pen'):
+            self._stamp_outline_pen = QPen(QColor(255, 255, 255, 235), 1.3)
+            self._stamp_shadow_pen = QPen(QColor(0, 0, 0, 70), 1.3)
+            self._stamp_shadow_brush = QColor(0, 0, 0, 65)
+            self._stamp_play_color = QColor(255, 255, 255, 240)
+
+        # Shadow pass
+        painter.setPen(self._stamp_shadow_pen)
+        painter.setBrush(self._stamp_shadow_brush)
+        painter.drawEllipse(stamp_rect.translated(1, 1))
+
+        # Colored status badge
+        painter.setPen(self._stamp_outline_pen)
+        painter.setBrush(badge_color)
+        painter.drawEllipse(stamp_rect)
+
+        # Play triangle
+        cx = stamp_rect.center().x()
+        cy = stamp_rect.center().y()
+        triangle = QPolygon([
+            QPoint(cx - 2, cy - 4),
+            QPoint(cx - 2, cy + 4),
+            QPoint(cx + 4, cy),
+        ])
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self._stamp_play_color)
+        painter.drawPolygon(triangle)
+
     def _draw_review_badges(self, painter, option, index):
         """Draw compact review-mark badges on the top-right corner."""
         try:
@@ -994,15 +1055,10 @@ class ImageDelegate(QStyledItemDelegate):
                 return
 
             painter.save()
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
             font = painter.font()
             font.setBold(True)
-            font.setPointSizeF(float(get_review_badge_font_size()))
+            font.setPointSizeF(self._review_badge_font_size)
             painter.setFont(font)
-            text_color = QColor(get_review_badge_text_color())
-            text_color.setAlpha(245)
-            style_spec = self._review_badge_style_spec()
-            radius = float(get_review_badge_corner_radius())
 
             badge_size = self._review_badge_size
             gap = self._review_badge_gap
@@ -1010,19 +1066,12 @@ class ImageDelegate(QStyledItemDelegate):
             y = option.rect.top() + self._review_badge_margin
 
             for label, color in badges:
-                badge_rect = QRect(x, y, badge_size, badge_size)
-                fill, outline = self._review_badge_palette(color, style_spec)
-                self._draw_overlay_chip(
+                self._blit_badge_sprite(
                     painter,
-                    badge_rect,
-                    fill=fill,
-                    outline=outline,
-                    radius=radius,
-                    shadow=QColor(style_spec.get('shadow', QColor(0, 0, 0, 60))),
-                    variant=str(style_spec.get('variant', 'solid') or 'solid'),
-                    glass_highlight=QColor(style_spec.get('glass_highlight', QColor(255, 255, 255, 68))),
-                    text=label,
-                    text_color=text_color,
+                    QRect(x, y, badge_size, badge_size),
+                    ('review', self._review_badge_style, label, color.rgba()),
+                    lambda sprite_painter, badge_rect, label=label, color=color:
+                        self._render_review_badge(sprite_painter, badge_rect, label, color),
                 )
                 x -= badge_size + gap
 
@@ -1030,6 +1079,24 @@ class ImageDelegate(QStyledItemDelegate):
         except Exception:
             pass
 
+    def _render_review_badge(self, painter, badge_rect: QRect, label: str, color: QColor):
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        style_spec = self._review_badge_style_spec()
+        fill, outline = self._review_badge_palette(color, style_spec)
+        radius = self._review_badge_corner_radius
+        self._draw_overlay_chip(
+            painter,
+            badge_rect,
+            fill=fill,
+            outline=outline,
+            radius=radius,
+            shadow=QColor(style_spec.get('shadow', QColor(0, 0, 0, 60))),
+            variant=str(style_spec.get('variant', 'solid') or 'solid'),
+            glass_highlight=QColor(style_spec.get('glass_highlight', QColor(255, 255, 255, 68))),
+            text=label,
+            text_color=self._review_badge_text_color,
+        )
+
     def _reaction_icon_path(self, kind: str, rect: QRect) -> QPainterPath:
         icon_rect = rect.adjusted(3, 3, -3, -3)
         left = float(icon_rect.left())
@@ -1108,14 +1175,25 @@ class ImageDelegate(QStyledItemDelegate):
             mixed.setAlpha(max(0, min(255, int(alpha))))
         return mixed
 
+    def _cached_badge_style_spec(self, kind: str, style: str, build) -> dict:
+        """Style specs are rebuilt per call by settings helpers; keep one per style."""
+        spec = self._badge_style_specs.get((kind, style))
+        if spec is None:
+            spec = self._badge_style_specs[(kind, style)] = build(style)
+        return spec
+
     def _review_badge_style_spec(self) -> dict:
-        return get_thumbnail_review_badge_style_spec(
-            str(getattr(self, '_review_badge_style', 'review_tile') or 'review_tile')
+        return self._cached_badge_style_spec(
+            'review',
+            str(getattr(self, '_review_badge_style', 'review_tile') or 'review_tile'),
+            get_thumbnail_review_badge_style_spec,
         )
 
     def _reaction_badge_style_spec(self) -> dict:
-        return get_thumbnail_reaction_badge_style_spec(
-            str(getattr(self, '_reaction_badge_style', 'review_tile') or 'review_tile')
+        return self._cached_badge_style_spec(
+            'reaction',
+            str(getattr(self, '_reaction_badge_style', 'review_tile') or 'review_tile'),
+            get_thumbnail_reaction_badge_style_spec,
         )
 
     def _review_badge_palette(self, base_color: QColor, style_spec: dict) -> tuple[QColor, QColor]:
@@ -1218,8 +1296,10 @@ class ImageDelegate(QStyledItemDelegate):
         return f"{rounded_half:.1f}".rstrip('0').rstrip('.')
 
     def _star_badge_style_spec(self) -> dict:
-        return get_thumbnail_star_badge_style_spec(
-            str(getattr(self, '_star_badge_style', 'halo_tag_star_right') or 'halo_tag_star_right')
+        return self._cached_badge_style_spec(
+            'star',
+            str(getattr(self, '_star_badge_style', 'halo_tag_star_right') or 'halo_tag_star_right'),
+            get_thumbnail_star_badge_style_spec,
         )
 
     def _star_badge_label(self, image) -> str | None:
@@ -1421,12 +1501,8 @@ class ImageDelegate(QStyledItemDelegate):
                 return
 
             painter.save()
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
-            style_spec = self._reaction_badge_style_spec()
-
             badge_size = self._reaction_badge_size
             gap = self._reaction_badge_gap
-            radius = float(style_spec.get('radius', 5.0))
             side = str(getattr(self, '_reaction_badge_position', 'left'))
             y = option.rect.bottom() - self._reaction_badge_margin - badge_size + 1
             if side == 'left':
@@ -1436,19 +1512,12 @@ class ImageDelegate(QStyledItemDelegate):
                 x = option.rect.right() - self._reaction_badge_margin - total_width + 1
 
             for kind, _background_color, _icon_color in badges:
-                badge_rect = QRect(x, y, badge_size, badge_size)
-                fill, outline, icon_color = self._reaction_badge_palette(kind, style_spec)
-                self._draw_overlay_chip(
+                self._blit_badge_sprite(
                     painter,
-                    badge_rect,
-                    fill=fill,
-                    outline=outline,
-                    radius=radius,
-                    shadow=QColor(style_spec.get('shadow', QColor(0, 0, 0, 60))),
-                    variant=str(style_spec.get('variant', 'solid') or 'solid'),
-                    glass_highlight=QColor(style_spec.get('glass_highlight', QColor(255, 255, 255, 68))),
-                    path=self._reaction_icon_path(kind, badge_rect),
-                    icon_color=icon_color,
+                    QRect(x, y, badge_size, badge_size),
+                    ('reaction', self._reaction_badge_style, kind),
+                    lambda sprite_painter, badge_rect, kind=kind:
+                        self._render_reaction_badge(sprite_painter, badge_rect, kind),
                 )
                 x += badge_size + gap
 
@@ -1456,6 +1525,23 @@ class ImageDelegate(QStyledItemDelegate):
         except Exception:
             pass
 
+    def _render_reaction_badge(self, painter, badge_rect: QRect, kind: str):
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        style_spec = self._reaction_badge_style_spec()
+        fill, outline, icon_color = self._reaction_badge_palette(kind, style_spec)
+        self._draw_overlay_chip(
+            painter,
+            badge_rect,
+            fill=fill,
+            outline=outline,
+            radius=float(style_spec.get('radius', 5.0)),
+            shadow=QColor(style_spec.get('shadow', QColor(0, 0, 0, 60))),
+            variant=str(style_spec.get('variant', 'solid') or 'solid'),
+            glass_highlight=QColor(style_spec.get('glass_highlight', QColor(255, 255, 255, 68))),
+            path=self._reaction_icon_path(kind, badge_rect),
+            icon_color=icon_color,
+        )
+
     def _draw_star_rating_badge(self, painter, option, index):
         """Draw a compact bottom-corner star badge such as ★3 or ★4.5."""
         try:
@@ -1476,7 +1562,6 @@ class ImageDelegate(QStyledItemDelegate):
                 return
 
             painter.save()
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
             style_spec = self._star_badge_style_spec()
             font = painter.font()
             font.setBold(True)
@@ -1484,15 +1569,25 @@ class ImageDelegate(QStyledItemDelegate):
             painter.setFont(font)
             fm = painter.fontMetrics()
             badge_rect = self._star_badge_rect(option, image, label, fm)
-            variant = str(style_spec.get('variant', 'pill') or 'pill')
-            if variant == 'glass':
-                self._draw_star_badge_glass(painter, badge_rect, label, style_spec)
-            elif variant == 'split':
-                self._draw_star_badge_split(painter, badge_rect, label, style_spec)
-            elif variant == 'halo':
-                self._draw_star_badge_halo(painter, badge_rect, label, style_spec)
-            else:
-                self._draw_star_badge_pill(painter, badge_rect, label, style_spec)
+            self._blit_badge_sprite(
+                painter,
+                badge_rect,
+                ('star', self._star_badge_style, label),
+                lambda sprite_painter, local_rect: self._render_star_badge(
+                    sprite_painter, local_rect, label, style_spec),
+            )
             painter.restore()
         except Exception:
             pass
+
+    def _render_star_badge(self, painter, badge_rect: QRect, label: str, style_spec: dict):
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        variant = str(style_spec.get('variant', 'pill') or 'pill')
+        if variant == 'glass':
+            self._draw_star_badge_glass(painter, badge_rect, label, style_spec)
+        elif variant == 'split':
+            self._draw_star_badge_split(painter, badge_rect, label, style_spec)
+        elif variant == 'halo':
+            self._draw_star_badge_halo(painter, badge_rect, label, style_spec)
+        else:
+            self._draw_star_badge_pill(painter, badge_rect, label, style_spec)
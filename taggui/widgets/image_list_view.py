@@ -15,6 +15,7 @@ from widgets.image_list_masonry_submission_service import MasonrySubmissionServi
 from widgets.image_list_masonry_window_planner_service import MasonryWindowPlannerService
 from widgets.image_list_masonry_completion_service import MasonryCompletionService
 from widgets.reaction_feedback_overlay import ReactionFeedbackOverlay
+from utils.frame_trace import frame_trace
 from PySide6.QtGui import QColor, QPainterPath, QRegion
 from PySide6.QtWidgets import QProxyStyle
 
@@ -536,6 +537,16 @@ class ImageListView(
             return
         overlay.show_feedback(kind, enabled=enabled, stars=stars, anchor_rect=anchor_rect)
 
+    def paintEvent(self, event):
+        if not frame_trace.enabled:
+            super().paintEvent(event)
+            return
+        started = frame_trace.begin_frame()
+        try:
+            super().paintEvent(event)
+        finally:
+            frame_trace.end_frame(started)
+
     def keyboardSearch(self, search: str):
         """Disable Qt type-to-select; typing should not jump the media list."""
         return
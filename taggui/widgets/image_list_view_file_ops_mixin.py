@@ -213,9 +213,13 @@ class ImageListViewFileOpsMixin:
         if not copy_directory_path:
             return
         copy_directory_path = Path(copy_directory_path)
+        from utils.thumbnail_cache import carry_over_cached_thumbnail
+
         for image in selected_images:
             try:
-                shutil.copy(image.path, copy_directory_path)
+                copied_path = Path(shutil.copy(image.path, copy_directory_path))
+                carry_over_cached_thumbnail(
+                    image.path, image.path.stat().st_mtime, copied_path)
                 caption_file_path = image.path.with_suffix('.txt')
                 if caption_file_path.exists():
                     shutil.copy(caption_file_path, copy_directory_path)
@@ -235,6 +239,8 @@ class ImageListViewFileOpsMixin:
         # Get the source model to add duplicated images
         source_model = self.proxy_image_list_model.sourceModel()
 
+        from utils.thumbnail_cache import carry_over_cached_thumbnail
+
         duplicated_count = 0
         created_paths = []
         for image in selected_images:
@@ -255,8 +261,10 @@ class ImageListViewFileOpsMixin:
                     new_path = directory / f"{new_stem}{suffix}"
 
                 # Copy the media file
+                original_mtime = original_path.stat().st_mtime
                 shutil.copyfile(original_path, new_path)
                 os.utime(new_path, None)
+                carry_over_cached_thumbnail(original_path, original_mtime, new_path)
 
                 # Copy caption file if it exists
                 caption_file_path = original_path.with_suffix('.txt')
@@ -2648,13 +2648,7 @@ class ImageListViewGeometryMixin:
             if hit_global < 0:
                 scroll_offset = self.verticalScrollBar().value()
                 adjusted_point = QPoint(point.x(), point.y() + scroll_offset)
-                if not hasattr(self, '_masonry_index_map') or self._masonry_index_map is None:
-                    self._rebuild_masonry_index_map()
-                for global_idx, item in self._masonry_index_map.items():
-                    item_rect = QRect(item['x'], item['y'], item['width'], item['height'])
-                    if item_rect.contains(adjusted_point):
-                        hit_global = int(global_idx)
-                        break
+                hit_global = self._get_masonry_global_at(adjusted_point)
 
             if hit_global >= 0:
                 # Map global index → source row → source index → proxy index.
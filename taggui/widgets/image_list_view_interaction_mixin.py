@@ -1135,19 +1135,9 @@ class ImageListViewInteractionMixin:
                 else:
                     scroll_offset = int(self.verticalScrollBar().value())
                     adjusted_point = QPoint(click_pos.x(), click_pos.y() + scroll_offset)
-                    for item in reversed(self._masonry_items):
-                        g_idx = int(item.get('index', -1))
-                        if g_idx < 0:
-                            continue
-                        item_rect = QRect(
-                            int(item.get('x', 0)),
-                            int(item.get('y', 0)),
-                            int(item.get('width', 0)),
-                            int(item.get('height', 0)),
-                        )
-                        if item_rect.contains(adjusted_point):
-                            clicked_global = g_idx
-                            break
+                    hit_global = self._get_masonry_global_at(adjusted_point, last=True)
+                    if hit_global >= 0:
+                        clicked_global = hit_global
 
                 if clicked_global >= 0 and source_model is not None:
                     if hasattr(source_model, 'get_loaded_row_for_global_index'):
@@ -1459,19 +1449,9 @@ class ImageListViewInteractionMixin:
                     # Fallback: live masonry items (no recent paint).
                     scroll_offset = int(self.verticalScrollBar().value())
                     adjusted_point = QPoint(click_pos.x(), click_pos.y() + scroll_offset)
-                    for item in reversed(self._masonry_items):
-                        g_idx = int(item.get('index', -1))
-                        if g_idx < 0:
-                            continue
-                        item_rect = QRect(
-                            int(item.get('x', 0)),
-                            int(item.get('y', 0)),
-                            int(item.get('width', 0)),
-                            int(item.get('height', 0)),
-                        )
-                        if item_rect.contains(adjusted_point):
-                            clicked_global = g_idx
-                            break
+                    hit_global = self._get_masonry_global_at(adjusted_point, last=True)
+                    if hit_global >= 0:
+                        clicked_global = hit_global
 
                 if clicked_global >= 0 and source_model is not None:
                     self._selected_global_index = int(clicked_global)
@@ -2489,11 +2469,9 @@ class ImageListViewInteractionMixin:
                 if cache.enabled:
                     thumb_width = getattr(source_model, 'thumbnail_generation_width', 512)
                     mtime = image_via_proxy.path.stat().st_mtime
-                    cache_key = cache._get_cache_key(image_via_proxy.path, mtime, thumb_width)
-                    cache_path = cache._get_cache_path(cache_key)
-                    if cache_path.exists():
-                        cache_path.unlink()
-                        print(f"  Deleted disk cache entry: {cache_path.name}")
+                    removed = cache.remove_thumbnail(image_via_proxy.path, mtime, thumb_width)
+                    if removed:
+                        print(f"  Deleted {removed} disk cache level(s).")
                     else:
                         print(f"  No disk cache entry found for this file.")
             except Exception as e:
@@ -2520,7 +2498,7 @@ class ImageListViewInteractionMixin:
                 dimensions = None
                 if is_video:
                     from models.image_list_model import extract_video_info
-                    dimensions, _, _ = extract_video_info(img_path)
+                    dimensions, _, _ = extract_video_info(img_path, include_frame=False)
                 elif suffix == '.jxl':
                     from utils.jxlutil import get_jxl_size
                     dimensions = get_jxl_size(img_path)
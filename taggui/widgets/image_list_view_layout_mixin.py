@@ -1,6 +1,8 @@
 from widgets.image_list_shared import *  # noqa: F401,F403
 from widgets.image_list_masonry_lifecycle_service import MasonryLifecycleService
 from widgets.image_list_masonry_completion_service import MasonryCompletionService
+from widgets.masonry_spatial_index import MasonrySpatialIndex
+from utils.frame_trace import frame_trace
 
 class ImageListViewLayoutMixin:
     def _get_masonry_lifecycle_service(self) -> MasonryLifecycleService:
@@ -29,7 +31,12 @@ class ImageListViewLayoutMixin:
 
     def _on_masonry_calculation_complete(self, result):
         """Called when multiprocessing calculation completes."""
+        if not frame_trace.enabled:
+            self._get_masonry_completion_service().on_masonry_calculation_complete(result)
+            return
+        started = time.perf_counter()
         self._get_masonry_completion_service().on_masonry_calculation_complete(result)
+        frame_trace.record_event('completion', started, detail='masonry result')
 
 
     def _map_row_to_global_index_safely(self, row: int) -> int:
@@ -72,6 +79,27 @@ class ImageListViewLayoutMixin:
 
 
 
+    def _get_masonry_spatial_index(self):
+        """Return the spatial index for the current _masonry_items list.
+
+        Adopts the incremental page cache's index when it was assembled into
+        exactly this list; otherwise indexes the list once and keeps the
+        result until _masonry_items is replaced.
+        """
+        items = self._masonry_items
+        spatial_index = getattr(self, '_masonry_spatial_index', None)
+        if spatial_index is not None and spatial_index.source is items:
+            return spatial_index
+        incremental = getattr(self, '_masonry_incremental_service', None)
+        incremental_index = getattr(incremental, 'spatial_index', None)
+        if incremental_index is not None and incremental_index.source is items:
+            spatial_index = incremental_index
+        else:
+            spatial_index = MasonrySpatialIndex.from_items(items)
+        self._masonry_spatial_index = spatial_index
+        return spatial_index
+
+
     def _get_masonry_visible_items(self, viewport_rect):
         """Get masonry items that intersect with viewport_rect."""
         if not self._masonry_items:
@@ -80,33 +108,42 @@ class ImageListViewLayoutMixin:
         viewport_top = viewport_rect.top()
         viewport_bottom = viewport_rect.bottom()
 
-        # Linear search: masonry items are NOT sorted by Y (columns interleave Y values)
-        # Binary search was incorrectly assuming sorted order
+        # Masonry items are NOT sorted by Y (columns interleave Y values), so
+        # candidates come from the per-column spatial index.
         visible = []
-        for item in self._masonry_items:
-            item_y = item['y']
-            item_bottom = item_y + item['height']
-        
-            # Check if item overlaps with viewport vertically
-            if item_bottom >= viewport_top and item_y <= viewport_bottom:
-                item_rect = QRect(item['x'], item_y, item['width'], item['height'])
-                if item_rect.intersects(viewport_rect):
-                    visible.append({
-                        'index': item['index'],
-                        'rect': item_rect
-                    })
-
-        # DEBUG: Log when no visible items found at deep scroll
-        if not visible and viewport_top > 50000:
-            # Find Y range of all items
-            if self._masonry_items:
-                min_y = min(item['y'] for item in self._masonry_items)
-                max_y = max(item['y'] + item['height'] for item in self._masonry_items)
-                # print(f"[VISIBLE_DEBUG] viewport={viewport_top}-{viewport_bottom}, items Y range={min_y}-{max_y}, count={len(self._masonry_items)}")
+        candidates = self._get_masonry_spatial_index().query_rect(
+            viewport_rect.left(), viewport_top, viewport_rect.right(), viewport_bottom)
+        for item in candidates:
+            item_rect = QRect(item['x'], item['y'], item['width'], item['height'])
+            if item_rect.intersects(viewport_rect):
+                visible.append({
+                    'index': item['index'],
+                    'rect': item_rect
+                })
 
         return visible
 
 
+    def _get_masonry_global_at(self, content_point, *, last=False) -> int:
+        """Global index of the real item containing content_point, or -1.
+
+        With several overlapping hits, returns the first (or with `last`, the
+        last) one in _masonry_items order.
+        """
+        if not self._masonry_items:
+            return -1
+        x, y = content_point.x(), content_point.y()
+        hits = [
+            item for item in self._get_masonry_spatial_index().query_rect(x, y, x, y)
+            if int(item.get('index', -1)) >= 0
+            and QRect(int(item['x']), int(item['y']), int(item['width']),
+                      int(item['height'])).contains(content_point)
+        ]
+        if not hits:
+            return -1
+        return int((hits[-1] if last else hits[0])['index'])
+
+
     def _get_masonry_total_height(self):
         """Get total height from masonry results."""
         return self._masonry_total_height
@@ -736,9 +736,17 @@ class ImageListViewPaintSelectionMixin:
         import gc
         gc.collect()
 
+        from utils.thumbnail_cache import carry_over_cached_thumbnail
+
         for image in selected_images:
             try:
-                image.path.replace(move_directory_path / image.path.name)
+                try:
+                    old_mtime = image.path.stat().st_mtime
+                except OSError:
+                    old_mtime = None
+                moved_path = move_directory_path / image.path.name
+                image.path.replace(moved_path)
+                carry_over_cached_thumbnail(image.path, old_mtime, moved_path, move=True)
                 caption_file_path = image.path.with_suffix('.txt')
                 if caption_file_path.exists():
                     caption_file_path.replace(
@@ -1,3 +1,4 @@
+import os
 import re
 import time
 from PySide6.QtCore import (QEvent, QModelIndex, QPersistentModelIndex, QPoint, QPointF,
@@ -7,7 +8,7 @@ from PySide6.QtWidgets import (QGraphicsItem, QGraphicsPixmapItem, QGraphicsRect
                                QGraphicsScene, QGraphicsSimpleTextItem, QGraphicsView,
                                QVBoxLayout, QWidget, QStyleOptionGraphicsItem)
 from PIL import Image as pilimage
-from models.image_list_model import fallback_decode_qimage, repair_mismatched_image_extension_path
+from models.image_list_model import repair_mismatched_image_extension_path
 from utils.pillow_plugins import ensure_pillow_plugins_registered
 from utils.settings import (
     settings,
@@ -38,6 +39,10 @@ from widgets.marking import (MarkingItem, MarkingLabel, ResizeHintHUD,
 from widgets.marking_view import ImageGraphicsView
 from widgets.ideogram_label_item import IdeogramLabelItem
 from widgets.ideogram_region_item import IdeogramRegionItem
+from widgets.image_viewer_loader import StillImageLoader, decode_still
+from widgets.image_viewer_mipmaps import MipPyramidBuilder, pyramid_divisors, pyramid_key
+from widgets.image_viewer_prefetch import ImagePrefetchRing
+from widgets.image_viewer_tiles import TILED_PIXEL_THRESHOLD, TileLoader, TiledImageItem, tiled_source_for
 
 try:
     from shiboken6 import isValid as _shiboken_is_valid
@@ -605,6 +610,23 @@ class ImageViewer(QWidget):
         self._static_source_size = QSize()
         self._static_mipmap_pixmaps: dict[int, QPixmap] = {}
         self._static_current_mip_divisor = 1
+        # Background decoding of neighboring stills (main viewer only, created on first use).
+        self._prefetch_ring: ImagePrefetchRing | None = None
+        self._prefetch_enabled = (
+            not self.is_spawned_viewer
+            and os.environ.get('TAGGUI_VIEWER_PREFETCH', '1') != '0'
+        )
+        # Tile loader of the current gigapixel still, if it is shown tiled.
+        self._tiled_loader: TileLoader | None = None
+        # Stills decode on a worker while the thumbnail stands in for them.
+        self._async_still_loading = os.environ.get('TAGGUI_VIEWER_ASYNC_LOAD', '1') != '0'
+        self._still_loader: StillImageLoader | None = None
+        # (image, expected size) of the still behind the current placeholder.
+        self._pending_still = None
+        # (path, qimage) decoded in the background, for a reload that needs it.
+        self._still_handoff = None
+        # Builds the zoomed-out levels of the current still off the UI thread.
+        self._mip_builder: MipPyramidBuilder | None = None
 
         # Timer for auto-hiding controls
         self._controls_hide_timer = QTimer(self)
@@ -788,6 +810,8 @@ class ImageViewer(QWidget):
             if pixmap is None or pixmap.isNull():
                 return []
             qimage = pixmap.toImage()
+            # Tiled and still-loading images draw a reduced pixmap scaled up to image space.
+            rect = self.current_image_item.mapRectFromScene(QRectF(rect))
         if qimage is None or qimage.isNull():
             return []
 
@@ -932,6 +956,12 @@ class ImageViewer(QWidget):
     def _apply_static_image_quality_for_scale(self, scale: float | None = None, *, force_full: bool = False):
         if self._is_video_loaded or self.current_image_item is None:
             return
+        if self._tiled_loader is not None:
+            # Tiled stills pick their own pyramid level while painting.
+            return
+        if self._pending_still is not None:
+            # The placeholder thumbnail has no mipmaps; the full image replaces it.
+            return
         if _shiboken_is_valid is not None and not _shiboken_is_valid(self.current_image_item):
             self.current_image_item = None
             return
@@ -943,6 +973,10 @@ class ImageViewer(QWidget):
             return
 
         divisor = 1 if force_full else self._target_static_mip_divisor(scale)
+        if (divisor > 1 and divisor not in self._static_mipmap_pixmaps
+                and self._mip_builder is not None and self._mip_builder.building):
+            # Draw the nearest finer level until the background build reaches this one.
+            divisor = max((ready for ready in self._static_mipmap_pixmaps if ready < divisor), default=1)
         pixmap = self._get_static_mipmap_pixmap(divisor)
         if pixmap.isNull():
             return
@@ -1633,6 +1667,9 @@ class ImageViewer(QWidget):
             return False
         if self._is_video_loaded or self.current_image_item is None:
             return False
+        if self._tiled_loader is not None or self._pending_still is not None:
+            # There is no full-resolution pixmap of a tiled or loading still to compare against.
+            return False
 
         self._apply_static_image_quality_for_scale(1.0, force_full=True)
         base_pixmap = self.current_image_item.pixmap()
@@ -1694,6 +1731,8 @@ class ImageViewer(QWidget):
             return self.enter_compare_mode(base_proxy, incoming_proxy, keep_split_ratio=True)
         if self._is_video_loaded or self.current_image_item is None:
             return False
+        if self._tiled_loader is not None or self._pending_still is not None:
+            return False
         if len(self._compare_overlay_indices) >= 3:
             return self.replace_compare_right(incoming_proxy)
 
@@ -2330,6 +2369,17 @@ class ImageViewer(QWidget):
                 self.video_player.cleanup(force_gc=False)
         except Exception:
             pass
+        if self._prefetch_ring is not None:
+            self._prefetch_ring.shutdown()
+            self._prefetch_ring = None
+        self._release_tiled_image()
+        if self._still_loader is not None:
+            self._still_loader.shutdown()
+            self._still_loader = None
+        if self._mip_builder is not None:
+            self._mip_builder.shutdown()
+            self._mip_builder = None
+        self._pending_still = None
         super().closeEvent(event)
 
     def _position_video_controls(self, force_bottom=False):
@@ -3652,6 +3702,239 @@ class ImageViewer(QWidget):
             traceback.print_exc()
             self._show_error_placeholder(f"Read Error: {e}")
 
+    def _update_neighbor_prefetch(self):
+        """Queue background decodes of the stills next to the current row."""
+        if self._viewer_model_resetting or not self.proxy_image_index.isValid():
+            return
+        if self._prefetch_ring is None:
+            self._prefetch_ring = ImagePrefetchRing()
+        ring = self._prefetch_ring
+        model = self.proxy_image_list_model
+        row = self.proxy_image_index.row()
+        row_count = model.rowCount()
+        neighbor_paths = {}
+        for neighbor_row in ring.neighbor_rows(row):
+            if neighbor_row == row or not (0 <= neighbor_row < row_count):
+                continue
+            image = self._safe_get_image(model.index(neighbor_row, 0))
+            if image is None or bool(getattr(image, 'is_video', False)):
+                continue
+            dimensions = getattr(image, 'dimensions', None)
+            if (TILED_PIXEL_THRESHOLD > 0 and dimensions
+                    and dimensions[0] * dimensions[1] >= TILED_PIXEL_THRESHOLD):
+                # Shown tiled, so a full decode would be wasted memory.
+                continue
+            neighbor_paths[neighbor_row] = image.path
+        ring.update(row, neighbor_paths)
+
+    def _show_tiled_image(self, image) -> bool:
+        """Show a gigapixel still as a tiled item; False if it is not tiled."""
+        source = tiled_source_for(image.path)
+        if source is None:
+            return False
+        preview = source.decode_preview()
+        if preview is None:
+            return False
+        loader = TileLoader(source, parent=self)
+        image_item = TiledImageItem(source, preview, loader)
+        image_item.setTransformationMode(Qt.TransformationMode.SmoothTransformation)
+        image_item.setZValue(0)
+        self._set_scene_rect_for_item(image_item)
+        self.scene.addItem(image_item)
+        self.current_image_item = image_item
+        self.current_video_item = None
+        self._static_source_qimage = None
+        self._static_source_size = QSize(source.width, source.height)
+        self._static_mipmap_pixmaps = {}
+        self._static_current_mip_divisor = 1
+        self._tiled_loader = loader
+        MarkingItem.image_size = QRect(0, 0, source.width, source.height)
+        self._schedule_deferred_extension_repair(image)
+        self._fast_pan_visual_mode = True
+        self._set_fast_pan_visual_mode(False)
+        print(f"[IMAGE_VIEWER] Tiled rendering for {source.width}x{source.height} "
+              f"{image.path.name} (preview 1/{1 << source.preview_level})")
+        return True
+
+    def _show_static_qimage(self, image, qimage: QImage):
+        pixmap = QPixmap.fromImage(qimage)
+        self._static_source_qimage = qimage
+        self._static_source_size = qimage.size()
+        self._static_mipmap_pixmaps = {1: pixmap}
+        self._static_current_mip_divisor = 1
+        self._start_static_mip_pyramid(image.path, qimage)
+        self._schedule_deferred_extension_repair(image)
+
+        # Use standard pixmap item with SmoothTransformation
+        image_item = QGraphicsPixmapItem(pixmap)
+        image_item.setTransformationMode(Qt.TransformationMode.SmoothTransformation)
+        image_item.setCacheMode(QGraphicsItem.NoCache)
+        image_item.setZValue(0)
+        self._set_scene_rect_for_item(image_item)
+        self.scene.addItem(image_item)
+        self.current_image_item = image_item  # Keep reference to prevent garbage collection!
+        self.current_video_item = None
+        MarkingItem.image_size = QRect(QPoint(0, 0), qimage.size())
+        self._fast_pan_visual_mode = True
+        self._set_fast_pan_visual_mode(False)
+
+    def _apply_still_path_changes(self, image, path_changes) -> None:
+        """Follow renames and conversions made while decoding `image`."""
+        for stale_path, new_path in path_changes:
+            image.path = new_path
+            self._invalidate_current_thumbnail_after_path_repair(image, stale_path=stale_path)
+            self._persist_repaired_selection_path(image.path)
+
+    def _still_placeholder_qimage(self, image, size: QSize | None) -> QImage | None:
+        """The list thumbnail of `image` if it shows the whole frame."""
+        if getattr(image, 'crop', None) is not None:
+            return None
+        qimage = getattr(image, 'thumbnail_qimage', None)
+        if qimage is None or qimage.isNull():
+            try:
+                from utils.thumbnail_cache import get_thumbnail_cache
+                source_model = getattr(self.proxy_image_list_model, 'sourceModel', lambda: None)()
+                thumb_width = getattr(source_model, 'thumbnail_generation_width', 512)
+                cache = get_thumbnail_cache()
+                qimage = None
+                if cache.enabled:
+                    qimage = cache.get_thumbnail_qimage(image.path, image.path.stat().st_mtime, thumb_width)
+            except Exception:
+                qimage = None
+        if qimage is None or qimage.isNull():
+            return None
+        if size is not None:
+            # Very tall images get a cropped thumbnail; do not stretch it.
+            aspect = size.width() / size.height()
+            if abs(qimage.width() / qimage.height() - aspect) > 0.02 * aspect:
+                return None
+        return qimage
+
+    def _show_still_placeholder(self, image) -> None:
+        """Show the thumbnail at full size and decode the still in the background."""
+        size = image.dimensions_qsize()
+        thumbnail = self._still_placeholder_qimage(image, size)
+        if size is None:
+            size = thumbnail.size() if thumbnail is not None else QSize(800, 600)
+        if thumbnail is not None:
+            pixmap = QPixmap.fromImage(thumbnail)
+        else:
+            pixmap = QPixmap(1, 1)
+            pixmap.fill(Qt.GlobalColor.transparent)
+
+        image_item = QGraphicsPixmapItem(pixmap)
+        image_item.setTransformationMode(Qt.TransformationMode.SmoothTransformation)
+        image_item.setCacheMode(QGraphicsItem.NoCache)
+        image_item.setZValue(0)
+        image_item.setTransform(QTransform.fromScale(
+            size.width() / pixmap.width(), size.height() / pixmap.height()))
+        self._set_scene_rect_for_item(image_item)
+        self.scene.addItem(image_item)
+        self.current_image_item = image_item
+        self.current_video_item = None
+        self._static_source_qimage = None
+        self._static_source_size = QSize(size)
+        self._static_mipmap_pixmaps = {}
+        self._static_current_mip_divisor = 1
+        MarkingItem.image_size = QRect(QPoint(0, 0), size)
+        self._pending_still = (image, QSize(size))
+
+        if self._still_loader is None:
+            self._still_loader = StillImageLoader(parent=self)
+            self._still_loader.set_loaded_callback(self._on_still_loaded)
+            self._still_loader.set_superseded_callback(self._on_superseded_still_loaded)
+        self._still_loader.prefetch_ring = self._prefetch_ring
+        self._still_loader.request(image.path, image)
+
+    def _cancel_pending_still(self) -> None:
+        self._pending_still = None
+        if self._still_loader is not None:
+            self._still_loader.cancel()
+        if self._mip_builder is not None:
+            self._mip_builder.cancel()
+
+    def _start_static_mip_pyramid(self, image_path, qimage: QImage) -> None:
+        """Build the zoomed-out levels of `qimage` in the background."""
+        divisors = pyramid_divisors(qimage.width(), qimage.height(), STATIC_IMAGE_MIP_DIVISORS)
+        if not divisors:
+            return
+        if self._mip_builder is None:
+            self._mip_builder = MipPyramidBuilder(parent=self)
+            self._mip_builder.set_level_callback(self._on_mip_level_ready)
+        shared = self._mip_builder.build(pyramid_key(image_path, qimage), qimage, divisors)
+        for divisor, level in shared.items():
+            self._static_mipmap_pixmaps.setdefault(divisor, QPixmap.fromImage(level))
+
+    def _on_mip_level_ready(self, divisor: int, level: QImage) -> None:
+        if self._static_source_qimage is None:
+            return
+        self._static_mipmap_pixmaps.setdefault(divisor, QPixmap.fromImage(level))
+        self._apply_static_image_quality_for_scale()
+
+    def _take_still_handoff(self, path) -> QImage | None:
+        handoff, self._still_handoff = self._still_handoff, None
+        if handoff is not None and handoff[0] == path:
+            return handoff[1]
+        return None
+
+    def _on_superseded_still_loaded(self, image, result) -> None:
+        """Follow repairs of a still the selection already left; its pixels are dropped."""
+        if image is None:
+            return
+        for stale_path, new_path in result.path_changes:
+            image.path = new_path
+            self._invalidate_current_thumbnail_after_path_repair(image, stale_path=stale_path)
+            try:
+                restore_path = str(settings.value('last_selected_path', '') or '')
+            except Exception:
+                restore_path = ''
+            if restore_path == str(stale_path):
+                self._persist_repaired_selection_path(new_path)
+
+    def _on_still_loaded(self, result) -> None:
+        pending, self._pending_still = self._pending_still, None
+        if pending is None:
+            return
+        image, expected_size = pending
+        self._apply_still_path_changes(image, result.path_changes)
+        if result.qimage is None:
+            print(f"[IMAGE_VIEWER] Load failed (expected): {result.error}")
+            self.current_image_item = None
+            self._show_error_placeholder(f"Read Error: {result.error}")
+            return
+        item = self.current_image_item
+        if item is None or (_shiboken_is_valid is not None and not _shiboken_is_valid(item)):
+            return
+        qimage = result.qimage
+        if qimage.size() != expected_size:
+            # The list had other (or no) dimensions for it; lay the scene out again.
+            self._still_handoff = (image.path, qimage)
+            inhibit_reload_image = self.inhibit_reload_image
+            self.inhibit_reload_image = False
+            try:
+                self.load_image(self.proxy_image_index)
+            finally:
+                self.inhibit_reload_image = inhibit_reload_image
+            return
+
+        pixmap = QPixmap.fromImage(qimage)
+        self._static_source_qimage = qimage
+        self._static_source_size = qimage.size()
+        self._static_mipmap_pixmaps = {1: pixmap}
+        self._static_current_mip_divisor = 1
+        item.setTransform(QTransform())
+        item.setPixmap(pixmap)
+        item.setScale(1.0)
+        self._start_static_mip_pyramid(image.path, qimage)
+        self._apply_static_image_quality_for_scale()
+        self._schedule_deferred_extension_repair(image)
+
+    def _release_tiled_image(self):
+        if self._tiled_loader is not None:
+            self._tiled_loader.shutdown()
+            self._tiled_loader.deleteLater()
+            self._tiled_loader = None
+
     def _invalidate_current_thumbnail_after_path_repair(self, image, stale_path=None) -> None:
         """Clear stale thumbnail state and request one fresh thumbnail repaint."""
         try:
@@ -3667,10 +3950,7 @@ class ImageViewer(QWidget):
                 thumb_width = getattr(source_model, 'thumbnail_generation_width', 512)
                 cache_path_target = stale_path if stale_path is not None else image.path
                 mtime = cache_path_target.stat().st_mtime
-                cache_key = cache._get_cache_key(cache_path_target, mtime, thumb_width)
-                cache_path = cache._get_cache_path(cache_key)
-                if cache_path.exists():
-                    cache_path.unlink()
+                cache.remove_thumbnail(cache_path_target, mtime, thumb_width)
         except Exception:
             pass
 
@@ -3798,6 +4078,8 @@ class ImageViewer(QWidget):
             self._clear_marking_items_from_scene()
             self.ideogram_overlay_items.clear()
             self.view.clear_scene()
+            self._release_tiled_image()
+            self._cancel_pending_still()
             auto_play_after_layout = False
             was_video_loaded = bool(self._is_video_loaded)
 
@@ -3904,61 +4186,28 @@ class ImageViewer(QWidget):
                 except Exception:
                     pass
 
-                # Load static image using QImageReader (like thumbnails for best quality)
-                from PySide6.QtGui import QImageReader
-                image_reader = QImageReader(str(image.path))
-                image_reader.setAutoTransform(True)
-                qimage = image_reader.read()
-
-                if qimage.isNull():
-                    qimage, _fallback_size, fallback_path = fallback_decode_qimage(image.path)
-                    if fallback_path != image.path:
-                        stale_path = image.path
-                        image.path = fallback_path
-                        self._invalidate_current_thumbnail_after_path_repair(image, stale_path=stale_path)
-                        self._persist_repaired_selection_path(image.path)
-                    if qimage is None:
-                        repaired_path = repair_mismatched_image_extension_path(image.path)
-                        if repaired_path != image.path:
-                            stale_path = image.path
-                            image.path = repaired_path
-                            self._invalidate_current_thumbnail_after_path_repair(image, stale_path=stale_path)
-                            self._persist_repaired_selection_path(image.path)
-                            image_reader = QImageReader(str(image.path))
-                            image_reader.setAutoTransform(True)
-                            qimage = image_reader.read()
-
-                        if qimage is None or qimage.isNull():
-                            qimage, _fallback_size, fallback_path = fallback_decode_qimage(image.path)
-                            if fallback_path != image.path:
-                                stale_path = image.path
-                                image.path = fallback_path
-                                self._invalidate_current_thumbnail_after_path_repair(image, stale_path=stale_path)
-                                self._persist_repaired_selection_path(image.path)
-                            if qimage is None:
-                                raise pilimage.UnidentifiedImageError(
-                                    f"cannot identify image file '{image.path}'"
-                                )
-
-                pixmap = QPixmap.fromImage(qimage)
-                self._static_source_qimage = qimage
-                self._static_source_size = qimage.size()
-                self._static_mipmap_pixmaps = {1: pixmap}
-                self._static_current_mip_divisor = 1
-                self._schedule_deferred_extension_repair(image)
-
-                # Use standard pixmap item with SmoothTransformation
-                image_item = QGraphicsPixmapItem(pixmap)
-                image_item.setTransformationMode(Qt.TransformationMode.SmoothTransformation)
-                image_item.setCacheMode(QGraphicsItem.NoCache)
-                image_item.setZValue(0)
-                self._set_scene_rect_for_item(image_item)
-                self.scene.addItem(image_item)
-                self.current_image_item = image_item  # Keep reference to prevent garbage collection!
-                self.current_video_item = None
-                MarkingItem.image_size = QRect(QPoint(0, 0), qimage.size())
-                self._fast_pan_visual_mode = True
-                self._set_fast_pan_visual_mode(False)
+                # Load static image using QImageReader (like thumbnails for best quality).
+                # Gigapixel stills are tiled; others come from the prefetch ring or
+                # decode in the background behind the thumbnail.
+                if not self._show_tiled_image(image):
+                    qimage = self._take_still_handoff(image.path)
+                    if qimage is None and self._prefetch_ring is not None:
+                        qimage = self._prefetch_ring.take(
+                            image.path, wait=not self._async_still_loading)
+                    if qimage is None and self._async_still_loading:
+                        self._show_still_placeholder(image)
+                    else:
+                        if qimage is None:
+                            result = decode_still(image.path)
+                            self._apply_still_path_changes(image, result.path_changes)
+                            if result.qimage is None:
+                                raise pilimage.UnidentifiedImageError(result.error)
+                            qimage = result.qimage
+                        self._show_static_qimage(image, qimage)
+
+            if self._prefetch_enabled:
+                # After this event so the selected image paints first.
+                QTimer.singleShot(0, self._update_neighbor_prefetch)
 
             mode = self.get_zoom_follow_mode()
             if mode == ZOOM_FOLLOW_MODE_FIT_LOCK:
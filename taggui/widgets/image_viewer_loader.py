@@ -0,0 +1,141 @@
+"""Background decoding of the still selected in the image viewer.
+
+The viewer used to decode the selected still on the UI thread, including the
+repair chain for damaged or misnamed files: the PIL and OpenCV fallbacks, the
+extension repair rename and the ffmpeg conversion. One bad file could freeze
+the window for seconds. `StillImageLoader` runs `decode_still` on worker
+threads instead. Every request gets a new generation number. Queued requests
+from older generations are cancelled, and results that arrive for them are
+dropped, so only the latest selection is ever shown.
+
+Path changes found by the repair chain are returned to the caller rather than
+applied here, because updating the `Image`, the thumbnail cache and the
+restore settings has to happen on the UI thread. A superseded decode that
+already started still renames or converts the file on disk, so its path
+changes are reported through a separate callback even though its pixels are
+dropped.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtGui import QImage, QImageReader
+
+from models.image_list_model import fallback_decode_qimage, repair_mismatched_image_extension_path
+
+
+@dataclass
+class StillLoadResult:
+    qimage: QImage | None
+    path: Path
+    # (old path, new path) for each rename or conversion, in order.
+    path_changes: list[tuple[Path, Path]] = field(default_factory=list)
+    error: str = ''
+
+
+def _read_qimage(path: Path) -> QImage | None:
+    reader = QImageReader(str(path))
+    reader.setAutoTransform(True)
+    qimage = reader.read()
+    return None if qimage.isNull() else qimage
+
+
+def decode_still(path: Path) -> StillLoadResult:
+    """Decode a still the way the viewer shows it, repairing the file if needed."""
+    path = Path(path)
+    path_changes = []
+    qimage = _read_qimage(path)
+    if qimage is not None:
+        return StillLoadResult(qimage, path)
+
+    qimage, _fallback_size, fallback_path = fallback_decode_qimage(path)
+    if fallback_path != path:
+        path_changes.append((path, fallback_path))
+        path = fallback_path
+    if qimage is None:
+        repaired_path = repair_mismatched_image_extension_path(path)
+        if repaired_path != path:
+            path_changes.append((path, repaired_path))
+            path = repaired_path
+            qimage = _read_qimage(path)
+        if qimage is None:
+            qimage, _fallback_size, fallback_path = fallback_decode_qimage(path)
+            if fallback_path != path:
+                path_changes.append((path, fallback_path))
+                path = fallback_path
+
+    if qimage is None:
+        return StillLoadResult(None, path, path_changes, f"cannot identify image file '{path}'")
+    return StillLoadResult(qimage, path, path_changes)
+
+
+class StillImageLoader(QObject):
+    """Decodes the selected still off the UI thread; stale results are dropped."""
+
+    loaded = Signal(int, object)  # generation, StillLoadResult
+
+    def __init__(self, decode=decode_still, parent=None):
+        super().__init__(parent)
+        self._decode = decode
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="viewer_still")
+        self._pending = {}  # generation -> (Future, context)
+        self._closed = False
+        self._on_loaded = None
+        self._on_superseded = None
+        self.generation = 0
+        # Checked on the worker first, so a neighbor decode already under way is reused.
+        self.prefetch_ring = None
+        self.loaded.connect(self._deliver)
+
+    def set_loaded_callback(self, callback):
+        """Call `callback(result)` on the GUI thread for the latest request only."""
+        self._on_loaded = callback
+
+    def set_superseded_callback(self, callback):
+        """Call `callback(context, result)` for superseded decodes that changed paths."""
+        self._on_superseded = callback
+
+    def request(self, path, context=None) -> int:
+        """Start decoding `path`, superseding every earlier request.
+
+        `context` is handed back with the result of a superseded decode.
+        """
+        self.cancel()
+        generation = self.generation
+        if not self._closed:
+            future = self._executor.submit(self._run, generation, Path(path), self.prefetch_ring)
+            self._pending[generation] = (future, context)
+        return generation
+
+    def cancel(self):
+        """Drop the current request; a decode that already started only reports path changes."""
+        self.generation += 1
+        for generation, (future, _context) in list(self._pending.items()):
+            if future.cancel():
+                del self._pending[generation]
+
+    def shutdown(self):
+        self._closed = True
+        self._on_loaded = None
+        self._on_superseded = None
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, generation: int, path: Path, prefetch_ring):
+        try:
+            qimage = prefetch_ring.take(path) if prefetch_ring is not None else None
+            result = StillLoadResult(qimage, path) if qimage is not None else self._decode(path)
+        except Exception as e:
+            result = StillLoadResult(None, path, error=str(e))
+        if not self._closed:
+            self.loaded.emit(generation, result)
+
+    def _deliver(self, generation: int, result: StillLoadResult):
+        _future, context = self._pending.pop(generation, (None, None))
+        if generation == self.generation:
+            if self._on_loaded is not None:
+                self._on_loaded(result)
+        elif result.path_changes and self._on_superseded is not None:
+            self._on_superseded(context, result)
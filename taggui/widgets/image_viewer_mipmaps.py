@@ -0,0 +1,162 @@
+"""Background mip pyramids for stills shown in the image viewer.
+
+Zoomed-out stills are drawn from a downscaled copy so smooth filtering stays
+cheap. The copies used to be made with `QImage.scaled` on the UI thread the
+first time a zoom level was needed, which made the first zoom-out on a large
+image hitch. `MipPyramidBuilder` now builds every level on a worker right
+after the image loads, each level from the previous one, and hands levels to
+the viewer as they finish.
+
+Finished pyramids go into `shared_mip_pyramids`, an LRU shared by every
+viewer in the process. The main, fullscreen and floating viewers reuse the
+levels of an image another viewer has already built. Entries are keyed by path,
+file size, mtime and image size, so an edited file gets a new pyramid.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QObject, Qt, Signal
+from PySide6.QtGui import QImage
+
+
+SHARED_BUDGET_BYTES = 256 * 1024 * 1024
+# Levels whose longer side would drop below this are not built.
+MIN_LEVEL_DIMENSION = 256
+
+
+def pyramid_key(path, qimage: QImage) -> tuple | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return str(path), int(stat.st_size), int(stat.st_mtime_ns), qimage.width(), qimage.height()
+
+
+def pyramid_divisors(width: int, height: int, divisors) -> list[int]:
+    """The divisors above 1 worth building for an image of this size."""
+    longest = max(int(width), int(height))
+    return [divisor for divisor in divisors
+            if divisor > 1 and longest / float(divisor) >= MIN_LEVEL_DIMENSION]
+
+
+def level_size(width: int, height: int, divisor: int) -> tuple[int, int]:
+    return (max(1, int(round(float(width) / float(divisor)))),
+            max(1, int(round(float(height) / float(divisor)))))
+
+
+class MipPyramidCache:
+    """LRU of pyramids keyed by `pyramid_key`, bounded in bytes."""
+
+    def __init__(self, budget_bytes: int = SHARED_BUDGET_BYTES):
+        self.budget_bytes = int(budget_bytes)
+        self.bytes = 0
+        self._lock = threading.Lock()
+        self._pyramids: OrderedDict[tuple, dict[int, QImage]] = OrderedDict()
+
+    def levels(self, key) -> dict[int, QImage]:
+        with self._lock:
+            levels = self._pyramids.get(key)
+            if levels is None:
+                return {}
+            self._pyramids.move_to_end(key)
+            return dict(levels)
+
+    def add_level(self, key, divisor: int, qimage: QImage):
+        size = int(qimage.sizeInBytes())
+        with self._lock:
+            levels = self._pyramids.setdefault(key, {})
+            self._pyramids.move_to_end(key)
+            previous = levels.get(divisor)
+            if previous is not None:
+                self.bytes -= int(previous.sizeInBytes())
+            levels[divisor] = qimage
+            self.bytes += size
+            while self.bytes > self.budget_bytes and len(self._pyramids) > 1:
+                old_key, old_levels = next(iter(self._pyramids.items()))
+                if old_key == key:
+                    break
+                del self._pyramids[old_key]
+                self.bytes -= sum(int(level.sizeInBytes()) for level in old_levels.values())
+
+    def clear(self):
+        with self._lock:
+            self._pyramids.clear()
+            self.bytes = 0
+
+
+shared_mip_pyramids = MipPyramidCache()
+
+
+class MipPyramidBuilder(QObject):
+    """Builds pyramid levels on a worker; results arrive via `level_ready`."""
+
+    # generation, divisor, QImage; divisor 0 (and no image) marks the end of a build.
+    level_ready = Signal(int, int, object)
+
+    def __init__(self, cache: MipPyramidCache | None = None, parent=None):
+        super().__init__(parent)
+        self.cache = shared_mip_pyramids if cache is None else cache
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="viewer_mipmaps")
+        self._closed = False
+        self._on_level = None
+        self.generation = 0
+        self.building = False
+        self.level_ready.connect(self._deliver)
+
+    def set_level_callback(self, callback):
+        """Call `callback(divisor, qimage)` on the GUI thread as levels finish."""
+        self._on_level = callback
+
+    def build(self, key, source: QImage, divisors: list[int]) -> dict[int, QImage]:
+        """Start building `divisors` for `source`; returns the levels already shared."""
+        self.cancel()
+        shared = self.cache.levels(key) if key is not None else {}
+        if self._closed or all(divisor in shared for divisor in divisors):
+            return shared
+        self.building = True
+        self._executor.submit(self._run, self.generation, key, source, sorted(divisors), shared)
+        return shared
+
+    def cancel(self):
+        """Stop delivering the current build; its worker stops at the next level."""
+        self.generation += 1
+        self.building = False
+
+    def shutdown(self):
+        self._closed = True
+        self._on_level = None
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, generation: int, key, source: QImage, divisors: list[int], shared):
+        previous = source
+        try:
+            for divisor in divisors:
+                if generation != self.generation or self._closed:
+                    return
+                level = shared.get(divisor)
+                if level is None:
+                    width, height = level_size(source.width(), source.height(), divisor)
+                    level = previous.scaled(width, height, Qt.AspectRatioMode.IgnoreAspectRatio,
+                                            Qt.TransformationMode.SmoothTransformation)
+                    if key is not None:
+                        self.cache.add_level(key, divisor, level)
+                    self.level_ready.emit(generation, divisor, level)
+                previous = level
+        except Exception as e:
+            print(f"[IMAGE_VIEWER] Mipmap build failed: {e}")
+        finally:
+            if not self._closed:
+                self.level_ready.emit(generation, 0, None)
+
+    def _deliver(self, generation: int, divisor: int, level):
+        if generation != self.generation:
+            return
+        if divisor == 0:
+            self.building = False
+            return
+        if self._on_level is not None:
+            self._on_level(divisor, level)
@@ -0,0 +1,174 @@
+"""Background decoding of the images next to the one shown in the viewer.
+
+Stepping through large photos with the arrow keys used to decode each one on
+the UI thread when it was selected. `ImagePrefetchRing` decodes the next and
+previous few images in the list order on worker threads. It keeps the decoded
+`QImage`s under a byte budget, so when the selection moves onto one of them,
+the only UI-thread work left is `QPixmap.fromImage`.
+
+Cache entries are keyed by path, size and modification time. An image edited
+on disk is decoded again instead of being served stale.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from PySide6.QtGui import QImage, QImageReader
+
+
+# Rows decoded ahead in the direction of travel; half as many (at least one) behind.
+DEFAULT_NEIGHBORS = 3
+DEFAULT_BUDGET_BYTES = 768 * 1024 * 1024
+# Waiting for an in-flight decode of the selected image beats starting over.
+IN_FLIGHT_WAIT_S = 2.0
+
+
+def _cache_key(path) -> tuple[str, int, int] | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return str(path), int(stat.st_size), int(stat.st_mtime_ns)
+
+
+def decode_static_qimage(path) -> QImage | None:
+    """Decode like the viewer does; None when Qt cannot read the file."""
+    reader = QImageReader(str(path))
+    reader.setAutoTransform(True)
+    qimage = reader.read()
+    if qimage.isNull():
+        return None
+    return qimage
+
+
+class ImagePrefetchRing:
+    def __init__(self, *, neighbors: int = DEFAULT_NEIGHBORS,
+                 budget_bytes: int = DEFAULT_BUDGET_BYTES, decode=decode_static_qimage):
+        self.neighbors = max(0, int(neighbors))
+        self.budget_bytes = max(0, int(budget_bytes))
+        self._decode = decode
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="viewer_prefetch")
+        self._lock = threading.Lock()
+        self._ready: OrderedDict[tuple, QImage] = OrderedDict()
+        self._ready_bytes = 0
+        self._pending = {}  # key -> Future
+        self._wanted: set[tuple] = set()
+        self._last_row = None
+        self._direction = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def ready_bytes(self) -> int:
+        return self._ready_bytes
+
+    def shutdown(self):
+        with self._lock:
+            for future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+            self._ready.clear()
+            self._ready_bytes = 0
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def take(self, path, *, wait: bool = True) -> QImage | None:
+        """Decoded image for `path` if it is ready or about to be.
+
+        An image whose decode is already running is waited for, unless `wait`
+        is False, in which case None is returned and the decode keeps going.
+        A queued decode that has not started is cancelled, and the caller
+        decodes it.
+        """
+        key = _cache_key(path)
+        if key is None:
+            return None
+        with self._lock:
+            qimage = self._ready.get(key)
+            if qimage is not None:
+                self._ready.move_to_end(key)
+                self.hits += 1
+                return qimage
+            future = self._pending.get(key)
+        if future is not None and not wait and future.running():
+            return None
+        if future is not None and not future.cancel():
+            try:
+                qimage = future.result(timeout=IN_FLIGHT_WAIT_S)
+            except Exception:
+                qimage = None
+            if qimage is not None:
+                self.hits += 1
+                return qimage
+        self.misses += 1
+        return None
+
+    def neighbor_rows(self, row: int) -> range:
+        """Rows `update` may ask for around `row`."""
+        return range(row - self.neighbors, row + self.neighbors + 1)
+
+    def update(self, row: int, neighbor_paths: dict[int, Path]):
+        """Prefetch around `row`; `neighbor_paths` maps nearby rows to image paths.
+
+        Rows in the direction of travel are queued first, and fewer rows are
+        kept behind. When the direction reverses, queued decodes for rows that
+        are no longer wanted are cancelled.
+        """
+        if self._last_row is not None and row != self._last_row:
+            self._direction = 1 if row > self._last_row else -1
+        self._last_row = row
+        lead = self._direction or 1
+
+        behind = max(1, self.neighbors // 2) if self.neighbors else 0
+        ordered_rows = [row + lead * distance for distance in range(1, self.neighbors + 1)]
+        ordered_rows += [row - lead * distance for distance in range(1, behind + 1)]
+
+        wanted = []
+        for neighbor_row in ordered_rows:
+            path = neighbor_paths.get(neighbor_row)
+            if path is None:
+                continue
+            key = _cache_key(path)
+            if key is not None:
+                wanted.append((key, path))
+
+        with self._lock:
+            self._wanted = {key for key, _path in wanted}
+            for key, future in list(self._pending.items()):
+                if key not in self._wanted and future.cancel():
+                    del self._pending[key]
+            for key, path in wanted:
+                if key in self._ready or key in self._pending:
+                    continue
+                self._pending[key] = self._executor.submit(self._decode_into_cache, key, path)
+
+    def _decode_into_cache(self, key, path):
+        qimage = None
+        try:
+            qimage = self._decode(path)
+            return qimage
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+                if qimage is not None and key in self._wanted:
+                    self._store_locked(key, qimage)
+
+    def _store_locked(self, key, qimage: QImage):
+        size = int(qimage.sizeInBytes())
+        if size > self.budget_bytes:
+            return
+        previous = self._ready.pop(key, None)
+        if previous is not None:
+            self._ready_bytes -= int(previous.sizeInBytes())
+        self._ready[key] = qimage
+        self._ready_bytes += size
+        # Evict least recently used entries, preferring ones the ring no longer wants.
+        for evict_wanted in (False, True):
+            for old_key in list(self._ready):
+                if self._ready_bytes <= self.budget_bytes:
+                    return
+                if old_key == key or ((old_key in self._wanted) != evict_wanted):
+                    continue
+                self._ready_bytes -= int(self._ready.pop(old_key).sizeInBytes())
@@ -0,0 +1,344 @@
+"""Tiled, on-demand rendering for very large stills in the image viewer.
+
+The normal path decodes the whole file into one QImage. For a 20k x 20k scan
+that is gigabytes of RAM and a long stall on the UI thread. For images above
+`TILED_PIXEL_THRESHOLD`, the viewer instead shows a `TiledImageItem`:
+
+- A small preview, decoded with `QImageReader.setScaledSize`, is always
+  available and is drawn first.
+- Level k of the pyramid is the image at 1 / 2**k scale, cut into
+  `TILE_SIZE` tiles. Paint picks the level that matches the zoom and asks a
+  `TileLoader` for the missing visible tiles. The loader decodes them on
+  worker threads with `setClipRect` plus `setScaledSize`, a row strip of tiles
+  per read.
+- Until a tile arrives, the best cached coarser tile, or the preview, is
+  drawn in its place, so the view refines from coarse to fine while panning
+  and zooming.
+
+Region decoding needs an image plugin that implements clip rect and scaled
+size reads (Qt's JPEG plugin does). Other formats, and files with an EXIF
+rotation, keep the full-decode path.
+"""
+
+import math
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QObject, QRect, QRectF, QSize, Qt, Signal
+from PySide6.QtGui import QImage, QImageIOHandler, QImageReader, QPainter, QPixmap
+from PySide6.QtWidgets import QGraphicsItem, QGraphicsPixmapItem
+
+
+# Images with at least this many pixels are tiled; 0 disables tiling.
+TILED_PIXEL_THRESHOLD = int(os.environ.get('TAGGUI_TILED_IMAGE_PIXELS', 50_000_000))
+TILE_SIZE = 512
+# The preview is the first pyramid level whose longer side fits in this.
+PREVIEW_MAX_DIMENSION = 2048
+TILE_CACHE_BUDGET_BYTES = 256 * 1024 * 1024
+# Tiles per row strip; strips are aligned so repeated requests reuse keys.
+STRIP_TILES = 4
+
+
+class TiledImageSource:
+    """Geometry of the tile pyramid for one file, plus its decoders."""
+
+    def __init__(self, path, width: int, height: int):
+        self.path = str(path)
+        self.width = int(width)
+        self.height = int(height)
+        longest = max(self.width, self.height)
+        self.preview_level = max(0, math.ceil(math.log2(longest / PREVIEW_MAX_DIMENSION))) \
+            if longest > PREVIEW_MAX_DIMENSION else 0
+
+    def level_size(self, level: int) -> tuple[int, int]:
+        scale = 1 << level
+        return -(-self.width // scale), -(-self.height // scale)
+
+    def tile_grid(self, level: int) -> tuple[int, int]:
+        level_width, level_height = self.level_size(level)
+        return -(-level_width // TILE_SIZE), -(-level_height // TILE_SIZE)
+
+    def tile_source_rect(self, level: int, tx: int, ty: int) -> QRect:
+        span = TILE_SIZE << level
+        x = tx * span
+        y = ty * span
+        return QRect(x, y, min(span, self.width - x), min(span, self.height - y))
+
+    def tile_level_size(self, level: int, tx: int, ty: int) -> tuple[int, int]:
+        level_width, level_height = self.level_size(level)
+        return (min(TILE_SIZE, level_width - tx * TILE_SIZE),
+                min(TILE_SIZE, level_height - ty * TILE_SIZE))
+
+    def tiles_in_rect(self, level: int, rect: QRectF) -> list[tuple[int, int]]:
+        """Tiles at `level` that intersect `rect`, given in source pixels."""
+        span = TILE_SIZE << level
+        columns, rows = self.tile_grid(level)
+        left = max(0, int(rect.left() // span))
+        top = max(0, int(rect.top() // span))
+        right = min(columns - 1, int(math.ceil(rect.right() / span)) - 1)
+        bottom = min(rows - 1, int(math.ceil(rect.bottom() / span)) - 1)
+        return [(tx, ty) for ty in range(top, bottom + 1) for tx in range(left, right + 1)]
+
+    def _reader(self) -> QImageReader:
+        reader = QImageReader(self.path)
+        reader.setAutoTransform(False)
+        return reader
+
+    def decode_preview(self) -> QImage | None:
+        reader = self._reader()
+        width, height = self.level_size(self.preview_level)
+        reader.setScaledSize(QSize(width, height))
+        qimage = reader.read()
+        return None if qimage.isNull() else qimage
+
+    def decode_strip(self, level: int, ty: int, first_tx: int, last_tx: int) -> list:
+        """Decode tiles first_tx..last_tx of row `ty` in one read."""
+        first = self.tile_source_rect(level, first_tx, ty)
+        last = self.tile_source_rect(level, last_tx, ty)
+        widths = [self.tile_level_size(level, tx, ty)[0] for tx in range(first_tx, last_tx + 1)]
+        height = self.tile_level_size(level, first_tx, ty)[1]
+        reader = self._reader()
+        reader.setClipRect(QRect(first.left(), first.top(), last.right() - first.left() + 1, first.height()))
+        reader.setScaledSize(QSize(sum(widths), height))
+        strip = reader.read()
+        if strip.isNull():
+            return []
+        tiles = []
+        offset = 0
+        for tx, width in zip(range(first_tx, last_tx + 1), widths):
+            tiles.append(((level, tx, ty), strip.copy(offset, 0, width, height)))
+            offset += width
+        return tiles
+
+
+def tiled_source_for(path, threshold: int | None = None) -> TiledImageSource | None:
+    """A TiledImageSource when `path` is large enough and region-decodable."""
+    threshold = TILED_PIXEL_THRESHOLD if threshold is None else int(threshold)
+    if threshold <= 0:
+        return None
+    reader = QImageReader(str(path))
+    size = reader.size()
+    if not size.isValid() or size.width() * size.height() < threshold:
+        return None
+    if not (reader.supportsOption(QImageIOHandler.ImageOption.ClipRect)
+            and reader.supportsOption(QImageIOHandler.ImageOption.ScaledSize)):
+        return None
+    if reader.transformation() != QImageIOHandler.Transformation.TransformationNone:
+        return None
+    return TiledImageSource(path, size.width(), size.height())
+
+
+class TileCache:
+    """LRU of decoded tiles keyed by (level, tx, ty), bounded in bytes."""
+
+    def __init__(self, budget_bytes: int = TILE_CACHE_BUDGET_BYTES):
+        self.budget_bytes = int(budget_bytes)
+        self.bytes = 0
+        self._tiles: OrderedDict[tuple, QImage] = OrderedDict()
+
+    def __contains__(self, key) -> bool:
+        return key in self._tiles
+
+    def __len__(self) -> int:
+        return len(self._tiles)
+
+    def get(self, key) -> QImage | None:
+        tile = self._tiles.get(key)
+        if tile is not None:
+            self._tiles.move_to_end(key)
+        return tile
+
+    def put(self, key, tile: QImage):
+        previous = self._tiles.pop(key, None)
+        if previous is not None:
+            self.bytes -= previous.sizeInBytes()
+        self._tiles[key] = tile
+        self.bytes += tile.sizeInBytes()
+        while self.bytes > self.budget_bytes and len(self._tiles) > 1:
+            _old_key, old_tile = self._tiles.popitem(last=False)
+            self.bytes -= old_tile.sizeInBytes()
+
+    def clear(self):
+        self._tiles.clear()
+        self.bytes = 0
+
+
+class TileLoader(QObject):
+    """Decodes tile strips off the UI thread; results arrive via `tiles_ready`."""
+
+    tiles_ready = Signal(object, object)  # strip key, [((level, tx, ty), QImage)]
+
+    def __init__(self, source: TiledImageSource, parent=None):
+        super().__init__(parent)
+        self.source = source
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="viewer_tiles")
+        self._pending = {}  # strip key -> Future
+        self._closed = False
+        self._on_tiles = None
+        # Emitted from workers; the slot runs on the loader's (GUI) thread.
+        self.tiles_ready.connect(self._on_tiles_ready)
+
+    def set_tiles_callback(self, callback):
+        """Call `callback(tiles)` on the GUI thread as strips arrive."""
+        self._on_tiles = callback
+
+    def shutdown(self):
+        self._closed = True
+        self._on_tiles = None
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def request(self, strips: list[tuple[int, int, int]]):
+        """Queue strips (level, ty, chunk) in priority order; drop stale queued ones."""
+        if self._closed:
+            return
+        wanted = set(strips)
+        for key, future in list(self._pending.items()):
+            if key not in wanted and future.cancel():
+                del self._pending[key]
+        for key in strips:
+            if key not in self._pending:
+                self._pending[key] = self._executor.submit(self._decode, key)
+
+    def _decode(self, key):
+        level, ty, chunk = key
+        columns, _rows = self.source.tile_grid(level)
+        first_tx = chunk * STRIP_TILES
+        last_tx = min(columns - 1, first_tx + STRIP_TILES - 1)
+        try:
+            tiles = self.source.decode_strip(level, ty, first_tx, last_tx)
+        except Exception as e:
+            print(f"[IMAGE_VIEWER] Tile decode failed for {self.source.path}: {e}")
+            tiles = []
+        if not self._closed:
+            self.tiles_ready.emit(key, tiles)
+
+    def _on_tiles_ready(self, key, tiles):
+        self._pending.pop(key, None)
+        if self._on_tiles is not None and tiles:
+            self._on_tiles(tiles)
+
+
+class TiledImageItem(QGraphicsPixmapItem):
+    """Pixmap item that shows the preview and paints visible tiles over it.
+
+    The item's pixmap is the preview scaled up by `setScale`, the same way
+    the viewer's mipmaps are, so code that reads `pixmap()` or the scene
+    rect sees a normal image item.
+    """
+
+    def __init__(self, source: TiledImageSource, preview: QImage, loader: TileLoader,
+                 cache: TileCache | None = None):
+        super().__init__(QPixmap.fromImage(preview))
+        self.source = source
+        self.loader = loader
+        self.cache = cache or TileCache()
+        self.preview_divisor = 1 << source.preview_level
+        self.setScale(float(self.preview_divisor))
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption, True)
+        super().setCacheMode(QGraphicsItem.CacheMode.NoCache)
+        loader.set_tiles_callback(self._on_tiles_ready)
+
+    def setCacheMode(self, mode, *args):
+        # A device cache would hold the whole zoomed item; tiles already cache.
+        super().setCacheMode(QGraphicsItem.CacheMode.NoCache)
+
+    def level_for_scale(self, device_per_source: float) -> int:
+        """Pyramid level whose resolution is at least the screen's."""
+        source_per_device = 1.0 / max(1e-9, device_per_source)
+        if source_per_device < 2.0:
+            return 0
+        return min(self.source.preview_level, int(math.floor(math.log2(source_per_device))))
+
+    def _source_rect(self, local_rect: QRectF) -> QRectF:
+        d = self.preview_divisor
+        rect = QRectF(local_rect.left() * d, local_rect.top() * d,
+                      local_rect.width() * d, local_rect.height() * d)
+        return rect.intersected(QRectF(0, 0, self.source.width, self.source.height))
+
+    def _local_rect(self, source_rect: QRect) -> QRectF:
+        d = float(self.preview_divisor)
+        return QRectF(source_rect.left() / d, source_rect.top() / d,
+                      source_rect.width() / d, source_rect.height() / d)
+
+    def wanted_strips(self, level: int, visible_source: QRectF) -> list[tuple[int, int, int]]:
+        """Missing strips for the visible area, nearest to its center first.
+
+        Strips one level coarser come first, so the view sharpens in steps.
+        """
+        center = visible_source.center()
+        strips = []
+        levels = [level]
+        if level + 1 < self.source.preview_level:
+            levels.insert(0, level + 1)
+        for strip_level in levels:
+            span = TILE_SIZE << strip_level
+            missing = {}
+            for tx, ty in self.source.tiles_in_rect(strip_level, visible_source):
+                if (strip_level, tx, ty) in self.cache:
+                    continue
+                distance = abs((tx + 0.5) * span - center.x()) + abs((ty + 0.5) * span - center.y())
+                key = (strip_level, ty, tx // STRIP_TILES)
+                missing[key] = min(distance, missing.get(key, distance))
+            strips.extend(sorted(missing, key=missing.get))
+        return strips
+
+    def paint(self, painter: QPainter, option, widget=None):
+        device_per_local = option.levelOfDetailFromTransform(painter.worldTransform())
+        level = self.level_for_scale(device_per_local / self.preview_divisor)
+        if level >= self.source.preview_level:
+            super().paint(painter, option, widget)
+            return
+
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform,
+                              self.transformationMode() == Qt.TransformationMode.SmoothTransformation)
+        exposed = option.exposedRect
+        painter.drawPixmap(exposed, self.pixmap(), exposed)
+
+        visible_local = exposed
+        if widget is not None:
+            inverse, invertible = painter.worldTransform().inverted()
+            if invertible:
+                visible_local = inverse.mapRect(QRectF(widget.rect()))
+        self.loader.request(self.wanted_strips(level, self._source_rect(visible_local)))
+
+        for tx, ty in self.source.tiles_in_rect(level, self._source_rect(exposed)):
+            source_rect = self.source.tile_source_rect(level, tx, ty)
+            tile = self.cache.get((level, tx, ty))
+            if tile is not None:
+                painter.drawImage(self._local_rect(source_rect), tile)
+                continue
+            self._paint_coarser(painter, level, source_rect)
+
+    def _paint_coarser(self, painter: QPainter, level: int, source_rect: QRect):
+        """Fill a missing tile from the finest cached coarser tile."""
+        for coarser in range(level + 1, self.source.preview_level):
+            span = TILE_SIZE << coarser
+            key = (coarser, source_rect.left() // span, source_rect.top() // span)
+            tile = self.cache.get(key)
+            if tile is None:
+                continue
+            origin = self.source.tile_source_rect(coarser, key[1], key[2])
+            scale = float(1 << coarser)
+            region = QRectF(
+                (source_rect.left() - origin.left()) / scale,
+                (source_rect.top() - origin.top()) / scale,
+                source_rect.width() / scale,
+                source_rect.height() / scale,
+            )
+            painter.drawImage(self._local_rect(source_rect), tile, region)
+            return
+
+    def _on_tiles_ready(self, tiles):
+        dirty = QRectF()
+        for tile_key, tile in tiles:
+            self.cache.put(tile_key, tile)
+            dirty = dirty.united(self._local_rect(self.source.tile_source_rect(*tile_key)))
+        try:
+            self.update(dirty)
+        except RuntimeError:
+            # The item was removed with the scene; the loader is shut down next.
+            pass
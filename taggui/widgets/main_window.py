@@ -29,6 +29,7 @@ from models.tag_counter_model import TagCounterModel
 from utils.icons import taggui_icon
 from utils.big_widgets import BigPushButton
 from utils.diagnostic_logging import diagnostic_print, diagnostic_time_prefix
+from utils.frame_trace import HISTOGRAM_EDGES_MS, frame_trace
 from utils.image import Image
 from utils.key_press_forwarder import KeyPressForwarder
 from utils.review_marks import (
@@ -60,7 +61,7 @@ except ImportError:
 from widgets.all_tags_editor import AllTagsEditor
 from widgets.auto_captioner import AutoCaptioner
 from widgets.auto_markings import AutoMarkings
-from widgets.image_list import ImageList
+from widgets.image_list import ImageList, ImageListView
 from widgets.image_tags_editor import ImageTagsEditor
 from widgets.ideogram_caption_editor import IdeogramCaptionEditor
 from widgets.pipeline_editor import PipelineEditor
@@ -107,6 +108,8 @@ class PerfHudOverlay(QWidget):
         self.setMouseTracking(True)
         self._ui_ms_samples = deque(maxlen=160)
         self._playback_ms_samples = deque(maxlen=160)
+        self._histogram_counts = []
+        self._histogram_labels = []
         self._lines = []
         self._mode = "ui"
         self._dragging = False
@@ -116,6 +119,7 @@ class PerfHudOverlay(QWidget):
         self._resize_start_size = QSize()
         self._on_mode_changed = None
         self._on_geometry_changed = None
+        self._on_export_requested = None
         self._resize_grip_px = 20
         self._title_bar_h = 28
         self.setFixedSize(360, 152)
@@ -131,10 +135,23 @@ class PerfHudOverlay(QWidget):
             " border-radius: 5px; padding: 2px 8px; font-size: 10px; font-weight: 600; }"
             "QPushButton:hover { background: rgba(56,68,88,230); }"
         )
-        self._mode_btn.setToolTip("Switch graph mode:\n- UI: app main-thread timing\n- Playback: video frame cadence timing")
+        self._mode_btn.setToolTip(
+            "Switch graph mode:\n- UI: app main-thread timing\n- Playback: video frame cadence timing"
+            "\n- List: image list frame-time histogram and worst-frame breakdown"
+        )
         self._mode_btn.clicked.connect(self._cycle_mode)
+        self._export_btn = QPushButton("Export", self)
+        self._export_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self._export_btn.setStyleSheet(self._mode_btn.styleSheet())
+        self._export_btn.setToolTip("Save the recorded image list frames as a Chrome trace (chrome://tracing, Perfetto)")
+        self._export_btn.clicked.connect(self._request_export)
+        self._export_btn.hide()
         self.hide()
 
+    @property
+    def mode(self) -> str:
+        return self._mode
+
     def _parent_global_bounds(self):
         parent = self.parentWidget()
         if parent is None:
@@ -151,15 +168,28 @@ class PerfHudOverlay(QWidget):
         self._lines = list(lines)
         self.update()
 
+    def set_histogram(self, counts: list[int], labels: list[str]):
+        self._histogram_counts = list(counts)
+        self._histogram_labels = list(labels)
+
     def set_mode_changed_callback(self, callback):
         self._on_mode_changed = callback
 
+    def set_export_callback(self, callback):
+        self._on_export_requested = callback
+
+    def _request_export(self):
+        if callable(self._on_export_requested):
+            self._on_export_requested()
+
     def set_geometry_changed_callback(self, callback):
         self._on_geometry_changed = callback
 
     def _cycle_mode(self):
-        self._mode = "playback" if self._mode == "ui" else "ui"
-        self._mode_btn.setText("Mode: Playback" if self._mode == "playback" else "Mode: UI")
+        self._mode = {"ui": "playback", "playback": "list"}.get(self._mode, "ui")
+        self._mode_btn.setText({"playback": "Mode: Playback", "list": "Mode: List"}.get(self._mode, "Mode: UI"))
+        self._export_btn.setVisible(self._mode == "list")
+        self._layout_buttons()
         if callable(self._on_mode_changed):
             try:
                 self._on_mode_changed(self._mode)
@@ -195,7 +225,9 @@ class PerfHudOverlay(QWidget):
         painter.drawText(12, max(18, dynamic_title_h - 8), "Performance HUD")
 
         samples = self._graph_samples()
-        if len(samples) >= 2:
+        if self._mode == "list":
+            self._paint_histogram(painter, graph_rect)
+        elif len(samples) >= 2:
             # Dynamic range keeps sparkline sensitive while still showing spikes.
             sorted_vals = sorted(samples)
             p95 = sorted_vals[int(max(0, min(len(sorted_vals) - 1, round(len(sorted_vals) * 0.95) - 1)))]
@@ -284,13 +316,52 @@ class PerfHudOverlay(QWidget):
         painter.drawLine(grip.left() + 4, grip.bottom(), grip.right(), grip.top() + 4)
         painter.drawLine(grip.left() + 8, grip.bottom(), grip.right(), grip.top() + 8)
 
-    def resizeEvent(self, event):
-        super().resizeEvent(event)
+    def _paint_histogram(self, painter, graph_rect: QRectF):
+        """Frame-time buckets as bars; red buckets miss the 60 fps budget."""
+        counts = self._histogram_counts
+        if not counts or sum(counts) <= 0:
+            painter.setPen(QPen(QColor(240, 240, 240, 160), 1))
+            painter.setFont(QFont("Consolas", 9))
+            painter.drawText(int(graph_rect.left()) + 8, int(graph_rect.center().y()) + 4, "No image list frames yet")
+            return
+        label_h = 12
+        slot_w = graph_rect.width() / len(counts)
+        bar_area_h = graph_rect.height() - label_h - 4
+        peak = max(counts)
+        painter.setFont(QFont("Consolas", 7))
+        for position, count in enumerate(counts):
+            bar_h = bar_area_h * (count / peak) if peak else 0
+            bar_rect = QRectF(
+                graph_rect.left() + position * slot_w + 3,
+                graph_rect.top() + 2 + (bar_area_h - bar_h),
+                max(2.0, slot_w - 6),
+                bar_h,
+            )
+            over_budget = position > 1
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(255, 110, 96, 210) if over_budget else QColor(96, 220, 140, 210))
+            painter.drawRect(bar_rect)
+            painter.setPen(QPen(QColor(235, 240, 255, 200), 1))
+            label = self._histogram_labels[position] if position < len(self._histogram_labels) else ""
+            painter.drawText(
+                QRectF(graph_rect.left() + position * slot_w, graph_rect.bottom() - label_h - 1, slot_w, label_h),
+                Qt.AlignmentFlag.AlignCenter,
+                f"{label}:{count}",
+            )
+
+    def _layout_buttons(self):
         btn_h = max(18, min(30, int(self.height() * 0.14)))
         btn_w = max(120, min(240, int(self.width() * 0.34)))
         self._mode_btn.setGeometry(self.width() - btn_w - 10, 6, btn_w, btn_h)
         mode_font_size = max(9, min(13, int(btn_h * 0.48)))
         self._mode_btn.setFont(QFont("Consolas", mode_font_size))
+        export_w = max(56, int(btn_w * 0.45))
+        self._export_btn.setGeometry(self.width() - btn_w - export_w - 16, 6, export_w, btn_h)
+        self._export_btn.setFont(QFont("Consolas", mode_font_size))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._layout_buttons()
 
     def _is_in_resize_zone(self, pos: QPoint) -> bool:
         return (
@@ -308,7 +379,7 @@ class PerfHudOverlay(QWidget):
             self._resize_start_size = self.size()
             event.accept()
             return
-        if not self._mode_btn.geometry().contains(pos):
+        if not self._mode_btn.geometry().contains(pos) and not self._export_btn.geometry().contains(pos):
             self._dragging = True
             self._drag_offset = (event.globalPosition().toPoint() - self.pos()) if hasattr(event, "globalPosition") else (self.mapToGlobal(pos) - self.pos())
             event.accept()
@@ -398,10 +469,25 @@ class PerfHudOverlay(QWidget):
             "line1": "videos = loaded video viewers.\nplaying = currently playing viewers.\nactive = controls owner.",
             "line2": "pending = queued updates waiting dispatch.\nscheduler = tick interval.",
             "line3": "dispatch/s = applied control updates per second.\ndropped/s = overwritten queued updates per second.",
+            "list_graph": (
+                "Image list frame-time histogram:\n"
+                "- each bar counts recorded frames by paint + between-frame work\n"
+                "- red bars missed the 60fps budget (16.7ms)"
+            ),
+            "list_line0": "Recorded image list frames, median and 95th percentile frame time.",
+            "list_line1": "Slowest frame: paint time, and model data() time/calls made while painting.",
+            "list_line2": "Work before the slowest frame: thumbnail delivery ms/items,\nmasonry completion ms, page loads ms/count.",
+            "list_line3": (
+                "RAM = resident pages and their estimated memory (Image objects, tags,\n"
+                "decoded thumbnails) against the page memory budget.\n"
+                "Thumbnail delivery batches and their average size."
+            ),
             "drag": "Drag HUD by this top area.",
             "resize": "Resize HUD from this corner.",
             "panel": "Performance HUD.\nCtrl+Shift+J or Ctrl+Alt+J to show/hide.",
         }
+        if self._mode == "list" and f"list_{key}" in tips:
+            key = f"list_{key}"
         self.setToolTip(tips.get(key, ""))
 
 
@@ -695,6 +781,7 @@ class MainWindow(QMainWindow):
         self._perf_hud = PerfHudOverlay(self)
         self._perf_hud.set_mode_changed_callback(self._on_perf_hud_mode_changed)
         self._perf_hud.set_geometry_changed_callback(self._on_perf_hud_geometry_changed)
+        self._perf_hud.set_export_callback(self._export_frame_trace)
         self._selection_wall_speed_overlay = SelectionWallSpeedOverlay(self)
         self._selection_wall_speed_overlay.speed_changed.connect(self._on_selection_wall_speed_changed)
         self._selection_wall_speed_overlay.play_pause_requested.connect(self._toggle_selection_wall_play_pause)
@@ -1656,6 +1743,15 @@ class MainWindow(QMainWindow):
                     print(f"[SHUTDOWN] Masonry executor shutdown warning: {e}")
                 setattr(list_view, '_masonry_executor', None)
 
+        # Video probe worker processes must not outlive the app. Only loaded
+        # once a video was probed, so don't import it just to stop it.
+        probe_module = sys.modules.get('utils.video.probe')
+        if probe_module is not None:
+            try:
+                probe_module.shutdown_probe_pool()
+            except Exception as e:
+                print(f"[SHUTDOWN] Video probe pool shutdown warning: {e}")
+
     def _cleanup_window_viewer_for_shutdown(self, window):
         """Release floating/comparison viewer media backends before Qt teardown."""
         try:
@@ -1747,6 +1843,12 @@ class MainWindow(QMainWindow):
                     dock.set_footer_strip_height(height)
             return
 
+        if key == 'page_memory_budget_mb':
+            self.image_list_model.apply_page_memory_budget()
+            if getattr(self.image_list_model, '_paginated_mode', False):
+                self.image_list_model._evict_old_pages()
+            return
+
         if key not in ('max_pages_in_memory', 'thumbnail_eviction_pages'):
             return
 
@@ -4127,8 +4229,8 @@ class MainWindow(QMainWindow):
             except Exception:
                 pass
 
-        list_view = getattr(getattr(self, 'image_list', None), 'list_view', None)
-        if list_view is not None:
+        # Every browser's delegate caches badge specs and sprites, not just the main one.
+        for list_view in self._iter_image_list_views():
             try:
                 delegate = getattr(list_view, 'delegate', None)
                 if delegate is not None and hasattr(delegate, 'refresh_thumbnail_badge_settings'):
@@ -4326,6 +4428,9 @@ class MainWindow(QMainWindow):
         video_controls.timeline_slider.scrub_started.connect(video_player.begin_timeline_scrub)
         video_controls.timeline_slider.sliderReleased.connect(video_player.end_timeline_scrub)
         video_controls.marker_preview_requested.connect(video_player.seek_to_frame)
+        video_controls.timeline_slider.marker_drag_started.connect(video_player.begin_marker_preview)
+        video_controls.timeline_slider.marker_drag_ended.connect(video_player.end_marker_preview)
+        video_player.sprite_sheet_changed.connect(video_controls.timeline_slider.set_sprite_sheet)
         video_controls.skip_back_btn.clicked.connect(
             lambda checked=False, current_viewer=viewer: current_viewer.handle_video_controls_skip_button_step('backward')
         )
@@ -4558,6 +4663,19 @@ class MainWindow(QMainWindow):
         else:
             self._hud_playback_last_frame_global_ts = None
 
+        if self._perf_hud.mode == "list":
+            labels = [f"<{edge:g}" for edge in HISTOGRAM_EDGES_MS] + [f">{HISTOGRAM_EDGES_MS[-1]:g}"]
+            self._perf_hud.set_histogram(frame_trace.histogram(), labels)
+            lines = frame_trace.summary_lines()
+            if getattr(self.image_list_model, '_paginated_mode', False) and len(lines) == 4:
+                usage = self.image_list_model.page_residency_usage()
+                lines[3] = (
+                    f"RAM pages={usage['pages']} {usage['bytes'] / 1048576:.0f}/"
+                    f"{usage['budget_bytes'] / 1048576:.0f}MB  {lines[3]}"
+                )
+            self._perf_hud.set_metrics(ui_ms=ui_ms, playback_ms=playback_ms, lines=lines)
+            return
+
         pb_text = f"{playback_ms:5.1f}ms" if isinstance(playback_ms, (int, float)) else " n/a "
         lines = [
             f"UI {ui_ms:5.1f}ms  PB(playback) {pb_text}  profile={self._video_controls_perf_profile}",
@@ -4569,8 +4687,20 @@ class MainWindow(QMainWindow):
         self._perf_hud.set_metrics(ui_ms=ui_ms, playback_ms=playback_ms, lines=lines)
 
     def _on_perf_hud_mode_changed(self, mode: str):
-        # Reserved for future persistence; no-op for now.
-        _ = mode
+        # Image list frames are only recorded while someone is looking at them.
+        frame_trace.set_enabled(self._perf_hud_enabled and mode == "list")
+
+    def _export_frame_trace(self):
+        default_name = f"taggui-frame-trace-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        path, _selected_filter = QFileDialog.getSaveFileName(
+            self, 'Export Frame Trace', str(Path.home() / default_name), 'Trace JSON (*.json)')
+        if not path:
+            return
+        try:
+            frame_trace.export_chrome_trace(path)
+            print(f"[PERF] Exported {len(frame_trace.frames)} image list frames to {path}")
+        except OSError as e:
+            QMessageBox.warning(self, 'Export Frame Trace', f'Could not write the trace:\n{e}')
 
     def _on_perf_hud_geometry_changed(self, rect):
         if rect is None:
@@ -4623,6 +4753,7 @@ class MainWindow(QMainWindow):
         else:
             self._perf_hud_timer.stop()
             self._perf_hud.hide()
+        self._on_perf_hud_mode_changed(self._perf_hud.mode)
         self._sync_perf_hud_menu_action()
 
     def _skip_viewer_video(self, viewer: ImageViewer, backward: bool):
@@ -5909,6 +6040,22 @@ class MainWindow(QMainWindow):
             mapped = pos
         self._on_main_viewer_context_menu_spawn(mapped)
 
+    def _iter_image_list_views(self) -> list[ImageListView]:
+        """Return the main and secondary browser list views plus any other alive ones."""
+        list_views = []
+        candidates = [
+            getattr(getattr(self, 'image_list', None), 'list_view', None),
+            getattr(getattr(getattr(self, '_secondary_browser', None), 'dock', None), 'list_view', None),
+        ]
+        try:
+            candidates.extend(self.findChildren(ImageListView))
+        except RuntimeError:
+            pass
+        for list_view in candidates:
+            if list_view is not None and not any(list_view is seen for seen in list_views):
+                list_views.append(list_view)
+        return list_views
+
     def _iter_all_viewers(self) -> list[ImageViewer]:
         """Return main viewer plus currently alive floating viewers."""
         viewers = [self.image_viewer]
@@ -0,0 +1,322 @@
+"""Array-based masonry placement for very large layouts.
+
+Item heights are computed with NumPy in one pass and the result is kept as
+struct-of-arrays (index, x, y, width, height, aspect_ratio) instead of one
+dict per item. Greedy shortest-column placement is inherently sequential (each
+choice depends on every earlier one), so that step stays a loop, but over a
+heap of plain ints: each column is keyed as ``y * num_columns + column``, so the
+heap minimum is the shortest column with ties going to the lowest column, and
+x/y are decoded from the keys with array math afterwards.
+
+Column tops are checkpointed every few thousand rows. When only some heights
+change (for example after background dimension repair), update_masonry_arrays
+resumes from the checkpoint before the first change and stops as soon as the
+column tops match the old ones again, up to a uniform shift.
+
+Output, including tie-breaking (lowest column wins), aspect-ratio sanitizing
+and SPACER rows, matches the dict-based worker item for item.
+"""
+
+from dataclasses import dataclass
+
+import heapq
+from bisect import bisect_left
+
+import numpy as np
+
+
+SPACER_INDEX = -2
+MIN_ASPECT_RATIO = 0.01
+MAX_ASPECT_RATIO = 100.0
+# spacer_heights value for rows that are ordinary items.
+NOT_A_SPACER = -1
+# Rows between stored column-top checkpoints.
+DEFAULT_CHECKPOINT_INTERVAL = 4096
+
+
+@dataclass
+class MasonryArrays:
+    """Positioned masonry items as parallel arrays."""
+    index: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    width: np.ndarray
+    height: np.ndarray
+    aspect_ratio: np.ndarray
+    total_height: int
+    # Column tops before every `checkpoint_interval`-th row, when known.
+    checkpoints: np.ndarray | None = None
+    checkpoint_interval: int = 0
+
+    def __len__(self):
+        return len(self.index)
+
+    def take(self, rows) -> 'MasonryArrays':
+        """Return the selected rows; total_height is kept unchanged."""
+        return MasonryArrays(
+            index=self.index[rows], x=self.x[rows], y=self.y[rows],
+            width=self.width[rows], height=self.height[rows],
+            aspect_ratio=self.aspect_ratio[rows], total_height=self.total_height)
+
+    def to_items(self) -> list[dict]:
+        """Convert to the list-of-dicts form used by the view."""
+        return [
+            {'index': index, 'x': x, 'y': y, 'width': width,
+             'height': height, 'aspect_ratio': aspect_ratio}
+            for index, x, y, width, height, aspect_ratio in zip(
+                self.index.tolist(), self.x.tolist(), self.y.tolist(),
+                self.width.tolist(), self.height.tolist(),
+                self.aspect_ratio.tolist())
+        ]
+
+
+def _is_spacer(aspect_ratio) -> bool:
+    return (isinstance(aspect_ratio, tuple) and len(aspect_ratio) == 2
+            and aspect_ratio[0] == 'SPACER')
+
+
+def items_data_to_arrays(items_data):
+    """Split worker `items_data` into index, aspect-ratio and spacer arrays.
+
+    Non-numeric aspect ratios become 1.0, matching the dict-based worker.
+
+    Returns:
+        (indices, aspect_ratios, spacer_heights); spacer_heights is None when
+        there are no SPACER rows, else NOT_A_SPACER for ordinary items
+    """
+    if not items_data:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, np.empty(0, dtype=np.float64), None
+    indices = [index for index, _aspect_ratio in items_data]
+    aspect_ratios = [aspect_ratio for _index, aspect_ratio in items_data]
+    if set(map(type, aspect_ratios)) <= {int, float}:
+        # Fast path: plain numbers only, no spacers.
+        return (np.array(indices, dtype=np.int64),
+                np.array(aspect_ratios, dtype=np.float64), None)
+
+    ratios = []
+    spacer_heights = []
+    for aspect_ratio in aspect_ratios:
+        if _is_spacer(aspect_ratio):
+            ratios.append(1.0)
+            spacer_heights.append(int(aspect_ratio[1]))
+        elif isinstance(aspect_ratio, (int, float)):
+            ratios.append(float(aspect_ratio))
+            spacer_heights.append(NOT_A_SPACER)
+        else:
+            ratios.append(1.0)
+            spacer_heights.append(NOT_A_SPACER)
+    spacer_heights = np.array(spacer_heights, dtype=np.int64)
+    if not (spacer_heights != NOT_A_SPACER).any():
+        spacer_heights = None
+    return (np.array(indices, dtype=np.int64),
+            np.array(ratios, dtype=np.float64), spacer_heights)
+
+
+def sanitize_aspect_ratios(aspect_ratios: np.ndarray) -> np.ndarray:
+    """Replace zero, negative and NaN ratios with 1.0 and clamp the rest."""
+    sanitized = np.where(aspect_ratios > 0, aspect_ratios, 1.0)
+    return np.clip(sanitized, MIN_ASPECT_RATIO, MAX_ASPECT_RATIO)
+
+
+def _prepare_rows(aspect_ratios, column_width, spacing, num_columns, spacer_heights):
+    """Sanitized ratios, heights, widths and spacer mask for a layout input."""
+    aspect_ratios = sanitize_aspect_ratios(np.asarray(aspect_ratios, dtype=np.float64))
+    heights = (column_width / aspect_ratios).astype(np.int64)
+    widths = np.full(len(heights), column_width, dtype=np.int64)
+    spacer_mask = None
+    if spacer_heights is not None:
+        spacer_heights = np.asarray(spacer_heights, dtype=np.int64)
+        spacer_mask = spacer_heights != NOT_A_SPACER
+        heights[spacer_mask] = spacer_heights[spacer_mask]
+        widths[spacer_mask] = (column_width + spacing) * num_columns - spacing
+        aspect_ratios[spacer_mask] = 1.0
+    return aspect_ratios, heights, widths, spacer_mask
+
+
+def _column_tops(column_keys, num_columns):
+    tops = [0] * num_columns
+    for key in column_keys:
+        tops[key % num_columns] = key // num_columns
+    return tops
+
+
+def _place_rows(keys, heights, spacer_rows, start, end, column_tops, spacing,
+                num_columns, checkpoint_interval, checkpoints, converged=None):
+    """Greedy placement of rows [start, end) into `keys`.
+
+    `column_tops` is the per-column state before `start`. Whenever a row is a
+    multiple of `checkpoint_interval`, the state before it is stored in
+    `checkpoints`; `converged(row, tops)` may stop placement there.
+
+    Returns:
+        (column tops after the last placed row, row placement stopped at)
+    """
+    column_keys = sorted(top * num_columns + column for column, top in enumerate(column_tops))
+    replace_top = heapq.heapreplace
+    spacer_position = bisect_left(spacer_rows, start)
+    row = start
+    while row < end:
+        if row % checkpoint_interval == 0:
+            tops = _column_tops(column_keys, num_columns)
+            if converged is not None and converged(row, tops):
+                return tops, row
+            checkpoints[row // checkpoint_interval] = tops
+        next_spacer = spacer_rows[spacer_position] if spacer_position < len(spacer_rows) else end
+        if next_spacer == row:
+            # Spacer row: push every column below it.
+            max_height = max(column_keys) // num_columns
+            keys[row] = max_height * num_columns
+            top = max_height + int(heights[row])
+            column_keys = [top * num_columns + column for column in range(num_columns)]
+            spacer_position += 1
+            row += 1
+            continue
+        piece_end = min(end, next_spacer, (row // checkpoint_interval + 1) * checkpoint_interval)
+        piece_keys = []
+        add_key = piece_keys.append
+        for step in ((heights[row:piece_end] + spacing) * num_columns).tolist():
+            key = column_keys[0]
+            add_key(key)
+            replace_top(column_keys, key + step)
+        keys[row:piece_end] = piece_keys
+        row = piece_end
+    return _column_tops(column_keys, num_columns), end
+
+
+def _finish_arrays(indices, keys, widths, heights, aspect_ratios, spacer_mask,
+                   column_width, spacing, num_columns, total_height,
+                   checkpoints, checkpoint_interval) -> MasonryArrays:
+    xs = (keys % num_columns) * (column_width + spacing) if num_columns else keys
+    ys = keys // num_columns if num_columns else keys
+    if spacer_mask is not None:
+        xs[spacer_mask] = 0
+        indices = np.where(spacer_mask, SPACER_INDEX, indices)
+    return MasonryArrays(
+        index=indices,
+        x=xs,
+        y=ys,
+        width=widths,
+        height=heights,
+        aspect_ratio=aspect_ratios,
+        total_height=total_height,
+        checkpoints=checkpoints,
+        checkpoint_interval=checkpoint_interval,
+    )
+
+
+def compute_masonry_arrays(indices, aspect_ratios, column_width, spacing,
+                           num_columns, spacer_heights=None,
+                           checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL) -> MasonryArrays:
+    """Place items into the shortest column, returning struct-of-arrays.
+
+    Args:
+        indices: Item indices; spacer rows are reported as SPACER_INDEX
+        aspect_ratios: Width / height per item; sanitized here
+        column_width: Width of each column
+        spacing: Spacing between items
+        num_columns: Number of columns
+        spacer_heights: Optional per-row spacer height, NOT_A_SPACER for items
+        checkpoint_interval: Column tops are recorded before every Kth row so
+            update_masonry_arrays can resume from them
+
+    Raises:
+        ValueError: if there are items to place but no columns
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    count = len(indices)
+    if num_columns < 1:
+        if count:
+            raise ValueError('num_columns must be at least 1')
+        num_columns = 0
+    checkpoint_interval = max(1, int(checkpoint_interval))
+
+    aspect_ratios, heights, widths, spacer_mask = _prepare_rows(
+        aspect_ratios, column_width, spacing, num_columns, spacer_heights)
+    spacer_rows = np.flatnonzero(spacer_mask).tolist() if spacer_mask is not None else []
+    # Heap keys encode (column top, column) as top * num_columns + column.
+    keys = np.zeros(count, dtype=np.int64)
+    checkpoints = np.zeros((-(-count // checkpoint_interval), num_columns), dtype=np.int64)
+    column_tops, _row = _place_rows(
+        keys, heights, spacer_rows, 0, count, [0] * num_columns, spacing,
+        num_columns, checkpoint_interval, checkpoints)
+    return _finish_arrays(
+        indices, keys, widths, heights, aspect_ratios, spacer_mask,
+        column_width, spacing, num_columns, max(column_tops) if column_tops else 0,
+        checkpoints, checkpoint_interval)
+
+
+def update_masonry_arrays(previous: MasonryArrays, indices, aspect_ratios, column_width,
+                          spacing, num_columns, spacer_heights=None) -> MasonryArrays:
+    """Re-place only what changed since `previous` was computed.
+
+    `previous` must come from compute_masonry_arrays (or this function) with
+    the same column settings. Placement restarts at the checkpoint before the
+    first row whose height changed. Past the last changed row, each checkpoint
+    is compared with the old one: identical column tops mean the rest of the
+    layout is unchanged, and tops that all moved by the same amount mean the
+    rest only shifts by that amount; either way placement stops there. Falls
+    back to a full compute_masonry_arrays when the inputs are not comparable.
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    count = len(indices)
+    interval = previous.checkpoint_interval
+    if (previous.checkpoints is None or not interval or num_columns < 1
+            or len(previous) != count
+            or previous.checkpoints.shape[1:] != (num_columns,)):
+        return compute_masonry_arrays(indices, aspect_ratios, column_width, spacing,
+                                      num_columns, spacer_heights)
+
+    aspect_ratios, heights, widths, spacer_mask = _prepare_rows(
+        aspect_ratios, column_width, spacing, num_columns, spacer_heights)
+    new_index = np.where(spacer_mask, SPACER_INDEX, indices) if spacer_mask is not None else indices
+    if not np.array_equal(new_index, previous.index) or not np.array_equal(widths, previous.width):
+        # Rows were inserted, removed, reordered, or spacers moved.
+        return compute_masonry_arrays(indices, aspect_ratios, column_width, spacing,
+                                      num_columns, spacer_heights, interval)
+
+    keys = (np.asarray(previous.y, dtype=np.int64) * num_columns
+            + np.asarray(previous.x, dtype=np.int64) // (column_width + spacing))
+    checkpoints = np.array(previous.checkpoints, dtype=np.int64)
+    changed_rows = np.flatnonzero(heights != previous.height)
+    if not len(changed_rows):
+        return _finish_arrays(
+            indices, keys, widths, heights, aspect_ratios, spacer_mask, column_width,
+            spacing, num_columns, previous.total_height, checkpoints, interval)
+
+    first_changed = int(changed_rows[0])
+    last_changed = int(changed_rows[-1])
+    start = first_changed // interval * interval
+    shift = 0
+
+    def converged(row, tops):
+        nonlocal shift
+        if row <= last_changed:
+            return False
+        delta = np.asarray(tops, dtype=np.int64) - previous.checkpoints[row // interval]
+        if (delta == delta[0]).all():
+            shift = int(delta[0])
+            return True
+        return False
+
+    spacer_rows = np.flatnonzero(spacer_mask).tolist() if spacer_mask is not None else []
+    column_tops, stopped_at = _place_rows(
+        keys, heights, spacer_rows, start, count, checkpoints[start // interval].tolist(),
+        spacing, num_columns, interval, checkpoints, converged)
+    if stopped_at < count:
+        total_height = previous.total_height + shift
+        if shift:
+            keys[stopped_at:] += shift * num_columns
+            checkpoints[stopped_at // interval:] += shift
+    else:
+        total_height = max(column_tops)
+    return _finish_arrays(
+        indices, keys, widths, heights, aspect_ratios, spacer_mask,
+        column_width, spacing, num_columns, total_height, checkpoints, interval)
+
+
+def calculate_masonry_arrays(items_data, column_width, spacing, num_columns) -> MasonryArrays:
+    """`items_data` convenience wrapper around compute_masonry_arrays."""
+    indices, aspect_ratios, spacer_heights = items_data_to_arrays(items_data)
+    return compute_masonry_arrays(indices, aspect_ratios, column_width, spacing,
+                                  num_columns, spacer_heights)
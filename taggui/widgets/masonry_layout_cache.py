@@ -0,0 +1,136 @@
+"""Binary on-disk format for masonry layouts.
+
+A layout file is a fixed 64-byte header followed by packed columns:
+
+    header   magic, format version, column width, spacing, column count,
+             item count, total height, input fingerprint, payload CRC32
+    payload  aspect_ratio float64[n], then index, x, y, width, height int32[n]
+
+Files are memory-mapped on load and validated (header, size, CRC32 and the
+fingerprint of the input items) without creating a Python object per item.
+The columns are then copied out as arrays and the mapping is closed, so a
+later write can replace the file; Windows refuses to replace a mapped file.
+The masonry worker hands those arrays to `MasonryIncrementalService` along
+with the view's items.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from widgets.masonry_engine import MasonryArrays
+except ModuleNotFoundError:
+    from taggui.widgets.masonry_engine import MasonryArrays
+
+
+LAYOUT_MAGIC = b'TGMASNRY'
+LAYOUT_FORMAT_VERSION = 1
+LAYOUT_FILE_SUFFIX = '.masonry'
+# magic, version, column_width, spacing, num_columns, item_count,
+# total_height, input fingerprint, payload crc32, padding
+_HEADER = struct.Struct('<8sIiiiqq16sI4x')
+HEADER_SIZE = _HEADER.size
+_INT32_COLUMNS = ('index', 'x', 'y', 'width', 'height')
+_INT32_MAX = np.iinfo(np.int32).max
+_INT32_MIN = np.iinfo(np.int32).min
+BYTES_PER_ITEM = 8 + 4 * len(_INT32_COLUMNS)
+
+
+def layout_input_fingerprint(indices, aspect_ratios, spacer_heights=None) -> bytes:
+    """Hash the layout input so a stored layout is only reused for it."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(indices, dtype=np.int64).tobytes())
+    digest.update(np.ascontiguousarray(aspect_ratios, dtype=np.float64).tobytes())
+    if spacer_heights is not None:
+        digest.update(b'spacers')
+        digest.update(np.ascontiguousarray(spacer_heights, dtype=np.int64).tobytes())
+    return digest.digest()
+
+
+def write_layout_file(path: Path, arrays: MasonryArrays, column_width: int, spacing: int,
+                      num_columns: int, fingerprint: bytes) -> bool:
+    """Write `arrays` to `path` atomically.
+
+    Returns:
+        False when a value does not fit the int32 columns (nothing is written)
+    """
+    columns = [np.asarray(getattr(arrays, name)) for name in _INT32_COLUMNS]
+    for column in columns:
+        if len(column) and (column.max() > _INT32_MAX or column.min() < _INT32_MIN):
+            return False
+    payload = [np.ascontiguousarray(arrays.aspect_ratio, dtype='<f8').tobytes()]
+    payload.extend(np.ascontiguousarray(column, dtype='<i4').tobytes() for column in columns)
+    crc = 0
+    for chunk in payload:
+        crc = zlib.crc32(chunk, crc)
+    header = _HEADER.pack(
+        LAYOUT_MAGIC, LAYOUT_FORMAT_VERSION, int(column_width), int(spacing),
+        int(num_columns), len(arrays), int(arrays.total_height), fingerprint, crc)
+
+    path = Path(path)
+    temp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(header)
+            for chunk in payload:
+                f.write(chunk)
+        os.replace(temp_path, path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+    return True
+
+
+def read_layout_file(path: Path, column_width: int, spacing: int, num_columns: int,
+                     fingerprint: bytes) -> MasonryArrays | None:
+    """Map and validate a layout file, returning its columns as arrays.
+
+    Returns:
+        None when the file is missing, was written for other settings or
+        input, or fails the size or checksum checks
+    """
+    try:
+        with open(path, 'rb') as f:
+            file_size = os.fstat(f.fileno()).st_size
+            if file_size < HEADER_SIZE:
+                return None
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    (magic, version, stored_column_width, stored_spacing, stored_num_columns,
+     item_count, total_height, stored_fingerprint, crc) = _HEADER.unpack_from(mapped, 0)
+    if (magic != LAYOUT_MAGIC
+            or version != LAYOUT_FORMAT_VERSION
+            or stored_column_width != column_width
+            or stored_spacing != spacing
+            or stored_num_columns != num_columns
+            or stored_fingerprint != fingerprint
+            or item_count < 0
+            or file_size != HEADER_SIZE + item_count * BYTES_PER_ITEM):
+        mapped.close()
+        return None
+    with memoryview(mapped) as view:
+        valid = zlib.crc32(view[HEADER_SIZE:]) == crc
+    if not valid:
+        mapped.close()
+        return None
+
+    # Copy out so no array pins the mapping; close it before the next write.
+    try:
+        offset = HEADER_SIZE
+        aspect_ratio = np.frombuffer(mapped, dtype='<f8', count=item_count, offset=offset).copy()
+        offset += item_count * 8
+        columns = {}
+        for name in _INT32_COLUMNS:
+            columns[name] = np.frombuffer(mapped, dtype='<i4', count=item_count, offset=offset).copy()
+            offset += item_count * 4
+    finally:
+        mapped.close()
+    return MasonryArrays(aspect_ratio=aspect_ratio, total_height=total_height, **columns)
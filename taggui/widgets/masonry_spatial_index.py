@@ -0,0 +1,150 @@
+"""Spatial index over positioned masonry items.
+
+Hit-testing and viewport queries used to scan every masonry item. This index
+answers point and rect queries in O(log n + k) and can be updated one segment
+(for example one cached page) at a time.
+
+Items are grouped into segments; inside a segment they are bucketed by their
+horizontal slot (x, width), which for a masonry layout is a column, or the
+full width for spacers. Each bucket keeps its items sorted by top edge
+together with a running maximum of bottom edges, so two binary searches bound
+the items that can overlap a y-range even when items in a bucket overlap. The
+segments themselves are kept in the same structure, ordered by top edge.
+"""
+
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+
+import numpy as np
+
+
+# Items per segment when indexing a flat item list.
+DEFAULT_SEGMENT_SIZE = 65536
+
+
+def _column(items, key):
+    return np.fromiter((item[key] for item in items), dtype=np.int64, count=len(items))
+
+
+class _Segment:
+    """Static index over one group of items."""
+
+    __slots__ = ('key', 'top', 'bottom', 'buckets', 'items')
+
+    def __init__(self, key, items):
+        self.key = key
+        self.items = items
+        xs = _column(items, 'x')
+        widths = _column(items, 'width')
+        tops = _column(items, 'y')
+        bottoms = tops + _column(items, 'height')
+
+        # Stable: by slot (x, then width), then top edge, then list position.
+        order = np.lexsort((tops, widths, xs))
+        sorted_xs = xs[order]
+        sorted_widths = widths[order]
+        slot_starts = np.flatnonzero(
+            (np.diff(sorted_xs) != 0) | (np.diff(sorted_widths) != 0)) + 1
+        slot_bounds = [0, *slot_starts.tolist(), len(order)]
+
+        self.buckets = []
+        for start, end in zip(slot_bounds, slot_bounds[1:]):
+            rows = order[start:end]
+            x = int(sorted_xs[start])
+            self.buckets.append((
+                x, x + int(sorted_widths[start]), tops[rows],
+                np.maximum.accumulate(bottoms[rows]), bottoms[rows], rows,
+            ))
+        self.top = int(tops.min())
+        self.bottom = int(bottoms.max())
+
+    def query(self, left, top, right, bottom, out):
+        items = self.items
+        for x_start, x_end, tops, max_bottoms, bottoms, rows in self.buckets:
+            if x_start > right or x_end < left:
+                continue
+            first = int(np.searchsorted(max_bottoms, top, 'left'))
+            last = int(np.searchsorted(tops, bottom, 'right'))
+            if first >= last:
+                continue
+            hits = rows[first:last][bottoms[first:last] >= top]
+            out.extend((self.key, position, items[position]) for position in hits.tolist())
+
+
+class MasonrySpatialIndex:
+    """Point and rect queries over masonry item dicts.
+
+    Query results are items whose vertical extent [y, y + height] and
+    horizontal extent [x, x + width] touch the query range, in segment order
+    and then item order within a segment (the order of the source list for an
+    index built with from_items). Callers apply exact QRect tests.
+    """
+
+    def __init__(self):
+        self._segments = {}
+        self._ordered = None
+        self._segment_tops = []
+        self._segment_max_bottoms = []
+        # The item list this index was built from, for staleness checks.
+        self.source = None
+
+    @classmethod
+    def from_items(cls, items, segment_size=DEFAULT_SEGMENT_SIZE):
+        """Index a flat item list, `segment_size` consecutive items per segment."""
+        index = cls()
+        items = items or []
+        for segment_number, start in enumerate(range(0, len(items), segment_size)):
+            index.set_segment(segment_number, items[start:start + segment_size])
+        index.source = items
+        return index
+
+    def __len__(self):
+        return sum(len(segment.items) for segment in self._segments.values())
+
+    def set_segment(self, key, items):
+        """Add or replace the items stored under `key` (an orderable key)."""
+        if items:
+            self._segments[key] = _Segment(key, items)
+        else:
+            self._segments.pop(key, None)
+        self._ordered = None
+
+    def remove_segment(self, key):
+        if self._segments.pop(key, None) is not None:
+            self._ordered = None
+
+    def clear(self):
+        self._segments.clear()
+        self._ordered = None
+
+    def _ensure_order(self):
+        if self._ordered is not None:
+            return
+        self._ordered = sorted(self._segments.values(), key=lambda segment: segment.top)
+        self._segment_tops = [segment.top for segment in self._ordered]
+        self._segment_max_bottoms = list(accumulate(
+            (segment.bottom for segment in self._ordered), max))
+
+    def query_rect(self, left, top, right, bottom) -> list[dict]:
+        """Items touching the rect with inclusive edges (left, top)-(right, bottom)."""
+        self._ensure_order()
+        hits = []
+        first = bisect_left(self._segment_max_bottoms, top)
+        last = bisect_right(self._segment_tops, bottom)
+        for segment in self._ordered[first:last]:
+            if segment.bottom >= top:
+                segment.query(left, top, right, bottom, hits)
+        hits.sort(key=lambda hit: (hit[0], hit[1]))
+        return [hit[2] for hit in hits]
+
+    def query_y_range(self, top, bottom) -> list[dict]:
+        """Items touching the horizontal band between `top` and `bottom`."""
+        return self.query_rect(float('-inf'), top, float('inf'), bottom)
+
+    def item_at(self, x, y):
+        """First item whose rect contains the point, or None."""
+        for item in self.query_rect(x, y, x, y):
+            if (item['x'] <= x < item['x'] + item['width']
+                    and item['y'] <= y < item['y'] + item['height']):
+                return item
+        return None
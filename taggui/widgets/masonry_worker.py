@@ -3,12 +3,16 @@
 This runs in a separate process to avoid Python GIL blocking the UI thread.
 """
 
-import pickle
 from pathlib import Path
 from dataclasses import dataclass
 import threading
 
-MASONRY_CACHE_VERSION = 4
+MASONRY_CACHE_VERSION = 5
+
+# Last computed layout ((column_width, spacing, num_columns), MasonryArrays),
+# kept so the next calculation can reuse its checkpoints.
+_previous_layout = None
+_previous_layout_lock = threading.Lock()
 
 
 @dataclass
@@ -34,7 +38,8 @@ def calculate_masonry_layout(items_data, column_width, spacing, num_columns, cac
         cache_key: Optional cache key
 
     Returns:
-        dict with 'items' (list of positioned items) and 'total_height'
+        dict with 'items' (list of positioned items), 'total_height' and
+        'arrays' (the same layout as MasonryArrays; absent after an error)
     """
     # Top-level safety wrapper to catch ANY crash before process dies
     try:
@@ -53,101 +58,42 @@ def calculate_masonry_layout(items_data, column_width, spacing, num_columns, cac
 def _calculate_masonry_layout_impl(items_data, column_width, spacing, num_columns, cache_key=None):
     """Internal implementation of masonry layout calculation."""
     try:
+        try:
+            from widgets.masonry_engine import items_data_to_arrays
+            from widgets.masonry_layout_cache import layout_input_fingerprint
+        except ModuleNotFoundError:
+            from taggui.widgets.masonry_engine import items_data_to_arrays
+            from taggui.widgets.masonry_layout_cache import layout_input_fingerprint
+
+        indices, aspect_ratios, spacer_heights = items_data_to_arrays(items_data)
+        fingerprint = layout_input_fingerprint(indices, aspect_ratios, spacer_heights) if cache_key else None
+
         # Try to load from cache first
         if cache_key:
             try:
-                cached = _load_from_cache(cache_key, items_data, column_width, spacing, num_columns)
-                if cached:
-                    return cached
+                cached = _load_from_cache(cache_key, fingerprint, column_width, spacing, num_columns)
+                if cached is not None:
+                    return {
+                        'items': cached.to_items(),
+                        'total_height': cached.total_height,
+                        'arrays': cached,
+                    }
             except Exception as e:
                 # Cache load failed, proceed with calculation
                 print(f"[MASONRY] Cache load failed: {e}")
 
-        # Calculate positions
-        column_heights = [0] * num_columns
-        positioned_items = []
-        column_stride = column_width + spacing
-
-        for index, aspect_ratio in items_data:
-            # CHECK FOR SPACER
-            # Spacer format: aspect_ratio is ('SPACER', height_pixels)
-            if isinstance(aspect_ratio, tuple) and len(aspect_ratio) == 2 and aspect_ratio[0] == 'SPACER':
-                spacer_height = int(aspect_ratio[1])
-                
-                # Push ALL columns down to the max height + spacer
-                # This ensures the gap is preserved across the whole layout width
-                max_h = max(column_heights)
-                
-                # Create a VISUAL item for the spacer so we can paint it (Loading Text) and use it as a trigger
-                full_width = (column_width + spacing) * num_columns - spacing
-                positioned_items.append({
-                    'index': -2,
-                    'x': 0,
-                    'y': max_h,
-                    'width': int(full_width),
-                    'height': int(spacer_height),
-                    'aspect_ratio': 1.0,
-                })
-
-                new_h = max_h + spacer_height
-                for i in range(num_columns):
-                    column_heights[i] = new_h
-                
-                continue
-
-            # Calculate item dimensions
-            item_width = column_width
-
-            # Validate aspect ratio to prevent crashes
-            if not isinstance(aspect_ratio, (int, float)):
-                 aspect_ratio = 1.0 # Fallback for bad data
-
-            if not aspect_ratio or aspect_ratio <= 0 or aspect_ratio != aspect_ratio:  # NaN check
-                aspect_ratio = 1.0  # Fallback to square
-            if aspect_ratio > 100:  # Extremely wide
-                aspect_ratio = 100
-            if aspect_ratio < 0.01:  # Extremely tall
-                aspect_ratio = 0.01
-
-            item_height = int(item_width / aspect_ratio)
-
-            # Find shortest column
-            shortest_col = 0
-            shortest_height = column_heights[0]
-            for column_index in range(1, num_columns):
-                column_height = column_heights[column_index]
-                if column_height < shortest_height:
-                    shortest_col = column_index
-                    shortest_height = column_height
-
-            # Calculate position
-            x = shortest_col * column_stride
-            y = column_heights[shortest_col]
-
-            # Store positioned item
-            positioned_items.append({
-                'index': index,
-                'x': x,
-                'y': y,
-                'width': item_width,
-                'height': item_height,
-                'aspect_ratio': aspect_ratio,
-            })
-
-            # Update column height
-            column_heights[shortest_col] += item_height + spacing
-
-        total_height = max(column_heights) if column_heights else 0
-
+        # Place items with the array engine, then emit the dicts the view uses.
+        arrays = _place_items(indices, aspect_ratios, spacer_heights, column_width, spacing, num_columns)
         result = {
-            'items': positioned_items,
-            'total_height': total_height
+            'items': arrays.to_items(),
+            'total_height': arrays.total_height,
+            'arrays': arrays,
         }
 
         # Save to cache
         if cache_key:
             try:
-                _save_to_cache(cache_key, result, items_data, column_width, spacing, num_columns)
+                _save_to_cache(cache_key, arrays, fingerprint, column_width, spacing, num_columns)
             except Exception as e:
                 # Cache save failed, but return result anyway
                 print(f"[MASONRY] Cache save failed: {e}")
@@ -166,6 +112,33 @@ def _calculate_masonry_layout_impl(items_data, column_width, spacing, num_column
         }
 
 
+def _place_items(indices, aspect_ratios, spacer_heights, column_width, spacing, num_columns):
+    """Lay out items, resuming from the previous layout's checkpoints if possible.
+
+    Background dimension repair changes a few heights at a time; the engine
+    then only re-places rows from the checkpoint before the first change until
+    the column heights converge again.
+    """
+    global _previous_layout
+    try:
+        from widgets.masonry_engine import compute_masonry_arrays, update_masonry_arrays
+    except ModuleNotFoundError:
+        from taggui.widgets.masonry_engine import compute_masonry_arrays, update_masonry_arrays
+
+    settings_key = (column_width, spacing, num_columns)
+    with _previous_layout_lock:
+        previous = _previous_layout
+    if previous is not None and previous[0] == settings_key:
+        arrays = update_masonry_arrays(
+            previous[1], indices, aspect_ratios, column_width, spacing, num_columns, spacer_heights)
+    else:
+        arrays = compute_masonry_arrays(
+            indices, aspect_ratios, column_width, spacing, num_columns, spacer_heights)
+    with _previous_layout_lock:
+        _previous_layout = (settings_key, arrays)
+    return arrays
+
+
 def _get_cache_path(cache_key, *, ensure_parent=False):
     """Get a cache path, creating its directory only for a write."""
     cache_dir = Path.home() / '.taggui_cache' / 'masonry'
@@ -173,107 +146,63 @@ def _get_cache_path(cache_key, *, ensure_parent=False):
         cache_dir.mkdir(parents=True, exist_ok=True)
     import hashlib
     key_hash = hashlib.md5(cache_key.encode()).hexdigest()
-    return cache_dir / f'{key_hash}.pkl'  # Changed from .json to .pkl
+    return cache_dir / f'{key_hash}.v{MASONRY_CACHE_VERSION}.masonry'
 
 
-def _save_to_cache_worker(cache_path, cache_data):
+def _save_to_cache_worker(cache_path, arrays, fingerprint, column_width, spacing, num_columns):
     """Background worker to save cache without blocking."""
     try:
-        with open(cache_path, 'wb') as f:
-            pickle.dump(cache_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        from widgets.masonry_layout_cache import write_layout_file
+    except ModuleNotFoundError:
+        from taggui.widgets.masonry_layout_cache import write_layout_file
+    try:
+        if not write_layout_file(cache_path, arrays, column_width, spacing, num_columns, fingerprint):
+            print("[MASONRY] Layout too tall for the binary cache, not saved")
     except Exception as e:
         print(f"[MASONRY] Background cache save failed: {e}")
 
 
-def _save_to_cache(cache_key, result, items_data, column_width, spacing, num_columns):
-    """Save result to cache asynchronously in background thread."""
+def _save_to_cache(cache_key, arrays, fingerprint, column_width, spacing, num_columns):
+    """Save a layout to the binary cache in a background thread."""
     try:
         cache_path = _get_cache_path(cache_key, ensure_parent=True)
-        cache_data = {
-            'cache_version': MASONRY_CACHE_VERSION,
-            'column_width': column_width,
-            'spacing': spacing,
-            'num_columns': num_columns,
-            'items_count': len(items_data),
-            'items': result['items'],
-            'total_height': result['total_height']
-        }
 
         # Save in background thread so it never blocks
         thread = threading.Thread(
             target=_save_to_cache_worker,
-            args=(cache_path, cache_data),
+            args=(cache_path, arrays, fingerprint, column_width, spacing, num_columns),
             daemon=True  # Don't prevent app exit
         )
         thread.start()
+        return thread
 
     except Exception as e:
         print(f"[MASONRY] Failed to start cache save thread: {e}")
+        return None
 
 
-def _load_from_cache(cache_key, items_data, column_width, spacing, num_columns):
-    """Load result from cache if valid."""
-    try:
-        cache_path = _get_cache_path(cache_key)
-        if not cache_path.exists():
-            # Try old .json cache for migration
-            old_cache_path = cache_path.with_suffix('.json')
-            if old_cache_path.exists():
-                print(f"[MASONRY] Deleting old JSON cache, will regenerate with pickle")
-                old_cache_path.unlink()
-            return None
-
-        with open(cache_path, 'rb') as f:
-            cache_data = pickle.load(f)
-
-        # Validate cache
-        if (cache_data.get('cache_version') != MASONRY_CACHE_VERSION or
-            cache_data['column_width'] != column_width or
-            cache_data['spacing'] != spacing or
-            cache_data['num_columns'] != num_columns or
-            cache_data['items_count'] != len(items_data)):
-            return None
-
-        # Validate both item order and aspect ratios. Order mismatches can
-        # otherwise reuse a stale layout and apply the wrong heights to items.
-        cached_items = cache_data['items']
-        if len(cached_items) != len(items_data):
-            return None
-
-        if len(items_data) <= 256:
-            sample_positions = list(range(len(items_data)))
-        else:
-            sample_positions = sorted({
-                0,
-                len(items_data) - 1,
-                len(items_data) // 4,
-                len(items_data) // 2,
-                (3 * len(items_data)) // 4,
-                *range(min(64, len(items_data))),
-                *range(max(0, len(items_data) - 64), len(items_data)),
-            })
-
-        for i in sample_positions:
-            index, aspect_ratio = items_data[i]
-            if i >= len(cached_items):
-                return None
-            cached_item = cached_items[i]
-
-            if int(cached_item.get('index', -999999)) != int(index):
-                return None
-            
-            # SPACER HANDLING: If aspect_ratio is a tuple (SPACER), skip float validation
-            if isinstance(aspect_ratio, tuple):
-                 continue
-
-            cached_aspect = cached_item['aspect_ratio']
-            if abs(cached_aspect - aspect_ratio) > 0.001:
-                return None
+def _remove_legacy_cache_files(cache_path):
+    """Delete pickle/JSON layouts written by older versions for this key."""
+    key_hash = cache_path.name.split('.', 1)[0]
+    for suffix in ('.pkl', '.json'):
+        legacy_path = cache_path.with_name(f'{key_hash}{suffix}')
+        try:
+            if legacy_path.exists():
+                print(f"[MASONRY] Deleting old {suffix} cache, will regenerate as binary")
+                legacy_path.unlink()
+        except OSError:
+            pass
 
-        return {
-            'items': cache_data['items'],
-            'total_height': cache_data['total_height']
-        }
-    except Exception as e:
-        print(f"[MASONRY] Cache load failed: {e}")
+
+def _load_from_cache(cache_key, fingerprint, column_width, spacing, num_columns):
+    """Map a cached layout for this exact input; None on any mismatch."""
+    try:
+        from widgets.masonry_layout_cache import read_layout_file
+    except ModuleNotFoundError:
+        from taggui.widgets.masonry_layout_cache import read_layout_file
+    cache_path = _get_cache_path(cache_key)
+    if not cache_path.exists():
+        _remove_legacy_cache_files(cache_path)
         return None
+    return read_layout_file(cache_path, column_width, spacing, num_columns, fingerprint)
+
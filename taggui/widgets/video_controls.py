@@ -1,7 +1,7 @@
 import time
 
-from PySide6.QtCore import Qt, Signal, Slot, QEvent, QTimer, QPointF, QRectF
-from PySide6.QtGui import QIcon, QPainter, QPolygonF, QColor, QPen
+from PySide6.QtCore import Qt, Signal, Slot, QEvent, QTimer, QPoint, QPointF, QRectF
+from PySide6.QtGui import QIcon, QPainter, QPixmap, QPolygonF, QColor, QPen
 from PySide6.QtWidgets import (QApplication, QFrame, QHBoxLayout, QLabel, QPushButton,
                                QSlider, QSpinBox, QVBoxLayout, QWidget, QCheckBox, QStyle, QStyleOptionSlider,
                                QSizePolicy)
@@ -43,6 +43,10 @@ class LoopSlider(QSlider):
         self._marker_offset_y = -2
         self._marker_shape = 'triangle'
 
+        # Hover previews come from the video's sprite sheet, never the decoder.
+        self._sprite_sheet = None
+        self._hover_preview = None
+
         # Set minimum height to show markers above slider
         self.setMinimumHeight(30)
 
@@ -59,6 +63,36 @@ class LoopSlider(QSlider):
         self.loop_end = end
         self.update()
 
+    def set_sprite_sheet(self, sheet):
+        """Set the SpriteSheet used for hover previews (None turns them off)."""
+        self._sprite_sheet = sheet
+        self.setMouseTracking(sheet is not None)
+        if sheet is None:
+            self._hide_hover_preview()
+
+    def _show_hover_preview(self, x_pos: int, value: int):
+        if self._hover_preview is None:
+            self._hover_preview = QLabel(self, Qt.WindowType.ToolTip)
+            self._hover_preview.setStyleSheet('QLabel { border: 1px solid #808080; background: black; }')
+        self._hover_preview.setPixmap(QPixmap.fromImage(self._sprite_sheet.tile(value)))
+        self._hover_preview.adjustSize()
+        size = self._hover_preview.size()
+        anchor = self.mapToGlobal(QPoint(int(x_pos), 0))
+        self._hover_preview.move(anchor.x() - size.width() // 2, anchor.y() - size.height() - 4)
+        self._hover_preview.show()
+
+    def _hide_hover_preview(self):
+        if self._hover_preview is not None:
+            self._hover_preview.hide()
+
+    def leaveEvent(self, event):
+        self._hide_hover_preview()
+        super().leaveEvent(event)
+
+    def hideEvent(self, event):
+        self._hide_hover_preview()
+        super().hideEvent(event)
+
     def clear_loop_markers(self):
         """Clear loop markers."""
         self.loop_start = None
@@ -170,6 +204,7 @@ class LoopSlider(QSlider):
 
     def mousePressEvent(self, event):
         """Handle mouse press for marker dragging and position jumping."""
+        self._hide_hover_preview()
         opt = QStyleOptionSlider()
         self.initStyleOption(opt)
         groove = self.style().subControlRect(QStyle.ComplexControl.CC_Slider, opt, QStyle.SubControl.SC_SliderGroove, self)
@@ -272,6 +307,13 @@ class LoopSlider(QSlider):
             event.accept()
             return
 
+        if self._sprite_sheet is not None and event.buttons() == Qt.MouseButton.NoButton:
+            opt = QStyleOptionSlider()
+            self.initStyleOption(opt)
+            groove = self.style().subControlRect(QStyle.ComplexControl.CC_Slider, opt, QStyle.SubControl.SC_SliderGroove, self)
+            x_pos = max(groove.left(), min(event.pos().x(), groove.right()))
+            self._show_hover_preview(x_pos, self._position_to_value(x_pos, groove))
+
         super().mouseMoveEvent(event)
 
     def mouseReleaseEvent(self, event):
@@ -2901,6 +2943,22 @@ class VideoControlsWidget(QWidget):
             """)
         self._last_audio_visual_state = current_visual_state
 
+    @staticmethod
+    def _stream_info_tooltip(metadata: dict) -> str:
+        """Describe the cached stream metadata (codec, pixel format, exact rate)."""
+        lines = []
+        if metadata.get('codec'):
+            lines.append(f"Codec: {metadata['codec']}")
+        if metadata.get('pixel_format'):
+            lines.append(f"Pixel format: {metadata['pixel_format']}")
+        if metadata.get('fps_num') and metadata.get('fps_den'):
+            lines.append(f"Frame rate: {metadata['fps_num']}/{metadata['fps_den']}")
+        if metadata.get('rotation'):
+            lines.append(f"Rotation: {metadata['rotation']}°")
+        if metadata.get('keyframe_interval'):
+            lines.append(f"Keyframe interval: {float(metadata['keyframe_interval']):.2f}s")
+        return '\n'.join(lines)
+
     @Slot(dict)
     def set_video_info(self, metadata: dict, image=None, proxy_model=None):
         """Update controls with video metadata and load loop markers from image."""
@@ -2961,6 +3019,7 @@ class VideoControlsWidget(QWidget):
 
         # Update info labels
         self.fps_label.setText(f'{fps:.2f} fps')
+        self.fps_label.setToolTip(self._stream_info_tooltip(metadata))
         self.frame_count_label.setText(f'{frame_count} frames')
 
         # Update frame total label initially
@@ -3458,6 +3517,7 @@ class VideoControlsWidget(QWidget):
         self.timeline_slider.setValue(0)
         self.time_label.setText('00:00.000 / 00:00.000')
         self.fps_label.setText('0.00 fps')
+        self.fps_label.setToolTip('')
         self.frame_count_label.setText('0 frames')
         self.frame_total_label.setText('/ 0')
         # N*4+1 frame rule indicator removed - now shown as stamp on sidebar preview
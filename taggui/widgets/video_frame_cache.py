@@ -0,0 +1,251 @@
+"""Decoded-frame cache for exact frame stepping in the video player.
+
+The OpenCV path used to call `cap.set(CAP_PROP_POS_FRAMES, n)` and
+`cap.read()` for every frame it showed. Every seek goes back to a keyframe
+and decodes forward, so stepping one frame at a time, especially backward,
+cost a whole GOP decode per step. Three things make stepping cheap:
+
+- `FrameCache` keeps recently shown frames as QImages under a byte budget.
+- The player skips the seek when the requested frame is the capture's next
+  frame, and grabs forward over short gaps instead of seeking.
+- `GopPrefetcher` decodes a window of frames around the current one on a
+  worker with its own capture, in the stepping direction first. A backward
+  step then finds its frame already in the cache.
+- With a keyframe index (`utils.video.keyframe_index`), `seek_capture`
+  reads through any gap that has no keyframe in it, and otherwise seeks to
+  the keyframe before the target and decodes forward from there.
+
+OpenCV is passed in by the player, so importing this module does not load it.
+"""
+
+import threading
+from collections import OrderedDict
+
+from PySide6.QtGui import QImage
+
+
+DEFAULT_BUDGET_BYTES = 256 * 1024 * 1024
+# Frames decoded on each side of the current one, if the budget allows.
+GOP_WINDOW_FRAMES = 24
+# Forward gaps up to this many frames are read through instead of seeking.
+SEQUENTIAL_SKIP_MAX = 12
+
+
+def bgr_frame_to_qimage(cv2, frame, sar_num: float, sar_den: float) -> QImage:
+    """RGB QImage of an OpenCV BGR frame, stretched for non-square pixels."""
+    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    if sar_num > 0 and sar_den > 0 and sar_num != sar_den:
+        h, w = frame_rgb.shape[:2]
+        display_width = int(w * sar_num / sar_den)
+        frame_rgb = cv2.resize(frame_rgb, (display_width, h), interpolation=cv2.INTER_LINEAR)
+    # tobytes() so the QImage owns its buffer and the numpy array can be freed.
+    h, w, ch = frame_rgb.shape
+    return QImage(frame_rgb.tobytes(), w, h, ch * w, QImage.Format.Format_RGB888)
+
+
+def seek_capture(cv2, cap, frame_number: int, next_frame: int | None, keyframe_index=None) -> bool:
+    """Position `cap` so its next read returns `frame_number`.
+
+    `next_frame` is the frame the capture reads next without seeking, if
+    known. Returns False when the capture ran out of frames on the way.
+    """
+    skip = frame_number - next_frame if next_frame is not None else -1
+    if skip == 0:
+        return True
+    keyframe = keyframe_index.preceding_keyframe(frame_number) if keyframe_index is not None else None
+    if skip > 0 and (skip <= SEQUENTIAL_SKIP_MAX or (keyframe is not None and next_frame >= keyframe)):
+        # A seek would decode the same frames, or a short gap is cheaper to read through.
+        start = next_frame
+    elif keyframe is not None:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, keyframe)
+        start = keyframe
+    else:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+        return True
+    for _ in range(frame_number - start):
+        if not cap.grab():
+            return False
+    return True
+
+
+class FrameCache:
+    """Thread-safe LRU of decoded frames keyed by frame number."""
+
+    def __init__(self, budget_bytes: int = DEFAULT_BUDGET_BYTES):
+        self.budget_bytes = max(0, int(budget_bytes))
+        self.bytes = 0
+        # Size of the most recent frame; sizes the prefetch window.
+        self.frame_bytes = 0
+        self._lock = threading.Lock()
+        self._frames: OrderedDict[int, QImage] = OrderedDict()
+
+    def __contains__(self, frame_number: int) -> bool:
+        with self._lock:
+            return frame_number in self._frames
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._frames)
+
+    def get(self, frame_number: int) -> QImage | None:
+        with self._lock:
+            qimage = self._frames.get(frame_number)
+            if qimage is not None:
+                self._frames.move_to_end(frame_number)
+            return qimage
+
+    def put(self, frame_number: int, qimage: QImage):
+        size = int(qimage.sizeInBytes())
+        with self._lock:
+            self.frame_bytes = size
+            if size > self.budget_bytes:
+                return
+            previous = self._frames.pop(frame_number, None)
+            if previous is not None:
+                self.bytes -= int(previous.sizeInBytes())
+            self._frames[frame_number] = qimage
+            self.bytes += size
+            while self.bytes > self.budget_bytes:
+                _old_frame, old_image = self._frames.popitem(last=False)
+                self.bytes -= int(old_image.sizeInBytes())
+
+    def missing(self, frame_numbers) -> list[int]:
+        with self._lock:
+            return [frame_number for frame_number in frame_numbers if frame_number not in self._frames]
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+            self.bytes = 0
+            self.frame_bytes = 0
+
+    def window_frames(self, window: int) -> int:
+        """`window` capped so both sides fit in the budget next to the shown frame."""
+        frame_bytes = self.frame_bytes
+        if frame_bytes <= 0:
+            return window
+        return max(0, min(window, (self.budget_bytes // frame_bytes - 1) // 2))
+
+
+class GopPrefetcher:
+    """Decodes the frames around the current one on a worker thread."""
+
+    def __init__(self, cv2, video_path, cache: FrameCache, *, window: int = GOP_WINDOW_FRAMES,
+                 keyframe_index=None):
+        self._cv2 = cv2
+        self.video_path = str(video_path)
+        self.cache = cache
+        self.window = max(0, int(window))
+        self.keyframe_index = keyframe_index
+        self._lock = threading.Lock()
+        self._wanted = None  # (center, direction, total_frames)
+        self._thread = None
+        self._closed = False
+        self._cap = None
+        self._next_frame = None
+        self._sar = (0.0, 0.0)
+
+    def request(self, center: int, direction: int, total_frames: int):
+        """Prefetch around `center`, on the `direction` side (+1 or -1) first."""
+        if self._closed or self.window <= 0:
+            return
+        with self._lock:
+            self._wanted = (int(center), -1 if direction < 0 else 1, int(total_frames))
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="video_gop_prefetch", daemon=True)
+            self._thread.start()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._wanted = None
+            thread = self._thread
+        if thread is None:
+            self._release_capture()
+
+    def plan(self, center: int, direction: int, total_frames: int) -> list[tuple[int, int]]:
+        """Missing (first, last) frame runs to decode, in priority order."""
+        window = self.cache.window_frames(self.window)
+        last_frame = total_frames - 1 if total_frames > 0 else center + window
+        ahead = range(center + 1, min(last_frame, center + window) + 1)
+        behind = range(max(0, center - window), center)
+        runs = []
+        for side in ((behind, ahead) if direction < 0 else (ahead, behind)):
+            missing = self.cache.missing(side)
+            if missing:
+                runs.append((missing[0], missing[-1]))
+        return runs
+
+    def _run(self):
+        try:
+            while True:
+                with self._lock:
+                    wanted = self._wanted
+                    if wanted is None or self._closed:
+                        return
+                runs = self.plan(*wanted)
+                if not runs:
+                    with self._lock:
+                        if self._wanted == wanted:
+                            self._wanted = None
+                    continue
+                if not self._decode_run(*runs[0], wanted):
+                    # Unreadable frames; stop instead of retrying them forever.
+                    with self._lock:
+                        if self._wanted == wanted:
+                            self._wanted = None
+        except Exception as e:
+            print(f"[VIDEO] Frame prefetch failed for {self.video_path}: {e}")
+        finally:
+            with self._lock:
+                self._thread = None
+                closed = self._closed
+            if closed:
+                self._release_capture()
+
+    def _capture(self):
+        if self._cap is None:
+            cv2 = self._cv2
+            cap = cv2.VideoCapture(self.video_path, cv2.CAP_FFMPEG)
+            # Software decode: D3D11 hardware decode next to MPV's renderer
+            # crashes the GPU driver (0xe24c4a02), see video_player.py.
+            cap.set(cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_NONE)
+            if not cap.isOpened():
+                cap.release()
+                return None
+            self._cap = cap
+            self._sar = (cap.get(cv2.CAP_PROP_SAR_NUM), cap.get(cv2.CAP_PROP_SAR_DEN))
+        return self._cap
+
+    def _release_capture(self):
+        cap, self._cap = self._cap, None
+        if cap is not None:
+            cap.release()
+
+    def _decode_run(self, first: int, last: int, wanted) -> bool:
+        cap = self._capture()
+        if cap is None:
+            return False
+        cv2 = self._cv2
+        if not seek_capture(cv2, cap, first, self._next_frame, self.keyframe_index):
+            self._next_frame = None
+            return False
+        for frame_number in range(first, last + 1):
+            with self._lock:
+                current = self._wanted
+                if self._closed or current is None:
+                    return True
+            if current != wanted:
+                center, direction, _total = current
+                if direction != wanted[1] or not (first - self.window <= center <= last + self.window):
+                    # The user moved on; plan again from the new position.
+                    return True
+            ok, frame = cap.read()
+            if not ok:
+                self._next_frame = None
+                return False
+            self._next_frame = frame_number + 1
+            if frame_number not in self.cache:
+                self.cache.put(frame_number, bgr_frame_to_qimage(cv2, frame, *self._sar))
+        return True
@@ -17,6 +17,19 @@ from PySide6.QtOpenGLWidgets import QOpenGLWidget
 from PySide6.QtGui import QOpenGLContext
 
 from utils.video import playback_backend
+from widgets.video_frame_cache import (
+    DEFAULT_BUDGET_BYTES as FRAME_CACHE_DEFAULT_BUDGET_BYTES,
+    FrameCache,
+    GopPrefetcher,
+    bgr_frame_to_qimage,
+    seek_capture,
+)
+from widgets.video_sprite_sheet import SpriteSheetBuilder, sprite_sheets_enabled
+from utils.video.keyframe_index import (
+    cached_keyframe_index,
+    keyframe_index_enabled,
+    request_keyframe_index,
+)
 from utils.video.playback_backend import (
     MPV_RUNTIME_SEARCHED_DIRS,
     VLC_RUNTIME_SEARCHED_DIRS,
@@ -28,6 +41,23 @@ from utils.video.playback_backend import (
 )
 
 
+# Quiet time after the last scrub move before the exact frame is decoded.
+SCRUB_EXACT_FRAME_DELAY_MS = 120
+
+
+def _display_dimensions(video_dimensions, video_metadata):
+    """Storage dimensions widened by the stored SAR, as decoded frames are shown."""
+    try:
+        width, height = (int(value) for value in video_dimensions)
+        sar_num = float((video_metadata or {}).get('sar_num') or 1)
+        sar_den = float((video_metadata or {}).get('sar_den') or 1)
+    except (TypeError, ValueError):
+        return video_dimensions
+    if width <= 0 or sar_num <= 0 or sar_den <= 0 or sar_num == sar_den:
+        return video_dimensions
+    return int(width * sar_num / sar_den), height
+
+
 @lru_cache(maxsize=1)
 def _get_cv2():
     """Load OpenCV only when frame-accurate fallback operations need it."""
@@ -159,11 +189,32 @@ class VideoPlayerWidget(QWidget):
     playback_started = Signal()  # Emitted when playback starts
     playback_paused = Signal()   # Emitted when playback pauses
     _vlc_loop_end_crossed = Signal()  # Emitted from VLC thread when segment loop end is reached
+    _keyframe_index_loaded = Signal(str, object)  # video_path, KeyframeIndex or None; from a worker
+    sprite_sheet_changed = Signal(object)  # SpriteSheet of the current video, or None
 
     def __init__(self):
         super().__init__()
         self.video_path = None
         self.cap = None  # OpenCV capture for frame extraction
+        # Frame the capture reads next without seeking, when known.
+        self._cap_next_frame = None
+        self._last_exact_frame = None
+        budget_mb = os.environ.get('TAGGUI_VIDEO_FRAME_CACHE_MB')
+        self._frame_cache = FrameCache(
+            int(budget_mb) * 1024 * 1024 if budget_mb is not None else FRAME_CACHE_DEFAULT_BUDGET_BYTES
+        )
+        self._gop_prefetcher = None
+        # Keyframe/packet-time index of the current video, once loaded.
+        self._keyframe_index = None
+        self._keyframe_index_loaded.connect(self._on_keyframe_index_loaded)
+        # Timeline sprite sheet: drawn while scrubbing, exact frame once it settles.
+        self._sprite_sheet = None
+        self._sprite_builder = None
+        self._marker_preview_active = False
+        self._scrub_exact_timer = QTimer(self)
+        self._scrub_exact_timer.setSingleShot(True)
+        self._scrub_exact_timer.setInterval(SCRUB_EXACT_FRAME_DELAY_MS)
+        self._scrub_exact_timer.timeout.connect(self._show_settled_scrub_frame)
         self.pixmap_item = None  # For displaying OpenCV frames when paused
         self.video_item = None  # QGraphicsVideoItem for QMediaPlayer
 
@@ -1743,6 +1794,7 @@ class VideoPlayerWidget(QWidget):
         """Finish a timeline scrub session and reveal the settled paused MPV frame."""
         self._timeline_scrub_active = False
         self._timeline_scrub_cover_reveal_pending = False
+        self._flush_settled_scrub_frame()
         if (
             (not self.is_playing)
             and bool(getattr(self, '_mpv_paused_seek_cover_active', False))
@@ -1750,6 +1802,66 @@ class VideoPlayerWidget(QWidget):
         ):
             self._begin_mpv_paused_seek_reveal()
 
+    def begin_marker_preview(self):
+        """Loop-marker drag started: preview from the sprite sheet while it moves."""
+        self._marker_preview_active = True
+
+    def end_marker_preview(self):
+        self._marker_preview_active = False
+        self._flush_settled_scrub_frame()
+
+    def _sprite_scrub_active(self) -> bool:
+        return bool(self._timeline_scrub_active or self._marker_preview_active)
+
+    def _show_sprite_frame(self, frame_number: int) -> bool:
+        """Show the sprite tile nearest to `frame_number` at the frame's size."""
+        sheet = self._sprite_sheet
+        item = self._get_live_pixmap_item()
+        if sheet is None or item is None:
+            return False
+        try:
+            current = item.pixmap()
+        except RuntimeError:
+            return False
+        tile = sheet.tile(frame_number)
+        if not current.isNull():
+            tile = tile.scaled(current.size(), Qt.AspectRatioMode.IgnoreAspectRatio,
+                               Qt.TransformationMode.SmoothTransformation)
+        self._present_frame_pixmap(item, QPixmap.fromImage(tile))
+        return True
+
+    @Slot()
+    def _show_settled_scrub_frame(self):
+        if self.video_path and not self.is_playing:
+            self._show_opencv_frame(self.current_frame)
+
+    def _flush_settled_scrub_frame(self):
+        if self._scrub_exact_timer.isActive():
+            self._scrub_exact_timer.stop()
+            self._show_settled_scrub_frame()
+
+    def _request_sprite_sheet(self):
+        """Load the timeline sprite sheet from the cache, or build it in the background."""
+        if not sprite_sheets_enabled() or not self.video_path or self.fps <= 0 or self.total_frames <= 0:
+            return
+        if self._sprite_builder is None:
+            self._sprite_builder = SpriteSheetBuilder(
+                _get_cv2, self, is_playing=lambda: self.is_playing)
+            self._sprite_builder.set_ready_callback(self._on_sprite_sheet_ready)
+        self._sprite_builder.request(self.video_path, self.fps, self.total_frames)
+
+    def _on_sprite_sheet_ready(self, sheet):
+        self._sprite_sheet = sheet
+        self.sprite_sheet_changed.emit(sheet)
+
+    def _reset_sprite_sheet(self):
+        if self._sprite_builder is not None:
+            self._sprite_builder.cancel()
+        self._scrub_exact_timer.stop()
+        if self._sprite_sheet is not None:
+            self._sprite_sheet = None
+            self.sprite_sheet_changed.emit(None)
+
     def _cancel_vlc_reveal(self):
         self._vlc_pending_reveal = False
         self._vlc_reveal_deadline_monotonic = 0.0
@@ -2334,6 +2446,14 @@ class VideoPlayerWidget(QWidget):
                 fps = float(video_metadata.get('fps') or 0.0)
             except Exception:
                 fps = 0.0
+            try:
+                # The stored rational rate is exact (30000/1001, not 29.97003).
+                fps_num = int(video_metadata.get('fps_num') or 0)
+                fps_den = int(video_metadata.get('fps_den') or 0)
+                if fps_num > 0 and fps_den > 0:
+                    fps = fps_num / fps_den
+            except Exception:
+                pass
             try:
                 frame_count = int(video_metadata.get('frame_count') or 0)
             except Exception:
@@ -2344,6 +2464,8 @@ class VideoPlayerWidget(QWidget):
                     duration_ms = duration_s * 1000.0
             except Exception:
                 duration_ms = 0.0
+        if frame_count <= 0 < fps and duration_ms > 0:
+            frame_count = int(round(duration_ms / 1000.0 * fps))
         if fps > 0:
             self.fps = float(fps)
         if frame_count > 0:
@@ -2417,6 +2539,7 @@ class VideoPlayerWidget(QWidget):
                 pass
             return False
         self.cap = cap
+        self._cap_next_frame = None
         cv2 = _get_cv2()
         try:
             fps = float(self.cap.get(cv2.CAP_PROP_FPS) or 0.0)
@@ -2456,9 +2579,11 @@ class VideoPlayerWidget(QWidget):
         if self.cap:
             self.cap.release()
             self.cap = None
+        self._reset_frame_cache()
 
         self.video_path = video_path
         self.pixmap_item = pixmap_item
+        self._request_keyframe_index()
         self._active_forward_backend = PLAYBACK_BACKEND_QT_HYBRID
         self._mpv_needs_reload = True
         self._mpv_ready_for_seeks = False
@@ -2559,9 +2684,10 @@ class VideoPlayerWidget(QWidget):
                 return False
 
         # Show initial preview without blocking on OpenCV unless necessary.
+        # Size it like decoded frames, which are stretched for non-square pixels.
         preview_ready = self._set_initial_preview_pixmap(
             preview_qimage=preview_qimage,
-            video_dimensions=video_dimensions,
+            video_dimensions=_display_dimensions(video_dimensions, video_metadata),
         )
         if not preview_ready:
             if self._ensure_cap_ready():
@@ -2588,6 +2714,7 @@ class VideoPlayerWidget(QWidget):
         self._set_mpv_visible(False)
         self._set_vlc_visible(False)
         self.pixmap_item.show()
+        self._request_sprite_sheet()
 
         return True
 
@@ -3150,6 +3277,13 @@ class VideoPlayerWidget(QWidget):
                     self._set_mpv_visible(True)
                 else:
                     self._set_mpv_visible(not cover_active)
+            elif (
+                self._sprite_scrub_active()
+                and frame_number not in self._frame_cache
+                and self._show_sprite_frame(frame_number)
+            ):
+                # Sheet tile now; the exact frame is decoded once the scrub settles.
+                self._scrub_exact_timer.start()
             else:
                 self._show_opencv_frame(frame_number)
 
@@ -3170,12 +3304,10 @@ class VideoPlayerWidget(QWidget):
         else:
             frame_number = max(0, int(frame_number))
 
-        # Seek to frame
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-
-        # Read frame
-        ret, frame = self.cap.read()
-        if not ret:
+        qt_image = self._frame_cache.get(frame_number)
+        if qt_image is None:
+            qt_image = self._read_opencv_frame(cv2, frame_number)
+        if qt_image is None:
             print(f"Failed to read frame {frame_number}")
             self.consecutive_frame_failures += 1
 
@@ -3198,26 +3330,11 @@ class VideoPlayerWidget(QWidget):
 
         # Reset failure counter on successful read
         self.consecutive_frame_failures = 0
+        self._prefetch_frames_around(frame_number)
+        self._present_frame_pixmap(item, QPixmap.fromImage(qt_image))
 
-        # Convert BGR to RGB
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-        # Apply SAR correction if needed
-        sar_num = self.cap.get(cv2.CAP_PROP_SAR_NUM)
-        sar_den = self.cap.get(cv2.CAP_PROP_SAR_DEN)
-
-        if sar_num > 0 and sar_den > 0 and sar_num != sar_den:
-            h, w = frame_rgb.shape[:2]
-            display_width = int(w * sar_num / sar_den)
-            frame_rgb = cv2.resize(frame_rgb, (display_width, h), interpolation=cv2.INTER_LINEAR)
-
-        # Convert to QPixmap — use tobytes() so QImage owns the buffer and
-        # the numpy array can be freed without corrupting the image data.
-        h, w, ch = frame_rgb.shape
-        bytes_per_line = ch * w
-        qt_image = QImage(frame_rgb.tobytes(), w, h, bytes_per_line, QImage.Format_RGB888)
-        pixmap = QPixmap.fromImage(qt_image)
-
+    def _present_frame_pixmap(self, item: QGraphicsPixmapItem, pixmap: QPixmap):
+        """Put a paused-frame pixmap on screen, above MPV when its surface is up."""
         # If MPV widget is actively covering the viewport, it composites on top of
         # QGraphicsScene items (pixmap_item) regardless of Z-order. In that case
         # use a native QLabel overlay raised above mpv_widget instead.
@@ -3252,6 +3369,67 @@ class VideoPlayerWidget(QWidget):
             self.pixmap_item = None
             return
 
+    def _read_opencv_frame(self, cv2, frame_number: int) -> QImage | None:
+        """Decode one frame, reading on from the capture position when possible."""
+        if not seek_capture(cv2, self.cap, frame_number, self._cap_next_frame, self._keyframe_index):
+            self._cap_next_frame = None
+            return None
+        ret, frame = self.cap.read()
+        if not ret:
+            self._cap_next_frame = None
+            return None
+        self._cap_next_frame = frame_number + 1
+        qt_image = bgr_frame_to_qimage(
+            cv2, frame,
+            self.cap.get(cv2.CAP_PROP_SAR_NUM),
+            self.cap.get(cv2.CAP_PROP_SAR_DEN),
+        )
+        self._frame_cache.put(frame_number, qt_image)
+        return qt_image
+
+    def _prefetch_frames_around(self, frame_number: int):
+        """Decode the GOP around a stepped-to frame in the background."""
+        last_frame, self._last_exact_frame = self._last_exact_frame, frame_number
+        step = frame_number - last_frame if last_frame is not None else 0
+        if self.is_playing and abs(step) > 2:
+            # Cover frames during native playback are one-off, not stepping.
+            return
+        if not self.video_path or self._frame_cache.budget_bytes <= 0:
+            return
+        if self._gop_prefetcher is None:
+            self._gop_prefetcher = GopPrefetcher(_get_cv2(), self.video_path, self._frame_cache,
+                                                 keyframe_index=self._keyframe_index)
+        self._gop_prefetcher.request(frame_number, -1 if step < 0 else 1, int(self.total_frames or 0))
+
+    def _reset_frame_cache(self):
+        if self._gop_prefetcher is not None:
+            self._gop_prefetcher.close()
+            self._gop_prefetcher = None
+        self._frame_cache.clear()
+        self._cap_next_frame = None
+        self._last_exact_frame = None
+        self._keyframe_index = None
+        self._reset_sprite_sheet()
+
+    def _request_keyframe_index(self):
+        """Load the persisted keyframe index, building it with ffprobe if needed."""
+        if not self.video_path or not keyframe_index_enabled():
+            return
+        video_path = str(self.video_path)
+        index = cached_keyframe_index(video_path)
+        if index is not None:
+            self._keyframe_index = index
+            return
+        request_keyframe_index(video_path, lambda index: self._keyframe_index_loaded.emit(video_path, index))
+
+    @Slot(str, object)
+    def _on_keyframe_index_loaded(self, video_path: str, index):
+        if index is None or str(self.video_path) != video_path:
+            return
+        self._keyframe_index = index
+        if self._gop_prefetcher is not None:
+            self._gop_prefetcher.keyframe_index = index
+
     @Slot(int)
     def _on_position_changed(self, position_ms: int):
         """Handle QMediaPlayer position changes."""
@@ -3644,7 +3822,10 @@ class VideoPlayerWidget(QWidget):
             position_ms = None
 
         resolved = fallback
-        if position_ms is not None and self.fps > 0:
+        if position_ms is not None and self._keyframe_index is not None:
+            # Packet times stay exact for variable frame rate clips.
+            resolved = self._keyframe_index.frame_for_time(float(position_ms) / 1000.0)
+        elif position_ms is not None and self.fps > 0:
             resolved = int(round((float(position_ms) / 1000.0) * float(self.fps)))
 
         if self.total_frames > 0:
@@ -3685,6 +3866,7 @@ class VideoPlayerWidget(QWidget):
 
             # Read frame
             ret, frame = self.cap.read()
+            self._cap_next_frame = target_frame + 1 if ret else None
             if not ret:
                 return None
 
@@ -3851,6 +4033,7 @@ class VideoPlayerWidget(QWidget):
         if self.cap:
             self.cap.release()
             self.cap = None
+        self._reset_frame_cache()
 
         # Remove video item from scene
         video_item = self.video_item
@@ -0,0 +1,251 @@
+"""Timeline thumbnail sprite sheets for video scrubbing.
+
+Scrubbing the timeline and dragging loop markers used to decode every frame
+they passed over, which lagged on long clips. `build_sprite_sheet` decodes
+one frame every few seconds in a single sequential pass and packs small
+copies of them into one sheet image. `SpriteSheet.tile` then returns the
+nearest tile for any frame without touching the decoder.
+
+Sheets are stored in the thumbnail cache, keyed by path, mtime and size.
+They are built once per file version. The player draws sheet tiles while a
+scrub or marker drag is in progress and decodes the exact frame once it
+settles. The timeline shows tiles as hover previews.
+
+The builder decodes in the GUI process next to MPV, so its worker thread runs
+at the lowest OS priority, decodes in software, and waits while the clip is
+playing.
+
+OpenCV is passed in by the caller (the builder takes a loader and calls it on
+its worker), so importing this module does not load it.
+"""
+
+import os
+import time
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from PySide6.QtCore import QObject, QRect, Signal
+from PySide6.QtGui import QImage
+
+from utils.thumbnail_cache_index import _set_low_priority_current_thread
+
+
+SPRITE_SHEETS_ENV = 'TAGGUI_VIDEO_SPRITE_SHEETS'
+SPRITE_COLUMNS = 10
+TILE_WIDTH = 160
+# Long clips space their tiles out so a sheet stays this size.
+MAX_TILES = 300
+MIN_INTERVAL_SECONDS = 1.0
+# How often a build paused for playback checks whether it may go on.
+PAUSE_POLL_SECONDS = 0.25
+
+
+def sprite_sheets_enabled() -> bool:
+    return os.getenv(SPRITE_SHEETS_ENV, '1').strip() != '0'
+
+
+def sprite_frame_numbers(fps: float, frame_count: int) -> list[int]:
+    """Frames to put on the sheet: one every interval, never more than MAX_TILES."""
+    if fps <= 0 or frame_count <= 0:
+        return []
+    duration = frame_count / fps
+    interval = max(MIN_INTERVAL_SECONDS, duration / MAX_TILES)
+    frames = []
+    tile = 0
+    while True:
+        frame_number = int(round(tile * interval * fps))
+        if frame_number >= frame_count:
+            return frames
+        frames.append(frame_number)
+        tile += 1
+
+
+@dataclass
+class SpriteSheet:
+    """Sheet image plus the frame number of each tile, in row-major order."""
+
+    image: QImage
+    tile_width: int
+    tile_height: int
+    columns: int
+    frames: list[int] = field(default_factory=list)
+
+    def tile_index(self, frame_number: int) -> int:
+        """Index of the tile nearest to `frame_number`."""
+        position = bisect_left(self.frames, int(frame_number))
+        if position <= 0:
+            return 0
+        if position >= len(self.frames):
+            return len(self.frames) - 1
+        before, after = self.frames[position - 1], self.frames[position]
+        return position if after - frame_number < frame_number - before else position - 1
+
+    def tile(self, frame_number: int) -> QImage:
+        index = self.tile_index(frame_number)
+        row, column = divmod(index, self.columns)
+        return self.image.copy(QRect(column * self.tile_width, row * self.tile_height,
+                                     self.tile_width, self.tile_height))
+
+    def to_index(self) -> dict:
+        return {
+            'tile_width': self.tile_width,
+            'tile_height': self.tile_height,
+            'columns': self.columns,
+            'frames': list(self.frames),
+        }
+
+    @classmethod
+    def from_index(cls, image: QImage, index: dict) -> 'SpriteSheet | None':
+        try:
+            sheet = cls(image, int(index['tile_width']), int(index['tile_height']),
+                        int(index['columns']), [int(frame) for frame in index['frames']])
+        except (KeyError, TypeError, ValueError):
+            return None
+        rows = -(-len(sheet.frames) // max(1, sheet.columns))
+        if (not sheet.frames or image.width() < sheet.columns * sheet.tile_width
+                or image.height() < rows * sheet.tile_height):
+            return None
+        return sheet
+
+
+def build_sprite_sheet(cv2, video_path, fps: float, frame_count: int,
+                       should_stop=None, should_pause=None) -> SpriteSheet | None:
+    """Decode the sheet's frames in one forward pass over the video.
+
+    While `should_pause()` is true the pass waits between frames instead of
+    decoding, so it does not compete with playback.
+    """
+    import numpy as np
+
+    frames = sprite_frame_numbers(fps, frame_count)
+    if not frames:
+        return None
+    cap = cv2.VideoCapture(str(video_path), cv2.CAP_FFMPEG)
+    # Software decode, like the player's own captures: D3D11 hardware decode
+    # next to MPV's renderer crashes the GPU driver (0xe24c4a02).
+    cap.set(cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_NONE)
+    try:
+        if not cap.isOpened():
+            return None
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        sar_num = cap.get(cv2.CAP_PROP_SAR_NUM)
+        sar_den = cap.get(cv2.CAP_PROP_SAR_DEN)
+        if width <= 0 or height <= 0:
+            return None
+        display_width = width * sar_num / sar_den if sar_num > 0 and sar_den > 0 else width
+        tile_height = max(1, int(round(TILE_WIDTH * height / display_width)))
+        columns = min(SPRITE_COLUMNS, len(frames))
+        rows = -(-len(frames) // columns)
+        sheet = np.zeros((rows * tile_height, columns * TILE_WIDTH, 3), dtype=np.uint8)
+
+        wanted = iter(enumerate(frames))
+        tile_index, next_frame = next(wanted)
+        last_tile = -1
+        for frame_number in range(frames[-1] + 1):
+            while should_pause is not None and should_pause():
+                if should_stop is not None and should_stop():
+                    return None
+                time.sleep(PAUSE_POLL_SECONDS)
+            if should_stop is not None and should_stop():
+                return None
+            # grab() walks forward cheaply; only sheet frames are converted.
+            if not cap.grab():
+                break
+            if frame_number != next_frame:
+                continue
+            ok, frame = cap.retrieve()
+            if ok:
+                tile = cv2.resize(frame, (TILE_WIDTH, tile_height), interpolation=cv2.INTER_AREA)
+                row, column = divmod(tile_index, columns)
+                sheet[row * tile_height:(row + 1) * tile_height,
+                      column * TILE_WIDTH:(column + 1) * TILE_WIDTH] = tile
+                last_tile = tile_index
+            step = next(wanted, None)
+            if step is None:
+                break
+            tile_index, next_frame = step
+        if last_tile < 0:
+            return None
+        sheet = cv2.cvtColor(sheet, cv2.COLOR_BGR2RGB)
+        image = QImage(sheet.tobytes(), sheet.shape[1], sheet.shape[0], sheet.shape[1] * 3,
+                       QImage.Format.Format_RGB888)
+        # A clip that ends early (bad frame count) keeps only the tiles it filled.
+        return SpriteSheet(image, TILE_WIDTH, tile_height, columns, frames[:last_tile + 1])
+    finally:
+        cap.release()
+
+
+class SpriteSheetBuilder(QObject):
+    """Loads or builds sheets on a worker; results arrive via `sheet_ready`."""
+
+    # generation, SpriteSheet or None
+    sheet_ready = Signal(int, object)
+
+    def __init__(self, load_cv2, parent=None, is_playing=None):
+        super().__init__(parent)
+        self._load_cv2 = load_cv2
+        self._is_playing = is_playing
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='video_sprite_sheet',
+                                            initializer=_set_low_priority_current_thread)
+        self._closed = False
+        self._on_ready = None
+        self.generation = 0
+        self.sheet_ready.connect(self._deliver)
+
+    def set_ready_callback(self, callback):
+        """Call `callback(sheet)` on the GUI thread when a requested sheet is ready."""
+        self._on_ready = callback
+
+    def request(self, video_path, fps: float, frame_count: int):
+        self.cancel()
+        if self._closed:
+            return
+        self._executor.submit(self._run, self.generation, str(video_path), float(fps), int(frame_count))
+
+    def cancel(self):
+        self.generation += 1
+
+    def shutdown(self):
+        self._closed = True
+        self._on_ready = None
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, generation: int, video_path: str, fps: float, frame_count: int):
+        from pathlib import Path
+        from utils.thumbnail_cache import get_thumbnail_cache
+
+        if generation != self.generation or self._closed:
+            return
+        sheet = None
+        try:
+            path = Path(video_path)
+            stat = path.stat()
+            cache = get_thumbnail_cache()
+            cached = cache.get_sprite_sheet(path, stat.st_mtime, stat.st_size)
+            if cached is not None:
+                sheet = SpriteSheet.from_index(*cached)
+            if sheet is None:
+                sheet = build_sprite_sheet(
+                    self._load_cv2(), path, fps, frame_count,
+                    should_stop=lambda: generation != self.generation or self._closed,
+                    should_pause=self._is_playing,
+                )
+                if sheet is not None:
+                    cache.save_sprite_sheet(path, stat.st_mtime, stat.st_size, sheet.image, sheet.to_index())
+        except Exception as e:
+            print(f'[VIDEO] Sprite sheet failed for {video_path}: {e}')
+            sheet = None
+        if not self._closed:
+            try:
+                self.sheet_ready.emit(generation, sheet)
+            except RuntimeError:
+                pass
+
+    def _deliver(self, generation: int, sheet):
+        if generation != self.generation or sheet is None:
+            return
+        if self._on_ready is not None:
+            self._on_ready(sheet)
@@ -0,0 +1,54 @@
+"""Media fixtures shared by the image viewer, thumbnail cache and video tests.
+
+Not a test module: the test files import it by name (pytest puts this folder
+on sys.path). cv2 is imported inside `write_video` only, since collection must
+not load it (see the lazy startup tests).
+"""
+
+import time
+
+from PySide6.QtGui import QColor, QImage
+from PySide6.QtWidgets import QApplication
+
+from utils.thumbnail_cache import ThumbnailCache
+
+
+def spin_until(predicate, timeout=10.0):
+    """Run Qt events until `predicate()` holds or `timeout` seconds pass."""
+    app = QApplication.instance()
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        if app is not None:
+            app.processEvents()
+        time.sleep(0.01)
+
+
+def write_png(path, width, height):
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    image.fill(QColor(40, 90, 140))
+    assert image.save(str(path))
+    return path
+
+
+def write_video(path, frame_count=60, fps=10.0):
+    """64x48 MJPG clip whose frame N has brightness N * 4 (frame 0 is black)."""
+    import cv2
+    import numpy as np
+
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), fps, (64, 48))
+    for index in range(frame_count):
+        writer.write(np.full((48, 64, 3), min(255, index * 4), dtype=np.uint8))
+    writer.release()
+    return path
+
+
+def brightness(qimage):
+    return qimage.pixelColor(qimage.width() // 2, qimage.height() // 2).red()
+
+
+def bare_cache(cache_dir):
+    """Thumbnail cache in `cache_dir` without settings, index or GC thread."""
+    cache = ThumbnailCache.__new__(ThumbnailCache)
+    cache.enabled = True
+    cache.cache_dir = cache_dir
+    return cache
@@ -0,0 +1,112 @@
+import json
+import os
+from pathlib import Path
+import sys
+
+import numpy as np
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+sys.path.insert(0, str(ROOT / "taggui"))
+
+import benchmark_regression as bench
+
+
+BENCHMARK_SMOKE_ROWS = 20000
+
+
+def test_synthetic_aspect_ratios_are_deterministic_and_bounded():
+    for distribution in ("photo", "lognormal", "extreme"):
+        first = bench.synthetic_aspect_ratios(5000, distribution, seed=7)
+        second = bench.synthetic_aspect_ratios(5000, distribution, seed=7)
+        assert np.array_equal(first, second)
+        assert np.all(first > 0.05) and np.all(first < 20)
+
+    extreme = bench.synthetic_aspect_ratios(5000, "extreme", seed=7)
+    assert (extreme > 3.0).any() and (extreme < 0.3).any()
+    with pytest.raises(ValueError):
+        bench.synthetic_aspect_ratios(10, "square")
+
+
+def test_synthetic_database_is_built_once_and_reused(tmp_path):
+    db = bench.build_synthetic_database(tmp_path, 2500, seed=3)
+    assert db.count() == 2500
+    first_page = db.get_page(0, 100, "mtime", "DESC")
+    assert len(first_page) == 100
+    assert [row["mtime"] for row in first_page] == sorted(
+        (row["mtime"] for row in first_page), reverse=True)
+    db.close()
+
+    reopened = bench.build_synthetic_database(tmp_path, 2500, seed=3)
+    assert reopened.count() == 2500
+    assert reopened.get_page(0, 100, "mtime", "DESC") == first_page
+    reopened.close()
+
+
+def test_compare_to_baseline_applies_tolerance_and_slack():
+    baseline = {"median_ms": 100.0, "tolerance": 1.5, "slack_ms": 2.0}
+
+    assert bench.compare_to_baseline("case", 152.0, baseline) is None
+    message = bench.compare_to_baseline("case", 153.0, baseline)
+    assert message and "case" in message and "152.0" in message
+    assert bench.compare_to_baseline("case", 200.0, baseline, tolerance_scale=2.0) is None
+    assert bench.compare_to_baseline("case", 10_000.0, None) is None
+
+
+def test_suite_records_baselines_for_every_case(tmp_path):
+    baselines_path = tmp_path / "baselines.json"
+
+    failures = bench.run_suite(
+        3000, tmp_path / "data", update=True, baselines_path=baselines_path, repeats=1)
+
+    assert failures == []
+    stored = json.loads(baselines_path.read_text(encoding="utf-8"))["3000"]
+    assert set(stored) == {
+        "masonry_layout_photo",
+        "masonry_layout_lognormal",
+        "masonry_layout_extreme",
+        "incremental_page_down",
+        "incremental_page_up",
+        "strict_domain_math",
+        "db_get_page_0pct",
+        "db_get_page_50pct",
+        "db_get_page_100pct",
+        "db_order_cache_rebuild",
+        "badge_paint_sprites",
+        "badge_paint_vector",
+    }
+    assert all(entry["median_ms"] >= 0 for entry in stored.values())
+
+
+def test_ratio_checks_compare_cases_from_the_same_run():
+    measured = {"badge_paint_sprites": 40.0, "badge_paint_vector": 100.0}
+
+    assert bench.compare_ratios(measured) == []
+    measured["badge_paint_sprites"] = 60.0
+    message, = bench.compare_ratios(measured)
+    assert "badge_paint_sprites" in message and "badge_paint_vector" in message
+    # Pairs missing a case (e.g. filtered with --only) are skipped.
+    assert bench.compare_ratios({"badge_paint_sprites": 60.0}) == []
+
+
+def test_relative_claims_hold_on_a_small_dataset(tmp_path):
+    # Machine-independent, so it runs by default; absolute baselines are opt-in below.
+    failures = bench.run_suite(
+        BENCHMARK_SMOKE_ROWS, tmp_path / "data", baselines_path=tmp_path / "none.json",
+        absolute=False)
+
+    assert not failures, "\n".join(failures)
+
+
+@pytest.mark.skipif(
+    os.environ.get("TAGGUI_BENCHMARKS") != "1",
+    reason="set TAGGUI_BENCHMARKS=1 to time against scripts/benchmark_baselines.json",
+)
+def test_no_performance_regressions():
+    rows = int(os.environ.get("TAGGUI_BENCHMARK_ROWS", bench.DEFAULT_ROWS))
+
+    failures = bench.run_suite(rows, bench.default_data_dir())
+
+    assert not failures, "\n".join(failures)
@@ -0,0 +1,67 @@
+import json
+from pathlib import Path
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "taggui"))
+
+from utils.frame_trace import FrameTrace
+
+
+def _frame(trace, started, paint_ms):
+    trace.end_frame(started)
+    trace.frames[-1].paint_ms = paint_ms
+
+
+def test_between_frame_work_is_attributed_to_the_next_frame():
+    trace = FrameTrace()
+    trace.set_enabled(True)
+
+    trace.add("thumbnails", 4.0, count=12)
+    trace.add("page_load", 6.0)
+    trace.add("data", 1.5, count=40)
+    _frame(trace, 1.0, 5.0)
+    _frame(trace, 1.02, 2.0)
+
+    first, second = trace.frames
+    assert first.counts["thumbnails"] == 12
+    # data() runs inside paint, so it is reported but not added on top.
+    assert first.total_ms == 15.0
+    assert second.work_ms["thumbnails"] == 0.0 and second.total_ms == 2.0
+    assert round(second.interval_ms, 3) == 20.0
+
+
+def test_histogram_and_worst_frame():
+    trace = FrameTrace()
+    for position, paint_ms in enumerate((4.0, 12.0, 20.0, 20.0, 120.0)):
+        _frame(trace, float(position), paint_ms)
+
+    assert trace.histogram() == [1, 1, 2, 0, 0, 1]
+    assert trace.worst_frame().paint_ms == 120.0
+    lines = trace.summary_lines()
+    assert len(lines) == 4 and "frames=5" in lines[0]
+
+
+def test_chrome_trace_export(tmp_path):
+    trace = FrameTrace()
+    trace.record_event("completion", 0.5, detail="masonry result")
+    _frame(trace, 1.0, 3.0)
+
+    path = trace.export_chrome_trace(tmp_path / "trace.json")
+    document = json.loads(path.read_text(encoding="utf-8"))
+
+    names = [event["name"] for event in document["traceEvents"]]
+    assert names == ["masonry result", "paint"]
+    paint = document["traceEvents"][1]
+    assert paint["ph"] == "X" and paint["dur"] == 3000.0
+    assert paint["args"]["completion_count"] == 1
+    assert sum(document["otherData"]["histogram"]) == 1
+
+
+def test_forced_trace_stays_enabled():
+    trace = FrameTrace()
+    assert trace.enabled is False
+    trace.always_on = True
+    trace.set_enabled(False)
+    assert trace.enabled is True
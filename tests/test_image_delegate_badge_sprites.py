@@ -0,0 +1,133 @@
+import os
+from pathlib import Path
+import sys
+from types import SimpleNamespace
+
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+ROOT = Path(__file__).resolve().parents[1]
+TAGGUI_ROOT = ROOT / 'taggui'
+sys.path.insert(0, str(TAGGUI_ROOT))
+
+from PySide6.QtCore import QRect, Qt
+from PySide6.QtGui import QColor, QImage, QPainter
+from PySide6.QtWidgets import QApplication, QStyleOptionViewItem
+
+from widgets.image_list_shared import ImageDelegate
+
+
+class _FakeIndex:
+    def __init__(self, image):
+        self._image = image
+
+    def data(self, role):
+        return self._image if role == Qt.ItemDataRole.UserRole else None
+
+
+def _badged_image(**overrides):
+    values = dict(
+        is_video=True,
+        video_metadata={'frame_count': 81},
+        review_rank=1,
+        review_flags=0,
+        love=True,
+        bomb=True,
+        rating=0.6,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def _paint_overlays(delegate, image, size=(160, 120)):
+    canvas = QImage(size[0], size[1], QImage.Format.Format_ARGB32_Premultiplied)
+    canvas.fill(QColor(40, 40, 40))
+    option = QStyleOptionViewItem()
+    option.rect = QRect(0, 0, size[0], size[1])
+    index = _FakeIndex(image)
+    painter = QPainter(canvas)
+    delegate._draw_n4_plus_1_stamp(painter, option, index)
+    delegate._draw_review_badges(painter, option, index)
+    delegate._draw_reaction_badges(painter, option, index)
+    delegate._draw_star_rating_badge(painter, option, index)
+    painter.end()
+    return canvas
+
+
+def _max_channel_difference(first, second):
+    first_bytes = bytes(first.constBits())
+    second_bytes = bytes(second.constBits())
+    return max(abs(a - b) for a, b in zip(first_bytes, second_bytes))
+
+
+def test_badges_render_once_and_are_blitted_afterwards():
+    app = QApplication.instance() or QApplication([])
+    delegate = ImageDelegate()
+    image = _badged_image()
+
+    first = _paint_overlays(delegate, image)
+    sprite_count = len(delegate._badge_sprites)
+    # Video stamp, one review badge, two reactions and the star badge.
+    assert sprite_count == 5
+
+    rendered = []
+    original = delegate._render_reaction_badge
+    delegate._render_reaction_badge = lambda *args: rendered.append(args) or original(*args)
+    second = _paint_overlays(delegate, image)
+
+    assert rendered == []
+    assert len(delegate._badge_sprites) == sprite_count
+    assert first == second
+    delegate.deleteLater()
+
+
+def test_sprites_match_direct_painting():
+    app = QApplication.instance() or QApplication([])
+    cached = ImageDelegate()
+    direct = ImageDelegate()
+    direct._badge_sprites_enabled = False
+    image = _badged_image(video_metadata={'frame_count': 80}, bomb=False)
+
+    cached_canvas = _paint_overlays(cached, image)
+    difference = _max_channel_difference(cached_canvas, _paint_overlays(direct, image))
+
+    assert cached_canvas != _paint_overlays(cached, SimpleNamespace(is_video=False))
+    assert difference <= 8
+    assert direct._badge_sprites == {}
+    cached.deleteLater()
+    direct.deleteLater()
+
+
+def test_refreshing_badge_settings_clears_the_atlas():
+    app = QApplication.instance() or QApplication([])
+    delegate = ImageDelegate()
+    _paint_overlays(delegate, _badged_image())
+    assert delegate._badge_sprites
+
+    delegate.refresh_thumbnail_badge_settings()
+
+    assert delegate._badge_sprites == {}
+    delegate.deleteLater()
+
+
+def test_badge_setting_changes_refresh_every_browser_delegate():
+    from widgets.main_window import MainWindow
+
+    refreshed = []
+
+    def list_view(name):
+        delegate = SimpleNamespace(refresh_thumbnail_badge_settings=lambda: refreshed.append(name))
+        return SimpleNamespace(delegate=delegate, viewport=lambda: SimpleNamespace(update=lambda: None))
+
+    primary, secondary, extra = list_view('primary'), list_view('secondary'), list_view('extra')
+    window = SimpleNamespace(
+        image_list=SimpleNamespace(list_view=primary),
+        _secondary_browser=SimpleNamespace(dock=SimpleNamespace(list_view=secondary)),
+        findChildren=lambda _cls: [primary, extra],
+        _sync_review_controls_from_context=lambda: None,
+    )
+    window._iter_image_list_views = lambda: MainWindow._iter_image_list_views(window)
+
+    MainWindow._refresh_review_badge_config(window)
+
+    assert refreshed == ['primary', 'secondary', 'extra']
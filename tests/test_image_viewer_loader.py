@@ -0,0 +1,190 @@
+import os
+from pathlib import Path
+import sys
+import threading
+import time
+
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'taggui'))
+
+from PySide6.QtCore import QSortFilterProxyModel, Qt
+from PySide6.QtGui import QImage, QStandardItem, QStandardItemModel
+from PySide6.QtWidgets import QApplication
+
+from utils.image import Image
+from widgets.image_viewer_loader import StillImageLoader, StillLoadResult, decode_still
+
+from media_helpers import spin_until, write_png
+
+
+APP = QApplication.instance() or QApplication([])
+
+
+def test_decode_still_reports_repairs_and_unreadable_files(tmp_path, monkeypatch):
+    from widgets import image_viewer_loader
+
+    good = decode_still(write_png(tmp_path / 'good.png', 30, 20))
+    assert good.qimage.size().toTuple() == (30, 20)
+    assert good.path_changes == []
+
+    # A PNG named .webp that Qt cannot open by its name: the repair renames it.
+    misnamed = tmp_path / 'misnamed.webp'
+    misnamed.write_bytes(b'broken')
+    repaired = write_png(tmp_path / 'misnamed.png', 8, 6)
+    monkeypatch.setattr(image_viewer_loader, 'fallback_decode_qimage',
+                        lambda path: (None, None, path))
+    monkeypatch.setattr(image_viewer_loader, 'repair_mismatched_image_extension_path',
+                        lambda path: repaired if path == misnamed else path)
+    result = decode_still(misnamed)
+    assert result.qimage.size().toTuple() == (8, 6)
+    assert result.path_changes == [(misnamed, repaired)]
+    assert result.path == repaired
+
+    broken = tmp_path / 'broken.png'
+    broken.write_bytes(b'definitely not an image')
+    result = decode_still(broken)
+    assert result.qimage is None
+    assert 'cannot identify image file' in result.error
+
+
+def test_only_the_latest_request_is_delivered():
+    release = threading.Event()
+    decoded = []
+
+    def slow_decode(path):
+        release.wait(5.0)
+        decoded.append(path.name)
+        return StillLoadResult(QImage(4, 4, QImage.Format.Format_RGB32), path)
+
+    loader = StillImageLoader(decode=slow_decode)
+    delivered = []
+    loader.set_loaded_callback(lambda result: delivered.append(result.path.name))
+    try:
+        # Two workers: the first two start right away, the third waits in the queue.
+        loader.request('first.png')
+        time.sleep(0.05)
+        loader.request('second.png')
+        time.sleep(0.05)
+        loader.request('third.png')
+        loader.request('fourth.png')
+        release.set()
+        spin_until(lambda: len(decoded) >= 3 and not loader._pending)
+
+        # Started decodes run to the end but are not shown; the queued third one never runs.
+        assert sorted(decoded) == ['first.png', 'fourth.png', 'second.png']
+        assert delivered == ['fourth.png']
+    finally:
+        loader.shutdown()
+
+
+def test_superseded_decode_still_reports_its_path_changes():
+    release = threading.Event()
+
+    def repairing_decode(path):
+        release.wait(5.0)
+        repaired = path.with_suffix('.png')
+        return StillLoadResult(QImage(4, 4, QImage.Format.Format_RGB32), repaired,
+                               [(path, repaired)])
+
+    loader = StillImageLoader(decode=repairing_decode)
+    delivered = []
+    superseded = []
+    loader.set_loaded_callback(lambda result: delivered.append(result.path.name))
+    loader.set_superseded_callback(
+        lambda context, result: superseded.append((context, result.path_changes)))
+    try:
+        loader.request('first.webp', 'first image')
+        time.sleep(0.05)
+        loader.request('second.webp', 'second image')
+        release.set()
+        spin_until(lambda: not loader._pending)
+
+        assert delivered == ['second.png']
+        assert superseded == [('first image', [(Path('first.webp'), Path('first.png'))])]
+    finally:
+        loader.shutdown()
+
+
+def test_switching_selection_during_a_repair_still_follows_the_rename(tmp_path, monkeypatch):
+    from widgets import image_viewer_loader
+    from widgets.image_viewer import ImageViewer
+
+    misnamed = tmp_path / 'misnamed.webp'
+    misnamed.write_bytes(b'broken')
+    repaired = tmp_path / 'misnamed.png'
+    repairing = threading.Event()
+    release = threading.Event()
+
+    def slow_repair(path):
+        if path != misnamed:
+            return path
+        repairing.set()
+        release.wait(5.0)
+        write_png(repaired, 8, 6)
+        misnamed.unlink()
+        return repaired
+
+    monkeypatch.setattr(image_viewer_loader, 'fallback_decode_qimage',
+                        lambda path: (None, None, path))
+    monkeypatch.setattr(image_viewer_loader, 'repair_mismatched_image_extension_path', slow_repair)
+
+    first = Image(misnamed, (8, 6))
+    second = Image(write_png(tmp_path / 'second.png', 40, 30), (40, 30))
+    source_model = QStandardItemModel()
+    for image in (first, second):
+        item = QStandardItem()
+        item.setData(image, Qt.ItemDataRole.UserRole)
+        source_model.appendRow(item)
+    proxy_model = QSortFilterProxyModel()
+    proxy_model.setSourceModel(source_model)
+
+    viewer = ImageViewer(proxy_model, is_spawned_viewer=False)
+    try:
+        viewer.load_image(proxy_model.index(0, 0))
+        assert repairing.wait(5.0)
+        viewer.load_image(proxy_model.index(1, 0))
+        release.set()
+        spin_until(lambda: first.path == repaired and viewer._pending_still is None)
+
+        # The rename is followed although its pixels were never shown.
+        assert first.path == repaired
+        assert viewer.current_image_item.pixmap().size().toTuple() == (40, 30)
+    finally:
+        release.set()
+        viewer.close()
+        viewer.deleteLater()
+        APP.processEvents()
+
+
+def test_viewer_shows_thumbnail_then_swaps_in_full_image(tmp_path):
+    from widgets.image_viewer import ImageViewer
+
+    path = write_png(tmp_path / 'still.png', 640, 480)
+    image = Image(path, (640, 480))
+    image.thumbnail_qimage = QImage(64, 48, QImage.Format.Format_RGB32)
+    source_model = QStandardItemModel()
+    item = QStandardItem()
+    item.setData(image, Qt.ItemDataRole.UserRole)
+    source_model.appendRow(item)
+    proxy_model = QSortFilterProxyModel()
+    proxy_model.setSourceModel(source_model)
+
+    viewer = ImageViewer(proxy_model, is_spawned_viewer=False)
+    try:
+        viewer.load_image(proxy_model.index(0, 0))
+        placeholder = viewer.current_image_item
+        assert viewer._pending_still is not None
+        assert placeholder.pixmap().width() == 64
+        assert viewer.scene.sceneRect().size().toSize().toTuple() == (640, 480)
+
+        spin_until(lambda: viewer._pending_still is None)
+        assert viewer.current_image_item is placeholder
+        assert placeholder.pixmap().size().toTuple() == (640, 480)
+        assert placeholder.transform().isIdentity()
+    finally:
+        viewer.close()
+        viewer.deleteLater()
+        APP.processEvents()
@@ -0,0 +1,95 @@
+import os
+from pathlib import Path
+import sys
+
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'taggui'))
+
+from PySide6.QtCore import QSortFilterProxyModel, Qt
+from PySide6.QtGui import QImage, QStandardItem, QStandardItemModel
+from PySide6.QtWidgets import QApplication
+
+from utils.image import Image
+from widgets.image_viewer_mipmaps import (
+    MipPyramidBuilder,
+    MipPyramidCache,
+    level_size,
+    pyramid_divisors,
+    pyramid_key,
+)
+
+from media_helpers import spin_until, write_png
+
+
+APP = QApplication.instance() or QApplication([])
+DIVISORS = (1, 2, 4, 8, 16, 32)
+
+
+def test_pyramid_stops_before_levels_get_small():
+    assert pyramid_divisors(4000, 3000, DIVISORS) == [2, 4, 8]
+    assert pyramid_divisors(300, 200, DIVISORS) == []
+    assert level_size(1001, 333, 4) == (250, 83)
+
+
+def test_builder_delivers_levels_and_shares_them(tmp_path):
+    path = write_png(tmp_path / 'big.png', 2048, 1024)
+    source = QImage(str(path))
+    cache = MipPyramidCache()
+    builder = MipPyramidBuilder(cache=cache)
+    delivered = {}
+    builder.set_level_callback(lambda divisor, level: delivered.__setitem__(divisor, level.size().toTuple()))
+    key = pyramid_key(path, source)
+    try:
+        assert builder.build(key, source, [2, 4, 8]) == {}
+        spin_until(lambda: not builder.building)
+        assert delivered == {2: (1024, 512), 4: (512, 256), 8: (256, 128)}
+
+        # A second viewer gets the finished pyramid without building anything.
+        other = MipPyramidBuilder(cache=cache)
+        shared = other.build(key, source, [2, 4, 8])
+        assert sorted(shared) == [2, 4, 8]
+        assert not other.building
+        other.shutdown()
+    finally:
+        builder.shutdown()
+
+
+def test_cache_evicts_whole_pyramids_least_recently_used_first():
+    level = QImage(64, 64, QImage.Format.Format_RGB32)
+    cache = MipPyramidCache(budget_bytes=level.sizeInBytes() * 3)
+    cache.add_level('a', 2, level)
+    cache.add_level('a', 4, level)
+    cache.add_level('b', 2, level)
+    assert cache.levels('a')
+    cache.add_level('c', 2, level)
+
+    assert cache.levels('b') == {}
+    assert sorted(cache.levels('a')) == [2, 4]
+    assert cache.bytes == level.sizeInBytes() * 3
+
+
+def test_viewer_installs_levels_built_in_the_background(tmp_path):
+    from widgets.image_viewer import ImageViewer
+
+    path = write_png(tmp_path / 'still.png', 2400, 1200)
+    source_model = QStandardItemModel()
+    item = QStandardItem()
+    item.setData(Image(path, (2400, 1200)), Qt.ItemDataRole.UserRole)
+    source_model.appendRow(item)
+    proxy_model = QSortFilterProxyModel()
+    proxy_model.setSourceModel(source_model)
+
+    viewer = ImageViewer(proxy_model, is_spawned_viewer=False)
+    try:
+        viewer.load_image(proxy_model.index(0, 0))
+        spin_until(lambda: viewer._pending_still is None
+                    and viewer._mip_builder is not None and not viewer._mip_builder.building)
+        assert sorted(viewer._static_mipmap_pixmaps) == [1, 2, 4, 8]
+        assert viewer._static_mipmap_pixmaps[4].size().toTuple() == (600, 300)
+    finally:
+        viewer.close()
+        viewer.deleteLater()
+        APP.processEvents()
@@ -0,0 +1,93 @@
+import os
+from pathlib import Path
+import sys
+import threading
+import time
+
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'taggui'))
+
+from PySide6.QtGui import QColor, QImage
+
+from widgets.image_viewer_prefetch import ImagePrefetchRing, decode_static_qimage
+
+
+def _write_images(tmp_path, count, size=32):
+    paths = {}
+    for row in range(count):
+        image = QImage(size, size, QImage.Format.Format_RGB32)
+        image.fill(QColor(row * 20 % 255, 0, 0))
+        path = tmp_path / f'{row:03d}.png'
+        assert image.save(str(path))
+        paths[row] = path
+    return paths
+
+
+def _wait_idle(ring, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while ring._pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_neighbors_are_decoded_and_handed_over(tmp_path):
+    paths = _write_images(tmp_path, 10)
+    ring = ImagePrefetchRing(neighbors=2)
+    try:
+        ring.update(4, {row: paths[row] for row in ring.neighbor_rows(4) if row != 4})
+        _wait_idle(ring)
+
+        qimage = ring.take(paths[5])
+        assert qimage is not None and qimage.size().width() == 32
+        assert qimage.pixelColor(0, 0) == decode_static_qimage(paths[5]).pixelColor(0, 0)
+        assert ring.take(paths[9]) is None
+        assert (ring.hits, ring.misses) == (1, 1)
+
+        # An edited file is decoded again rather than served from the cache.
+        replacement = QImage(16, 16, QImage.Format.Format_RGB32)
+        replacement.fill(QColor(0, 0, 255))
+        time.sleep(0.01)
+        assert replacement.save(str(paths[6]))
+        assert ring.take(paths[6]) is None
+    finally:
+        ring.shutdown()
+
+
+def test_reversing_direction_cancels_queued_decodes(tmp_path):
+    paths = _write_images(tmp_path, 20)
+    gate = threading.Event()
+    decoded = []
+
+    def slow_decode(path):
+        gate.wait(5.0)
+        decoded.append(Path(path).name)
+        return decode_static_qimage(path)
+
+    ring = ImagePrefetchRing(neighbors=4, decode=slow_decode)
+    try:
+        ring.update(10, {row: paths[row] for row in range(6, 15) if row != 10})
+        ring.update(11, {row: paths[row] for row in range(7, 16) if row != 11})
+        # Reverse: rows 13-15 ahead of the old direction are no longer wanted.
+        ring.update(10, {row: paths[row] for row in range(6, 15) if row != 10})
+        gate.set()
+        _wait_idle(ring)
+
+        assert '014.png' not in decoded and '015.png' not in decoded
+        assert ring.take(paths[9]) is not None
+    finally:
+        ring.shutdown()
+
+
+def test_ready_images_stay_under_the_budget(tmp_path):
+    paths = _write_images(tmp_path, 12, size=64)
+    one_image = 64 * 64 * 4
+    ring = ImagePrefetchRing(neighbors=3, budget_bytes=2 * one_image)
+    try:
+        ring.update(5, {row: paths[row] for row in ring.neighbor_rows(5) if row != 5})
+        _wait_idle(ring)
+        assert ring.ready_bytes <= 2 * one_image
+        assert len(ring._ready) == 2
+    finally:
+        ring.shutdown()
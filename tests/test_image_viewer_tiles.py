@@ -0,0 +1,112 @@
+import os
+from pathlib import Path
+import sys
+
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'taggui'))
+
+from PySide6.QtCore import QRectF
+from PySide6.QtGui import QColor, QImage
+from PySide6.QtWidgets import QApplication
+
+from widgets.image_viewer_tiles import (
+    STRIP_TILES,
+    TILE_SIZE,
+    TileCache,
+    TileLoader,
+    TiledImageItem,
+    TiledImageSource,
+    tiled_source_for,
+)
+
+
+def _write_gradient(path, width, height):
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    for y in range(height):
+        for x in range(0, width, 8):
+            color = QColor(x * 255 // width, y * 255 // height, 128)
+            for dx in range(min(8, width - x)):
+                image.setPixelColor(x + dx, y, color)
+    assert image.save(str(path), quality=95)
+    return path
+
+
+def test_only_large_region_decodable_files_are_tiled(tmp_path):
+    jpeg = _write_gradient(tmp_path / 'big.jpg', 1300, 700)
+    png = tmp_path / 'big.png'
+    assert QImage(1300, 700, QImage.Format.Format_RGB32).save(str(png))
+
+    assert tiled_source_for(jpeg, threshold=2_000_000) is None
+    assert tiled_source_for(jpeg, threshold=0) is None
+    assert tiled_source_for(png, threshold=100_000) is None
+    source = tiled_source_for(jpeg, threshold=100_000)
+    assert (source.width, source.height) == (1300, 700)
+
+
+def test_pyramid_geometry():
+    source = TiledImageSource('unused.jpg', 20000, 9000)
+    # 20000 / 2**4 = 1250 is the first level that fits the 2048 preview bound.
+    assert source.preview_level == 4
+    assert source.level_size(1) == (10000, 4500)
+    assert source.tile_grid(0) == (-(-20000 // TILE_SIZE), -(-9000 // TILE_SIZE))
+    last = source.tile_source_rect(0, 39, 17)
+    assert (last.right() + 1, last.bottom() + 1) == (20000, 9000)
+    assert source.tile_level_size(0, 39, 17) == (20000 - 39 * TILE_SIZE, 9000 - 17 * TILE_SIZE)
+    assert source.tiles_in_rect(1, QRectF(0, 0, 1024, 1025)) == [(0, 0), (0, 1)]
+
+
+def test_strip_tiles_match_full_decode(tmp_path):
+    app = QApplication.instance() or QApplication([])
+    path = _write_gradient(tmp_path / 'strip.jpg', 1300, 700)
+    source = TiledImageSource(path, 1300, 700)
+    full = QImage(str(path))
+
+    tiles = dict(source.decode_strip(0, 1, 0, 2))
+    assert sorted(tiles) == [(0, 0, 1), (0, 1, 1), (0, 2, 1)]
+    last = tiles[(0, 2, 1)]
+    assert (last.width(), last.height()) == (1300 - 2 * TILE_SIZE, 700 - TILE_SIZE)
+    for x, y in ((5, 5), (100, 150), (last.width() - 1, last.height() - 1)):
+        expected = full.pixelColor(2 * TILE_SIZE + x, TILE_SIZE + y)
+        actual = last.pixelColor(x, y)
+        assert abs(expected.red() - actual.red()) <= 8
+        assert abs(expected.green() - actual.green()) <= 8
+
+
+def test_tile_cache_evicts_least_recently_used_by_bytes():
+    tile = QImage(64, 64, QImage.Format.Format_RGB32)
+    cache = TileCache(budget_bytes=tile.sizeInBytes() * 2)
+    cache.put((0, 0, 0), tile)
+    cache.put((0, 1, 0), tile)
+    assert cache.get((0, 0, 0)) is not None
+    cache.put((0, 2, 0), tile)
+
+    assert (0, 1, 0) not in cache
+    assert (0, 0, 0) in cache and (0, 2, 0) in cache
+    assert cache.bytes == tile.sizeInBytes() * 2
+
+
+def test_item_requests_coarser_strips_first_and_skips_cached_tiles():
+    app = QApplication.instance() or QApplication([])
+    source = TiledImageSource('unused.jpg', 16384, 8192)
+    preview = QImage(2048, 1024, QImage.Format.Format_RGB32)
+    loader = TileLoader(source)
+    try:
+        item = TiledImageItem(source, preview, loader)
+        assert item.preview_divisor == 8
+        assert item.level_for_scale(1.0) == 0
+        assert item.level_for_scale(0.3) == 1
+        assert item.level_for_scale(0.01) == source.preview_level
+
+        visible = QRectF(0, 0, TILE_SIZE * 2 * STRIP_TILES, TILE_SIZE * 4)
+        strips = item.wanted_strips(1, visible)
+        assert strips[0][0] == 2
+        assert {strip for strip in strips if strip[0] == 1} == {(1, 0, 0), (1, 1, 0)}
+
+        for tx in range(STRIP_TILES):
+            item.cache.put((1, tx, 0), QImage(8, 8, QImage.Format.Format_RGB32))
+        assert (1, 0, 0) not in item.wanted_strips(1, visible)
+    finally:
+        loader.shutdown()
@@ -0,0 +1,203 @@
+import math
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "taggui"))
+
+from taggui.widgets.masonry_engine import (
+    SPACER_INDEX,
+    calculate_masonry_arrays,
+    compute_masonry_arrays,
+    items_data_to_arrays,
+    update_masonry_arrays,
+)
+from taggui.widgets.masonry_worker import calculate_masonry_layout
+
+
+def _reference_layout(items_data, column_width, spacing, num_columns):
+    """The per-item dict loop the array engine replaced."""
+    column_heights = [0] * num_columns
+    items = []
+    for index, aspect_ratio in items_data:
+        if isinstance(aspect_ratio, tuple) and len(aspect_ratio) == 2 and aspect_ratio[0] == 'SPACER':
+            max_h = max(column_heights)
+            items.append({
+                'index': -2, 'x': 0, 'y': max_h,
+                'width': int((column_width + spacing) * num_columns - spacing),
+                'height': int(aspect_ratio[1]), 'aspect_ratio': 1.0,
+            })
+            column_heights = [max_h + int(aspect_ratio[1])] * num_columns
+            continue
+        if not isinstance(aspect_ratio, (int, float)):
+            aspect_ratio = 1.0
+        if not aspect_ratio or aspect_ratio <= 0 or aspect_ratio != aspect_ratio:
+            aspect_ratio = 1.0
+        if aspect_ratio > 100:
+            aspect_ratio = 100
+        if aspect_ratio < 0.01:
+            aspect_ratio = 0.01
+        item_height = int(column_width / aspect_ratio)
+        shortest_col = 0
+        for column_index in range(1, num_columns):
+            if column_heights[column_index] < column_heights[shortest_col]:
+                shortest_col = column_index
+        items.append({
+            'index': index, 'x': shortest_col * (column_width + spacing),
+            'y': column_heights[shortest_col], 'width': column_width,
+            'height': item_height, 'aspect_ratio': aspect_ratio,
+        })
+        column_heights[shortest_col] += item_height + spacing
+    return {'items': items, 'total_height': max(column_heights) if column_heights else 0}
+
+
+def _random_items_data(count, seed, *, spacers=False, bad_values=False):
+    rng = random.Random(seed)
+    # Few distinct ratios so equal column heights (ties) are common.
+    ratios = [0.5, 2 / 3, 0.75, 1.0, 4 / 3, 1.5, 16 / 9]
+    items_data = []
+    for index in range(count):
+        if spacers and rng.random() < 0.01:
+            items_data.append((index, ('SPACER', rng.randint(0, 80))))
+        elif bad_values and rng.random() < 0.05:
+            items_data.append((index, rng.choice(
+                [0, -1.0, math.nan, math.inf, 1e-9, 1e9, None, 'wide', 7])))
+        else:
+            items_data.append((index, rng.choice(ratios)))
+    return items_data
+
+
+def test_engine_matches_reference_layout():
+    cases = [
+        (_random_items_data(5000, 1), 200, 2, 4),
+        (_random_items_data(5000, 2, spacers=True), 157, 0, 7),
+        (_random_items_data(5000, 3, spacers=True, bad_values=True), 96, 5, 3),
+        (_random_items_data(300, 4), 300, 8, 1),
+        ([(0, ('SPACER', 40)), (1, ('SPACER', 10)), (2, 1.0)], 100, 2, 3),
+        ([], 100, 2, 3),
+    ]
+    for items_data, column_width, spacing, num_columns in cases:
+        expected = _reference_layout(items_data, column_width, spacing, num_columns)
+        result = calculate_masonry_layout(items_data, column_width, spacing, num_columns)
+        assert result.pop('arrays').to_items() == expected['items']
+        assert result == expected
+
+
+def test_engine_returns_struct_of_arrays():
+    arrays = compute_masonry_arrays(
+        np.arange(4), np.array([1.0, 2.0, 1.0, 0.5]),
+        column_width=100, spacing=0, num_columns=2,
+        spacer_heights=np.array([-1, -1, 20, -1]))
+
+    assert len(arrays) == 4
+    assert arrays.x.tolist() == [0, 100, 0, 0]
+    assert arrays.y.tolist() == [0, 0, 100, 120]
+    assert arrays.width.tolist() == [100, 100, 200, 100]
+    assert arrays.height.tolist() == [100, 50, 20, 200]
+    assert arrays.index.tolist() == [0, 1, SPACER_INDEX, 3]
+    assert arrays.total_height == 320
+
+
+def test_engine_rejects_items_without_columns():
+    assert calculate_masonry_arrays([], 100, 2, 0).total_height == 0
+    assert calculate_masonry_layout([(0, 1.0)], 100, 2, 0) == {'items': [], 'total_height': 0}
+
+
+def test_incremental_cache_from_arrays_matches_dict_path():
+    from taggui.widgets.image_list_masonry_incremental_service import MasonryIncrementalService
+
+    items_data = [(0, ('SPACER', 40))] + _random_items_data(700, 5)
+    items_data = [(index + 1000, ratio) for index, ratio in items_data]
+    arrays = calculate_masonry_arrays(items_data, 150, 3, 4)
+
+    from_dicts = MasonryIncrementalService(view=None)
+    from_dicts.cache_from_full_result(arrays.to_items(), 250, 150, 3, 4, 100.0)
+    from_arrays = MasonryIncrementalService(view=None)
+    from_arrays.cache_from_arrays(arrays, 250, 150, 3, 4, 100.0)
+
+    assert from_arrays._page_cache == from_dicts._page_cache
+    assert from_arrays._prefix_height == from_dicts._prefix_height == 40
+    assert from_arrays.get_cached_pages() == {4, 5, 6}
+
+    # Given the view's dicts, pages share them instead of building copies.
+    items = arrays.to_items()
+    sharing = MasonryIncrementalService(view=None)
+    sharing.cache_from_arrays(arrays, 250, 150, 3, 4, 100.0, items=items)
+    assert sharing._page_cache == from_dicts._page_cache
+    item_ids = {id(item) for item in items}
+    assert all(id(item) in item_ids
+               for page in sharing._page_cache.values() for item in page['items'])
+
+
+def _assert_same_layout(actual, expected):
+    for field in ("index", "x", "y", "width", "height", "aspect_ratio", "checkpoints"):
+        assert np.array_equal(getattr(actual, field), getattr(expected, field)), field
+    assert actual.total_height == expected.total_height
+
+
+def test_checkpointed_update_matches_full_recompute():
+    rng = random.Random(7)
+    for num_columns, spacers in ((1, False), (3, False), (5, True)):
+        items_data = _random_items_data(3000, num_columns, spacers=spacers)
+        indices, ratios, spacer_heights = items_data_to_arrays(items_data)
+        layout = compute_masonry_arrays(
+            indices, ratios, 150, 4, num_columns, spacer_heights, checkpoint_interval=64)
+        for _ in range(10):
+            ratios = ratios.copy()
+            for row in rng.sample(range(len(ratios)), rng.randint(1, 3)):
+                ratios[row] = rng.choice([0.5, 1.0, 1.5, 3.0])
+            updated = update_masonry_arrays(
+                layout, indices, ratios, 150, 4, num_columns, spacer_heights)
+            expected = compute_masonry_arrays(
+                indices, ratios, 150, 4, num_columns, spacer_heights, checkpoint_interval=64)
+            _assert_same_layout(updated, expected)
+            layout = updated
+
+
+def test_checkpointed_update_stops_at_uniform_shift(monkeypatch):
+    from taggui.widgets import masonry_engine
+
+    ratios = np.ones(10_000)
+    layout = compute_masonry_arrays(np.arange(10_000), ratios, 100, 0, 1, checkpoint_interval=100)
+    ratios = ratios.copy()
+    ratios[150] = 2.0
+
+    placed_rows = []
+    original_place_rows = masonry_engine._place_rows
+
+    def counting_place_rows(keys, heights, spacer_rows, start, end, *args, **kwargs):
+        tops, stopped_at = original_place_rows(keys, heights, spacer_rows, start, end, *args, **kwargs)
+        placed_rows.append(stopped_at - start)
+        return tops, stopped_at
+
+    monkeypatch.setattr(masonry_engine, "_place_rows", counting_place_rows)
+    updated = update_masonry_arrays(layout, np.arange(10_000), ratios, 100, 0, 1)
+
+    assert placed_rows == [100]
+    assert updated.y[151] == 150 * 100 + 50
+    assert updated.y[-1] == layout.y[-1] - 50
+    assert updated.total_height == layout.total_height - 50
+
+
+def test_incremental_reflow_shifts_converged_pages_without_layout():
+    from taggui.widgets.image_list_masonry_incremental_service import MasonryIncrementalService
+
+    ratios = {index: 1.0 for index in range(500)}
+    items = calculate_masonry_arrays(sorted(ratios.items()), 100, 2, 1).to_items()
+    service = MasonryIncrementalService(view=None)
+    service.cache_from_full_result(items, 100, 100, 2, 1, 100.0)
+
+    ratios[150] = 2.0
+    loaded_pages = []
+
+    def load_page(page_num):
+        loaded_pages.append(page_num)
+        return [(index, ratios[index]) for index in range(page_num * 100, page_num * 100 + 100)]
+
+    assert service.reflow_cached_pages_from(1, load_page) == [1]
+    assert loaded_pages == [1]
+    expected = calculate_masonry_arrays(sorted(ratios.items()), 100, 2, 1).to_items()
+    assert service.assemble_items() == expected
@@ -0,0 +1,78 @@
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "taggui"))
+
+from widgets.image_list_masonry_incremental_service import MasonryIncrementalService
+from widgets.masonry_engine import calculate_masonry_arrays
+from widgets.masonry_spatial_index import MasonrySpatialIndex
+
+
+def _layout(count, seed, num_columns=5):
+    rng = random.Random(seed)
+    items_data = [(index, rng.choice([0.5, 0.8, 1.0, 1.5, 2.0])) for index in range(count)]
+    items_data.insert(count // 2, (-1, ("SPACER", 60)))
+    return calculate_masonry_arrays(items_data, 120, 4, num_columns).to_items()
+
+
+def _brute_force(items, left, top, right, bottom):
+    return [
+        item for item in items
+        if item["y"] <= bottom and item["y"] + item["height"] >= top
+        and item["x"] <= right and item["x"] + item["width"] >= left
+    ]
+
+
+def test_rect_and_point_queries_match_linear_scan():
+    items = _layout(3000, 1)
+    index = MasonrySpatialIndex.from_items(items, segment_size=97)
+    rng = random.Random(2)
+    total_height = max(item["y"] + item["height"] for item in items)
+
+    assert len(index) == len(items)
+    for _ in range(200):
+        top = rng.randint(-50, total_height)
+        left = rng.randint(-10, 600)
+        rect = (left, top, left + rng.randint(0, 400), top + rng.randint(0, 900))
+        assert index.query_rect(*rect) == _brute_force(items, *rect)
+
+        x, y = rng.randint(0, 620), rng.randint(0, total_height)
+        expected = next(
+            (item for item in items
+             if item["x"] <= x < item["x"] + item["width"]
+             and item["y"] <= y < item["y"] + item["height"]),
+            None,
+        )
+        assert index.item_at(x, y) is expected
+
+
+def test_segments_update_incrementally():
+    index = MasonrySpatialIndex()
+    first = [{"index": 0, "x": 0, "y": 0, "width": 10, "height": 10}]
+    second = [{"index": 1, "x": 0, "y": 20, "width": 10, "height": 10}]
+    index.set_segment(0, first)
+    index.set_segment(1, second)
+    assert index.query_y_range(0, 100) == first + second
+
+    moved = [{"index": 1, "x": 0, "y": 40, "width": 10, "height": 10}]
+    index.set_segment(1, moved)
+    assert index.item_at(5, 25) is None
+    assert index.item_at(5, 45) is moved[0]
+
+    index.remove_segment(0)
+    assert index.query_y_range(0, 100) == moved
+
+
+def test_incremental_service_index_tracks_assembled_items():
+    items = [item for item in _layout(900, 3, num_columns=4) if item["index"] >= 0]
+    service = MasonryIncrementalService(view=None)
+    service.cache_from_full_result(items, 300, 120, 4, 4, 100.0)
+    next_page = [(index, 1.0) for index in range(900, 1200)]
+    service.compute_page_down(3, next_page)
+    service.purge_far_pages(3, max_pages=3)
+
+    assembled = service.assemble_items()
+    assert service.spatial_index.source is assembled
+    assert service.spatial_index.query_y_range(-10**9, 10**9) == assembled
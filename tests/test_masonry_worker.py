@@ -26,7 +26,8 @@ def test_masonry_layout_preserves_ties_sanitization_and_spacers():
         num_columns=2,
     )
 
-    assert result == {
+    assert result["arrays"].to_items() == result["items"]
+    assert {key: result[key] for key in ("items", "total_height")} == {
         "items": [
             {
                 "index": 0,
@@ -71,3 +72,67 @@ def test_masonry_layout_preserves_ties_sanitization_and_spacers():
         ],
         "total_height": 211,
     }
+
+
+def test_masonry_layout_cache_round_trips_and_rejects_changed_input(monkeypatch, tmp_path):
+    monkeypatch.setattr(masonry_worker.Path, "home", lambda: tmp_path)
+    saved_threads = []
+    original_save = masonry_worker._save_to_cache
+    monkeypatch.setattr(
+        masonry_worker, "_save_to_cache",
+        lambda *args: saved_threads.append(original_save(*args)),
+    )
+    items_data = [(0, 1.0), (1, 0.5), (2, ("SPACER", 20)), (3, 2.0)]
+
+    computed = calculate_masonry_layout(items_data, 100, 2, 2, cache_key="folder")
+    for thread in saved_threads:
+        thread.join()
+    assert masonry_worker._get_cache_path("folder").is_file()
+
+    loaded = []
+    original_load = masonry_worker._load_from_cache
+    monkeypatch.setattr(
+        masonry_worker, "_load_from_cache",
+        lambda *args: loaded.append(original_load(*args)) or loaded[-1],
+    )
+    cached = calculate_masonry_layout(items_data, 100, 2, 2, cache_key="folder")
+    assert loaded[-1] is cached["arrays"]
+    assert cached["items"] == computed["items"]
+    assert cached["total_height"] == computed["total_height"]
+    assert cached["arrays"].y.tolist() == computed["arrays"].y.tolist()
+
+    # Changed input or settings miss the stored layout and are recomputed.
+    reordered = [items_data[1], items_data[0], *items_data[2:]]
+    calculate_masonry_layout(reordered, 100, 2, 2, cache_key="folder")
+    assert loaded[-1] is None
+    calculate_masonry_layout(items_data, 100, 2, 3, cache_key="folder")
+    assert loaded[-1] is None
+    for thread in saved_threads:
+        thread.join()
+
+
+def test_masonry_layout_cache_rejects_corrupted_payload(tmp_path):
+    from taggui.widgets.masonry_engine import calculate_masonry_arrays, items_data_to_arrays
+    from taggui.widgets.masonry_layout_cache import (
+        HEADER_SIZE,
+        layout_input_fingerprint,
+        read_layout_file,
+        write_layout_file,
+    )
+
+    items_data = [(index, 1.0 + index % 3) for index in range(50)]
+    fingerprint = layout_input_fingerprint(*items_data_to_arrays(items_data))
+    arrays = calculate_masonry_arrays(items_data, 120, 4, 3)
+    path = tmp_path / "layout.masonry"
+    assert write_layout_file(path, arrays, 120, 4, 3, fingerprint)
+    loaded = read_layout_file(path, 120, 4, 3, fingerprint)
+    assert loaded.y.tolist() == arrays.y.tolist()
+    # Nothing keeps the file mapped, so the next write can replace it (Windows).
+    assert all(getattr(loaded, name).flags.owndata
+               for name in ("index", "x", "y", "width", "height", "aspect_ratio"))
+    assert write_layout_file(path, arrays, 120, 4, 3, fingerprint)
+
+    data = bytearray(path.read_bytes())
+    data[HEADER_SIZE + 8 * 50 + 7] ^= 0xFF
+    path.write_bytes(bytes(data))
+    assert read_layout_file(path, 120, 4, 3, fingerprint) is None
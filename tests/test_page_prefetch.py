@@ -0,0 +1,95 @@
+import os
+from pathlib import Path
+import sys
+
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'taggui'))
+
+from PySide6.QtWidgets import QApplication
+
+from models.image_list_model import ImageListModel
+from utils.page_prefetch import PagePrefetchPlanner
+
+
+def _scroll(planner, start, step, samples, interval=0.05, now=0.0):
+    for sample in range(samples):
+        planner.observe(start + sample * step, now=now + sample * interval)
+    return now + (samples - 1) * interval
+
+
+def test_lookahead_follows_direction_and_grows_with_latency():
+    planner = PagePrefetchPlanner(1000)
+    now = _scroll(planner, 10_000, 500, 6)  # 10k items/s downwards
+
+    assert planner.velocity > 0
+    assert planner.plan(10, 13, 999, budget=10, now=now) == [14, 15, 16]
+
+    for _ in range(20):
+        planner.record_latency(0.5)
+    assert planner.plan(10, 13, 999, budget=10, now=now) == list(range(14, 22))
+    assert planner.plan(10, 13, 999, budget=2, now=now) == [14, 15]
+    assert planner.plan(10, 13, 15, budget=10, now=now) == [14, 15]
+
+    now = _scroll(planner, 12_000, -500, 4, now=now + 0.05)
+    assert planner.velocity < 0
+    assert planner.plan(10, 13, 999, budget=3, now=now) == [9, 8, 7]
+
+
+def test_idle_and_jumps_do_not_prefetch():
+    planner = PagePrefetchPlanner(1000)
+    now = _scroll(planner, 0, 500, 6)
+
+    assert planner.plan(0, 3, 999, budget=10, now=now + 1.0) == []
+
+    planner.observe(900_000, now=now + 0.05)
+    assert planner.velocity == 0.0
+    assert planner.plan(0, 3, 999, budget=10, now=now + 0.05) == []
+
+    slow = PagePrefetchPlanner(1000)
+    now = _scroll(slow, 0, 5, 6)
+    assert slow.plan(0, 3, 999, budget=10, now=now) == []
+
+
+def test_model_prefetches_ahead_without_crowding_the_protected_window(monkeypatch):
+    app = QApplication.instance() or QApplication([])
+    model = ImageListModel(256, ', ')
+    requested = []
+
+    def fake_request(page_num):
+        requested.append(page_num)
+        model._loading_pages.add(page_num)
+
+    monkeypatch.setattr(model, '_request_page_load', fake_request)
+    model._paginated_mode = True
+    model._db = object()
+    model._total_count = 1_000_000
+    model.MAX_PAGES_IN_MEMORY = 12
+    try:
+        planner = model._page_prefetch_planner
+        for _ in range(20):
+            planner.record_latency(1.0)
+        now = _scroll(planner, 100_000, 1000, 6, now=planner._last_time or 0.0)
+        monkeypatch.setattr('utils.page_prefetch.time.perf_counter', lambda: now)
+
+        model._pages = {page_num: [] for page_num in range(104, 108)}
+        model._pending_page_range = (104_000, 108_999)
+        model._process_pending_page_requests()
+
+        # 12 in memory - 7 protected (range +/- 1) - 1 spare allows four
+        # prefetch pages; the in-flight cap stops after three.
+        assert requested == [108, 109, 110, 111]
+        assert model._protected_page_window == (103, 109)
+
+        requested.clear()
+        model._loading_pages.clear()
+        model.MAX_PAGES_IN_MEMORY = 8
+        model._process_pending_page_requests()
+        assert requested == [108]
+    finally:
+        model._db = None
+        model.shutdown_background_workers()
+        model.deleteLater()
+        app.processEvents()
@@ -0,0 +1,99 @@
+import os
+from pathlib import Path
+import sys
+
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'taggui'))
+
+from PySide6.QtGui import QImage
+from PySide6.QtWidgets import QApplication
+
+from models.image_list_model import ImageListModel
+from utils.image import Image
+from utils import page_residency
+from utils.page_residency import (
+    MB,
+    auto_page_budget_bytes,
+    choose_victim,
+    estimate_page_bytes,
+    page_thumbnail_bytes,
+)
+
+
+def _page(count, *, tags=0, video=False):
+    images = []
+    for index in range(count):
+        image = Image(
+            path=Path(f'/data/item_{index:05d}.mp4' if video else f'/data/item_{index:05d}.png'),
+            dimensions=(3840, 2160),
+            tags=[f'tag_{tag}' for tag in range(tags)],
+            is_video=video,
+        )
+        if video:
+            image.video_metadata = {'fps': 30.0, 'duration': 4.0, 'frame_count': 120}
+            image.viewer_loop_markers = {'main': {'start': 0, 'end': 60}}
+        images.append(image)
+    return images
+
+
+def test_page_estimates_scale_with_content():
+    plain = estimate_page_bytes(_page(100))
+    heavy = estimate_page_bytes(_page(100, tags=20, video=True))
+    assert 50_000 < plain < 150_000
+    assert heavy > plain * 2
+
+    images = _page(3)
+    images[0].thumbnail_qimage = QImage(64, 32, QImage.Format.Format_ARGB32)
+    images[1].thumbnail = object()
+    assert page_thumbnail_bytes(images, icon_fallback_bytes=1000) == (64 * 32 * 4 + 1000, 2)
+
+
+def test_auto_budget_is_clamped():
+    assert auto_page_budget_bytes(available=512 * MB) == 256 * MB
+    assert auto_page_budget_bytes(available=8192 * MB) == 2048 * MB
+    assert auto_page_budget_bytes(available=64 * 1024 * MB) == 4096 * MB
+    assert auto_page_budget_bytes(available=0) == page_residency.FALLBACK_BUDGET_BYTES
+
+
+def test_victim_is_the_heaviest_older_unprotected_page():
+    costs = {1: 10, 2: 500, 3: 20, 4: 900, 5: 30, 6: 40}
+    order = [1, 2, 3, 4, 5, 6]
+
+    assert choose_victim(order, costs, protected=None) == 2
+    assert choose_victim(order, costs, protected=(2, 3)) == 4
+    assert choose_victim(order, costs, protected=(1, 6)) is None
+
+
+def test_model_evicts_by_bytes_but_keeps_protected_pages(monkeypatch):
+    app = QApplication.instance() or QApplication([])
+    model = ImageListModel(256, ', ')
+    monkeypatch.setattr(model, '_emit_pages_updated', lambda: None)
+    try:
+        light = _page(200)
+        heavy = _page(200, tags=30, video=True)
+        light_bytes = estimate_page_bytes(light)
+        heavy_bytes = estimate_page_bytes(heavy)
+        model._page_memory_budget_bytes = heavy_bytes + 3 * light_bytes + 1
+        model.set_page_protection_window(3, 4)
+
+        model._store_page(0, heavy)
+        for page_num in range(1, 5):
+            model._store_page(page_num, _page(200))
+        model._evict_old_pages()
+
+        # The heavy page is old and unprotected, so it goes first and frees
+        # enough for the four light pages.
+        assert sorted(model._pages) == [1, 2, 3, 4]
+        usage = model.page_residency_usage(max_age_s=0)
+        assert usage['pages'] == 4 and usage['bytes'] == 4 * light_bytes
+
+        model._page_memory_budget_bytes = 1
+        model._evict_old_pages()
+        assert sorted(model._pages) == [3, 4]
+    finally:
+        model.shutdown_background_workers()
+        model.deleteLater()
+        app.processEvents()
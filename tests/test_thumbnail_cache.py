@@ -9,9 +9,14 @@ ROOT = Path(__file__).resolve().parents[1]
 TAGGUI_ROOT = ROOT / "taggui"
 sys.path.insert(0, str(TAGGUI_ROOT))
 
-from utils.thumbnail_cache import ThumbnailCache
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage
+
+from utils.thumbnail_cache import PYRAMID_WIDTHS, ThumbnailCache
 from models.image_list_model import ImageListModel
 
+from media_helpers import bare_cache
+
 
 def test_cache_probe_does_not_create_bucket_or_decode(tmp_path):
     cache = ThumbnailCache.__new__(ThumbnailCache)
@@ -30,6 +35,124 @@ def test_cache_probe_does_not_create_bucket_or_decode(tmp_path):
     assert cache.has_thumbnail(image_path, 123.0, 512)
 
 
+def test_save_writes_pyramid_levels_from_one_image(tmp_path):
+    cache = bare_cache(tmp_path)
+    image_path = tmp_path / "source.jpg"
+    qimage = QImage(512, 384, QImage.Format.Format_RGB888)
+    qimage.fill(Qt.GlobalColor.red)
+
+    cache.save_thumbnail_qimage(image_path, 5.0, 512, qimage)
+
+    for level_width in PYRAMID_WIDTHS:
+        level_path = cache._get_cache_path(
+            cache._get_cache_key(image_path, 5.0, level_width))
+        assert level_path.is_file()
+        assert QImage(str(level_path)).width() == level_width
+    assert len(cache.level_paths(image_path, 5.0)) == len(PYRAMID_WIDTHS)
+
+
+def test_missing_width_is_served_from_nearest_larger_level(tmp_path):
+    cache = bare_cache(tmp_path)
+    image_path = tmp_path / "source.jpg"
+    qimage = QImage(256, 256, QImage.Format.Format_RGB888)
+    qimage.fill(Qt.GlobalColor.blue)
+    cache._write_level(image_path, 5.0, 256, qimage)
+
+    assert cache.find_cached_level(image_path, 5.0, 200)[0] == 256
+    served = cache.get_thumbnail_qimage(image_path, 5.0, 200)
+    assert served is not None and served.width() == 200
+    # Upscaling a smaller level is never used as a substitute.
+    assert not cache.has_thumbnail(image_path, 5.0, 300)
+    assert cache.get_thumbnail_qimage(image_path, 5.0, 300) is None
+
+    assert cache.remove_thumbnail(image_path, 5.0) == 1
+    assert not cache.has_thumbnail(image_path, 5.0, 200)
+
+
+def _red_thumbnail():
+    qimage = QImage(512, 384, QImage.Format.Format_RGB888)
+    qimage.fill(Qt.GlobalColor.red)
+    return qimage
+
+
+def test_content_dedup_shares_levels_across_copies_and_renames(tmp_path):
+    cache = bare_cache(tmp_path / "cache")
+    cache.content_dedup = True
+    first = tmp_path / "a" / "source.jpg"
+    copy = tmp_path / "b" / "renamed.jpg"
+    for path in (first, copy):
+        path.parent.mkdir()
+        path.write_bytes(b"same bytes" * 1000)
+
+    cache.save_thumbnail_qimage(first, 5.0, 512, _red_thumbnail())
+
+    # The copy has never been thumbnailed, yet is served without decoding.
+    assert cache.content_fingerprint(copy, 9.0) == cache.content_fingerprint(first, 5.0)
+    level_width, served_path = cache.find_cached_level(copy, 9.0, 256)
+    assert level_width == 256
+    assert served_path == cache._get_cache_path(cache._get_cache_key(copy, 9.0, 256))
+    assert served_path.stat().st_ino == cache.level_paths(first, 5.0, 256)[1].stat().st_ino
+
+
+def test_carry_over_moves_levels_to_new_path(tmp_path):
+    cache = bare_cache(tmp_path / "cache")
+    old_path = tmp_path / "old.jpg"
+    new_path = tmp_path / "moved" / "old.jpg"
+    cache.save_thumbnail_qimage(old_path, 5.0, 512, _red_thumbnail())
+
+    assert cache.carry_over_thumbnail(old_path, 5.0, new_path, 5.0, move=True) == len(PYRAMID_WIDTHS)
+    assert cache.level_paths(old_path, 5.0) == []
+    assert cache.has_thumbnail(new_path, 5.0, 512)
+
+
+def test_stored_and_carried_fingerprints_are_reused_without_rehashing(tmp_path, monkeypatch):
+    from utils import thumbnail_cache as thumbnail_cache_module
+
+    cache = bare_cache(tmp_path / "cache")
+    cache.content_dedup = True
+    first = tmp_path / "first.jpg"
+    first.write_bytes(b"same bytes" * 1000)
+    cache.save_thumbnail_qimage(first, 5.0, 512, _red_thumbnail())
+    fingerprint = cache.content_fingerprint(first, 5.0)
+
+    def no_rehash(path):
+        raise AssertionError(f"rehashed {path}")
+
+    monkeypatch.setattr(thumbnail_cache_module, "compute_content_fingerprint", no_rehash)
+    # A fingerprint read back from the folder DB under the file's new name.
+    renamed = tmp_path / "renamed.jpg"
+    cache.remember_content_fingerprints([(renamed, 7.0, fingerprint)])
+    assert cache.find_cached_level(renamed, 7.0, 256)[0] == 256
+
+    copy = tmp_path / "copy.jpg"
+    cache.carry_over_thumbnail(first, 5.0, copy, 8.0)
+    assert cache.content_fingerprint(copy, 8.0) == fingerprint
+
+
+def test_folder_db_keeps_fingerprints_across_plain_renames_only(tmp_path):
+    from utils.image_index_db import ImageIndexDB
+
+    for name in ("a.jpg", "b.jpg"):
+        (tmp_path / name).write_bytes(b"original")
+    db = ImageIndexDB(tmp_path)
+    try:
+        db.bulk_insert_files(sorted(tmp_path.glob("*.jpg")), tmp_path)
+        db.set_content_fingerprints([("a.jpg", "fingerprint-a"), ("b.jpg", "fingerprint-b")])
+
+        (tmp_path / "a.jpg").rename(tmp_path / "renamed.jpg")
+        assert db.rename_image_path("a.jpg", "renamed.jpg", directory_path=tmp_path)
+        # A conversion writes different content under the new name.
+        (tmp_path / "b.jpg").unlink()
+        (tmp_path / "b.png").write_bytes(b"converted to png")
+        assert db.rename_image_path("b.jpg", "b.png", directory_path=tmp_path)
+
+        rows = db.get_page(0, 10, sort_field="file_name", sort_dir="ASC")
+        assert {row["file_name"]: row["content_fingerprint"] for row in rows} == {
+            "renamed.jpg": "fingerprint-a", "b.png": None}
+    finally:
+        db.close()
+
+
 def test_thumbnail_future_cleanup_handles_fast_and_replaced_tasks(tmp_path):
     tracker = type("Tracker", (), {})()
     tracker._thumbnail_lock = threading.Lock()
@@ -0,0 +1,93 @@
+from pathlib import Path
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[1]
+TAGGUI_ROOT = ROOT / "taggui"
+sys.path.insert(0, str(TAGGUI_ROOT))
+
+from utils.thumbnail_cache import ThumbnailCache
+from utils.thumbnail_cache_index import ThumbnailCacheIndex
+
+
+def _indexed_cache(cache_dir):
+    cache = ThumbnailCache.__new__(ThumbnailCache)
+    cache.enabled = True
+    cache.cache_dir = cache_dir
+    cache._index = ThumbnailCacheIndex(cache_dir)
+    return cache
+
+
+def _write_entry(cache, cache_key, size, accessed):
+    cache_path = cache._get_cache_path(cache_key, ensure_parent=True)
+    cache_path.write_bytes(b"x" * size)
+    cache._index.record_write(cache_key, size)
+    cache._index._pending_writes[cache_key] = (size, accessed)
+    return cache_path
+
+
+def test_evicts_least_recently_used_entries_to_fit_cap(tmp_path):
+    cache = _indexed_cache(tmp_path)
+    paths = {
+        key: _write_entry(cache, key, 100, accessed)
+        for key, accessed in (("aa01", 1.0), ("bb02", 2.0), ("cc03", 3.0), ("dd04", 4.0))
+    }
+    cache._index.flush()
+    # A read refreshes the oldest entry, so the second-oldest goes first.
+    cache._index.record_hit("aa01")
+    cache.max_bytes = 300
+
+    assert cache.run_maintenance() == 2
+    assert paths["aa01"].exists()
+    assert not paths["bb02"].exists()
+    assert not paths["cc03"].exists()
+    assert paths["dd04"].exists()
+    assert cache._index.totals() == (200, 2)
+    cache._index.close()
+
+
+def test_stats_persist_lifetime_counters_across_sessions(tmp_path):
+    index = ThumbnailCacheIndex(tmp_path)
+    index.record_hit("aa01")
+    index.record_hit("aa01")
+    index.record_miss()
+    index.close()
+
+    reopened = ThumbnailCacheIndex(tmp_path)
+    reopened.record_miss()
+    stats = reopened.stats()
+    assert stats["session_hits"] == 0
+    assert stats["lifetime_hits"] == 2
+    assert stats["lifetime_misses"] == 2
+    reopened.close()
+
+
+def test_bootstrap_registers_webp_and_drops_png_without_rglob(tmp_path):
+    cache = _indexed_cache(tmp_path)
+    bucket = tmp_path / "ab"
+    bucket.mkdir()
+    (bucket / "abcd.webp").write_bytes(b"x" * 10)
+    (bucket / "abef.png").write_bytes(b"x" * 10)
+    cache._index.set_meta_value(ThumbnailCacheIndex.BOOTSTRAP_PURGE_WEBP_KEY, "0")
+
+    cache._bootstrap_index_from_disk()
+
+    assert (bucket / "abcd.webp").exists()
+    assert not (bucket / "abef.png").exists()
+    assert cache._index.is_bootstrapped()
+    assert cache._index.totals() == (10, 1)
+    cache._index.close()
+
+
+def test_maintenance_priority_is_only_lowered_per_thread(monkeypatch):
+    from utils import thumbnail_cache_index
+
+    calls = []
+    monkeypatch.setattr(thumbnail_cache_index.os, "nice", calls.append)
+    # os.nice is per-thread on Linux only; on macOS it would slow the GUI process.
+    monkeypatch.setattr(thumbnail_cache_index.sys, "platform", "darwin")
+    thumbnail_cache_index._set_low_priority_current_thread()
+    assert calls == []
+    monkeypatch.setattr(thumbnail_cache_index.sys, "platform", "linux")
+    thumbnail_cache_index._set_low_priority_current_thread()
+    assert calls == [19]
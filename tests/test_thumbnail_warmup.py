@@ -0,0 +1,146 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing
+from pathlib import Path
+import sys
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+TAGGUI_ROOT = ROOT / "taggui"
+sys.path.insert(0, str(TAGGUI_ROOT))
+
+from PIL import Image as PilImage
+
+import utils.thumbnail_cache as thumbnail_cache_module
+import utils.thumbnail_warmup as thumbnail_warmup
+from utils.image_index_db import ImageIndexDB
+
+from media_helpers import bare_cache
+
+
+def _init_spawned_worker(cache_dir):
+    # The real pool initializer, then a cache in the test's temp dir instead of
+    # the one from the user's settings.
+    thumbnail_warmup._init_warm_worker()
+    thumbnail_cache_module._thumbnail_cache = bare_cache(Path(cache_dir))
+
+
+def _make_folder(folder, count):
+    folder.mkdir()
+    for index in range(count):
+        PilImage.new("RGB", (64, 48), (index * 20, 0, 0)).save(folder / f"img_{index:02d}.png")
+    db = ImageIndexDB(folder)
+    db.bulk_insert_relative_paths([f"img_{index:02d}.png" for index in range(count)], folder)
+    db.close()
+
+
+def test_uncached_rows_are_keyset_paged_and_marked_in_batches(tmp_path):
+    folder = tmp_path / "media"
+    _make_folder(folder, 5)
+    db = ImageIndexDB(folder)
+
+    first_page = db.get_uncached_thumbnail_rows(after_id=0, limit=2)
+    second_page = db.get_uncached_thumbnail_rows(after_id=first_page[-1]["id"], limit=10)
+    assert [row["file_name"] for row in first_page + second_page] == [
+        f"img_{index:02d}.png" for index in range(5)
+    ]
+
+    assert db.mark_thumbnails_cached(["img_00.png", "img_03.png"]) == 2
+    assert db.count_cached_thumbnails() == 2
+    remaining = db.get_uncached_thumbnail_rows(after_id=0, limit=10)
+    assert [row["file_name"] for row in remaining] == ["img_01.png", "img_02.png", "img_04.png"]
+    db.close()
+
+
+def test_warm_generates_missing_thumbnails_and_resumes(tmp_path, monkeypatch):
+    folder = tmp_path / "media"
+    _make_folder(folder, 4)
+    cache = bare_cache(tmp_path / "cache")
+    monkeypatch.setattr(thumbnail_cache_module, "_thumbnail_cache", cache)
+    monkeypatch.setattr(thumbnail_warmup, "TASK_CHUNK_SIZE", 1)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        counters = thumbnail_warmup.warm_thumbnails(
+            folder, jobs=2, thumbnail_width=32, executor=executor)
+    assert counters == {"generated": 4, "cached": 0, "failed": 0}
+    for index in range(4):
+        image_path = folder / f"img_{index:02d}.png"
+        assert cache.has_thumbnail(image_path, image_path.stat().st_mtime, 32)
+
+    db = ImageIndexDB(folder)
+    assert db.count_cached_thumbnails() == 4
+    db.close()
+
+    # A second run finds nothing left to do.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        counters = thumbnail_warmup.warm_thumbnails(
+            folder, jobs=2, thumbnail_width=32, executor=executor)
+    assert counters == {"generated": 0, "cached": 0, "failed": 0}
+
+
+def test_warm_in_spawned_worker_processes_stores_dimensions(tmp_path, monkeypatch):
+    folder = tmp_path / "media"
+    _make_folder(folder, 3)
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(thumbnail_warmup, "TASK_CHUNK_SIZE", 1)
+
+    with ProcessPoolExecutor(
+        max_workers=2,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_spawned_worker,
+        initargs=(str(cache_dir),),
+    ) as executor:
+        counters = thumbnail_warmup.warm_thumbnails(
+            folder, jobs=2, thumbnail_width=32, executor=executor,
+            cache=bare_cache(cache_dir))
+
+    assert counters == {"generated": 3, "cached": 0, "failed": 0}
+    cache = bare_cache(cache_dir)
+    db = ImageIndexDB(folder)
+    for index in range(3):
+        image_path = folder / f"img_{index:02d}.png"
+        assert cache.has_thumbnail(image_path, image_path.stat().st_mtime, 32)
+        assert db.get_cached_info(image_path.name, image_path.stat().st_mtime)["dimensions"] == (64, 48)
+    assert db.count_cached_thumbnails() == 3
+    db.close()
+
+
+def test_warm_regenerates_thumbnails_evicted_behind_the_cached_flag(tmp_path, monkeypatch):
+    folder = tmp_path / "media"
+    _make_folder(folder, 3)
+    cache = bare_cache(tmp_path / "cache")
+    monkeypatch.setattr(thumbnail_cache_module, "_thumbnail_cache", cache)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        thumbnail_warmup.warm_thumbnails(folder, jobs=1, thumbnail_width=32, executor=executor)
+
+    # The size cap's LRU eviction removes files but leaves the DB flag set.
+    evicted_path = folder / "img_01.png"
+    for level_path in cache.level_paths(evicted_path, evicted_path.stat().st_mtime, 32):
+        level_path.unlink()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        counters = thumbnail_warmup.warm_thumbnails(
+            folder, jobs=1, thumbnail_width=32, executor=executor)
+    assert counters == {"generated": 1, "cached": 0, "failed": 0}
+    assert cache.has_thumbnail(evicted_path, evicted_path.stat().st_mtime, 32)
+
+
+def test_warm_refuses_a_folder_larger_than_the_cache_cap(tmp_path, monkeypatch):
+    folder = tmp_path / "media"
+    _make_folder(folder, 3)
+    cache = bare_cache(tmp_path / "cache")
+    cache.max_bytes = 3 * thumbnail_warmup.ESTIMATED_LEVEL_BYTES - 1
+    monkeypatch.setattr(thumbnail_cache_module, "_thumbnail_cache", cache)
+
+    with pytest.raises(RuntimeError, match="--allow-eviction"):
+        thumbnail_warmup.warm_thumbnails(folder, jobs=1, thumbnail_width=32)
+    db = ImageIndexDB(folder)
+    assert db.count_cached_thumbnails() == 0
+    db.close()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        counters = thumbnail_warmup.warm_thumbnails(
+            folder, jobs=1, thumbnail_width=32, allow_eviction=True, executor=executor)
+    assert counters["generated"] == 3
@@ -0,0 +1,126 @@
+import os
+from pathlib import Path
+import sys
+
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'taggui'))
+
+from PySide6.QtGui import QImage
+from PySide6.QtWidgets import QApplication, QGraphicsPixmapItem
+
+from widgets.video_frame_cache import FrameCache, GopPrefetcher
+
+from media_helpers import brightness, spin_until, write_video
+
+
+APP = QApplication.instance() or QApplication([])
+
+
+def test_cache_is_bounded_and_sizes_the_window():
+    frame = QImage(100, 100, QImage.Format.Format_RGB888)
+    cache = FrameCache(budget_bytes=frame.sizeInBytes() * 5)
+    for frame_number in range(7):
+        cache.put(frame_number, frame)
+
+    assert len(cache) == 5
+    assert cache.missing(range(7)) == [0, 1]
+    # Five frames fit: the shown one plus two on each side.
+    assert cache.window_frames(24) == 2
+
+
+def test_prefetcher_decodes_behind_first_when_stepping_backward(tmp_path):
+    import cv2
+
+    path = write_video(tmp_path / 'clip.avi')
+    cache = FrameCache()
+    prefetcher = GopPrefetcher(cv2, path, cache, window=6)
+    try:
+        assert prefetcher.plan(30, -1, 60) == [(24, 29), (31, 36)]
+        prefetcher.request(30, -1, 60)
+        spin_until(lambda: not cache.missing(range(24, 37)) or len(cache) >= 12)
+        spin_until(lambda: prefetcher._thread is None)
+
+        assert cache.missing(range(24, 30)) == []
+        assert cache.missing(range(31, 37)) == []
+        assert abs(brightness(cache.get(27)) - 27 * 4) <= 6
+    finally:
+        prefetcher.close()
+
+
+def test_prefetcher_capture_turns_off_hardware_decoding():
+    import cv2
+
+    class RecordingCapture:
+        def __init__(self, *_args):
+            self.props = {}
+
+        def set(self, prop, value):
+            self.props[prop] = value
+            return True
+
+        def isOpened(self):
+            return True
+
+        def get(self, _prop):
+            return 1.0
+
+    class FakeCv2:
+        CAP_FFMPEG = cv2.CAP_FFMPEG
+        CAP_PROP_HW_ACCELERATION = cv2.CAP_PROP_HW_ACCELERATION
+        VIDEO_ACCELERATION_NONE = cv2.VIDEO_ACCELERATION_NONE
+        CAP_PROP_SAR_NUM = cv2.CAP_PROP_SAR_NUM
+        CAP_PROP_SAR_DEN = cv2.CAP_PROP_SAR_DEN
+        VideoCapture = RecordingCapture
+
+    prefetcher = GopPrefetcher(FakeCv2, 'clip.mp4', FrameCache())
+    cap = prefetcher._capture()
+
+    assert cap.props[cv2.CAP_PROP_HW_ACCELERATION] == cv2.VIDEO_ACCELERATION_NONE
+
+
+def test_player_steps_without_seeking_and_serves_prefetched_frames(tmp_path):
+    import cv2
+    import pytest
+
+    pytest.importorskip('PySide6.QtMultimedia', exc_type=ImportError)
+    from widgets.video_player import VideoPlayerWidget
+
+    path = write_video(tmp_path / 'clip.avi')
+    player = VideoPlayerWidget()
+    player.video_path = path
+    player.pixmap_item = QGraphicsPixmapItem()
+    assert player._ensure_cap_ready()
+    real_cap = player.cap
+    try:
+        seeks = []
+
+        class CountingCapture:
+            def __getattr__(self, name):
+                return getattr(real_cap, name)
+
+            def set(self, prop, value):
+                if prop == cv2.CAP_PROP_POS_FRAMES:
+                    seeks.append(value)
+                return real_cap.set(prop, value)
+
+        player.cap = CountingCapture()
+        player._show_opencv_frame(20)
+        player._show_opencv_frame(21)
+        player._show_opencv_frame(25)
+        assert seeks == [20]
+        assert abs(brightness(player.pixmap_item.pixmap().toImage()) - 25 * 4) <= 6
+
+        # Stepping back is served from the background-decoded window.
+        spin_until(lambda: 19 in player._frame_cache)
+        player._show_opencv_frame(24)
+        player._show_opencv_frame(19)
+        assert seeks == [20]
+        assert abs(brightness(player.pixmap_item.pixmap().toImage()) - 19 * 4) <= 6
+    finally:
+        player.cap = real_cap
+        player.cleanup(force_gc=False)
+        player.deleteLater()
+        APP.processEvents()
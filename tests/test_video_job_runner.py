@@ -0,0 +1,82 @@
+from pathlib import Path
+import sys
+import threading
+import time
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'taggui'))
+
+from utils.video import job_runner
+from utils.video.job_runner import default_worker_count, run_jobs
+
+
+def test_jobs_overlap_and_results_keep_input_order():
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def job(value):
+        with lock:
+            running.append(value)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(value)
+        return value * 2
+
+    results, report = run_jobs(range(8), job, label='test', describe=str, workers=4)
+
+    assert results == [0, 2, 4, 6, 8, 10, 12, 14]
+    assert max(peak) == 4
+    assert (report.succeeded, report.failed, report.workers) == (8, 0, 4)
+    assert report.jobs_per_minute > 0
+
+
+def test_cancel_from_the_progress_callback_skips_jobs_not_started(monkeypatch):
+    monkeypatch.delenv(job_runner.VIDEO_JOB_WORKERS_ENV, raising=False)
+    started = []
+    callback_threads = set()
+
+    def job(value):
+        started.append(value)
+        time.sleep(0.05)
+        return value
+
+    def progress(current, total, name):
+        callback_threads.add(threading.get_ident())
+        return current >= 1
+
+    results, report = run_jobs(range(20), job, label='test', describe=str,
+                               progress_callback=progress, workers=2)
+
+    assert callback_threads == {threading.get_ident()}
+    assert report.cancelled > 0
+    assert report.succeeded == len(started) < 20
+    assert results[:2] == [0, 1]
+
+
+def test_batch_sar_fix_collects_errors_and_sizes_pool_by_encoder_threads(monkeypatch):
+    # Imported lazily: collection must not load ffmpeg helpers (see lazy startup tests).
+    from utils.video import batch_processor
+
+    monkeypatch.delenv(job_runner.VIDEO_JOB_WORKERS_ENV, raising=False)
+    monkeypatch.setenv(job_runner.FFMPEG_JOB_THREADS_ENV, '2')
+    monkeypatch.setattr(job_runner.os, 'cpu_count', lambda: 8)
+    assert default_worker_count(2) == 4
+    calls = []
+
+    def fake_fix(input_path, output_path, threads=None):
+        calls.append((input_path.name, threads))
+        if input_path.name == 'bad.mp4':
+            return False, 'ffmpeg error: broken'
+        return True, 'Fixed'
+
+    monkeypatch.setattr(batch_processor.SARFixer, 'fix_sar_to_square_pixels', fake_fix)
+    paths = [Path('a.mp4'), Path('bad.mp4'), Path('c.mp4')]
+
+    success, failure, errors = batch_processor.BatchProcessor.batch_fix_sar(paths)
+
+    assert (success, failure) == (2, 1)
+    assert errors == ['bad.mp4: ffmpeg error: broken']
+    assert sorted(calls) == [('a.mp4', 2), ('bad.mp4', 2), ('c.mp4', 2)]
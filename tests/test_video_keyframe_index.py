@@ -0,0 +1,148 @@
+from pathlib import Path
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'taggui'))
+
+from utils.image_index_db import ImageIndexDB
+from utils.video import keyframe_index
+from utils.video.keyframe_index import KeyframeIndex, parse_packet_csv
+from widgets.video_frame_cache import seek_capture
+
+
+# Decode order with B-frames: I0 P3 B1 B2 I4 B5, plus a discarded packet.
+PACKET_CSV = """\
+1.000000,K__
+1.300000,___
+1.100000,___
+1.200000,___
+N/A,___
+1.400000,K__
+1.450000,__D
+1.500000,___
+"""
+
+
+def test_packets_are_indexed_in_presentation_order():
+    index = parse_packet_csv(PACKET_CSV)
+
+    assert [round(value, 6) for value in index.frame_times] == [0.0, 0.1, 0.2, 0.3, 0.4, 0.5]
+    assert index.keyframes == [0, 4]
+    assert index.preceding_keyframe(3) == 0
+    assert index.preceding_keyframe(5) == 4
+    assert index.frame_for_time(0.26) == 3
+    assert index.frame_for_time(9.0) == 5
+    # Cuts must start on a keyframe and end before one (or at the end).
+    assert index.can_stream_copy(0, 3)
+    assert index.can_stream_copy(4, 5)
+    assert not index.can_stream_copy(0, 2)
+    assert not index.can_stream_copy(1, 3)
+
+
+# Open GOP: B-frames decoded after the keyframe at 1.3 are shown before it.
+OPEN_GOP_PACKET_CSV = """\
+1.000000,K__
+1.200000,___
+1.100000,___
+1.300000,K__
+1.250000,___
+1.280000,___
+1.400000,___
+1.500000,K__
+1.600000,___
+"""
+
+
+def test_open_gop_keyframes_are_not_cut_points():
+    index = parse_packet_csv(OPEN_GOP_PACKET_CSV)
+
+    assert index.keyframes == [0, 5, 7]
+    assert index.cut_points == [0, 7]
+    assert index.preceding_keyframe(6) == 5
+    # Frames 3 and 4 may reference frame 2, so nothing can be cut at frame 5.
+    assert not index.can_stream_copy(5, 6)
+    assert not index.can_stream_copy(0, 4)
+    assert index.can_stream_copy(0, 6)
+    assert index.smart_cut_segments(2, 8) == [(2, 6, False), (7, 8, True)]
+
+    # An index stored before cut points were recorded allows no stream copy.
+    legacy = KeyframeIndex(index.frame_times, index.keyframes)
+    assert not legacy.can_stream_copy(0, 6)
+    assert legacy.smart_cut_segments(0, 8) is None
+
+
+def test_index_is_probed_once_then_read_back_from_the_folder_db(tmp_path, monkeypatch):
+    ImageIndexDB(tmp_path).close()
+    (tmp_path / 'clips').mkdir()
+    video_path = tmp_path / 'clips' / 'clip.mp4'
+    video_path.write_bytes(b'video')
+    probes = []
+
+    def fake_probe(path):
+        probes.append(Path(path).name)
+        return parse_packet_csv(PACKET_CSV)
+
+    monkeypatch.setattr(keyframe_index, 'probe_keyframe_index', fake_probe)
+    keyframe_index.clear_memory_cache()
+    try:
+        assert keyframe_index.load_keyframe_index(video_path).keyframes == [0, 4]
+        keyframe_index.clear_memory_cache()
+        assert keyframe_index.load_keyframe_index(video_path).frame_count == 6
+        assert probes == ['clip.mp4']
+
+        # An edited file no longer matches the stored size, so it is probed again.
+        video_path.write_bytes(b'edited video')
+        keyframe_index.load_keyframe_index(video_path)
+        assert probes == ['clip.mp4', 'clip.mp4']
+
+        # Stored without cut points by an older version: probed once more.
+        db = ImageIndexDB(tmp_path)
+        try:
+            db.conn.execute('UPDATE video_keyframe_index SET cut_points = NULL')
+            db.conn.commit()
+        finally:
+            db.close()
+        keyframe_index.clear_memory_cache()
+        assert keyframe_index.load_keyframe_index(video_path).cut_points == [0, 4]
+        keyframe_index.clear_memory_cache()
+        keyframe_index.load_keyframe_index(video_path)
+        assert probes == ['clip.mp4'] * 3
+    finally:
+        keyframe_index.clear_memory_cache()
+
+
+def test_seeks_land_on_the_preceding_keyframe():
+    class FakeCapture:
+        def __init__(self):
+            self.calls = []
+
+        def set(self, prop, value):
+            self.calls.append(('set', value))
+
+        def grab(self):
+            self.calls.append('grab')
+            return True
+
+    class FakeCv2:
+        CAP_PROP_POS_FRAMES = 1
+
+    index = KeyframeIndex([i / 10 for i in range(100)], [0, 30, 60])
+    cap = FakeCapture()
+    # No keyframe between frames 5 and 25: reading through beats a seek.
+    assert seek_capture(FakeCv2, cap, 25, 5, index)
+    assert cap.calls == ['grab'] * 20
+
+    cap.calls.clear()
+    assert seek_capture(FakeCv2, cap, 40, 5, index)
+    assert cap.calls == [('set', 30)] + ['grab'] * 10
+
+
+def test_smart_cut_copies_complete_gops_and_reencodes_the_ends():
+    index = KeyframeIndex([i / 10 for i in range(100)], [0, 30, 60, 90], [0, 30, 60, 90])
+
+    assert index.smart_cut_segments(10, 79) == [(10, 29, False), (30, 59, True), (60, 79, False)]
+    assert index.smart_cut_segments(30, 99) == [(30, 99, True)]
+    assert index.smart_cut_segments(5, 89) == [(5, 29, False), (30, 89, True)]
+    # No complete GOP inside: nothing to copy.
+    assert index.smart_cut_segments(35, 70) is None
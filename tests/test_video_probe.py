@@ -0,0 +1,171 @@
+from pathlib import Path
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[1]
+TAGGUI_ROOT = ROOT / "taggui"
+sys.path.insert(0, str(TAGGUI_ROOT))
+
+from utils.image_index_db import ImageIndexDB
+from utils.video import probe
+
+from media_helpers import write_video
+
+
+def test_probe_reads_metadata_and_seeks_past_first_frame(tmp_path):
+    video_path = tmp_path / "clip.avi"
+    write_video(video_path)
+
+    first = probe.probe_video_file(str(video_path))
+    representative = probe.probe_video_file(
+        str(video_path), representative_frame=True, max_frame_width=32)
+
+    assert first["dimensions"] == (64, 48)
+    assert first["metadata"]["frame_count"] == 60
+    assert first["metadata"]["sar_num"] == 1
+    rgb_bytes, width, height = representative["frame"]
+    assert (width, height) == (32, 24)
+    assert first["frame"][0][0] < 10
+    assert rgb_bytes[0] > 10
+
+
+def test_metadata_only_lookup_reuses_earlier_probe(tmp_path):
+    video_path = tmp_path / "clip.avi"
+    write_video(video_path, frame_count=5)
+    metadata = {"fps": 10.0, "duration": 0.5, "frame_count": 5, "sar_num": 4, "sar_den": 3}
+
+    probe.remember_probe_metadata(video_path, (64, 48), metadata)
+
+    assert probe.get_cached_probe_metadata(video_path) == ((64, 48), metadata)
+    video_path.write_bytes(b"changed")
+    assert probe.get_cached_probe_metadata(video_path) is None
+
+
+def test_save_info_persists_video_sar(tmp_path):
+    db = ImageIndexDB(tmp_path)
+    metadata = {"fps": 24.0, "duration": 2.0, "frame_count": 48, "sar_num": 4, "sar_den": 3}
+    db.save_info("clip.mp4", 720, 480, True, 123.0, metadata)
+
+    cached = db.get_cached_info("clip.mp4", 123.0)
+    assert cached["video_metadata"]["sar_num"] == 4
+    assert cached["video_metadata"]["sar_den"] == 3
+    db.close()
+
+
+def test_stream_info_recovers_rational_rate_and_codec():
+    class FakeCv2:
+        CAP_PROP_FOURCC = 6
+        CAP_PROP_CODEC_PIXEL_FORMAT = 46
+        CAP_PROP_ORIENTATION_META = 48
+
+    def fourcc(text):
+        return sum(ord(char) << (8 * index) for index, char in enumerate(text))
+
+    class FakeCap:
+        values = {6: fourcc("avc1"), 46: fourcc("I420"), 48: 90.0}
+
+        def get(self, prop):
+            return self.values[prop]
+
+    info = probe.stream_info(FakeCv2, FakeCap(), 29.97002997)
+
+    assert info == {"codec": "avc1", "pixel_format": "I420",
+                    "fps_num": 30000, "fps_den": 1001, "rotation": 90}
+
+
+def test_stream_info_survives_db_round_trip_with_keyframe_interval(tmp_path):
+    from utils.video.keyframe_index import KeyframeIndex
+
+    db = ImageIndexDB(tmp_path)
+    metadata = {"fps": 30000 / 1001, "duration": 2.0, "frame_count": 60, "sar_num": 1, "sar_den": 1,
+                "codec": "avc1", "pixel_format": "I420", "fps_num": 30000, "fps_den": 1001,
+                "rotation": 0}
+    db.save_info("clip.mp4", 720, 480, True, 123.0, metadata)
+    index = KeyframeIndex([frame * 0.5 for frame in range(5)], [0, 2, 4])
+    db.save_video_keyframe_index("clip.mp4", 123.0, 10, index)
+
+    cached = db.get_cached_info("clip.mp4", 123.0)["video_metadata"]
+    assert (cached["codec"], cached["fps_num"], cached["fps_den"]) == ("avc1", 30000, 1001)
+    assert cached["keyframe_interval"] == 1.0
+
+    # Re-indexing without stream details keeps what was stored.
+    db.save_info("clip.mp4", 720, 480, True, 123.0, {"fps": 29.97, "frame_count": 60})
+    assert db.get_cached_info("clip.mp4", 123.0)["video_metadata"]["pixel_format"] == "I420"
+    db.close()
+
+
+def test_hung_pool_probe_times_out_and_kills_the_workers(monkeypatch):
+    from concurrent.futures import Future
+
+    class FakeProcess:
+        killed = False
+
+        def is_alive(self):
+            return not self.killed
+
+        def kill(self):
+            self.killed = True
+
+    class HungExecutor:
+        def __init__(self):
+            self._processes = {1: FakeProcess()}
+            self.shut_down = False
+
+        def submit(self, *_args):
+            return Future()  # never completes, like a decoder stuck in a read
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            self.shut_down = True
+
+    executor = HungExecutor()
+    monkeypatch.setattr(probe, "_executor", executor)
+    monkeypatch.setattr(probe, "_pool_failures", 0)
+    monkeypatch.setattr(probe, "probe_timeout", lambda: 0.05)
+    monkeypatch.setenv(probe.VIDEO_PROBE_PROCESSES_ENV, "1")
+
+    result = probe.probe_video_in_pool("hung.mp4")
+
+    # Reported as unreadable rather than retried in-process, which would hang too.
+    assert result == {"dimensions": None, "metadata": None, "frame": None}
+    assert executor.shut_down and executor._processes[1].killed
+    assert probe._executor is None
+    # A slow file is not a broken pool: the next probe gets fresh workers.
+    assert probe._pool_failures == 0
+    assert probe.process_pool_enabled()
+
+
+def test_probe_timeout_does_not_include_the_queue_wait(monkeypatch):
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    def slow_probe(*_args):
+        time.sleep(0.3)
+        return {"dimensions": (64, 48), "metadata": {}, "frame": None}
+
+    # One worker, two probes: the second waits 0.3 s, then decodes for 0.3 s.
+    monkeypatch.setattr(probe, "probe_video_file", slow_probe)
+    monkeypatch.setattr(probe, "_executor", ThreadPoolExecutor(max_workers=1))
+    monkeypatch.setattr(probe, "_job_slots", None)
+    monkeypatch.setattr(probe, "_pool_failures", 0)
+    monkeypatch.setattr(probe, "probe_timeout", lambda: 0.5)
+    monkeypatch.setenv(probe.VIDEO_PROBE_PROCESSES_ENV, "1")
+    monkeypatch.setenv(probe.VIDEO_PROBE_WORKERS_ENV, "1")
+
+    with ThreadPoolExecutor(max_workers=2) as callers:
+        results = list(callers.map(probe.probe_video_in_pool, ["a.mp4", "b.mp4"]))
+
+    assert [result["dimensions"] for result in results] == [(64, 48), (64, 48)]
+    probe._executor.shutdown()
+
+
+def test_in_process_fallback_probe_keeps_the_time_limit(monkeypatch):
+    import threading
+
+    release = threading.Event()
+    monkeypatch.setattr(probe, "probe_video_file", lambda *_args: release.wait(5))
+    monkeypatch.setattr(probe, "probe_timeout", lambda: 0.05)
+
+    try:
+        assert probe.probe_video_in_thread("hung.mp4") == probe.EMPTY_PROBE_RESULT
+    finally:
+        release.set()
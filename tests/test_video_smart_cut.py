@@ -0,0 +1,195 @@
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'taggui'))
+
+from utils.video import keyframe_index
+
+
+requires_ffmpeg = pytest.mark.skipif(
+    shutil.which('ffmpeg') is None or shutil.which('ffprobe') is None,
+    reason='ffmpeg and ffprobe are needed to build synthetic clips',
+)
+
+
+def _write_clip(path, frame_count=100, fps=25, gop=25):
+    # Fixed GOPs: keyframes at 0, 25, 50, 75.
+    subprocess.run([
+        'ffmpeg', '-v', 'error',
+        '-f', 'lavfi', '-i', f'testsrc=size=128x72:rate={fps}',
+        '-f', 'lavfi', '-i', 'sine=frequency=440:sample_rate=48000',
+        '-frames:v', str(frame_count), '-shortest',
+        '-c:v', 'libx264', '-profile:v', 'high', '-pix_fmt', 'yuv420p',
+        '-g', str(gop), '-keyint_min', str(gop), '-sc_threshold', '0',
+        '-c:a', 'aac', '-y', str(path),
+    ], check=True, capture_output=True)
+
+
+def _frame_count(path):
+    result = subprocess.run([
+        'ffprobe', '-v', 'error', '-select_streams', 'v:0', '-count_frames',
+        '-show_entries', 'stream=nb_read_frames', '-of', 'csv=p=0', str(path),
+    ], check=True, capture_output=True, text=True)
+    return int(result.stdout.strip())
+
+
+@requires_ffmpeg
+def test_extract_range_copies_inner_gops_and_keeps_exact_frames(tmp_path):
+    # Imported lazily: collection must not load ffmpeg helpers (see lazy startup tests).
+    from utils.video.frame_editor import FrameEditor
+
+    source = tmp_path / 'clip.mp4'
+    _write_clip(source)
+    keyframe_index.clear_memory_cache()
+    try:
+        success, message = FrameEditor.extract_range(source, tmp_path / 'cut.mp4', 10, 79, 25.0)
+
+        assert success, message
+        assert 'smart cut (copied 50 frames, re-encoded 20)' in message
+        assert _frame_count(tmp_path / 'cut.mp4') == 70
+    finally:
+        keyframe_index.clear_memory_cache()
+
+
+@requires_ffmpeg
+def test_remove_range_joins_both_sides_around_the_cut(tmp_path):
+    from utils.video.frame_editor import FrameEditor
+
+    source = tmp_path / 'clip.mp4'
+    _write_clip(source)
+    keyframe_index.clear_memory_cache()
+    try:
+        success, message = FrameEditor.remove_range(source, tmp_path / 'trimmed.mp4', 40, 44, 25.0)
+
+        assert success, message
+        assert 'smart cut' in message
+        assert _frame_count(tmp_path / 'trimmed.mp4') == 95
+    finally:
+        keyframe_index.clear_memory_cache()
+
+
+@requires_ffmpeg
+def test_keyframe_aligned_extract_is_stream_copied_with_exact_frames(tmp_path):
+    from utils.video.frame_editor import FrameEditor
+
+    source = tmp_path / 'clip.mp4'
+    _write_clip(source)
+    keyframe_index.clear_memory_cache()
+    try:
+        # Two whole GOPs; with B-frames, -t alone lets packets of frame 75's GOP through.
+        success, message = FrameEditor.extract_range(source, tmp_path / 'cut.mp4', 25, 74, 25.0)
+
+        assert success, message
+        assert 'stream copy' in message
+        assert _frame_count(tmp_path / 'cut.mp4') == 50
+    finally:
+        keyframe_index.clear_memory_cache()
+
+
+@requires_ffmpeg
+def test_keyframe_aligned_remove_is_stream_copied_with_exact_frames(tmp_path):
+    from utils.video.frame_editor import FrameEditor
+
+    source = tmp_path / 'clip.mp4'
+    _write_clip(source)
+    keyframe_index.clear_memory_cache()
+    try:
+        # Dropping the tail keeps frames 0-49, which end right before a keyframe.
+        success, message = FrameEditor.remove_range(source, tmp_path / 'trimmed.mp4', 50, 99, 25.0)
+
+        assert success, message
+        assert 'stream copy' in message
+        assert _frame_count(tmp_path / 'trimmed.mp4') == 50
+    finally:
+        keyframe_index.clear_memory_cache()
+
+
+def test_stream_copy_with_the_wrong_frame_count_is_rejected(tmp_path, monkeypatch):
+    from utils.video import frame_editor
+    from utils.video.frame_editor import FrameEditor
+
+    packet_counts = ['23\n', '20\n']
+    commands = []
+
+    def fake_run(cmd, capture_output=True, text=True, timeout=None):
+        commands.append(cmd)
+        if cmd[0] == 'ffprobe':
+            return subprocess.CompletedProcess(cmd, 0, stdout=packet_counts.pop(0), stderr='')
+        if cmd[-1] == '-':
+            return subprocess.CompletedProcess(cmd, 0, stdout='', stderr='')
+        Path(cmd[-1]).write_bytes(b'video')
+        return subprocess.CompletedProcess(cmd, 0, stdout='', stderr='')
+
+    monkeypatch.setattr(frame_editor.subprocess, 'run', fake_run)
+    index = keyframe_index.KeyframeIndex([i / 10 for i in range(40)], [0, 20], [0, 20])
+    output = tmp_path / 'out.mp4'
+
+    # Packets of the next GOP slipped through: the caller re-encodes instead.
+    success, message = FrameEditor._verified_stream_copy(tmp_path / 'in.mp4', output, index, 0, 19)
+    assert not success and 'got 23 frames but expected 20' in message
+    assert not output.exists()
+    assert commands[0][commands[0].index('-frames:v') + 1] == '20'
+
+    success, message = FrameEditor._verified_stream_copy(tmp_path / 'in.mp4', output, index, 0, 19)
+    assert success, message
+    assert commands[-1][:4] == ['ffmpeg', '-v', 'error', '-i']
+    assert output.is_file()
+
+
+def test_unmatched_encoder_parameters_fall_back_to_a_full_reencode():
+    from utils.video.frame_editor import FrameEditor
+
+    h264 = {'codec_name': 'h264', 'profile': 'High', 'pix_fmt': 'yuv420p', 'level': 31}
+    assert FrameEditor._smart_cut_encoder_args(h264)[:6] == [
+        '-c:v', 'libx264', '-profile:v', 'high', '-pix_fmt', 'yuv420p']
+    assert '3.1' in FrameEditor._smart_cut_encoder_args(h264)
+    assert FrameEditor._smart_cut_encoder_args({**h264, 'pix_fmt': 'yuv444p'}) is None
+    assert FrameEditor._smart_cut_encoder_args({'codec_name': 'vp9', 'profile': 'Profile 0',
+                                                'pix_fmt': 'yuv420p'}) is None
+
+    index = keyframe_index.KeyframeIndex([i / 10 for i in range(40)], [0, 20])
+    success, message = FrameEditor._smart_cut(Path('in.webm'), Path('out.webm'), index,
+                                              [(5, 39)], False, {'codec_name': 'vp9'})
+    assert not success and 'no matching encoder' in message
+
+
+def test_smart_cut_output_that_fails_to_decode_is_rejected(tmp_path, monkeypatch):
+    from utils.video import frame_editor
+    from utils.video.frame_editor import FrameEditor
+
+    decode_stderr = []
+    commands = []
+
+    def fake_run(cmd, capture_output=True, text=True, timeout=None):
+        commands.append(cmd)
+        if cmd[0] == 'ffprobe':
+            return subprocess.CompletedProcess(cmd, 0, stdout='35\n', stderr='')
+        if cmd[-1] == '-':
+            # The decode check: `ffmpeg -v error -i joined -f null -`.
+            return subprocess.CompletedProcess(cmd, 0, stdout='', stderr=''.join(decode_stderr))
+        Path(cmd[-1]).write_bytes(b'video')
+        return subprocess.CompletedProcess(cmd, 0, stdout='', stderr='')
+
+    monkeypatch.setattr(frame_editor.subprocess, 'run', fake_run)
+    h264 = {'codec_name': 'h264', 'profile': 'High', 'pix_fmt': 'yuv420p'}
+    index = keyframe_index.KeyframeIndex([i / 10 for i in range(40)], [0, 20], [0, 20])
+    output = tmp_path / 'out.mp4'
+
+    decode_stderr.append('[h264 @ 0x1] reference picture missing during reorder\n')
+    success, message = FrameEditor._smart_cut(tmp_path / 'in.mp4', output, index,
+                                              [(5, 39)], False, h264)
+    assert not success and 'decode check failed' in message
+    assert not output.exists()
+    assert ['ffmpeg', '-v', 'error', '-i'] == commands[-1][:4]
+
+    decode_stderr.clear()
+    success, message = FrameEditor._smart_cut(tmp_path / 'in.mp4', output, index,
+                                              [(5, 39)], False, h264)
+    assert success, message
+    assert output.is_file()
@@ -0,0 +1,114 @@
+import os
+from pathlib import Path
+import sys
+
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'taggui'))
+
+from PySide6.QtWidgets import QApplication, QGraphicsPixmapItem
+
+from utils import thumbnail_cache
+from widgets import video_sprite_sheet
+from widgets.video_sprite_sheet import MAX_TILES, SpriteSheetBuilder, sprite_frame_numbers
+
+from media_helpers import bare_cache, brightness, spin_until, write_video
+
+
+APP = QApplication.instance() or QApplication([])
+
+
+def _load_cv2():
+    import cv2
+
+    return cv2
+
+
+def test_tiles_are_one_interval_apart_and_capped_for_long_clips():
+    assert sprite_frame_numbers(10.0, 50) == [0, 10, 20, 30, 40]
+    assert len(sprite_frame_numbers(30.0, 30 * 3600)) <= MAX_TILES + 1
+    assert sprite_frame_numbers(0.0, 50) == []
+
+
+def test_sheet_is_built_once_and_then_served_from_the_thumbnail_cache(tmp_path, monkeypatch):
+    path = write_video(tmp_path / 'clip.avi')
+    monkeypatch.setattr(thumbnail_cache, '_thumbnail_cache', bare_cache(tmp_path / 'cache'))
+    sheets = []
+    builder = SpriteSheetBuilder(_load_cv2)
+    builder.set_ready_callback(sheets.append)
+    try:
+        builder.request(path, 10.0, 60)
+        spin_until(lambda: sheets)
+        sheet = sheets[0]
+        assert sheet.frames == [0, 10, 20, 30, 40, 50]
+        assert abs(brightness(sheet.tile(21)) - 20 * 4) <= 6
+        assert sheet.tile(21).size().toTuple() == (sheet.tile_width, sheet.tile_height)
+
+        def no_rebuild(*_args, **_kwargs):
+            raise AssertionError('sheet should come from the cache')
+
+        monkeypatch.setattr(video_sprite_sheet, 'build_sprite_sheet', no_rebuild)
+        builder.request(path, 10.0, 60)
+        spin_until(lambda: len(sheets) == 2)
+        assert sheets[1].frames == sheet.frames
+        assert abs(brightness(sheets[1].tile(40)) - 40 * 4) <= 8
+    finally:
+        builder.shutdown()
+
+
+def test_build_waits_while_the_clip_is_playing(tmp_path, monkeypatch):
+    path = write_video(tmp_path / 'clip.avi')
+    monkeypatch.setattr(thumbnail_cache, '_thumbnail_cache', bare_cache(tmp_path / 'cache'))
+    monkeypatch.setattr(video_sprite_sheet, 'PAUSE_POLL_SECONDS', 0.01)
+    playing = [True]
+    sheets = []
+    builder = SpriteSheetBuilder(_load_cv2, is_playing=lambda: playing[0])
+    builder.set_ready_callback(sheets.append)
+    try:
+        builder.request(path, 10.0, 60)
+        spin_until(lambda: sheets, timeout=0.3)
+        assert sheets == []
+
+        playing[0] = False
+        spin_until(lambda: sheets)
+        assert sheets[0].frames == [0, 10, 20, 30, 40, 50]
+    finally:
+        builder.shutdown()
+
+
+def test_player_scrubs_on_sheet_tiles_and_decodes_the_settled_frame(tmp_path, monkeypatch):
+    import pytest
+
+    pytest.importorskip('PySide6.QtMultimedia', exc_type=ImportError)
+    from widgets.video_player import VideoPlayerWidget
+
+    path = write_video(tmp_path / 'clip.avi')
+    monkeypatch.setattr(thumbnail_cache, '_thumbnail_cache', bare_cache(tmp_path / 'cache'))
+    player = VideoPlayerWidget()
+    player.video_path = path
+    player.pixmap_item = QGraphicsPixmapItem()
+    player.fps = 10.0
+    player.total_frames = 60
+    try:
+        player._show_opencv_frame(0)
+        player._request_sprite_sheet()
+        spin_until(lambda: player._sprite_sheet is not None)
+
+        decoded = []
+        show_exact = player._show_opencv_frame
+        player._show_opencv_frame = lambda frame: (decoded.append(frame), show_exact(frame))
+        player.begin_timeline_scrub()
+        player.seek_to_frame(31)
+        player.seek_to_frame(42)
+        assert decoded == []
+        assert player.pixmap_item.pixmap().size().toTuple() == (64, 48)
+        assert abs(brightness(player.pixmap_item.pixmap().toImage()) - 40 * 4) <= 8
+
+        player.end_timeline_scrub()
+        assert decoded == [42]
+    finally:
+        player.cleanup(force_gc=False)
+        player.deleteLater()
+        APP.processEvents()
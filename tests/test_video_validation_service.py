@@ -0,0 +1,146 @@
+from pathlib import Path
+import os
+import sys
+import time
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'taggui'))
+
+from utils.image_index_db import ImageIndexDB
+from utils.video import validation_service
+
+
+def _folder(tmp_path):
+    ImageIndexDB(tmp_path).close()
+    (tmp_path / 'clips').mkdir()
+    for name in ('good.mp4', 'clips/broken.mp4'):
+        (tmp_path / name).write_bytes(b'video')
+    (tmp_path / 'photo.jpg').write_bytes(b'image')
+    return tmp_path
+
+
+def _fake_validator(monkeypatch, calls):
+    from utils.video.validator import VideoValidator
+
+    def fake_validate(video_path, deep=False, check_decode=False, timeout=30, threads=None):
+        calls.append((video_path.name, deep, check_decode))
+        if video_path.name == 'broken.mp4':
+            return False, 'Validation failed: moov atom not found'
+        return True, 'Video validated successfully'
+
+    monkeypatch.setattr(VideoValidator, 'validate', staticmethod(fake_validate))
+    # The fake lives in this process; keep the OpenCV levels here with it.
+    monkeypatch.setenv(validation_service.VALIDATION_PROCESSES_ENV, '0')
+
+
+def _hanging_validate(video_path, level='probe', timeout=None):
+    if video_path.name == 'broken.mp4':
+        time.sleep(60)
+    if video_path.name == 'good.mp4':
+        os._exit(3)
+    return None
+
+
+def test_folder_results_are_stored_and_unchanged_files_are_skipped(tmp_path, monkeypatch):
+    directory = _folder(tmp_path)
+    calls = []
+    _fake_validator(monkeypatch, calls)
+    validation_service.clear_memory_cache()
+    try:
+        results, report = validation_service.validate_folder(directory, 'probe', workers=2)
+        assert {path.name: result.ok for path, result in results.items()} == {
+            'good.mp4': True, 'broken.mp4': False}
+        assert report.completed == 2
+
+        # Nothing changed: the stored results answer, and a corrupt file
+        # stays corrupt even when a deeper level is requested.
+        calls.clear()
+        validation_service.clear_memory_cache()
+        _results, report = validation_service.validate_folder(directory, 'probe')
+        assert calls == [] and report.total == 0
+        _results, report = validation_service.validate_folder(directory, 'sample')
+        assert calls == [('good.mp4', True, False)]
+
+        calls.clear()
+        (directory / 'good.mp4').write_bytes(b'edited video')
+        assert validation_service.lookup_validation(directory / 'good.mp4') is None
+        validation_service.validate_folder(directory, 'probe')
+        assert calls == [('good.mp4', False, False)]
+        assert validation_service.lookup_validation(directory / 'clips' / 'broken.mp4').ok is False
+    finally:
+        validation_service.clear_memory_cache()
+
+
+def test_valid_and_corrupt_filters_query_the_stored_results(tmp_path, monkeypatch):
+    from models.image_list_model import ImageListModel
+
+    directory = _folder(tmp_path)
+    _fake_validator(monkeypatch, [])
+    validation_service.clear_memory_cache()
+    validation_service.validate_folder(directory, 'sample')
+    db = ImageIndexDB(directory)
+    try:
+        db.bulk_insert_files(sorted(directory.rglob('*.*')), directory)
+
+        def matching(filter_node):
+            sql, bindings = ImageListModel._build_filter_sql(None, filter_node)
+            rows = db.conn.execute(f'SELECT file_name FROM images WHERE {sql}', bindings).fetchall()
+            return sorted(Path(row[0]).name for row in rows)
+
+        assert matching(['valid', 'true']) == ['good.mp4']
+        assert matching(['valid', 'probe']) == ['good.mp4']
+        assert matching(['valid', 'decode']) == []
+        assert matching(['corrupt', 'true']) == ['broken.mp4']
+        assert matching(['corrupt', 'moov']) == ['broken.mp4']
+        assert matching(['corrupt', 'no']) == ['good.mp4']
+
+        # Edited after validation: the stored result no longer applies.
+        db.conn.execute("UPDATE images SET mtime = mtime + 10 WHERE is_video = 1")
+        assert matching(['valid', 'true']) == []
+        assert matching(['corrupt', 'true']) == []
+    finally:
+        db.close()
+        validation_service.clear_memory_cache()
+
+
+def test_hung_or_crashed_opencv_checks_are_killed_and_recorded(tmp_path, monkeypatch):
+    directory = _folder(tmp_path)
+    # Runs in the spawned workers: hangs on broken.mp4, kills the worker on good.mp4.
+    monkeypatch.setattr(validation_service, 'validate_video', _hanging_validate)
+    monkeypatch.setattr(validation_service, 'ISOLATION_GRACE_SECONDS', 8.0)
+    validation_service.clear_memory_cache()
+    try:
+        started = time.perf_counter()
+        results, report = validation_service.validate_folder(
+            directory, 'sample', workers=2, timeout=1.0)
+        assert time.perf_counter() - started < 30
+        messages = {path.name: (result.ok, result.message) for path, result in results.items()}
+        assert messages == {
+            'broken.mp4': (False, 'Validation timed out after 10s'),
+            'good.mp4': (False, 'Validator process crashed while decoding'),
+        }
+        assert report.completed == 2
+    finally:
+        validation_service.clear_memory_cache()
+
+
+def test_cancel_kills_running_opencv_checks(tmp_path, monkeypatch):
+    directory = _folder(tmp_path)
+    (directory / 'good.mp4').unlink()
+    monkeypatch.setattr(validation_service, 'validate_video', _hanging_validate)
+    validation_service.clear_memory_cache()
+    polls = []
+
+    def cancel_after_start(current, total, name):
+        polls.append(time.perf_counter())
+        return len(polls) > 20
+
+    try:
+        started = time.perf_counter()
+        results, _report = validation_service.validate_folder(
+            directory, 'sample', progress_callback=cancel_after_start, timeout=30.0)
+        assert time.perf_counter() - started < 20
+        assert results == {}
+    finally:
+        validation_service.clear_memory_cache()